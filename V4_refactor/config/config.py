@@ -76,6 +76,31 @@ class Config(BaseConfig):
     TERMINAL_MODE: bool = os.getenv("TERMINAL_MODE", "False").lower() == "true"
     FAST_CLASSIFICATION_ENABLED: bool = os.getenv("FAST_CLASSIFICATION_ENABLED", "False").lower() == "true"
     
+    # Tool execution (tool calls from one tutor turn run concurrently)
+    TOOL_MAX_CONCURRENCY: int = int(os.getenv("TOOL_MAX_CONCURRENCY", "4"))
+    TOOL_TIMEOUT_SECONDS: float = float(os.getenv("TOOL_TIMEOUT_SECONDS", "120"))
+    
+    # Shared OpenAI/Azure HTTP connection pool (core/llm/client_pool.py)
+    LLM_HTTP_MAX_CONNECTIONS: int = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "100"))
+    LLM_HTTP_MAX_KEEPALIVE: int = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "20"))
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("LLM_HTTP_KEEPALIVE_EXPIRY", "30"))
+    LLM_HTTP_TIMEOUT_SECONDS: float = float(os.getenv("LLM_HTTP_TIMEOUT_SECONDS", "600"))
+    LLM_HTTP2_ENABLED: bool = os.getenv("LLM_HTTP2_ENABLED", "True").lower() == "true"
+    
+    # Local intent router (skips the tutor routing LLM call when confident)
+    INTENT_ROUTER_ENABLED: bool = os.getenv("INTENT_ROUTER_ENABLED", "True").lower() == "true"
+    INTENT_ROUTER_CONFIDENCE: float = float(os.getenv("INTENT_ROUTER_CONFIDENCE", "0.8"))
+    
+    # Bounded context window (services/tutor/context_window.py): the last N
+    # messages go to the router/agents verbatim, older ones as a rolling summary
+    CONTEXT_WINDOW_ENABLED: bool = os.getenv("CONTEXT_WINDOW_ENABLED", "True").lower() == "true"
+    CONTEXT_KEEP_LAST_MESSAGES: int = int(os.getenv("CONTEXT_KEEP_LAST_MESSAGES", "12"))
+    CONTEXT_SUMMARY_BATCH: int = int(os.getenv("CONTEXT_SUMMARY_BATCH", "8"))
+    CONTEXT_TOKEN_BUDGET: int = int(os.getenv("CONTEXT_TOKEN_BUDGET", "6000"))
+    # Per-agent overrides, e.g. "hint=3000,feedback=12000"
+    CONTEXT_TOKEN_BUDGETS: str = os.getenv("CONTEXT_TOKEN_BUDGETS", "")
+    CONTEXT_SUMMARY_MODEL: str = os.getenv("CONTEXT_SUMMARY_MODEL", "")
+    
     # Default organism for cases
     DEFAULT_ORGANISM: str = os.getenv("DEFAULT_ORGANISM", "staphylococcus aureus")
     
@@ -87,6 +112,42 @@ class Config(BaseConfig):
     # Vector database settings
     FAISS_INDEX_PATH: str = os.getenv("FAISS_INDEX_PATH", str(DATA_DIR / "models" / "faiss_indices" / "output_index.faiss"))
     FAISS_DIMENSION: int = int(os.getenv("FAISS_DIMENSION", "1536"))
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "True").lower() == "true"
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", str(DATA_DIR / "cache" / "embeddings.sqlite3"))
+    EMBEDDING_CACHE_LRU_SIZE: int = int(os.getenv("EMBEDDING_CACHE_LRU_SIZE", "10000"))
+    INTENT_ROUTER_MODEL_PATH: str = os.getenv("INTENT_ROUTER_MODEL_PATH", str(DATA_DIR / "models" / "intent_router.pkl"))
+    
+    # Guideline result cache (services/guideline/result_cache.py); empty path = memory only
+    GUIDELINE_CACHE_ENABLED: bool = os.getenv("GUIDELINE_CACHE_ENABLED", "True").lower() == "true"
+    GUIDELINE_CACHE_PATH: str = os.getenv("GUIDELINE_CACHE_PATH", str(DATA_DIR / "cache" / "guideline_results.sqlite3"))
+    GUIDELINE_CACHE_TTL_SECONDS: float = float(os.getenv("GUIDELINE_CACHE_TTL_SECONDS", "86400"))
+    GUIDELINE_CACHE_LRU_SIZE: int = int(os.getenv("GUIDELINE_CACHE_LRU_SIZE", "256"))
+    GUIDELINE_CACHE_PREWARM: bool = os.getenv("GUIDELINE_CACHE_PREWARM", "True").lower() == "true"
+    
+    # Server-side chat sessions (services/infrastructure/session_store.py); empty path = memory only
+    SESSION_STORE_ENABLED: bool = os.getenv("SESSION_STORE_ENABLED", "True").lower() == "true"
+    SESSION_STORE_PATH: str = os.getenv("SESSION_STORE_PATH", str(DATA_DIR / "cache" / "sessions.sqlite3"))
+    SESSION_STORE_LRU_SIZE: int = int(os.getenv("SESSION_STORE_LRU_SIZE", "1000"))
+    SESSION_STORE_TTL_SECONDS: float = float(os.getenv("SESSION_STORE_TTL_SECONDS", "86400"))
+    
+    # Cases: False = serve only pre-generated cases (python -m microtutor.services.case.pregenerate)
+    CASE_GENERATION_ON_DEMAND: bool = os.getenv("CASE_GENERATION_ON_DEMAND", "True").lower() == "true"
+    
+    # Hybrid retrieval: max wait for the query embedding before answering from BM25 alone
+    RETRIEVAL_EMBED_TIMEOUT_SECONDS: float = float(os.getenv("RETRIEVAL_EMBED_TIMEOUT_SECONDS", "2.0"))
+    # Feedback examples only from cases of the current organism
+    FEEDBACK_ORGANISM_SCOPED: bool = os.getenv("FEEDBACK_ORGANISM_SCOPED", "False").lower() == "true"
+    # Versioned feedback indices (data/feedback_auto/versions): how often each worker
+    # checks for a newly published version (0 = never), and how many versions to keep
+    FEEDBACK_INDEX_RELOAD_INTERVAL_SECONDS: float = float(os.getenv("FEEDBACK_INDEX_RELOAD_INTERVAL_SECONDS", "5"))
+    FEEDBACK_INDEX_KEEP_VERSIONS: int = int(os.getenv("FEEDBACK_INDEX_KEEP_VERSIONS", "3"))
+    # Master feedback index type by corpus size: exact Flat below FLAT_MAX, HNSW below
+    # HNSW_MAX, IVF-PQ above; an approximate index must reach MIN_RECALL recall@K vs Flat
+    FEEDBACK_ANN_FLAT_MAX_ENTRIES: int = int(os.getenv("FEEDBACK_ANN_FLAT_MAX_ENTRIES", "20000"))
+    FEEDBACK_ANN_HNSW_MAX_ENTRIES: int = int(os.getenv("FEEDBACK_ANN_HNSW_MAX_ENTRIES", "500000"))
+    FEEDBACK_ANN_MIN_RECALL: float = float(os.getenv("FEEDBACK_ANN_MIN_RECALL", "0.95"))
+    FEEDBACK_ANN_RECALL_K: int = int(os.getenv("FEEDBACK_ANN_RECALL_K", "10"))
+    FEEDBACK_ANN_BENCHMARK_QUERIES: int = int(os.getenv("FEEDBACK_ANN_BENCHMARK_QUERIES", "200"))
     
     # Qdrant settings
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
@@ -25,6 +25,10 @@ except ImportError:
 
 from microtutor.services.infrastructure.cost import get_cost_service, CostService
 from microtutor.services.infrastructure.background import get_background_service, BackgroundTaskService
+from microtutor.services.infrastructure.session_store import get_session_store
+from microtutor.services.tutor.intent_router import get_intent_router
+from microtutor.utils.embedding_cache import get_embedding_cache
+from microtutor.services.guideline.cache import get_guidelines_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -202,6 +206,109 @@ async def get_background_status(
         )
 
 
+@router.get(
+    "/router/stats",
+    summary="Get intent router statistics",
+    description="Hit rate of the local intent router (turns routed without the tutor LLM call)"
+)
+async def get_router_stats() -> Dict[str, Any]:
+    """Get local intent router statistics.
+    
+    Returns:
+        Dictionary with request, local hit and LLM fallback counts and hit rate
+    """
+    try:
+        return {
+            "status": "success",
+            "data": get_intent_router().get_stats(),
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get intent router stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve intent router statistics"
+        )
+
+
+@router.get(
+    "/embeddings/cache/stats",
+    summary="Get embedding cache statistics",
+    description="Hit/miss counters for the (model, sha256(text)) embedding cache"
+)
+async def get_embedding_cache_stats() -> Dict[str, Any]:
+    """Get embedding cache statistics.
+    
+    Returns:
+        Dictionary with LRU/disk hits, misses, hit rate and entry counts
+    """
+    try:
+        cache = get_embedding_cache()
+        return {
+            "status": "success",
+            "data": cache.get_stats() if cache is not None else {"enabled": False},
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get embedding cache stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve embedding cache statistics"
+        )
+
+
+@router.get(
+    "/guidelines/cache/stats",
+    summary="Get guideline result cache statistics",
+    description="Hit/miss counters for the per-organism guideline result cache"
+)
+async def get_guideline_cache_stats() -> Dict[str, Any]:
+    """Get guideline result cache statistics.
+    
+    Returns:
+        Dictionary with LRU/disk hits, misses, expiries and entry counts
+    """
+    try:
+        cache = get_guidelines_cache().result_cache
+        return {
+            "status": "success",
+            "data": cache.get_stats() if cache is not None else {"enabled": False},
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get guideline cache stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve guideline cache statistics"
+        )
+
+
+@router.get(
+    "/sessions/stats",
+    summary="Get session store statistics",
+    description="Hit/miss/conflict counters for the server-side chat session store"
+)
+async def get_session_store_stats() -> Dict[str, Any]:
+    """Get session store statistics.
+    
+    Returns:
+        Dictionary with LRU hits, disk loads, misses, version conflicts and entry counts
+    """
+    try:
+        session_store = get_session_store()
+        return {
+            "status": "success",
+            "data": session_store.get_stats() if session_store is not None else {"enabled": False},
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Failed to get session store stats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve session store statistics"
+        )
+
+
 @router.get(
     "/health/detailed",
     summary="Detailed health check",
@@ -1,17 +1,21 @@
 """Chat-related API endpoints."""
 
+import json
 import logging
 from datetime import datetime
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
 
 from microtutor.api.dependencies import get_tutor_service
 from microtutor.api.dependencies import get_db
 from microtutor.core.config.config_helper import config
 from microtutor.schemas.api.requests import StartCaseRequest, ChatRequest, FeedbackRequest, CaseFeedbackRequest
 from microtutor.schemas.api.responses import StartCaseResponse, ChatResponse, ErrorResponse
-from microtutor.schemas.domain.domain import TutorContext
+from microtutor.schemas.domain.domain import TutorContext, TutorState
 from microtutor.services.infrastructure.background import BackgroundTaskService, get_background_service
+from microtutor.services.infrastructure.session_store import SessionVersionConflict, get_session_store
 from microtutor.services.tutor.service import TutorService
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -68,11 +72,22 @@ async def start_case(
         
         logger.info(f"[START_CASE] Success for case_id={request.case_id}")
         
+        history = [{"role": "assistant", "content": response.content}]
+        version = _save_session(TutorContext(
+            case_id=request.case_id,
+            organism=request.organism,
+            conversation_history=history,
+            current_state=TutorState.INFORMATION_GATHERING,
+            model_name=model_name,
+            session_metadata={"enable_guidelines": request.enable_guidelines or False}
+        ), base_version=None)  # A new case replaces any stored session
+        
         return StartCaseResponse(
             initial_message=response.content,
-            history=[{"role": "assistant", "content": response.content}],
+            history=history,
             case_id=request.case_id,
-            organism=request.organism
+            organism=request.organism,
+            version=version
         )
         
     except ValueError as e:
@@ -83,6 +98,228 @@ async def start_case(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to start case")
 
 
+@router.get(
+    "/start_case/{case_id}/guidelines",
+    summary="Get guideline prefetch status",
+    description="Status of the background guideline lookup started by start_case"
+)
+async def get_guideline_prefetch_status(
+    case_id: str,
+    tutor_service: TutorService = Depends(get_tutor_service)
+) -> dict:
+    """Status of a case's guideline prefetch: not_started, running, ready, failed or cancelled."""
+    return {"status": "success", "data": tutor_service.get_guideline_prefetch_status(case_id)}
+
+
+@router.delete(
+    "/start_case/{case_id}/guidelines",
+    summary="Cancel guideline prefetch",
+    description="Cancel the background guideline lookup for an abandoned case"
+)
+async def cancel_guideline_prefetch(
+    case_id: str,
+    tutor_service: TutorService = Depends(get_tutor_service)
+) -> dict:
+    """Cancel a case's guideline prefetch if it is still running."""
+    cancelled = tutor_service.cancel_guideline_prefetch(case_id)
+    logger.info(f"[START_CASE] Guideline prefetch cancel for case_id={case_id}: {cancelled}")
+    return {"status": "success", "cancelled": cancelled}
+
+
+def _save_session(context: TutorContext, base_version: Optional[int]) -> Optional[int]:
+    """Store a case's context server-side; returns its new version (None if the store is off).
+    
+    base_version is the stored version the turn was loaded from; the save
+    only succeeds if no other turn saved since. None replaces whatever is
+    stored (start_case, and turns that sent their own history).
+    
+    Raises:
+        HTTPException: 409 if another turn saved the session first
+    """
+    session_store = get_session_store()
+    if session_store is None:
+        return None
+    if base_version is None:
+        return session_store.replace(context)
+    try:
+        return session_store.save(context, base_version)
+    except SessionVersionConflict as e:
+        logger.warning(f"[CHAT] {e}")
+        raise _version_conflict(e)
+
+
+def _version_conflict(e: SessionVersionConflict) -> HTTPException:
+    """409 telling the client to resend its full history."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Session version conflict (server has version {e.actual}). Resend the full history."
+    )
+
+
+def _apply_client_phase(context: TutorContext, request: ChatRequest) -> None:
+    # Persist phase across requests.
+    # Without this, every /chat call starts from INITIALIZING and the tutor may
+    # infer/overwrite phase back to information gathering after a skip.
+    if request.current_phase:
+        try:
+            context.current_state = TutorState(request.current_phase)
+        except Exception:
+            logger.warning(f"[CHAT] Invalid current_phase from client: {request.current_phase!r}")
+
+
+def _load_session_context(
+    request: ChatRequest,
+    model_name: str,
+    use_azure: Optional[bool]
+) -> Optional[Tuple[TutorContext, int]]:
+    """(stored TutorContext for request.case_id updated with this request's settings, its version).
+    
+    Raises:
+        HTTPException: 409 if the client's version is behind the stored session,
+            or if it sent a version but there is no usable session (expired,
+            purged, never written to disk, other organism)
+    """
+    session_store = get_session_store()
+    session = None
+    if session_store is not None:
+        try:
+            session = session_store.get(request.case_id, expected_version=request.version)
+        except SessionVersionConflict as e:
+            logger.warning(f"[CHAT] {e}")
+            raise _version_conflict(e)
+    if session is not None and session[0].organism != request.organism_key:
+        logger.warning(f"[CHAT] Stored session for case_id={request.case_id} is for {session[0].organism!r} - ignoring it")
+        session = None
+    if session is None:
+        if request.version is not None:
+            # The client relies on the server-side history; answering from an
+            # empty context would silently drop the conversation
+            logger.warning(f"[CHAT] No usable session for case_id={request.case_id} (client sent version {request.version})")
+            raise _version_conflict(SessionVersionConflict(request.case_id, request.version, 0))
+        return None
+    context, version = session
+    context.model_name = model_name
+    context.use_azure = use_azure
+    context.session_metadata["enable_guidelines"] = request.enable_guidelines or False
+    _apply_client_phase(context, request)
+    return context, version
+
+
+def _build_tutor_context(
+    request: ChatRequest,
+    model_name: str,
+    use_azure: Optional[bool],
+    db: Session
+) -> Tuple[TutorContext, Optional[int]]:
+    """Build the TutorContext for a chat turn (shared by /chat and /chat/stream).
+    
+    A request without history continues the server-side session for its
+    case_id (no history to parse or filter). A request with history is
+    handled as before and replaces the stored session when the turn is saved.
+    
+    Returns:
+        (context, base_version) - pass base_version to _save_session();
+        None when the turn replaces the stored session
+    """
+    if not request.history:
+        session = _load_session_context(request, model_name, use_azure)
+        if session is not None:
+            return session
+    
+    # Filter system messages from incoming history
+    from microtutor.utils.conversation_utils import filter_system_messages
+    clean_history = filter_system_messages([msg.model_dump() for msg in request.history])
+
+    # If client history is empty (or clearly incomplete), fall back to server-side history.
+    # This prevents "I don't see any tests ordered yet" when the client failed to send prior turns.
+    if (not clean_history) and db is not None:
+        try:
+            # Pull a bounded window of messages, then restore chronological order.
+            # Note: conversation_logs in V4 schema stores role/content; metadata may not exist.
+            result = db.execute(
+                text(
+                    """
+                    SELECT role, content
+                    FROM conversation_logs
+                    WHERE case_id = :case_id
+                    ORDER BY timestamp DESC
+                    LIMIT :limit
+                    """
+                ),
+                {"case_id": request.case_id, "limit": 80},
+            )
+            rows = result.fetchall()
+            db_history = [{"role": r[0], "content": r[1]} for r in reversed(rows)]
+            db_history = filter_system_messages(db_history)
+            if db_history:
+                logger.warning(
+                    f"[CHAT] Client sent empty history; hydrated {len(db_history)} msgs from DB for case_id={request.case_id}"
+                )
+                clean_history = db_history
+        except Exception as e:
+            logger.warning(f"[CHAT] Failed to hydrate history from DB: {e}")
+    
+    context = TutorContext(
+        case_id=request.case_id,
+        organism=request.organism_key,
+        conversation_history=clean_history,
+        model_name=model_name,
+        use_azure=use_azure,
+        session_metadata={"enable_guidelines": request.enable_guidelines or False}
+    )
+    _apply_client_phase(context, request)
+    _hydrate_history_summary(context)
+    return context, None
+
+
+def _hydrate_history_summary(context: TutorContext) -> None:
+    """Reuse the stored session's conversation summary for a client-sent history.
+    
+    The summary applies only if the client's history starts with the
+    messages it covers; otherwise the turn starts without one. With the
+    session store off nothing would keep a summary, so folding is switched
+    off for the turn (see services/tutor/context_window.py).
+    """
+    session_store = get_session_store()
+    if session_store is None:
+        context.fold_history = False
+        return
+    try:
+        session = session_store.get(context.case_id)
+    except Exception as e:
+        logger.warning(f"[CHAT] Could not read stored session for case_id={context.case_id}: {e}")
+        return
+    if session is None:
+        return
+    stored, _ = session
+    count = stored.summarized_count
+    if not stored.history_summary or not count or stored.organism != context.organism:
+        return
+    
+    from microtutor.utils.conversation_utils import strip_feedback_blocks
+    client_prefix = strip_feedback_blocks(context.conversation_history[:count])
+    stored_prefix = stored.conversation_history[:count]
+    if len(client_prefix) == count and all(
+        a.get("role") == b.get("role") and a.get("content") == b.get("content")
+        for a, b in zip(client_prefix, stored_prefix)
+    ):
+        context.history_summary = stored.history_summary
+        context.summarized_count = count
+
+
+def _chat_metadata(request: ChatRequest, response, processing_time: float) -> dict:
+    """Response metadata for a chat turn (shared by /chat and /chat/stream)."""
+    return {
+        "processing_time_ms": processing_time,
+        "case_id": request.case_id,
+        "organism": request.organism_key,
+        # Bubble up tutor/service metadata (phase, guidelines flags, etc.)
+        **(response.metadata or {}),
+        # Normalize phase naming for frontend consumers
+        "current_phase": (response.metadata or {}).get("current_phase") or (response.metadata or {}).get("state"),
+    }
+
+
 @router.post(
     "/chat",
     response_model=ChatResponse,
@@ -103,6 +340,7 @@ async def chat(
     
     - **message**: The student's question or response
     - **history**: Full conversation history including system messages
+      (omit it and send **version** to continue the server-side session)
     - **organism_key**: Current organism being studied
     - **case_id**: Active case ID
     """
@@ -120,56 +358,7 @@ async def chat(
     logger.info(f"[CHAT] case_id={request.case_id}, model={model_name}, organism={request.organism_key}")
     
     try:
-        # Filter system messages from incoming history
-        from microtutor.utils.conversation_utils import filter_system_messages
-        clean_history = filter_system_messages([msg.model_dump() for msg in request.history])
-
-        # If client history is empty (or clearly incomplete), fall back to server-side history.
-        # This prevents "I don't see any tests ordered yet" when the client failed to send prior turns.
-        if (not clean_history) and db is not None:
-            try:
-                # Pull a bounded window of messages, then restore chronological order.
-                # Note: conversation_logs in V4 schema stores role/content; metadata may not exist.
-                result = db.execute(
-                    text(
-                        """
-                        SELECT role, content
-                        FROM conversation_logs
-                        WHERE case_id = :case_id
-                        ORDER BY timestamp DESC
-                        LIMIT :limit
-                        """
-                    ),
-                    {"case_id": request.case_id, "limit": 80},
-                )
-                rows = result.fetchall()
-                db_history = [{"role": r[0], "content": r[1]} for r in reversed(rows)]
-                db_history = filter_system_messages(db_history)
-                if db_history:
-                    logger.warning(
-                        f"[CHAT] Client sent empty history; hydrated {len(db_history)} msgs from DB for case_id={request.case_id}"
-                    )
-                    clean_history = db_history
-            except Exception as e:
-                logger.warning(f"[CHAT] Failed to hydrate history from DB: {e}")
-        
-        context = TutorContext(
-            case_id=request.case_id,
-            organism=request.organism_key,
-            conversation_history=clean_history,
-            model_name=model_name,
-            use_azure=use_azure,
-            session_metadata={"enable_guidelines": request.enable_guidelines or False}
-        )
-        # Persist phase across requests.
-        # Without this, every /chat call starts from INITIALIZING and the tutor may
-        # infer/overwrite phase back to information gathering after a skip.
-        if request.current_phase:
-            try:
-                from microtutor.schemas.domain.domain import TutorState
-                context.current_state = TutorState(request.current_phase)
-            except Exception:
-                logger.warning(f"[CHAT] Invalid current_phase from client: {request.current_phase!r}")
+        context, base_version = _build_tutor_context(request, model_name, use_azure, db)
         
         # Log user message asynchronously
         background_service.log_conversation_async(
@@ -195,6 +384,8 @@ async def chat(
             metadata={"tools_used": response.tools_used, "organism": request.organism_key}
         )
         
+        version = _save_session(context, base_version)
+        
         processing_time = (datetime.now() - start_time).total_seconds() * 1000
         logger.info(f"[CHAT] Completed in {processing_time:.2f}ms for case_id={request.case_id}")
         
@@ -202,18 +393,13 @@ async def chat(
             response=response.content,
             history=[{"role": msg["role"], "content": msg["content"]} for msg in context.conversation_history],
             tools_used=response.tools_used,
-            metadata={
-                "processing_time_ms": processing_time,
-                "case_id": request.case_id,
-                "organism": request.organism_key,
-                # Bubble up tutor/service metadata (phase, guidelines flags, etc.)
-                **(response.metadata or {}),
-                # Normalize phase naming for frontend consumers
-                "current_phase": (response.metadata or {}).get("current_phase") or (response.metadata or {}).get("state"),
-            },
-            feedback_examples=response.feedback_examples or []
+            metadata=_chat_metadata(request, response, processing_time),
+            feedback_examples=response.feedback_examples or [],
+            version=version
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         logger.error(f"[CHAT] ValueError: {e}")
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -222,6 +408,110 @@ async def chat(
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Failed to process message")
 
 
+def _sse_event(event: str, data: dict) -> str:
+    """Format one server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@router.post(
+    "/chat/stream",
+    responses={
+        400: {"model": ErrorResponse}
+    },
+    summary="Send a chat message (streamed)",
+    description="Same as /chat, but streams the tutor's reply as server-sent events"
+)
+async def chat_stream(
+    request: ChatRequest,
+    tutor_service: TutorService = Depends(get_tutor_service),
+    background_service: BackgroundTaskService = Depends(get_background_service)
+    ,db: Session = Depends(get_db)
+) -> StreamingResponse:
+    """Process a chat message and stream the reply as server-sent events.
+    
+    Events:
+    - **token**: `{"content": str}` - next chunk of the reply, in order
+    - **done**: same fields as the /chat response; `response` is the final,
+      authoritative text (e.g. patient replies with audio arrive as JSON here)
+    - **error**: `{"detail": str}` - the turn failed; no done event follows
+      (`status_code` 409 if another turn saved the session first)
+    """
+    start_time = datetime.now()
+    
+    # Validate required fields
+    if not request.case_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No active case ID. Please start a new case.")
+    if not request.organism_key:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No active organism. Please start a new case.")
+    
+    model_name = request.model_name or config.API_MODEL_NAME
+    use_azure = request.model_provider.lower() == 'azure' if request.model_provider else None
+    
+    logger.info(f"[CHAT_STREAM] case_id={request.case_id}, model={model_name}, organism={request.organism_key}")
+    
+    context, base_version = _build_tutor_context(request, model_name, use_azure, db)
+    
+    # Log user message asynchronously
+    background_service.log_conversation_async(
+        case_id=request.case_id,
+        role="user",
+        content=request.message,
+        metadata={"organism": request.organism_key}
+    )
+    
+    async def event_stream():
+        try:
+            async for event in tutor_service.process_message_stream(
+                message=request.message,
+                context=context,
+                feedback_enabled=request.feedback_enabled,
+                feedback_threshold=request.feedback_threshold
+            ):
+                if event["type"] == "delta":
+                    yield _sse_event("token", {"content": event["content"]})
+                    continue
+                
+                response = event["response"]
+                version = _save_session(context, base_version)
+                processing_time = (datetime.now() - start_time).total_seconds() * 1000
+                yield _sse_event("done", ChatResponse(
+                    response=response.content,
+                    history=[{"role": msg["role"], "content": msg["content"]} for msg in context.conversation_history],
+                    tools_used=response.tools_used,
+                    metadata=_chat_metadata(request, response, processing_time),
+                    feedback_examples=response.feedback_examples or [],
+                    version=version
+                ).model_dump())
+                
+                # Log assistant response once the stream has completed
+                background_service.log_conversation_async(
+                    case_id=request.case_id,
+                    role="assistant",
+                    content=response.content,
+                    metadata={"tools_used": response.tools_used, "organism": request.organism_key}
+                )
+                logger.info(f"[CHAT_STREAM] Completed in {processing_time:.2f}ms for case_id={request.case_id}")
+        
+        except HTTPException as e:
+            # Session conflict on save: the status line is already sent, so report it in the event
+            yield _sse_event("error", {"detail": e.detail, "status_code": e.status_code})
+        except ValueError as e:
+            logger.error(f"[CHAT_STREAM] ValueError: {e}")
+            yield _sse_event("error", {"detail": str(e)})
+        except Exception as e:
+            logger.error(f"[CHAT_STREAM] Error: {e}", exc_info=True)
+            yield _sse_event("error", {"detail": "Failed to process message"})
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # Don't let nginx buffer the stream
+        },
+    )
+
+
 @router.post(
     "/feedback",
     responses={
@@ -355,11 +645,11 @@ and they should ask the main tutor about case-specific questions."""
 async def get_available_organisms() -> dict:
     """Get list of organisms that have pre-generated cases available."""
     try:
-        from microtutor.services.case import CaseGeneratorRAGAgent
+        from microtutor.services.case import get_case_store
         
-        case_generator = CaseGeneratorRAGAgent()
-        cached_organisms = case_generator.get_cached_organisms()
-        hpi_organisms = case_generator.get_hpi_organisms()
+        case_store = get_case_store()
+        cached_organisms = case_store.organisms()
+        hpi_organisms = case_store.hpi_organisms()
         
         logger.info(f"[ORGANISMS] Found {len(cached_organisms)} cached organisms")
         
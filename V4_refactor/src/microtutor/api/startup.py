@@ -9,6 +9,7 @@ The import chain: startup -> background -> factory -> TutorService -> ... -> sta
 would cause circular imports if done at module level.
 """
 
+import asyncio
 import logging
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
@@ -32,6 +33,9 @@ async def lifespan(app) -> AsyncGenerator[None, None]:
     # Lazy imports to avoid circular import issues
     from microtutor.services.infrastructure.background import get_background_service, shutdown_background_service
     from microtutor.api.dependencies import init_database
+    from microtutor.core.config.config_helper import config
+    
+    prewarm_task = None
     
     # Startup
     logger.info("🚀 Starting MicroTutor application...")
@@ -45,6 +49,12 @@ async def lifespan(app) -> AsyncGenerator[None, None]:
         background_service = get_background_service()
         logger.info("✅ Background service initialized")
         
+        # Pre-warm guideline results for cached cases (in the background)
+        if getattr(config, "GUIDELINE_CACHE_PREWARM", True):
+            from microtutor.services.guideline.cache import get_guidelines_cache
+            prewarm_task = asyncio.create_task(get_guidelines_cache().prewarm())
+            logger.info("✅ Guideline cache prewarm started")
+        
         # Initialize other services if needed
         # (Add other service initialization here)
         
@@ -61,10 +71,18 @@ async def lifespan(app) -> AsyncGenerator[None, None]:
     logger.info("🛑 Shutting down MicroTutor application...")
     
     try:
+        if prewarm_task is not None and not prewarm_task.done():
+            prewarm_task.cancel()
+        
         # Shutdown background service
         shutdown_background_service()
         logger.info("✅ Background service shutdown complete")
         
+        # Close shared OpenAI connection pools
+        from microtutor.core.llm.client_pool import aclose_clients
+        await aclose_clients()
+        logger.info("✅ LLM client pools closed")
+        
         # Shutdown other services if needed
         # (Add other service cleanup here)
         
@@ -236,6 +236,7 @@ async function handleStartCaseWithOrganism(selectedOrganism) {
 
         // Initialize history from response with validation
         State.chatHistory = validateChatHistory(data.history);
+        State.sessionVersion = data.version ?? null;
 
         // Display messages
         if (DOM.chatbox) DOM.chatbox.innerHTML = '';
@@ -306,12 +307,15 @@ async function handleSendMessage() {
         console.log(`📊 [CHAT] Threshold: ${State.feedbackThreshold.toFixed(1)}`);
         console.log(`🤖 [CHAT] Model: ${State.currentModel} (${State.currentModelProvider})`);
 
-        const response = await fetch(`${API_BASE}/chat`, {
+        // The server keeps the session: once we have its version, send only the
+        // new message. On a version conflict (e.g. another tab), resend the history.
+        const postChat = (withHistory) => fetch(`${API_BASE}/chat`, {
             method: 'POST',
             headers: { 'Content-Type': 'application/json' },
             body: JSON.stringify({
                 message: messageText,
-                history: validHistory,
+                history: withHistory ? validHistory : [],
+                version: withHistory ? null : State.sessionVersion,
                 organism_key: State.currentOrganismKey,
                 case_id: State.currentCaseId,
                 model_name: State.currentModel,
@@ -323,6 +327,12 @@ async function handleSendMessage() {
             }),
         });
 
+        let response = await postChat(State.sessionVersion === null);
+        if (response.status === 409) {
+            console.warn('[CHAT] Session version conflict, resending full history');
+            response = await postChat(true);
+        }
+
         if (!response.ok) {
             const errData = await response.json();
 
@@ -339,6 +349,7 @@ async function handleSendMessage() {
 
         const data = await response.json();
         console.log('[CHAT] Response:', data);
+        State.sessionVersion = data.version ?? null;
 
         // Set tool tracking based on backend response
         if (data.tools_used && data.tools_used.length > 0) {
@@ -13,6 +13,8 @@ const State = {
     currentOrganismKey: null,
     currentPhase: 'information_gathering',
     caseComplete: false,
+    // Server-side session version (null = send full history)
+    sessionVersion: null,
 
     // Model state
     currentModelProvider: 'azure',
@@ -66,6 +68,7 @@ const State = {
         this.currentOrganismKey = null;
         this.currentPhase = 'information_gathering';
         this.caseComplete = false;
+        this.sessionVersion = null;
         this.currentModelProvider = 'azure';
         this.currentModel = 'gpt-5';
         this.guidelinesEnabled = true;
@@ -5,19 +5,19 @@ Base class for all agents, providing common LLM interaction functionality.
 Adapted from V3 to work standalone in V4 structure.
 """
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import os
 from dotenv import load_dotenv
 import json
-from openai import AzureOpenAI, OpenAI
 from microtutor.core.config.config_helper import config
+from microtutor.core.llm.client_pool import get_openai_client
 
 # Load environment variables
 load_dotenv()
 
 class BaseAgent:
     def __init__(self, model_name: str = None):
-        # Determine which client to use based on the toggle
+        # Determine which client to use based on the toggle (shared, pooled clients)
         use_azure_env = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
         azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
@@ -25,15 +25,11 @@ class BaseAgent:
         
         if use_azure_env and azure_endpoint and azure_api_key:
             # Use Azure OpenAI
-            self.client = AzureOpenAI(
-                azure_endpoint=azure_endpoint,
-                api_key=azure_api_key,
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2025-04-16")
-            )
+            self.client = get_openai_client(use_azure=True)
             self.use_azure = True
         elif openai_api_key:
             # Use personal OpenAI
-            self.client = OpenAI(api_key=openai_api_key)
+            self.client = get_openai_client(use_azure=False)
             self.use_azure = False
         else:
             raise ValueError("Missing required OpenAI environment variables. Check USE_AZURE_OPENAI setting and credentials.")
@@ -42,6 +38,17 @@ class BaseAgent:
         self.model_name = model_name if model_name else config.API_MODEL_NAME
         self.conversation_history = []
     
+    def _model_to_use(self) -> str:
+        """Model (or Azure deployment) name for chat completions."""
+        # For Azure, use deployment name if available, otherwise use model name
+        model_to_use = self.model_name
+        if self.use_azure:
+            # Check if there's a deployment mapping for this model
+            o4_mini_deployment = os.getenv("AZURE_OPENAI_O4_MINI_DEPLOYMENT")
+            if self.model_name == config.API_MODEL_NAME and o4_mini_deployment:
+                model_to_use = o4_mini_deployment
+        return model_to_use
+    
     def generate_response(self, system_prompt: str, user_prompt: str) -> str:
         """Generate a response using the LLM."""
         self.add_to_history("user", user_prompt)
@@ -54,23 +61,33 @@ class BaseAgent:
         for msg in self.conversation_history:
             messages.append({"role": msg["role"], "content": msg["content"]})
         
-        # For Azure, use deployment name if available, otherwise use model name
-        model_to_use = self.model_name
-        if self.use_azure:
-            # Check if there's a deployment mapping for this model
-            o4_mini_deployment = os.getenv("AZURE_OPENAI_O4_MINI_DEPLOYMENT")
-            if self.model_name == config.API_MODEL_NAME and o4_mini_deployment:
-                model_to_use = o4_mini_deployment
-        
         # Use the model's default max_tokens (no explicit limit)
         response = self.client.chat.completions.create(
-            model=model_to_use,
+            model=self._model_to_use(),
             messages=messages,
         )
         
         response_text = response.choices[0].message.content
         self.add_to_history("assistant", response_text)
         return response_text
+    
+    def complete(self, system_prompt: Optional[str], user_prompt: str, **kwargs) -> str:
+        """Single-turn LLM call that neither reads nor writes conversation history.
+        
+        Safe to call from several threads at once. Pass system_prompt=None to
+        send only the user message; extra kwargs (e.g. response_format) go to
+        chat.completions.create.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        messages.append({"role": "user", "content": user_prompt})
+        response = self.client.chat.completions.create(
+            model=self._model_to_use(),
+            messages=messages,
+            **kwargs,
+        )
+        return response.choices[0].message.content
 
     def add_to_history(self, role: str, content: str):
         """Add a message to the conversation history."""
@@ -3,10 +3,20 @@ Automatic FAISS index generation service.
 
 This service automatically generates and updates FAISS indices from database feedback
 data, enabling continuous improvement of the feedback system.
+
+Every full or incremental update writes a new index version and publishes it
+with an atomic pointer swap (see index_versions.py); files that retrievers
+may be reading are never overwritten in place. The entries of all index types
+of a version are stored once, in its feedback_metadata.db (metadata_store.py).
+
+Each entry is embedded once, into the master ("all") index; the "patient" and
+"tutor" indices are views listing master rows (INDEX_VIEWS). The master index
+type (exact Flat, HNSW or IVF-PQ) follows the corpus size and is recorded as
+index_metadata["index"] (see index_tiers.py).
 """
 
 import logging
-import pickle
+import shutil
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
@@ -14,12 +24,31 @@ from contextlib import contextmanager
 import faiss
 import numpy as np
 
+from microtutor.core.config.config_helper import config as app_config
 from microtutor.core.feedback.database_loader import DatabaseFeedbackLoader, DatabaseFeedbackConfig
-from microtutor.core.feedback.processor import FeedbackProcessor, FeedbackEntry
-from microtutor.utils.embedding_utils import get_embedding
+from microtutor.core.feedback.index_versions import (
+    INDEX_SUBDIRS,
+    INDEX_VIEWS,
+    MASTER_INDEX,
+    in_view,
+    index_dir,
+    new_version_dir,
+    prune_versions,
+    publish_version,
+    resolve_live_dir,
+)
+from microtutor.core.feedback.index_tiers import build_index, index_vectors, select_index, tier_is_current
+from microtutor.core.feedback.metadata_store import METADATA_FILENAME, FeedbackMetadataStore
+from microtutor.core.feedback.processor import BM25_FILENAME, FeedbackProcessor, FeedbackEntry
+from microtutor.utils.atomic_io import atomic_write_json
+from microtutor.utils.lexical_search import BM25Index
+from microtutor.utils.embedding_utils import embed_texts
 
 logger = logging.getLogger(__name__)
 
+# Keep superseded versions around this long: other workers may still be loading them
+_PRUNE_MIN_AGE_S = 300.0
+
 
 @contextmanager
 def get_db_session():
@@ -175,50 +204,44 @@ class AutoFAISSGenerator:
                 self.processor.entries = entries
             
             # Generate different types of indices (outside db session - don't need db anymore)
-            results = {}
-            
-            # All feedback index
-            logger.info("Generating all feedback index...")
-            all_index, all_texts, all_entries = self.processor.create_faiss_index(
-                output_dir=str(self.output_dir),
-                batch_size=32
-            )
-            results["all"] = {
-                "index_path": str(self.output_dir / "feedback_index.faiss"),
-                "texts_path": str(self.output_dir / "feedback_texts.pkl"),
-                "entries_path": str(self.output_dir / "feedback_entries.pkl"),
-                "count": len(all_entries)
-            }
-            
-            # Patient feedback index (rating >= 3)
-            logger.info("Generating patient feedback index...")
-            patient_index, patient_texts, patient_entries = self.processor.create_faiss_index(
-                output_dir=str(self.output_dir / "patient"),
-                batch_size=32,
-                filter_by_type="patient",
-                min_rating=3
-            )
-            results["patient"] = {
-                "index_path": str(self.output_dir / "patient" / "feedback_index.faiss"),
-                "texts_path": str(self.output_dir / "patient" / "feedback_texts.pkl"),
-                "entries_path": str(self.output_dir / "patient" / "feedback_entries.pkl"),
-                "count": len(patient_entries)
-            }
-            
-            # Tutor feedback index (rating >= 3)
-            logger.info("Generating tutor feedback index...")
-            tutor_index, tutor_texts, tutor_entries = self.processor.create_faiss_index(
-                output_dir=str(self.output_dir / "tutor"),
-                batch_size=32,
-                filter_by_type="tutor",
-                min_rating=3
-            )
-            results["tutor"] = {
-                "index_path": str(self.output_dir / "tutor" / "feedback_index.faiss"),
-                "texts_path": str(self.output_dir / "tutor" / "feedback_texts.pkl"),
-                "entries_path": str(self.output_dir / "tutor" / "feedback_entries.pkl"),
-                "count": len(tutor_entries)
-            }
+            # into a new version directory; nothing reads it until it is published
+            version_id, version_dir = new_version_dir(self.output_dir)
+            store = FeedbackMetadataStore(str(version_dir / METADATA_FILENAME), writable=True)
+            try:
+                results = {}
+                
+                # Master index: every entry embedded once
+                logger.info("Generating master feedback index...")
+                master_index, _, all_entries = self.processor.create_faiss_index(
+                    output_dir=str(index_dir(version_dir, MASTER_INDEX)),
+                    metadata_store=store
+                )
+                # Replace the exact index with an approximate one if the corpus calls for it
+                # (benchmarked under the view filters too - most searches go through a view)
+                view_masks = {
+                    view: np.array([in_view(entry, view) for entry in all_entries], dtype=bool)
+                    for view in INDEX_VIEWS
+                }
+                tiered, index_params = select_index(index_vectors(master_index), filters=view_masks)
+                if tiered is not None:
+                    faiss.write_index(tiered, str(index_dir(version_dir, MASTER_INDEX) / "feedback_index.faiss"))
+                results[MASTER_INDEX] = self._index_result(version_dir, MASTER_INDEX, len(all_entries))
+                
+                # Patient / tutor views (rating >= 3) - master rows, no extra embeddings
+                master_rows = store.row_ids(MASTER_INDEX)
+                for view in INDEX_VIEWS:
+                    rows = [int(row) for row, entry in zip(master_rows, all_entries) if in_view(entry, view)]
+                    if not rows:
+                        logger.warning(f"No entries for {view} index")
+                        continue
+                    store.add_index_rows(view, rows)
+                    results[view] = self._index_result(version_dir, view, len(rows))
+                    logger.info(f"Generated {view} view with {len(rows)} entries")
+            except Exception:
+                store.close()
+                shutil.rmtree(version_dir, ignore_errors=True)
+                raise
+            store.close()
             
             # Update metadata
             self.last_update = datetime.now()
@@ -228,18 +251,18 @@ class AutoFAISSGenerator:
                 "regular_feedback_count": len([e for e in entries if e.message_type != "case_feedback"]),
                 "case_feedback_count": len([e for e in entries if e.message_type == "case_feedback"]),
                 "min_rating": min(e.rating for e in entries) if entries else 1,
-                "max_rating": max(e.rating for e in entries) if entries else 5
+                "max_rating": max(e.rating for e in entries) if entries else 5,
+                "index": index_params
             })
             
-            # Save metadata
+            # Save metadata and switch readers to the new version
             self._save_metadata()
-            
-            # Signal that indices have been updated (for live reload)
-            self._notify_index_updated()
+            self._publish(version_id, results)
             
             logger.info(f"Successfully generated FAISS indices with {len(entries)} total entries")
             return {
                 "status": "success",
+                "version": version_id,
                 "results": results,
                 "metadata": self.index_metadata,
                 "incremental": False
@@ -252,18 +275,40 @@ class AutoFAISSGenerator:
     def _save_metadata(self) -> None:
         """Save index metadata to file."""
         try:
-            metadata_path = self.output_dir / "index_metadata.json"
-            import json
-            with open(metadata_path, 'w') as f:
-                json.dump(self.index_metadata, f, indent=2)
+            atomic_write_json(self.output_dir / "index_metadata.json", self.index_metadata, indent=2)
         except Exception as e:
             logger.error(f"Failed to save metadata: {e}")
     
+    @staticmethod
+    def _index_result(version_dir: Path, index_type: str, count: int) -> Dict[str, Any]:
+        """Paths and entry count of one index type in a version (views share the master index)."""
+        return {
+            "index_type": index_type,
+            "index_path": str(index_dir(version_dir, MASTER_INDEX) / "feedback_index.faiss"),
+            "metadata_path": str(version_dir / METADATA_FILENAME),
+            "count": count
+        }
+    
+    def _publish(self, version_id: str, results: Dict[str, Dict[str, Any]]) -> None:
+        """Make a fully written version live, reload this process, prune old versions."""
+        publish_version(
+            self.output_dir,
+            version_id,
+            {name: result["count"] for name, result in results.items()},
+            self.index_metadata,
+        )
+        # Signal that indices have been updated (other workers poll the CURRENT file)
+        self._notify_index_updated()
+        prune_versions(
+            self.output_dir,
+            keep=getattr(app_config, "FEEDBACK_INDEX_KEEP_VERSIONS", 3),
+            min_age_s=_PRUNE_MIN_AGE_S,
+        )
+    
     def _notify_index_updated(self) -> None:
-        """Notify the AutoFeedbackRetriever to reload indices.
+        """Notify this process's AutoFeedbackRetriever to swap in the new version.
         
-        This ensures that the in-memory FAISS indices are refreshed
-        after new feedback is added and re-indexed.
+        Retrievers in other processes pick it up from the CURRENT file.
         """
         try:
             from microtutor.core.feedback.auto_retriever import get_auto_feedback_retriever
@@ -289,6 +334,8 @@ class AutoFAISSGenerator:
     def get_status(self) -> Dict[str, Any]:
         """Get current status of the auto FAISS generator."""
         self.load_metadata()
+        live_version, live_dir, manifest = resolve_live_dir(self.output_dir)
+        master_exists = (index_dir(live_dir, MASTER_INDEX) / "feedback_index.faiss").exists()
         
         return {
             "last_update": self.index_metadata.get("last_updated"),
@@ -298,28 +345,20 @@ class AutoFAISSGenerator:
             "min_rating": self.index_metadata.get("min_rating", 1),
             "max_rating": self.index_metadata.get("max_rating", 5),
             "should_update": self.should_update(),
+            "version": live_version,
             "index_files_exist": {
-                "all": (self.output_dir / "feedback_index.faiss").exists(),
-                "patient": (self.output_dir / "patient" / "feedback_index.faiss").exists(),
-                "tutor": (self.output_dir / "tutor" / "feedback_index.faiss").exists()
+                name: (
+                    master_exists and name in manifest["indices"] if manifest.get("indices")
+                    else (index_dir(live_dir, name) / "feedback_index.faiss").exists()
+                )
+                for name in INDEX_SUBDIRS
             }
         }
     
     def cleanup_old_indices(self, keep_days: int = 7) -> None:
-        """Clean up old index files to save space."""
+        """Delete superseded index versions older than keep_days (never the live one)."""
         try:
-            cutoff_date = datetime.now() - timedelta(days=keep_days)
-            
-            for index_file in self.output_dir.rglob("*.faiss"):
-                if index_file.stat().st_mtime < cutoff_date.timestamp():
-                    logger.info(f"Removing old index file: {index_file}")
-                    index_file.unlink()
-            
-            for pkl_file in self.output_dir.rglob("*.pkl"):
-                if pkl_file.stat().st_mtime < cutoff_date.timestamp():
-                    logger.info(f"Removing old pickle file: {pkl_file}")
-                    pkl_file.unlink()
-                    
+            prune_versions(self.output_dir, keep=1, min_age_s=keep_days * 86400)
         except Exception as e:
             logger.error(f"Failed to cleanup old indices: {e}")
     
@@ -327,10 +366,18 @@ class AutoFAISSGenerator:
         """Check if we can do an incremental update instead of full regeneration."""
         try:
             # Check if existing indices exist
-            all_index_path = self.output_dir / "feedback_index.faiss"
+            _, live_dir, _ = resolve_live_dir(self.output_dir)
+            all_index_path = live_dir / "feedback_index.faiss"
             if not all_index_path.exists():
                 return False
             
+            # Pickle-based indices (before the metadata store) and versions with
+            # separate patient/tutor indices are migrated by a full rebuild
+            if not (live_dir / METADATA_FILENAME).exists():
+                return False
+            if any((index_dir(live_dir, view) / "feedback_index.faiss").exists() for view in INDEX_VIEWS):
+                return False
+            
             # Check if metadata exists
             metadata_path = self.output_dir / "index_metadata.json"
             if not metadata_path.exists():
@@ -395,24 +442,10 @@ class AutoFAISSGenerator:
                 
                 logger.info(f"Found {len(new_entries)} new feedback entries since {last_update}")
             
-            # Load existing indices
-            existing_indices = {}
-            existing_texts = {}
-            existing_entries = {}
-            
-            for index_type in ["all", "patient", "tutor"]:
-                index_dir = self.output_dir if index_type == "all" else self.output_dir / index_type
-                index_path = index_dir / "feedback_index.faiss"
-                texts_path = index_dir / "feedback_texts.pkl"
-                entries_path = index_dir / "feedback_entries.pkl"
-                
-                if all(p.exists() for p in [index_path, texts_path, entries_path]):
-                    # Use faiss.read_index() instead of pickle.load() for FAISS indices
-                    existing_indices[index_type] = faiss.read_index(str(index_path))
-                    with open(texts_path, 'rb') as f:
-                        existing_texts[index_type] = pickle.load(f)
-                    with open(entries_path, 'rb') as f:
-                        existing_entries[index_type] = pickle.load(f)
+            # Load the existing master index (the live version)
+            _, live_dir, manifest = resolve_live_dir(self.output_dir)
+            index_params = manifest.get("metadata", {}).get("index")
+            master_index = faiss.read_index(str(index_dir(live_dir, MASTER_INDEX) / "feedback_index.faiss"))
             
             # Process new entries
             self.processor.entries = new_entries
@@ -430,76 +463,43 @@ class AutoFAISSGenerator:
                 )
                 new_texts.append(text)
             
-            # Generate embeddings for new texts
+            # Same rule as full builds: entries without user input are not indexed
+            with_text = [i for i, text in enumerate(new_texts) if text and text.strip()]
+            new_entries = [new_entries[i] for i in with_text]
+            new_texts = [new_texts[i] for i in with_text]
+            if not new_entries:
+                return {"status": "skipped", "reason": "no_indexable_feedback"}
+            
+            # Generate embeddings for new texts (batched; failed inputs are skipped, not zero-filled)
             logger.info(f"Generating embeddings for {len(new_texts)} new entries...")
-            new_embeddings = []
-            for text in new_texts:
-                embedding = get_embedding(text)
-                new_embeddings.append(embedding)
+            embedded = embed_texts(new_texts, max_concurrency=self.processor.embedding_concurrency)
+            kept = [i for i, vec in enumerate(embedded) if vec is not None]
+            if len(kept) < len(new_texts):
+                logger.warning(f"Skipping {len(new_texts) - len(kept)} new entries whose embedding failed")
+            if not kept:
+                return {"status": "failed", "reason": "embedding_failed"}
+            new_entries = [new_entries[i] for i in kept]
+            new_texts = [new_texts[i] for i in kept]
             
-            new_embeddings_array = np.array(new_embeddings).astype('float32')
+            new_embeddings_array = np.array([embedded[i] for i in kept]).astype('float32')
             
             # Normalize new embeddings for cosine similarity
             faiss.normalize_L2(new_embeddings_array)
             
-            # Update each index type
-            results = {}
-            for index_type in ["all", "patient", "tutor"]:
-                if index_type not in existing_indices:
-                    continue
-                
-                # Filter new entries for this index type
-                if index_type == "patient":
-                    filtered_entries = [e for e in new_entries if e.message_type in ['patient', 'other'] and e.rating >= 3]
-                elif index_type == "tutor":
-                    filtered_entries = [e for e in new_entries if e.message_type in ['tutor', 'other'] and e.rating >= 3]
-                else:  # all
-                    filtered_entries = new_entries
-                
-                if not filtered_entries:
-                    logger.info(f"No new entries for {index_type} index")
-                    continue
-                
-                # Get corresponding texts and embeddings
-                filtered_texts = []
-                filtered_embeddings = []
-                for entry in filtered_entries:
-                    idx = new_entries.index(entry)
-                    filtered_texts.append(new_texts[idx])
-                    filtered_embeddings.append(new_embeddings[idx])
-                
-                if not filtered_texts:
-                    continue
-                
-                # Add to existing index
-                existing_indices[index_type].add(np.array(filtered_embeddings).astype('float32'))
-                existing_texts[index_type].extend(filtered_texts)
-                existing_entries[index_type].extend(filtered_entries)
-                
-                # Save updated index
-                index_dir = self.output_dir if index_type == "all" else self.output_dir / index_type
-                index_dir.mkdir(parents=True, exist_ok=True)
-                
-                index_path = index_dir / "feedback_index.faiss"
-                texts_path = index_dir / "feedback_texts.pkl"
-                entries_path = index_dir / "feedback_entries.pkl"
-                
-                # Use faiss.write_index() instead of pickle.dump() for FAISS indices
-                faiss.write_index(existing_indices[index_type], str(index_path))
-                with open(texts_path, 'wb') as f:
-                    pickle.dump(existing_texts[index_type], f)
-                with open(entries_path, 'wb') as f:
-                    pickle.dump(existing_entries[index_type], f)
-                
-                results[index_type] = {
-                    "index_path": str(index_path),
-                    "texts_path": str(texts_path),
-                    "entries_path": str(entries_path),
-                    "count": len(existing_entries[index_type]),
-                    "new_entries": len(filtered_entries)
-                }
-                
-                logger.info(f"Updated {index_type} index with {len(filtered_entries)} new entries (total: {len(existing_entries[index_type])})")
+            # Write the grown master index and view rows into a new version
+            version_id, version_dir = new_version_dir(self.output_dir)
+            try:
+                shutil.copy2(live_dir / METADATA_FILENAME, version_dir / METADATA_FILENAME)
+                store = FeedbackMetadataStore(str(version_dir / METADATA_FILENAME), writable=True)
+                try:
+                    results, index_params = self._write_incremental_version(
+                        version_dir, live_dir, store, new_entries, new_texts, new_embeddings_array, master_index, index_params,
+                    )
+                finally:
+                    store.close()
+            except Exception:
+                shutil.rmtree(version_dir, ignore_errors=True)
+                raise
             
             # Update metadata
             self.last_update = datetime.now()
@@ -509,17 +509,17 @@ class AutoFAISSGenerator:
                 "regular_feedback_count": len([e for e in all_entries if e.message_type != "case_feedback"]),
                 "case_feedback_count": len([e for e in all_entries if e.message_type == "case_feedback"]),
                 "min_rating": min(e.rating for e in all_entries) if all_entries else 1,
-                "max_rating": max(e.rating for e in all_entries) if all_entries else 5
+                "max_rating": max(e.rating for e in all_entries) if all_entries else 5,
+                "index": index_params
             })
             
             self._save_metadata()
-            
-            # Signal that indices have been updated (for live reload)
-            self._notify_index_updated()
+            self._publish(version_id, results)
             
             logger.info(f"Incremental update completed with {len(new_entries)} new entries")
             return {
                 "status": "success",
+                "version": version_id,
                 "results": results,
                 "metadata": self.index_metadata,
                 "incremental": True,
@@ -531,6 +531,100 @@ class AutoFAISSGenerator:
             # Fall back to full regeneration
             logger.info("Falling back to full regeneration...")
             return self._full_regeneration(config)
+    
+    def _write_incremental_version(
+        self,
+        version_dir: Path,
+        live_dir: Path,
+        store: FeedbackMetadataStore,
+        new_entries: List[FeedbackEntry],
+        new_texts: List[str],
+        new_embeddings_array: np.ndarray,
+        master_index: Any,
+        index_params: Optional[Dict[str, Any]],
+    ) -> Tuple[Dict[str, Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Write the live master index plus the new entries into version_dir.
+        
+        store is version_dir's copy of the live metadata store (a file copy -
+        versions are immutable); each new entry is added to it and to the
+        master index once, and listed in every view it joins. The live BM25
+        index is extended with the new texts rather than rebuilt.
+        
+        Returns:
+            (results per index type, master index parameters)
+        """
+        new_rows = store.add_entries(new_entries, new_texts)
+        target_dir = index_dir(version_dir, MASTER_INDEX)
+        store.add_index_rows(MASTER_INDEX, new_rows)
+        view_counts = {}
+        for view in INDEX_VIEWS:
+            rows = [row for row, entry in zip(new_rows, new_entries) if in_view(entry, view)]
+            if rows:
+                store.add_index_rows(view, rows)
+            view_counts[view] = len(rows)
+        total = store.count(MASTER_INDEX)
+        
+        # Add to the master index (in memory - the live files are not touched)
+        master_index.add(new_embeddings_array)
+        if not tier_is_current(index_params, master_index.ntotal, new_embeddings_array.shape[1]):
+            master_rows = store.row_ids(MASTER_INDEX)
+            view_masks = {view: np.isin(master_rows, store.row_ids(view)) for view in INDEX_VIEWS}
+            master_index, index_params = self._reselect_index(master_index, index_params, view_masks)
+        
+        # Use faiss.write_index() instead of pickle.dump() for FAISS indices
+        faiss.write_index(master_index, str(target_dir / "feedback_index.faiss"))
+        self._extend_bm25(live_dir, store, new_texts, total).save(str(target_dir / BM25_FILENAME))
+        
+        results = {MASTER_INDEX: self._index_result(version_dir, MASTER_INDEX, total)}
+        results[MASTER_INDEX]["new_entries"] = len(new_entries)
+        logger.info(f"Updated master index with {len(new_entries)} new entries (total: {total})")
+        
+        for view in INDEX_VIEWS:
+            count = store.count(view)
+            if count:
+                results[view] = self._index_result(version_dir, view, count)
+                results[view]["new_entries"] = view_counts[view]
+        return results, index_params
+    
+    @staticmethod
+    def _extend_bm25(live_dir: Path, store: FeedbackMetadataStore, new_texts: List[str], total: int) -> BM25Index:
+        """The live master BM25 index plus new_texts (rebuilt from the store if the live file is missing or stale)."""
+        try:
+            bm25 = BM25Index.load(str(index_dir(live_dir, MASTER_INDEX) / BM25_FILENAME))
+            if len(bm25) == total - len(new_texts):
+                bm25.add_documents(new_texts)
+                return bm25
+            logger.warning(f"Live BM25 index has {len(bm25)} documents, expected {total - len(new_texts)} - rebuilding")
+        except Exception as e:
+            logger.warning(f"Live BM25 index unavailable ({e}) - rebuilding")
+        return BM25Index.build(store.texts(store.row_ids(MASTER_INDEX)))
+    
+    @staticmethod
+    def _reselect_index(
+        index: Any,
+        index_params: Optional[Dict[str, Any]],
+        filters: Optional[Dict[str, np.ndarray]] = None,
+    ) -> Tuple[Any, Dict[str, Any]]:
+        """Rebuild the master index as the type its grown size calls for (no re-embedding).
+        
+        A candidate that fails the recall benchmark (unfiltered or under
+        filters, see select_index) leaves the current index in place, with
+        the rejection recorded.
+        """
+        current = index_params or {"type": "flat"}
+        vectors = index_vectors(index)
+        if vectors is None:
+            # IVF-PQ keeps only compressed codes - retraining needs the embeddings again
+            raise ValueError(f"{current['type']} index cannot be rebuilt from its vectors - full rebuild required")
+        logger.info(f"Master index ({current['type']}) no longer suits {index.ntotal} entries - reselecting")
+        tiered, candidate = select_index(vectors, filters=filters)
+        if tiered is not None:
+            return tiered, candidate
+        if candidate.get("rejected") and current["type"] != "flat":
+            return index, {**current, "rejected": candidate["rejected"]}
+        if current["type"] != "flat":
+            index = build_index(vectors, {"type": "flat"})
+        return index, candidate
 
 
 # Global instance
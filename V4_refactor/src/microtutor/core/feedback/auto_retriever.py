@@ -3,21 +3,105 @@ Auto feedback retriever that uses automatically generated FAISS indices.
 
 This retriever loads feedback examples from the auto-generated FAISS indices
 that are continuously updated from database feedback data.
+
+Search is hybrid: the FAISS (vector) ranking and a BM25 (lexical) ranking over
+the same texts are fused with reciprocal rank fusion. The query embedding has
+a time budget (RETRIEVAL_EMBED_TIMEOUT_SECONDS); if it is exceeded or fails,
+results come from BM25 alone instead of being empty.
+
+Rating and organism filters are applied inside the search, not to its
+results: both rankings only consider entries that pass the filter (FAISS via
+an IDSelector, or adaptive over-fetching on FAISS builds without search
+parameters), so a filtered search still returns k examples whenever k
+qualifying entries exist.
+
+All indices of one published version are held in an immutable IndexBundle.
+A reindex (see index_versions.py) is picked up by loading the new version
+into a fresh bundle and swapping a single reference, so a search always uses
+one consistent bundle and is never blocked by a reload. Every process polls
+the CURRENT pointer file (FEEDBACK_INDEX_RELOAD_INTERVAL_SECONDS) and loads a
+new version on a background thread.
+
+Entries are not held in memory: an index keeps its FAISS index, BM25 index,
+row ids into the version's shared metadata store (metadata_store.py) and the
+rating/organism columns used for filtering. Texts and entries (chat history
+included) are read from the store for the hits a search returns.
+
+"patient" and "tutor" are views of the master ("all") index: they share its
+FAISS and BM25 indices and add a membership mask, applied like any other
+filter (versions written before the master layout still load their own
+patient/tutor indices).
 """
 
 import logging
 import pickle
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field, replace
+from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import faiss
 import numpy as np
 
-from microtutor.core.feedback.processor import FeedbackExample
+from microtutor.core.config.config_helper import config
+from microtutor.core.feedback.processor import BM25_FILENAME, FeedbackExample
 from microtutor.core.feedback.auto_generator import get_auto_faiss_generator, get_project_root
+from microtutor.core.feedback.index_versions import (
+    CURRENT_FILENAME,
+    INDEX_SUBDIRS,
+    INDEX_VIEWS,
+    MASTER_INDEX,
+    index_dir,
+    resolve_live_dir,
+)
+from microtutor.core.feedback.index_tiers import apply_search_params, search_parameters
+from microtutor.core.feedback.metadata_store import METADATA_FILENAME, FeedbackMetadataStore
+from microtutor.utils.conversation_utils import normalize_organism_name
 from microtutor.utils.embedding_utils import get_embedding
+from microtutor.utils.lexical_search import BM25Index, reciprocal_rank_fusion
 
 logger = logging.getLogger(__name__)
 
+# Candidates taken from each ranking before fusion
+_MIN_FUSION_CANDIDATES = 20
+
+# Query embeddings run here so a slow call can be abandoned after the time budget
+_embed_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="feedback-embed")
+
+
+@dataclass(frozen=True)
+class LoadedIndex:
+    """One index type of a bundle; position i of every array describes FAISS row i."""
+    index: Any  # faiss.Index
+    store: FeedbackMetadataStore  # Shared by the bundle's indices
+    row_ids: np.ndarray  # store row of each FAISS row
+    bm25: BM25Index
+    ratings: np.ndarray  # int64 per row, for filtered search
+    organisms: np.ndarray  # normalized organism per row
+    members: Optional[np.ndarray] = None  # Rows of the index type, for views of the master index
+    
+    def __len__(self) -> int:
+        return len(self.row_ids) if self.members is None else int(self.members.sum())
+
+
+@dataclass(frozen=True)
+class IndexBundle:
+    """All indices of one version (None = flat pre-versioning layout)."""
+    version: Optional[str]
+    path: Path
+    indices: Dict[str, LoadedIndex] = field(default_factory=dict)
+    loaded_at: datetime = field(default_factory=datetime.now)
+
+
+def _pointer_stamp(path: Path) -> Optional[Tuple[float, int]]:
+    try:
+        st = path.stat()
+        return (st.st_mtime, st.st_size)
+    except OSError:
+        return None
+
 
 class AutoFeedbackRetriever:
     """Retrieves feedback examples using auto-generated FAISS indices."""
@@ -35,123 +119,407 @@ class AutoFeedbackRetriever:
         else:
             self.auto_feedback_dir = Path(auto_feedback_dir)
         
-        self.indices = {}
-        self.texts = {}
-        self.entries = {}
+        self.embed_timeout_s = getattr(config, "RETRIEVAL_EMBED_TIMEOUT_SECONDS", 2.0)
+        self.reload_interval_s = getattr(config, "FEEDBACK_INDEX_RELOAD_INTERVAL_SECONDS", 5.0)
+        
+        self._reload_lock = threading.Lock()  # One load at a time; searches never take it
+        self._reload_thread: Optional[threading.Thread] = None
+        self._last_check = time.monotonic()
+        self._pointer = self.auto_feedback_dir / CURRENT_FILENAME
+        self._pointer_seen = _pointer_stamp(self._pointer)
         
         logger.info(f"AutoFeedbackRetriever initialized with dir: {self.auto_feedback_dir}")
         
         # Load auto-generated indices
-        self._load_auto_indices()
+        self._bundle: IndexBundle = self._load_bundle()
     
-    def _load_auto_indices(self) -> None:
-        """Load auto-generated FAISS indices."""
+    @property
+    def bundle(self) -> IndexBundle:
+        """The live bundle (read the reference once per search)."""
+        return self._bundle
+    
+    def _load_bundle(self) -> IndexBundle:
+        """Load every index of the live version into a new bundle."""
+        version, version_dir, manifest = resolve_live_dir(self.auto_feedback_dir)
+        indices: Dict[str, LoadedIndex] = {}
         try:
-            # Load all feedback index
-            self._load_index("all", self.auto_feedback_dir)
-            
-            # Load patient feedback index
-            self._load_index("patient", self.auto_feedback_dir / "patient")
+            store = FeedbackMetadataStore.open(version_dir / METADATA_FILENAME)
+            columns = store.filter_columns() if store is not None else None
+        except Exception as e:
+            logger.error(f"Failed to open feedback metadata store in {version_dir}: {e}")
+            store, columns = None, None
+        for name in INDEX_SUBDIRS:
+            own_dir = index_dir(version_dir, name)
+            if store is None:
+                loaded = self._load_pickled_index(name, own_dir)
+            elif name in INDEX_VIEWS and not (own_dir / "feedback_index.faiss").exists():
+                loaded = self._load_view(name, indices.get(MASTER_INDEX))
+            else:
+                loaded = self._load_index(name, own_dir, store, columns)
+                if loaded is not None and name == MASTER_INDEX:
+                    # efSearch / nprobe of an approximate master index (index_tiers.py)
+                    apply_search_params(loaded.index, manifest.get("metadata", {}).get("index"))
+            if loaded is not None:
+                indices[name] = loaded
+        if indices:
+            logger.info(f"Auto-generated feedback indices loaded (version {version or 'flat'})")
+        else:
+            logger.error(f"No auto-generated feedback indices could be loaded from {version_dir}")
+        return IndexBundle(version=version, path=version_dir, indices=indices)
+    
+    def _load_index(
+        self,
+        name: str,
+        index_dir: Path,
+        store: FeedbackMetadataStore,
+        columns: Tuple[np.ndarray, np.ndarray],
+    ) -> Optional[LoadedIndex]:
+        """Load FAISS index and its row map from the store (None if missing or invalid)."""
+        try:
+            index_path = index_dir / "feedback_index.faiss"
+            if not index_path.exists():
+                logger.warning(f"Auto-feedback index not found for {name} at {index_dir}")
+                return None
             
-            # Load tutor feedback index
-            self._load_index("tutor", self.auto_feedback_dir / "tutor")
+            index = faiss.read_index(str(index_path))
+            # Verify it's a FAISS index
+            if not hasattr(index, 'ntotal'):
+                logger.warning(f"Invalid FAISS index format for {name}")
+                return None
+            row_ids = store.row_ids(name)
+            ratings, organisms = columns
+            if index.ntotal != len(row_ids) or (len(row_ids) and row_ids.max() >= len(ratings)):
+                logger.error(
+                    f"Inconsistent {name} auto-feedback index at {index_dir}: "
+                    f"{index.ntotal} vectors, {len(row_ids)} rows, {len(ratings)} stored entries"
+                )
+                return None
             
-            logger.info("Auto-generated feedback indices loaded successfully")
+            bm25 = None
+            bm25_path = index_dir / BM25_FILENAME
+            if bm25_path.exists():
+                try:
+                    bm25 = BM25Index.load(str(bm25_path))
+                except Exception as e:
+                    logger.warning(f"Unreadable BM25 index for {name} ({e}) - rebuilding")
+            if bm25 is None or len(bm25) != len(row_ids):
+                # Missing or stale file (older indices) - build from the stored texts
+                bm25 = BM25Index.build(store.texts(row_ids))
             
+            loaded = LoadedIndex(
+                index=index,
+                store=store,
+                row_ids=row_ids,
+                bm25=bm25,
+                ratings=ratings[row_ids],
+                organisms=organisms[row_ids],
+            )
+            logger.info(f"Loaded {name} auto-feedback index with {index.ntotal} entries")
+            return loaded
+                
+        except Exception as e:
+            logger.error(f"Failed to load {name} auto-feedback index: {e}")
+            return None
+    
+    def _load_view(self, name: str, master: Optional[LoadedIndex]) -> Optional[LoadedIndex]:
+        """A view index type: the master index restricted to the type's rows."""
+        if master is None:
+            logger.warning(f"No master index for the {name} view")
+            return None
+        try:
+            view_rows = master.store.row_ids(name)
+            if len(view_rows) == 0:
+                logger.warning(f"Auto-feedback index not found for {name} (no rows)")
+                return None
+            members = np.isin(master.row_ids, view_rows)
+            if int(members.sum()) != len(view_rows):
+                logger.error(f"Inconsistent {name} view: {len(view_rows)} rows, {int(members.sum())} in the master index")
+                return None
+            logger.info(f"Loaded {name} view of the master index with {len(view_rows)} entries")
+            return replace(master, members=members)
         except Exception as e:
-            logger.error(f"Failed to load auto-generated indices: {e}")
+            logger.error(f"Failed to load {name} auto-feedback view: {e}")
+            return None
     
-    def _load_index(self, name: str, index_dir: Path) -> None:
-        """Load FAISS index and associated data."""
+    def _load_pickled_index(self, name: str, index_dir: Path) -> Optional[LoadedIndex]:
+        """Load an index written before the metadata store (pickled texts and entries).
+        
+        The entries are copied into an in-memory store so search works the
+        same way; the next full regeneration writes the store format.
+        """
         try:
             index_path = index_dir / "feedback_index.faiss"
             texts_path = index_dir / "feedback_texts.pkl"
             entries_path = index_dir / "feedback_entries.pkl"
             
-            if all(p.exists() for p in [index_path, texts_path, entries_path]):
-                # Use faiss.read_index() instead of pickle.load() for FAISS indices
-                index = faiss.read_index(str(index_path))
-                # Verify it's a FAISS index
-                if hasattr(index, 'ntotal'):
-                    self.indices[name] = index
-                else:
-                    logger.warning(f"Invalid FAISS index format for {name}")
-                    return
-                with open(texts_path, 'rb') as f:
-                    self.texts[name] = pickle.load(f)
-                with open(entries_path, 'rb') as f:
-                    self.entries[name] = pickle.load(f)
-                
-                logger.info(f"Loaded {name} auto-feedback index with {self.indices[name].ntotal} entries")
-            else:
+            if not all(p.exists() for p in [index_path, texts_path, entries_path]):
                 logger.warning(f"Auto-feedback index not found for {name} at {index_dir}")
-                
+                return None
+            
+            with open(texts_path, 'rb') as f:
+                texts = pickle.load(f)
+            with open(entries_path, 'rb') as f:
+                entries = pickle.load(f)
+            store = FeedbackMetadataStore(":memory:")
+            store.add_index_rows(name, store.add_entries(entries, texts))
+            return self._load_index(name, index_dir, store, store.filter_columns())
         except Exception as e:
             logger.error(f"Failed to load {name} auto-feedback index: {e}")
+            return None
     
-    def retrieve_similar_examples(
-        self, 
-        input_text: str, 
-        history: List[Dict[str, str]], 
+    # ---------- Reload ----------
+    
+    def _swap(self, bundle: IndexBundle) -> bool:
+        """Make bundle live unless it lost indices the current one has."""
+        missing = set(self._bundle.indices) - set(bundle.indices)
+        if missing:
+            logger.error(f"Not switching to feedback index version {bundle.version}: {sorted(missing)} failed to load")
+            return False
+        self._bundle = bundle  # Single reference assignment - readers see old or new, never a mix
+        logger.info(f"Feedback indices now at version {bundle.version or 'flat'}")
+        return True
+    
+    def _reload(self) -> bool:
+        with self._reload_lock:
+            stamp = _pointer_stamp(self._pointer)
+            swapped = self._swap(self._load_bundle())
+            self._pointer_seen = stamp
+            return swapped
+    
+    def _maybe_reload(self) -> None:
+        """Start a background reload if CURRENT changed (checked every reload_interval_s)."""
+        now = time.monotonic()
+        if self.reload_interval_s <= 0 or now - self._last_check < self.reload_interval_s:
+            return
+        self._last_check = now
+        if _pointer_stamp(self._pointer) == self._pointer_seen:
+            return
+        if self._reload_thread is not None and self._reload_thread.is_alive():
+            return
+        logger.info("Feedback index version changed on disk - reloading in the background")
+        self._reload_thread = threading.Thread(target=self._reload, name="feedback-index-reload", daemon=True)
+        self._reload_thread.start()
+    
+    def _embed_query(self, input_text: str) -> Optional[np.ndarray]:
+        """Query embedding within the time budget, or None (timeout / failure)."""
+        future = _embed_executor.submit(get_embedding, input_text)
+        try:
+            embedding = future.result(timeout=self.embed_timeout_s)
+        except FutureTimeoutError:
+            logger.warning(f"Feedback query embedding exceeded {self.embed_timeout_s}s - using lexical search only")
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to embed feedback query ({e}) - using lexical search only")
+            return None
+        if not embedding:
+            return None
+        return np.array([embedding]).astype('float32')
+    
+    def _filter_mask(self, loaded: LoadedIndex, min_rating: int, organism: Optional[str]) -> Optional[np.ndarray]:
+        """Boolean mask of rows passing the filters, or None if every row passes."""
+        mask = loaded.ratings >= min_rating
+        if loaded.members is not None:
+            mask &= loaded.members
+        if organism:
+            mask &= loaded.organisms == normalize_organism_name(organism)
+        return None if mask.all() else mask
+
+    def _vector_search(
+        self,
+        loaded: LoadedIndex,
+        query_vector: np.ndarray,
+        n: int,
+        mask: Optional[np.ndarray],
+    ) -> List[Tuple[int, float]]:
+        """Top-n (row, score) among rows allowed by mask.
+        
+        Uses a FAISS IDSelector so the index itself skips filtered rows. An
+        approximate index can come back short under a selector (HNSW with a
+        restrictive filter, IVF lists that weren't probed); then the allowed
+        rows are scored exactly, so min(n, allowed rows) hits are always
+        returned. On builds or index types without search parameters or
+        reconstruct(), over-fetches (doubling) until n allowed rows are found
+        or the index is exhausted.
+        """
+        index = loaded.index
+        n_entries = len(loaded.row_ids)
+        if mask is not None:
+            allowed_ids = np.flatnonzero(mask).astype(np.int64)
+            if len(allowed_ids) == 0:
+                return []
+            want = min(n, len(allowed_ids))
+            try:
+                params = search_parameters(index, faiss.IDSelectorBatch(allowed_ids))
+                distances, indices = index.search(query_vector, want, params=params)
+                hits = [(int(idx), float(d)) for d, idx in zip(distances[0], indices[0]) if 0 <= idx < n_entries]
+                if len(hits) >= want:
+                    return hits
+                logger.debug(f"IDSelector search returned {len(hits)} of {want} - scoring allowed rows exactly")
+            except Exception as e:
+                logger.debug(f"IDSelector search unavailable ({e}) - over-fetching")
+            exact = self._exact_search(index, query_vector, want, allowed_ids)
+            if exact is not None:
+                return exact
+
+        fetch = n if mask is None else min(index.ntotal, n * 4)
+        while True:
+            distances, indices = index.search(query_vector, fetch)
+            # FAISS pads with -1 when the index has fewer entries than requested
+            hits = [
+                (int(idx), float(d)) for d, idx in zip(distances[0], indices[0])
+                if 0 <= idx < n_entries and (mask is None or mask[idx])
+            ]
+            if len(hits) >= n or fetch >= index.ntotal:
+                return hits[:n]
+            fetch = min(index.ntotal, fetch * 2)
+
+    @staticmethod
+    def _exact_search(index: Any, query_vector: np.ndarray, n: int, ids: np.ndarray) -> Optional[List[Tuple[int, float]]]:
+        """Top-n (row, score) over ids by scoring their reconstructed vectors, or None without reconstruct()."""
+        try:
+            vectors = index.reconstruct_batch(ids)
+        except Exception:
+            try:
+                vectors = np.vstack([index.reconstruct(int(idx)) for idx in ids])
+            except Exception:
+                return None
+        scores = vectors @ query_vector[0]
+        top = np.argsort(-scores)[:n]
+        return [(int(ids[i]), float(scores[i])) for i in top]
+
+    def _vector_scores(self, loaded: LoadedIndex, query_vector: np.ndarray, ids: List[int]) -> Dict[int, float]:
+        """Inner-product scores for specific rows (from reconstruct(); approximate for IVF-PQ)."""
+        index = loaded.index
+        scores = {}
+        for idx in ids:
+            try:
+                scores[idx] = float(np.dot(index.reconstruct(int(idx)), query_vector[0]))
+            except Exception:
+                break  # Index type without reconstruct() - leave the rest unscored
+        return scores
+    
+    def embed_query(self, input_text: str) -> Optional[np.ndarray]:
+        """Query vector for search_similar(query_vector=...), or None (lexical only).
+        
+        Lets one turn run several filtered searches with a single embedding call.
+        """
+        return self._embed_query(input_text)
+
+    def search_similar(
+        self,
+        input_text: str,
         k: int = 3,
         index_type: str = "all",
-        min_rating: int = 3
+        min_rating: int = 1,
+        organism: Optional[str] = None,
+        query_vector: Optional[np.ndarray] = None,
+        lexical_only: bool = False,
     ) -> List[FeedbackExample]:
-        """Retrieve similar feedback examples.
+        """Return the top-k hits passing the filters, in rank order.
+        
+        The filters restrict the candidates of both rankings, so up to k
+        results come back whenever that many entries qualify.
+        
+        similarity_score is the vector (cosine) score when the query embedding
+        is available; in lexical-only mode it is the BM25 score relative to the
+        best hit (0-1].
         
         Args:
             input_text: Input text to find similar examples for
-            history: Conversation history
-            k: Number of examples to retrieve
+            k: Number of results to retrieve
             index_type: Type of index to use ("all", "patient", "tutor")
-            min_rating: Minimum rating for examples
+            min_rating: Minimum rating of returned entries
+            organism: Only entries for this organism (any casing / spaces)
+            query_vector: Precomputed embed_query() result (skips embedding)
+            lexical_only: Skip the vector ranking (embed_query() returned None)
             
         Returns:
-            List of similar feedback examples
+            List of feedback examples, most similar first
         """
         try:
-            if index_type not in self.indices:
+            self._maybe_reload()
+            # One bundle for the whole search, even if a reload swaps it meanwhile
+            loaded = self._bundle.indices.get(index_type)
+            if loaded is None:
                 logger.warning(f"Index type {index_type} not available")
                 return []
             
-            # Get embedding for input text
-            embedding = get_embedding(input_text)
-            if not embedding:
-                logger.warning("Failed to get embedding for input text")
+            n_entries = len(loaded.row_ids)
+            n_candidates = max(k, _MIN_FUSION_CANDIDATES)
+            mask = self._filter_mask(loaded, min_rating, organism)
+            
+            # Lexical ranking is local and instant
+            lexical: List[Tuple[int, float]] = loaded.bm25.search(input_text, top_k=n_candidates, allowed=mask)
+            
+            # Vector ranking, if the embedding arrives in time
+            vector: List[Tuple[int, float]] = []
+            if query_vector is None and not lexical_only:
+                query_vector = self._embed_query(input_text)
+            if query_vector is not None:
+                vector = self._vector_search(loaded, query_vector, n_candidates, mask)
+            
+            if not vector and not lexical:
+                logger.warning("No vector or lexical matches for input text")
                 return []
             
-            # Search for similar examples
-            query_vector = np.array([embedding]).astype('float32')
-            distances, indices = self.indices[index_type].search(query_vector, k)
+            fused = [
+                idx for idx, _ in reciprocal_rank_fusion([[i for i, _ in vector], [i for i, _ in lexical]])
+                if idx < n_entries
+            ][:k]
+            
+            if query_vector is not None:
+                scores = dict(vector)
+                missing = [idx for idx in fused if idx not in scores]
+                if missing:
+                    scores.update(self._vector_scores(loaded, query_vector, missing))
+            else:
+                best = lexical[0][1] if lexical and lexical[0][1] > 0 else 1.0
+                scores = {idx: score / best for idx, score in lexical}
             
+            # Only the returned hits are read from the metadata store
             examples = []
-            for i, (distance, idx) in enumerate(zip(distances[0], indices[0])):
-                if idx >= len(self.entries[index_type]):
-                    continue
-                
-                entry = self.entries[index_type][idx]
-                
-                # Filter by minimum rating
-                if entry.rating < min_rating:
-                    continue
-                
-                # Create feedback example
-                example = FeedbackExample(
-                    text=self.texts[index_type][idx],
+            for idx, (text, entry) in zip(fused, loaded.store.fetch(loaded.row_ids[fused])):
+                examples.append(FeedbackExample(
+                    text=text,
                     entry=entry,
-                    similarity_score=float(distance),
+                    similarity_score=scores.get(idx, 0.0),
                     is_positive_example=entry.rating >= 3,
                     is_negative_example=entry.rating <= 2
-                )
-                examples.append(example)
-            
-            logger.info(f"Retrieved {len(examples)} similar examples from {index_type} index")
+                ))
             return examples
             
         except Exception as e:
             logger.error(f"Failed to retrieve similar examples: {e}")
             return []
     
+    def retrieve_similar_examples(
+        self, 
+        input_text: str, 
+        history: List[Dict[str, str]], 
+        k: int = 3,
+        index_type: str = "all",
+        min_rating: int = 3,
+        organism: Optional[str] = None,
+    ) -> List[FeedbackExample]:
+        """Retrieve similar feedback examples.
+        
+        Args:
+            input_text: Input text to find similar examples for
+            history: Conversation history
+            k: Number of examples to retrieve
+            index_type: Type of index to use ("all", "patient", "tutor")
+            min_rating: Minimum rating for examples
+            organism: Only examples from cases of this organism
+            
+        Returns:
+            List of similar feedback examples (k if enough qualify)
+        """
+        examples = self.search_similar(
+            input_text, k=k, index_type=index_type, min_rating=min_rating, organism=organism
+        )
+        logger.info(f"Retrieved {len(examples)} similar examples from {index_type} index")
+        return examples
+    
     def get_patient_examples(
         self, 
         input_text: str, 
@@ -186,23 +554,30 @@ class AutoFeedbackRetriever:
         )
     
     def refresh_indices(self) -> None:
-        """Refresh indices from auto-generated files."""
+        """Load the live version now and swap it in (searches continue on the old bundle meanwhile)."""
         try:
             logger.info("Refreshing auto-generated feedback indices...")
-            self._load_auto_indices()
-            logger.info("Auto-generated feedback indices refreshed successfully")
+            if self._reload():
+                logger.info("Auto-generated feedback indices refreshed successfully")
         except Exception as e:
             logger.error(f"Failed to refresh auto-generated indices: {e}")
     
     def get_index_stats(self) -> Dict[str, Any]:
         """Get statistics about loaded indices."""
-        stats = {}
-        for name in self.indices:
+        bundle = self._bundle
+        stats: Dict[str, Any] = {}
+        for name, loaded in bundle.indices.items():
             stats[name] = {
-                "total_entries": self.indices[name].ntotal,
-                "texts_count": len(self.texts.get(name, [])),
-                "entries_count": len(self.entries.get(name, []))
+                "total_entries": len(loaded),
+                "index_vectors": loaded.index.ntotal,
+                "index_class": type(loaded.index).__name__,
+                "view_of": MASTER_INDEX if loaded.members is not None else None,
+                "bm25_documents": len(loaded.bm25),
+                "entries_count": len(loaded),
+                "metadata_store": loaded.store.path
             }
+        stats["version"] = bundle.version
+        stats["loaded_at"] = bundle.loaded_at.isoformat()
         return stats
 
 
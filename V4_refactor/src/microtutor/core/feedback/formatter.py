@@ -9,6 +9,7 @@ feedback data to formatted text for prompt injection.
 from typing import List, Dict, Any, Optional
 from microtutor.core.feedback.processor import FeedbackExample
 from microtutor.core.feedback.auto_retriever import AutoFeedbackRetriever
+from microtutor.utils.conversation_utils import FEEDBACK_BLOCK_HEADER
 
 
 def format_feedback_examples(
@@ -28,7 +29,7 @@ def format_feedback_examples(
     if not examples:
         return ""
     
-    feedback_section = "=== EXPERT FEEDBACK EXAMPLES ===\n"
+    feedback_section = f"{FEEDBACK_BLOCK_HEADER}\n"
     
     if message_type == "tutor":
         feedback_section += "Here are examples of good and bad tutor responses to similar questions:\n"
@@ -0,0 +1,234 @@
+"""
+Index type selection for the feedback master index.
+
+Exact search (IndexFlatIP) costs O(entries) per query, and every production
+rating is added to the index. The generator therefore picks the index type by
+corpus size:
+
+    entries <  FEEDBACK_ANN_FLAT_MAX_ENTRIES     "flat"   exact IndexFlatIP
+    entries <  FEEDBACK_ANN_HNSW_MAX_ENTRIES     "hnsw"   HNSW graph over full vectors
+    otherwise                                    "ivfpq"  inverted lists + product quantization
+
+An approximate index only replaces Flat if it passes a recall@k benchmark
+against exact search on the same vectors (FEEDBACK_ANN_MIN_RECALL), both
+unfiltered and through an IDSelector for each view; otherwise the index
+stays Flat. The chosen parameters and benchmark result are stored
+with the index metadata (index_metadata.json and the version manifest), and
+the retriever re-applies the search-time parameters when it loads the index.
+"""
+
+import logging
+import math
+from typing import Any, Dict, Optional, Tuple
+
+import faiss
+import numpy as np
+
+from microtutor.core.config.config_helper import config
+
+logger = logging.getLogger(__name__)
+
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 128
+IVF_NPROBE = 32
+PQ_NBITS = 8
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """Largest PQ sub-quantizer count (<= 64) that divides the dimension."""
+    for m in (64, 48, 32, 24, 16, 12, 8, 4, 2, 1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def choose_index_params(n: int, dim: int, flat_max: int, hnsw_max: int) -> Dict[str, Any]:
+    """Index type and build/search parameters for n vectors of dimension dim."""
+    if n < flat_max:
+        return {"type": "flat"}
+    if n < hnsw_max:
+        return {"type": "hnsw", "M": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION, "ef_search": HNSW_EF_SEARCH}
+    # ~4*sqrt(n) lists, with at least 39 training points per centroid
+    nlist = max(16, min(int(4 * math.sqrt(n)), n // 39))
+    return {
+        "type": "ivfpq",
+        "nlist": nlist,
+        "m": _pq_subquantizers(dim),
+        "nbits": PQ_NBITS,
+        "nprobe": min(IVF_NPROBE, nlist),
+    }
+
+
+def build_index(vectors: np.ndarray, params: Dict[str, Any]) -> Any:
+    """Build (and train, for IVF-PQ) an inner-product index over normalized vectors."""
+    dim = vectors.shape[1]
+    kind = params["type"]
+    if kind == "flat":
+        index = faiss.IndexFlatIP(dim)
+    elif kind == "hnsw":
+        index = faiss.index_factory(dim, f"HNSW{params['M']}", faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params["ef_construction"]
+    elif kind == "ivfpq":
+        index = faiss.index_factory(
+            dim, f"IVF{params['nlist']},PQ{params['m']}x{params['nbits']}", faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+    else:
+        raise ValueError(f"Unknown feedback index type: {kind}")
+    index.add(vectors)
+    apply_search_params(index, params)
+    return index
+
+
+def apply_search_params(index: Any, params: Optional[Dict[str, Any]]) -> None:
+    """Set search-time parameters (efSearch / nprobe) on a built or loaded index."""
+    if not params:
+        return
+    try:
+        if params.get("type") == "hnsw":
+            index.hnsw.efSearch = params["ef_search"]
+        elif params.get("type") == "ivfpq":
+            ivf = faiss.extract_index_ivf(index)
+            ivf.nprobe = params["nprobe"]
+            ivf.make_direct_map()  # reconstruct() for scoring lexical-only hits
+    except Exception as e:
+        logger.warning(f"Could not apply {params.get('type')} search parameters: {e}")
+
+
+def search_parameters(index: Any, selector: Any) -> Any:
+    """SearchParameters carrying an IDSelector, of the class the index type expects."""
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    try:
+        ivf = faiss.extract_index_ivf(index)
+    except Exception:
+        return faiss.SearchParameters(sel=selector)
+    return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+
+
+def recall_at_k(
+    index: Any,
+    vectors: np.ndarray,
+    k: int = 10,
+    n_queries: int = 200,
+    seed: int = 0,
+    allowed: Optional[np.ndarray] = None,
+) -> float:
+    """Mean overlap of index's top-k with exact (Flat) top-k, for sampled stored vectors as queries.
+
+    Each query's own row is excluded from both result lists, so the
+    benchmark measures neighbours rather than self-matches. With an allowed
+    mask, queries and ground truth come from the allowed rows and the index
+    is searched through an IDSelector, the way filtered retrieval runs it;
+    -1 padding from a short filtered result counts as a miss.
+    """
+    ids = np.arange(vectors.shape[0], dtype=np.int64) if allowed is None else np.flatnonzero(allowed).astype(np.int64)
+    if len(ids) <= 1:
+        return 1.0
+    k = min(k, len(ids) - 1)
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(ids, size=min(n_queries, len(ids)), replace=False)
+    queries = vectors[rows]
+
+    exact = faiss.IndexFlatIP(vectors.shape[1])
+    exact.add(vectors[ids])
+    _, truth_pos = exact.search(queries, k + 1)
+    truth = ids[truth_pos]
+    if allowed is None:
+        _, found = index.search(queries, k + 1)
+    else:
+        params = search_parameters(index, faiss.IDSelectorBatch(ids))
+        _, found = index.search(queries, k + 1, params=params)
+
+    total = 0.0
+    for row, true_ids, found_ids in zip(rows, truth, found):
+        expected = [i for i in true_ids if i != row][:k]
+        got = {i for i in found_ids if i != row and i >= 0}
+        total += len(got.intersection(expected)) / len(expected)
+    return total / len(rows)
+
+
+def _thresholds() -> Tuple[int, int]:
+    return (
+        getattr(config, "FEEDBACK_ANN_FLAT_MAX_ENTRIES", 20000),
+        getattr(config, "FEEDBACK_ANN_HNSW_MAX_ENTRIES", 500000),
+    )
+
+
+def tier_is_current(params: Optional[Dict[str, Any]], n: int, dim: int) -> bool:
+    """Whether an index built with params still suits n entries.
+
+    False when the corpus crossed into another tier, an IVF-PQ index has
+    grown to 4x the vectors it was trained on, or a rejected approximate
+    index is worth benchmarking again (corpus grew 25% since).
+    """
+    params = params or {"type": "flat"}
+    wanted = choose_index_params(n, dim, *_thresholds())["type"]
+    if params["type"] == wanted:
+        return wanted != "ivfpq" or n <= 4 * params.get("trained_on", n)
+    rejected = params.get("rejected")
+    if rejected and rejected.get("type") == wanted:
+        return n < 1.25 * rejected.get("trained_on", 0)
+    return False
+
+
+def select_index(
+    vectors: np.ndarray,
+    filters: Optional[Dict[str, np.ndarray]] = None,
+) -> Tuple[Optional[Any], Dict[str, Any]]:
+    """Approximate index for the master vectors, if the corpus size calls for one and it passes recall@k.
+
+    Most searches are filtered (patient/tutor views, rating and organism
+    filters), so the candidate must pass the benchmark unfiltered and under
+    every mask in filters (name -> allowed rows), e.g. the view memberships.
+
+    Returns:
+        (index, params). index is None when exact Flat search should be
+        used, either because the corpus is small or because the candidate
+        failed the benchmark (reported under params["rejected"]). For an
+        approximate index, params holds its type, parameters and benchmark
+        ("recall_at_k" - the worst case - "k" and "filtered_recall").
+    """
+    n, dim = vectors.shape
+    params = choose_index_params(n, dim, *_thresholds())
+    params["trained_on"] = n
+    if params["type"] == "flat":
+        return None, params
+
+    k = getattr(config, "FEEDBACK_ANN_RECALL_K", 10)
+    min_recall = getattr(config, "FEEDBACK_ANN_MIN_RECALL", 0.95)
+    n_queries = getattr(config, "FEEDBACK_ANN_BENCHMARK_QUERIES", 200)
+    try:
+        candidate = build_index(vectors, params)
+        recall = recall_at_k(candidate, vectors, k=k, n_queries=n_queries)
+        filtered = {
+            name: round(recall_at_k(candidate, vectors, k=k, n_queries=n_queries, allowed=mask), 4)
+            for name, mask in (filters or {}).items()
+            if mask.any() and not mask.all()
+        }
+    except Exception as e:
+        logger.error(f"Building {params['type']} feedback index failed ({e}) - keeping exact search")
+        return None, {"type": "flat", "trained_on": n, "rejected": {**params, "error": str(e)}}
+    recall = min([recall, *filtered.values()])
+    params.update({"recall_at_k": round(recall, 4), "k": k, "filtered_recall": filtered})
+    if recall < min_recall:
+        logger.warning(
+            f"{params['type']} feedback index recall@{k} = {recall:.3f} < {min_recall} on {n} entries - keeping exact search"
+        )
+        return None, {"type": "flat", "trained_on": n, "rejected": params}
+    logger.info(f"Using {params['type']} feedback index for {n} entries (recall@{k} = {recall:.3f})")
+    return candidate, params
+
+
+def index_vectors(index: Any) -> Optional[np.ndarray]:
+    """All stored vectors of an exact-storage index (Flat, HNSW), else None."""
+    try:
+        if faiss.extract_index_ivf(index) is not None:
+            return None  # PQ codes only approximate the vectors
+    except Exception:
+        pass
+    try:
+        return index.reconstruct_n(0, index.ntotal)
+    except Exception:
+        return None
@@ -0,0 +1,145 @@
+"""
+Versioned layout of the auto-generated feedback indices.
+
+Each (re)index writes a complete, immutable bundle into a new directory and
+then publishes it by atomically replacing the CURRENT pointer file:
+
+    data/feedback_auto/
+        CURRENT                         id of the live version
+        versions/<id>/manifest.json     version id, creation time, per-index counts
+        versions/<id>/feedback_metadata.db   entries shared by all index types
+        versions/<id>/feedback_index.faiss, feedback_bm25.json   master ("all")
+        index_metadata.json             generator bookkeeping (last update, counts)
+
+Every entry is embedded and indexed once, in the master index. "patient" and
+"tutor" are views of it: their rows are listed in the metadata store and
+searches on them filter the master index by id. Versions written before the
+master layout have their own patient/ and tutor/ index directories.
+
+Files of a published version are never rewritten, so a process reading them
+sees one consistent bundle, and readers notice a new version by the CURRENT
+file changing. Without a CURRENT file the indices are read from the flat
+pre-versioning layout (data/feedback_auto/feedback_index.faiss, ...), which
+keeps its entries in per-index feedback_texts.pkl / feedback_entries.pkl.
+"""
+
+import json
+import logging
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from microtutor.utils.atomic_io import atomic_write_json, atomic_write_text
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_DIRNAME = "versions"
+CURRENT_FILENAME = "CURRENT"
+MANIFEST_FILENAME = "manifest.json"
+
+# Index type -> subdirectory inside a version (or the flat layout)
+INDEX_SUBDIRS: Dict[str, str] = {"all": "", "patient": "patient", "tutor": "tutor"}
+
+MASTER_INDEX = "all"
+
+# View index type -> (message types included, minimum rating)
+INDEX_VIEWS: Dict[str, Tuple[Tuple[str, ...], int]] = {
+    "patient": (("patient", "other"), 3),
+    "tutor": (("tutor", "other"), 3),
+}
+
+
+def in_view(entry: Any, index_type: str) -> bool:
+    """Whether a FeedbackEntry belongs to a view index type."""
+    message_types, min_rating = INDEX_VIEWS[index_type]
+    return entry.message_type in message_types and entry.rating >= min_rating
+
+
+def index_dir(version_dir: Path, index_type: str) -> Path:
+    """Directory holding one index type's files."""
+    subdir = INDEX_SUBDIRS[index_type]
+    return version_dir / subdir if subdir else version_dir
+
+
+def new_version_dir(root: Path) -> Tuple[str, Path]:
+    """Create an empty directory for the next version; returns (version_id, path)."""
+    version_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}-{os.getpid()}"
+    path = Path(root) / VERSIONS_DIRNAME / version_id
+    path.mkdir(parents=True, exist_ok=False)
+    return version_id, path
+
+
+def publish_version(root: Path, version_id: str, counts: Dict[str, int], metadata: Dict[str, Any]) -> None:
+    """Write the version's manifest, then point CURRENT at it (atomic swap)."""
+    root = Path(root)
+    version_dir = root / VERSIONS_DIRNAME / version_id
+    atomic_write_json(
+        version_dir / MANIFEST_FILENAME,
+        {
+            "version": version_id,
+            "created_at": datetime.now().isoformat(),
+            "indices": {name: {"dir": INDEX_SUBDIRS[name], "count": count} for name, count in counts.items()},
+            "metadata": metadata,
+        },
+        indent=2,
+    )
+    atomic_write_text(root / CURRENT_FILENAME, version_id + "\n")
+    logger.info(f"Published feedback index version {version_id} ({counts})")
+
+
+def current_version(root: Path) -> Optional[str]:
+    """Id of the live version, or None (flat layout / nothing published)."""
+    try:
+        version_id = (Path(root) / CURRENT_FILENAME).read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+    return version_id or None
+
+
+def resolve_live_dir(root: Path) -> Tuple[Optional[str], Path, Dict[str, Any]]:
+    """(version_id, directory, manifest) of the indices readers should load.
+
+    Falls back to the flat layout (version None, empty manifest) when no
+    version has been published or the published one is missing its manifest.
+    """
+    root = Path(root)
+    version_id = current_version(root)
+    if version_id:
+        version_dir = root / VERSIONS_DIRNAME / version_id
+        try:
+            with open(version_dir / MANIFEST_FILENAME, "r", encoding="utf-8") as f:
+                return version_id, version_dir, json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Feedback index version {version_id} is unreadable ({e}) - using flat layout")
+    return None, root, {}
+
+
+def prune_versions(root: Path, keep: int = 3, min_age_s: float = 0.0) -> List[str]:
+    """Delete old versions; returns the ids removed.
+
+    The live version and the `keep` newest ones are always kept, as are
+    versions younger than min_age_s (a reader may still be loading them).
+    """
+    versions_dir = Path(root) / VERSIONS_DIRNAME
+    if not versions_dir.is_dir():
+        return []
+    live = current_version(root)
+    candidates = sorted((p for p in versions_dir.iterdir() if p.is_dir()), key=lambda p: p.name, reverse=True)
+    removed = []
+    now = time.time()
+    for path in candidates[max(0, keep):]:
+        if path.name == live:
+            continue
+        try:
+            if now - path.stat().st_mtime < min_age_s:
+                continue
+            shutil.rmtree(path)
+            removed.append(path.name)
+        except OSError as e:
+            logger.warning(f"Could not remove feedback index version {path.name}: {e}")
+    if removed:
+        logger.info(f"Pruned {len(removed)} old feedback index versions")
+    return removed
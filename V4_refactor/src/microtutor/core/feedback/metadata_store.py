@@ -0,0 +1,209 @@
+"""
+Shared metadata store for the auto-generated feedback indices.
+
+Each index type ("all", "patient", "tutor") used to ship its own
+feedback_texts.pkl / feedback_entries.pkl with full FeedbackEntry objects
+(chat histories included), so an entry in two indices was stored, unpickled
+and kept in RAM twice per worker. A version now has one SQLite file instead:
+
+    versions/<id>/feedback_metadata.db
+        entries     one row per feedback entry (row_id, filter columns,
+                    embedding text, rated message, chat history as JSON)
+        index_rows  (index_type, position) -> row_id: FAISS row `position`
+                    of an index type is entry `row_id`
+
+Loading an index reads only the row map and the small filter columns
+(rating, organism) into numpy arrays. Texts, messages and chat histories
+stay on disk (read through mmap) and are fetched by row id for the hits a
+search returns.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from microtutor.core.feedback.processor import FeedbackEntry
+from microtutor.utils.conversation_utils import normalize_organism_name
+
+logger = logging.getLogger(__name__)
+
+METADATA_FILENAME = "feedback_metadata.db"
+
+# Read connections map the file instead of copying pages into SQLite's cache
+_MMAP_SIZE = 256 * 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    row_id INTEGER PRIMARY KEY,
+    entry_id INTEGER,
+    timestamp TEXT NOT NULL,
+    organism TEXT,
+    organism_key TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    message_type TEXT NOT NULL,
+    case_id TEXT,
+    text TEXT NOT NULL,
+    rated_message TEXT,
+    feedback_text TEXT,
+    replacement_text TEXT,
+    chat_history TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS index_rows (
+    index_type TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    row_id INTEGER NOT NULL,
+    PRIMARY KEY (index_type, position)
+);
+"""
+
+
+def _chunks(items: Sequence[int], size: int = 500) -> List[Sequence[int]]:
+    # Stay below SQLite's bound-parameter limit
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class FeedbackMetadataStore:
+    """Entries of one index version, shared by all its index types."""
+
+    def __init__(self, path: str, writable: bool = False):
+        """Open a store.
+
+        Args:
+            path: SQLite file (":memory:" for a temporary store)
+            writable: Create the schema and allow add_*(); read-only otherwise
+        """
+        self.path = path
+        self.writable = writable
+        self._lock = threading.Lock()  # One connection, shared by search threads
+        self._row_of: Dict[int, int] = {}  # id(entry) -> row_id for entries added by this instance
+        if writable or path == ":memory:":
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+        else:
+            self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size={_MMAP_SIZE}")
+
+    @classmethod
+    def open(cls, path: Path) -> Optional["FeedbackMetadataStore"]:
+        """Read-only store at path, or None if the file does not exist."""
+        if not Path(path).exists():
+            return None
+        return cls(str(path))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ---------- Writes (index builds) ----------
+
+    def add_entries(self, entries: Sequence[FeedbackEntry], texts: Sequence[str]) -> List[int]:
+        """Store entries with their embedding texts; returns their row ids.
+
+        An entry object already added through this store is not stored again,
+        so indices built from the same entries share rows.
+        """
+        with self._lock:
+            next_row = self._conn.execute("SELECT COALESCE(MAX(row_id) + 1, 0) FROM entries").fetchone()[0]
+            row_ids, rows = [], []
+            for entry, text in zip(entries, texts):
+                row_id = self._row_of.get(id(entry))
+                if row_id is None:
+                    row_id = self._row_of[id(entry)] = next_row
+                    next_row += 1
+                    rows.append((
+                        row_id, entry.id, entry.timestamp.isoformat(), entry.organism,
+                        normalize_organism_name(entry.organism or ""), entry.rating, entry.message_type,
+                        entry.case_id, text, entry.rated_message, entry.feedback_text,
+                        entry.replacement_text, json.dumps(entry.chat_history or []),
+                    ))
+                row_ids.append(row_id)
+            self._conn.executemany(
+                "INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._conn.commit()
+        return row_ids
+
+    def add_index_rows(self, index_type: str, row_ids: Sequence[int]) -> None:
+        """Append rows to an index type's row map (same order as its FAISS vectors)."""
+        with self._lock:
+            start = self._conn.execute(
+                "SELECT COUNT(*) FROM index_rows WHERE index_type = ?", (index_type,)
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT INTO index_rows VALUES (?, ?, ?)",
+                [(index_type, start + i, int(row_id)) for i, row_id in enumerate(row_ids)],
+            )
+            self._conn.commit()
+
+    # ---------- Reads ----------
+
+    def index_types(self) -> List[str]:
+        with self._lock:
+            return [r[0] for r in self._conn.execute("SELECT DISTINCT index_type FROM index_rows")]
+
+    def row_ids(self, index_type: str) -> np.ndarray:
+        """Entry row of each FAISS position of an index type."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT row_id FROM index_rows WHERE index_type = ? ORDER BY position", (index_type,)
+            ).fetchall()
+        return np.array([r[0] for r in rows], dtype=np.int64)
+
+    def filter_columns(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(ratings, organism keys) indexed by row_id, for filtered search."""
+        with self._lock:
+            rows = self._conn.execute("SELECT rating, organism_key FROM entries ORDER BY row_id").fetchall()
+        ratings = np.array([r[0] for r in rows], dtype=np.int64)
+        organisms = np.array([r[1] for r in rows], dtype=object)
+        return ratings, organisms
+
+    def texts(self, row_ids: Sequence[int]) -> List[str]:
+        """Embedding texts of rows, in the given order."""
+        found: Dict[int, str] = {}
+        with self._lock:
+            for chunk in _chunks([int(r) for r in row_ids]):
+                query = f"SELECT row_id, text FROM entries WHERE row_id IN ({','.join('?' * len(chunk))})"
+                found.update(self._conn.execute(query, chunk).fetchall())
+        return [found[int(r)] for r in row_ids]
+
+    def fetch(self, row_ids: Sequence[int]) -> List[Tuple[str, FeedbackEntry]]:
+        """(text, entry) of rows in the given order; chat histories are decoded here."""
+        found: Dict[int, Tuple[str, FeedbackEntry]] = {}
+        with self._lock:
+            for chunk in _chunks([int(r) for r in row_ids]):
+                query = (
+                    "SELECT row_id, entry_id, timestamp, organism, rating, message_type, case_id, text, "
+                    "rated_message, feedback_text, replacement_text, chat_history "
+                    f"FROM entries WHERE row_id IN ({','.join('?' * len(chunk))})"
+                )
+                for (row_id, entry_id, timestamp, organism, rating, message_type, case_id, text,
+                     rated_message, feedback_text, replacement_text, chat_history) in self._conn.execute(query, chunk):
+                    found[row_id] = (text, FeedbackEntry(
+                        id=entry_id,
+                        timestamp=datetime.fromisoformat(timestamp),
+                        organism=organism,
+                        rating=rating,
+                        rated_message=rated_message,
+                        feedback_text=feedback_text,
+                        replacement_text=replacement_text,
+                        chat_history=json.loads(chat_history),
+                        case_id=case_id,
+                        message_type=message_type,
+                    ))
+        return [found[int(r)] for r in row_ids]
+
+    def count(self, index_type: Optional[str] = None) -> int:
+        """Entries in the store, or rows of one index type."""
+        with self._lock:
+            if index_type is None:
+                return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM index_rows WHERE index_type = ?", (index_type,)
+            ).fetchone()[0]
@@ -18,8 +18,8 @@ try:
     import numpy as np
     import faiss
     import pickle
-    from tqdm import tqdm
-    from microtutor.utils.embedding_utils import get_embedding
+    from microtutor.utils.embedding_utils import embed_texts, get_embedding
+    from microtutor.utils.lexical_search import BM25Index
     FAISS_AVAILABLE = True
 except ImportError as e:
     import logging
@@ -39,6 +39,9 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# Saved next to feedback_index.faiss
+BM25_FILENAME = "feedback_bm25.json"
+
 
 @dataclass
 class FeedbackEntry:
@@ -78,9 +81,10 @@ class FeedbackExample:
 class FeedbackProcessor:
     """Processes feedback data and creates FAISS indices."""
     
-    def __init__(self, embedding_model: str = "text-embedding-3-small"):
+    def __init__(self, embedding_model: str = "text-embedding-3-small", embedding_concurrency: int = 4):
         """Initialize feedback processor."""
         self.embedding_model = embedding_model
+        self.embedding_concurrency = embedding_concurrency  # Embedding requests in flight during index builds
         self.entries: List[FeedbackEntry] = []
     
     def load_feedback_from_json(self, json_file_path: str) -> List[FeedbackEntry]:
@@ -206,11 +210,17 @@ class FeedbackProcessor:
     def create_faiss_index(
         self, 
         output_dir: str,
-        batch_size: int = 32,
+        batch_size: int = 256,
         filter_by_type: Optional[str] = None,
-        min_rating: Optional[int] = None
+        min_rating: Optional[int] = None,
+        metadata_store: Optional[Any] = None
     ) -> "Tuple[Any, List[str], List[FeedbackEntry]]":
-        """Create FAISS index from feedback entries."""
+        """Create FAISS index from feedback entries.
+        
+        With a metadata_store (FeedbackMetadataStore), entries and texts are
+        added to the store under index type filter_by_type (or "all") instead
+        of being pickled next to the index.
+        """
         if not FAISS_AVAILABLE:
             logger.warning("FAISS not available, returning empty index")
             return None, [], []
@@ -262,22 +272,25 @@ class FeedbackProcessor:
         if not valid_entries:
             raise ValueError("No valid entries to index after filtering for user input")
         
-        # Get embedding dimension
-        sample_embedding = get_embedding(texts[0])
-        embedding_dim = len(sample_embedding)
-        logger.info(f"Embedding dimension: {embedding_dim}")
+        # Generate embeddings with multi-input requests (cached, token-aware, concurrent)
+        embedded = embed_texts(
+            texts,
+            max_inputs_per_batch=batch_size,
+            max_concurrency=self.embedding_concurrency,
+        )
         
-        # Generate embeddings in batches
-        embeddings = []
-        for i in tqdm(range(0, len(texts), batch_size), desc="Generating embeddings"):
-            batch = texts[i:i+batch_size]
-            try:
-                batch_embeddings = [get_embedding(text) for text in batch]
-                embeddings.extend(batch_embeddings)
-            except Exception as e:
-                logger.error(f"Batch embedding failed: {e}")
-                # Use zero embeddings as fallback
-                embeddings.extend([np.zeros(embedding_dim) for _ in batch])
+        # Drop entries whose embedding failed - a zero vector would poison cosine search
+        kept = [i for i, vec in enumerate(embedded) if vec is not None]
+        if len(kept) < len(texts):
+            logger.warning(f"Skipping {len(texts) - len(kept)} entries whose embedding failed")
+        if not kept:
+            raise ValueError("Embedding failed for every entry")
+        texts = [texts[i] for i in kept]
+        valid_entries = [valid_entries[i] for i in kept]
+        embeddings = [embedded[i] for i in kept]
+        
+        embedding_dim = len(embeddings[0])
+        logger.info(f"Embedding dimension: {embedding_dim}")
         
         # Create FAISS index with cosine similarity
         embeddings_array = np.array(embeddings).astype('float32')
@@ -299,11 +312,19 @@ class FeedbackProcessor:
         
         faiss.write_index(index, str(index_path))
         
-        with open(texts_path, 'wb') as f:
-            pickle.dump(texts, f)
+        if metadata_store is not None:
+            metadata_store.add_index_rows(
+                filter_by_type or "all", metadata_store.add_entries(valid_entries, texts)
+            )
+        else:
+            with open(texts_path, 'wb') as f:
+                pickle.dump(texts, f)
+            
+            with open(entries_path, 'wb') as f:
+                pickle.dump(valid_entries, f)
         
-        with open(entries_path, 'wb') as f:
-            pickle.dump(valid_entries, f)
+        # Lexical (BM25) index over the same texts, for hybrid / offline retrieval
+        BM25Index.build(texts).save(str(output_path / BM25_FILENAME))
         
         logger.info(f"Saved FAISS index to {index_path}")
         logger.info(f"Index contains {index.ntotal} vectors")
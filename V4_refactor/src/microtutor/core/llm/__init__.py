@@ -1,10 +1,24 @@
 """LLM infrastructure - clients and routing."""
 
-from .llm_client import LLMClient
-from .llm_router import chat_complete, get_llm_client
+from .client_pool import aclose_clients, get_client_pool_stats, get_openai_client
+from .llm_client import AsyncLLMClient, LLMClient
+from .llm_router import (
+    achat_complete,
+    achat_complete_stream,
+    chat_complete,
+    get_async_llm_client,
+    get_llm_client,
+)
 
 __all__ = [
     "LLMClient",
+    "AsyncLLMClient",
     "chat_complete",
+    "achat_complete",
+    "achat_complete_stream",
     "get_llm_client",
+    "get_async_llm_client",
+    "get_openai_client",
+    "get_client_pool_stats",
+    "aclose_clients",
 ]
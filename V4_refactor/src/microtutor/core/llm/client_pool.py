@@ -0,0 +1,160 @@
+"""
+Client Pool - process-wide OpenAI/Azure OpenAI clients.
+
+Every OpenAI()/AzureOpenAI() construction brings its own httpx connection
+pool, so building one per call (or per service) means a fresh TCP + TLS
+handshake for requests that could have reused a warm connection. This module
+hands out one client per (provider, sync/async, credentials) and backs each
+with a keep-alive pool sized for our concurrency, over HTTP/2 when the `h2`
+package is installed.
+
+Usage:
+    from microtutor.core.llm.client_pool import get_openai_client
+
+    client = get_openai_client()                  # sync, provider from USE_AZURE_OPENAI
+    aclient = get_openai_client(is_async=True)    # AsyncOpenAI / AsyncAzureOpenAI
+"""
+
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from openai import AsyncAzureOpenAI, AsyncOpenAI, AzureOpenAI, OpenAI
+
+from microtutor.core.config.config_helper import config
+
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_AZURE_API_VERSION = "2025-04-16"
+
+_clients: Dict[Tuple, Any] = {}
+_lock = threading.Lock()
+
+
+def _use_azure_default() -> bool:
+    return os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
+
+
+def _http_settings() -> Dict[str, Any]:
+    """Connection pool settings (see config: LLM_HTTP_*)."""
+    return {
+        "limits": httpx.Limits(
+            max_connections=getattr(config, "LLM_HTTP_MAX_CONNECTIONS", 100),
+            max_keepalive_connections=getattr(config, "LLM_HTTP_MAX_KEEPALIVE", 20),
+            keepalive_expiry=getattr(config, "LLM_HTTP_KEEPALIVE_EXPIRY", 30.0),
+        ),
+        "timeout": httpx.Timeout(getattr(config, "LLM_HTTP_TIMEOUT_SECONDS", 600.0), connect=5.0),
+        "http2": HTTP2_AVAILABLE and getattr(config, "LLM_HTTP2_ENABLED", True),
+    }
+
+
+def _build_client(
+    use_azure: bool,
+    is_async: bool,
+    azure_endpoint: Optional[str],
+    api_key: str,
+    api_version: Optional[str],
+) -> Any:
+    """Construct an SDK client backed by a pooled httpx client."""
+    settings = _http_settings()
+    http_client = httpx.AsyncClient(**settings) if is_async else httpx.Client(**settings)
+
+    if use_azure:
+        client_cls = AsyncAzureOpenAI if is_async else AzureOpenAI
+        return client_cls(
+            azure_endpoint=azure_endpoint,
+            api_key=api_key,
+            api_version=api_version,
+            http_client=http_client,
+        )
+    client_cls = AsyncOpenAI if is_async else OpenAI
+    return client_cls(api_key=api_key, http_client=http_client)
+
+
+def get_openai_client(
+    use_azure: Optional[bool] = None,
+    is_async: bool = False,
+    *,
+    azure_endpoint: Optional[str] = None,
+    api_key: Optional[str] = None,
+    api_version: Optional[str] = None,
+) -> Any:
+    """Get the shared client for a provider (created on first use).
+
+    Args:
+        use_azure: Azure OpenAI vs personal OpenAI (None = USE_AZURE_OPENAI env)
+        is_async: Return AsyncOpenAI/AsyncAzureOpenAI instead of the blocking client
+        azure_endpoint: Override AZURE_OPENAI_ENDPOINT
+        api_key: Override AZURE_OPENAI_API_KEY / OPENAI_API_KEY
+        api_version: Override AZURE_OPENAI_API_VERSION
+
+    Returns:
+        OpenAI, AzureOpenAI, AsyncOpenAI or AsyncAzureOpenAI instance
+
+    Raises:
+        ValueError: If credentials for the requested provider are missing
+    """
+    if use_azure is None:
+        use_azure = _use_azure_default()
+
+    if use_azure:
+        azure_endpoint = azure_endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+        api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
+        api_version = api_version or os.getenv("AZURE_OPENAI_API_VERSION", DEFAULT_AZURE_API_VERSION)
+        if not azure_endpoint or not api_key:
+            raise ValueError("Missing Azure OpenAI credentials (AZURE_OPENAI_ENDPOINT / AZURE_OPENAI_API_KEY)")
+    else:
+        azure_endpoint = api_version = None
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("Missing OpenAI API key (OPENAI_API_KEY)")
+
+    key = (use_azure, is_async, azure_endpoint, api_key, api_version)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _build_client(use_azure, is_async, azure_endpoint, api_key, api_version)
+            _clients[key] = client
+            logger.info(
+                "Created shared %s%s client (http2=%s)",
+                "async " if is_async else "",
+                "Azure OpenAI" if use_azure else "OpenAI",
+                _http_settings()["http2"],
+            )
+    return client
+
+
+def get_client_pool_stats() -> Dict[str, Any]:
+    """Which shared clients exist (no credentials included)."""
+    with _lock:
+        clients = [
+            {"provider": "azure" if use_azure else "openai", "async": is_async, "api_version": api_version}
+            for (use_azure, is_async, _endpoint, _key, api_version) in _clients
+        ]
+    return {"http2_available": HTTP2_AVAILABLE, "client_count": len(clients), "clients": clients}
+
+
+async def aclose_clients() -> None:
+    """Close every shared client's connection pool (call on app shutdown)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            result = client.close()
+            if hasattr(result, "__await__"):
+                await result
+        except Exception as e:
+            logger.warning(f"Error closing shared OpenAI client: {e}")
@@ -2,16 +2,25 @@
 LLM Client Management - Handles Azure and OpenAI clients.
 
 Provides unified interface for both Azure and standard OpenAI APIs.
+LLMClient is the blocking client; AsyncLLMClient mirrors it on top of
+AsyncOpenAI/AsyncAzureOpenAI for use inside the FastAPI event loop.
+Both take their SDK client from client_pool, so every LLMClient in the
+process shares the same keep-alive connections.
 """
 
+import asyncio
 import os
 import time
-from typing import Dict, List, Optional, Union
-from openai import AzureOpenAI, OpenAI
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 import openai
 
 from microtutor.core.cost.cost_tracker import CostTracker, TokenUsage
 from microtutor.core.config.config_helper import config
+from microtutor.core.llm.client_pool import get_openai_client
+
+
+class _EmptyResponse(Exception):
+    """Internal signal: the model answered but the content was empty."""
 
 
 class LLMClient:
@@ -26,6 +35,7 @@ class LLMClient:
         use_azure_env = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
         # If use_azure is explicitly provided (not None), use it; otherwise use environment
         self.use_azure = use_azure if use_azure is not None else use_azure_env
+        self.deployment_map: Dict[str, str] = {}
         
         # Initialize appropriate client
         if self.use_azure:
@@ -33,6 +43,9 @@ class LLMClient:
         else:
             self._init_openai_client()
     
+    # Sync vs async SDK client - overridden by AsyncLLMClient
+    _is_async = False
+    
     def _init_azure_client(self):
         """Initialize Azure OpenAI client."""
         endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -45,7 +58,9 @@ class LLMClient:
             return
         
         try:
-            self.client = AzureOpenAI(
+            self.client = get_openai_client(
+                use_azure=True,
+                is_async=self._is_async,
                 azure_endpoint=endpoint,
                 api_key=api_key,
                 api_version=api_version
@@ -83,7 +98,7 @@ class LLMClient:
             return
         
         try:
-            self.client = OpenAI(api_key=api_key)
+            self.client = get_openai_client(use_azure=False, is_async=self._is_async, api_key=api_key)
             print("OpenAI client initialized")
         except Exception as e:
             print(f"Error initializing OpenAI client: {e}")
@@ -139,77 +154,18 @@ class LLMClient:
         """Try a specific model with retries."""
         for attempt in range(retries):
             try:
-                # Get deployment name for Azure
-                deployment = model
-                if self.use_azure and model in self.deployment_map:
-                    deployment = self.deployment_map[model]
-                    print(f"[DEBUG] Using Azure deployment: {deployment} for model: {model}")
-                else:
-                    print(f"[DEBUG] Using model directly: {deployment}")
-                
-                # Build API call
-                api_params = {
-                    "model": deployment,
-                    "messages": messages,
-                    # No max_tokens - use model default
-                }
-                
-                # Add tools for native function calling
-                if tools:
-                    api_params["tools"] = tools
-                    api_params["tool_choice"] = "auto"
-                
-                # Call API
+                api_params = self._build_api_params(model, messages, tools)
                 response = self.client.chat.completions.create(**api_params)
-                
-                # Track cost
-                usage = TokenUsage(
-                    prompt_tokens=response.usage.prompt_tokens,
-                    completion_tokens=response.usage.completion_tokens,
-                    total_tokens=response.usage.total_tokens
-                )
-                
-                input_text = messages[-1]["content"] if messages else ""
-                output_text = response.choices[0].message.content or ""
-                
-                self.cost_tracker.add_usage(model, usage, input_text, output_text)
-                
-                # Check for empty response
-                message = response.choices[0].message
-                content = message.content or ""
-                
-                # If we have tool calls, return them regardless of content
-                if tools and hasattr(message, 'tool_calls') and message.tool_calls:
-                    return {
-                        'content': content,
-                        'tool_calls': message.tool_calls
-                    }
-                
-                # For text responses, check if content is not empty
-                if content.strip():
-                    return content
-                else:
-                    print(f"Warning: Empty response from {model} (attempt {attempt + 1}/{retries})")
-                    print(f"  - Response object: {response}")
-                    print(f"  - Message content: '{content}'")
-                    print(f"  - Message length: {len(content)}")
-                    if attempt < retries - 1:
-                        time.sleep(1)  # Short delay before retry
-                        continue
-                    else:
-                        print(f"Error: {model} returned empty response after {retries} attempts")
-                        return None
-                
-            except openai.APIError as e:
-                error_code = getattr(e, 'code', None)
-                if error_code == 'model_not_found':
-                    print(f"Model {model} not found or no access - skipping retries")
-                    return None  # Don't retry for model not found errors
-                print(f"API Error with {model}: {e} (attempt {attempt + 1}/{retries})")
-            except openai.RateLimitError as e:
-                print(f"Rate limit with {model}: {e} (attempt {attempt + 1}/{retries})")
+                return self._handle_response(model, messages, tools, response, attempt, retries)
+            except _EmptyResponse:
+                if attempt < retries - 1:
+                    time.sleep(1)  # Short delay before retry
+                    continue
+                print(f"Error: {model} returned empty response after {retries} attempts")
+                return None
             except Exception as e:
-                print(f"Error with {model}: {e} (attempt {attempt + 1}/{retries})")
+                if self._log_attempt_error(model, e, attempt, retries):
+                    return None  # Don't retry for model not found errors
             
             if attempt < retries - 1:
                 time.sleep(2 ** attempt)  # Exponential backoff
@@ -217,6 +173,86 @@ class LLMClient:
         print(f"Error: {model} failed after {retries} attempts")
         return None
     
+    # ---------- Shared helpers (sync + async) ----------
+    
+    def _build_api_params(self, model: str, messages: List[Dict[str, str]], tools: Optional[List[Dict]]) -> Dict[str, Any]:
+        """Build chat.completions.create kwargs, resolving the Azure deployment name."""
+        deployment = model
+        if self.use_azure and model in self.deployment_map:
+            deployment = self.deployment_map[model]
+            print(f"[DEBUG] Using Azure deployment: {deployment} for model: {model}")
+        else:
+            print(f"[DEBUG] Using model directly: {deployment}")
+        
+        api_params = {
+            "model": deployment,
+            "messages": messages,
+            # No max_tokens - use model default
+        }
+        
+        # Add tools for native function calling
+        if tools:
+            api_params["tools"] = tools
+            api_params["tool_choice"] = "auto"
+        return api_params
+    
+    def _handle_response(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]],
+        response: Any,
+        attempt: int,
+        retries: int
+    ) -> Union[str, Dict]:
+        """Track cost and unpack a completion. Raises _EmptyResponse on blank text."""
+        # Track cost
+        usage = TokenUsage(
+            prompt_tokens=response.usage.prompt_tokens,
+            completion_tokens=response.usage.completion_tokens,
+            total_tokens=response.usage.total_tokens
+        )
+        
+        input_text = messages[-1]["content"] if messages else ""
+        output_text = response.choices[0].message.content or ""
+        
+        self.cost_tracker.add_usage(model, usage, input_text, output_text)
+        
+        # Check for empty response
+        message = response.choices[0].message
+        content = message.content or ""
+        
+        # If we have tool calls, return them regardless of content
+        if tools and hasattr(message, 'tool_calls') and message.tool_calls:
+            return {
+                'content': content,
+                'tool_calls': message.tool_calls
+            }
+        
+        # For text responses, check if content is not empty
+        if content.strip():
+            return content
+        
+        print(f"Warning: Empty response from {model} (attempt {attempt + 1}/{retries})")
+        print(f"  - Response object: {response}")
+        print(f"  - Message content: '{content}'")
+        print(f"  - Message length: {len(content)}")
+        raise _EmptyResponse()
+    
+    def _log_attempt_error(self, model: str, e: Exception, attempt: int, retries: int) -> bool:
+        """Log a failed attempt. Returns True when retrying this model is pointless."""
+        if isinstance(e, openai.RateLimitError):
+            print(f"Rate limit with {model}: {e} (attempt {attempt + 1}/{retries})")
+        elif isinstance(e, openai.APIError):
+            error_code = getattr(e, 'code', None)
+            if error_code == 'model_not_found':
+                print(f"Model {model} not found or no access - skipping retries")
+                return True
+            print(f"API Error with {model}: {e} (attempt {attempt + 1}/{retries})")
+        else:
+            print(f"Error with {model}: {e} (attempt {attempt + 1}/{retries})")
+        return False
+    
     def get_cost_summary(self) -> Dict:
         """Get cost tracking summary."""
         return self.cost_tracker.get_summary()
@@ -225,3 +261,216 @@ class LLMClient:
         """Print cost summary."""
         self.cost_tracker.print_summary()
 
+
+class AsyncLLMClient(LLMClient):
+    """Non-blocking LLMClient built on AsyncOpenAI/AsyncAzureOpenAI.
+    
+    Same deployment mapping, retry/fallback and cost-tracking semantics as
+    LLMClient, but generate() is a coroutine and backoff uses asyncio.sleep,
+    so an in-flight LLM call never blocks the event loop.
+    """
+    
+    _is_async = True
+    
+    async def generate(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        tools: Optional[List[Dict]] = None,
+        retries: int = 4,
+        fallback_model: Optional[str] = None
+    ) -> Union[str, Dict]:
+        """Async version of LLMClient.generate (same arguments and return values)."""
+        if not self.client:
+            raise Exception("LLM client not initialized")
+        
+        primary_model = model or self.model
+        fallback_model = fallback_model or "gpt-5"
+        
+        result = await self._try_model(primary_model, messages, tools, retries)
+        if result is not None:
+            return result
+        
+        if fallback_model != primary_model:
+            print(f"Primary model {primary_model} failed, trying fallback model {fallback_model}")
+            result = await self._try_model(fallback_model, messages, tools, retries)
+            if result is not None:
+                return result
+        
+        print(f"Error: Both primary model {primary_model} and fallback model {fallback_model} failed")
+        return None
+    
+    async def _try_model(self, model: str, messages: List[Dict[str, str]], tools: Optional[List[Dict]], retries: int) -> Union[str, Dict, None]:
+        """Try a specific model with retries (asyncio.sleep backoff)."""
+        for attempt in range(retries):
+            try:
+                api_params = self._build_api_params(model, messages, tools)
+                response = await self.client.chat.completions.create(**api_params)
+                return self._handle_response(model, messages, tools, response, attempt, retries)
+            except _EmptyResponse:
+                if attempt < retries - 1:
+                    await asyncio.sleep(1)
+                    continue
+                print(f"Error: {model} returned empty response after {retries} attempts")
+                return None
+            except Exception as e:
+                if self._log_attempt_error(model, e, attempt, retries):
+                    return None  # Don't retry for model not found errors
+            
+            if attempt < retries - 1:
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+        
+        print(f"Error: {model} failed after {retries} attempts")
+        return None
+    
+    async def generate_stream(
+        self,
+        messages: List[Dict[str, str]],
+        model: Optional[str] = None,
+        retries: int = 4,
+        fallback_model: Optional[str] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream a text response as it is generated (no tool calling).
+        
+        Same retry/fallback/cost semantics as generate(), with one caveat: once
+        tokens have been yielded the stream can't be transparently retried, so
+        a mid-stream failure is raised to the caller.
+        
+        Yields:
+            str: Content deltas, in order. Nothing is yielded if both models fail.
+        """
+        if not self.client:
+            raise Exception("LLM client not initialized")
+        
+        primary_model = model or self.model
+        fallback_model = fallback_model or "gpt-5"
+        models = [primary_model] if fallback_model == primary_model else [primary_model, fallback_model]
+        
+        for i, current_model in enumerate(models):
+            if i > 0:
+                print(f"Primary model {primary_model} failed, trying fallback model {current_model}")
+            status: Dict[str, Any] = {"ok": False}  # Per-call, the client is shared across requests
+            async for delta in self._stream_model(current_model, messages, None, retries, status):
+                yield delta
+            if status["ok"]:
+                return
+        
+        print(f"Error: Both primary model {primary_model} and fallback model {fallback_model} failed")
+    
+    async def generate_stream_with_tools(
+        self,
+        messages: List[Dict[str, str]],
+        tools: List[Dict],
+        model: Optional[str] = None,
+        retries: int = 4,
+        fallback_model: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream a response that may call tools instead of answering.
+        
+        Yields {"type": "delta", "content": str} events while the model answers
+        in text. If it calls tools, one {"type": "tool_calls", "tool_calls": [...]}
+        event follows at the end, each call shaped like
+        {"id": ..., "function": {"name": str, "arguments": str}}. Same
+        retry/fallback caveat as generate_stream().
+        """
+        if not self.client:
+            raise Exception("LLM client not initialized")
+        
+        primary_model = model or self.model
+        fallback_model = fallback_model or "gpt-5"
+        models = [primary_model] if fallback_model == primary_model else [primary_model, fallback_model]
+        
+        for i, current_model in enumerate(models):
+            if i > 0:
+                print(f"Primary model {primary_model} failed, trying fallback model {current_model}")
+            status: Dict[str, Any] = {"ok": False}
+            async for delta in self._stream_model(current_model, messages, tools, retries, status):
+                yield {"type": "delta", "content": delta}
+            if status["ok"]:
+                if status.get("tool_calls"):
+                    yield {"type": "tool_calls", "tool_calls": status["tool_calls"]}
+                return
+        
+        print(f"Error: Both primary model {primary_model} and fallback model {fallback_model} failed")
+    
+    async def _stream_model(
+        self,
+        model: str,
+        messages: List[Dict[str, str]],
+        tools: Optional[List[Dict]],
+        retries: int,
+        status: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream from a specific model with retries.
+        
+        Sets status["ok"] on success and, if the model called tools,
+        status["tool_calls"] to the assembled calls.
+        """
+        for attempt in range(retries):
+            emitted = False
+            try:
+                api_params = self._build_api_params(model, messages, tools)
+                api_params["stream"] = True
+                api_params["stream_options"] = {"include_usage": True}
+                stream = await self.client.chat.completions.create(**api_params)
+                
+                parts: List[str] = []
+                calls: Dict[int, Dict[str, Any]] = {}  # Tool call deltas by index
+                usage = None
+                async for chunk in stream:
+                    if getattr(chunk, "usage", None):
+                        usage = chunk.usage
+                    if not chunk.choices:
+                        continue
+                    choice_delta = chunk.choices[0].delta
+                    for tc in getattr(choice_delta, "tool_calls", None) or []:
+                        call = calls.setdefault(tc.index, {"id": None, "function": {"name": "", "arguments": ""}})
+                        if tc.id:
+                            call["id"] = tc.id
+                        if tc.function and tc.function.name:
+                            call["function"]["name"] += tc.function.name
+                        if tc.function and tc.function.arguments:
+                            call["function"]["arguments"] += tc.function.arguments
+                    delta = choice_delta.content
+                    if delta:
+                        emitted = True
+                        parts.append(delta)
+                        yield delta
+                
+                # Track cost (usage arrives on the final chunk)
+                if usage is not None:
+                    self.cost_tracker.add_usage(
+                        model,
+                        TokenUsage(
+                            prompt_tokens=usage.prompt_tokens,
+                            completion_tokens=usage.completion_tokens,
+                            total_tokens=usage.total_tokens
+                        ),
+                        messages[-1]["content"] if messages else "",
+                        "".join(parts)
+                    )
+                
+                if calls:
+                    status["tool_calls"] = [calls[i] for i in sorted(calls)]
+                    status["ok"] = True
+                    return
+                if "".join(parts).strip():
+                    status["ok"] = True
+                    return
+                
+                print(f"Warning: Empty streamed response from {model} (attempt {attempt + 1}/{retries})")
+                if attempt < retries - 1:
+                    await asyncio.sleep(1)
+                continue
+            except Exception as e:
+                if emitted:
+                    raise  # Can't retry once the caller has seen tokens
+                if self._log_attempt_error(model, e, attempt, retries):
+                    return
+            
+            if attempt < retries - 1:
+                await asyncio.sleep(2 ** attempt)  # Exponential backoff
+        
+        print(f"Error: {model} failed after {retries} attempts")
@@ -1,16 +1,17 @@
 """
 LLM Router - Public API for LLM interactions.
 
-Provides simple interface: chat_complete() with optional tool support.
+Provides simple interface: chat_complete() with optional tool support,
+and achat_complete() as its non-blocking counterpart for async callers.
 """
 
 import os
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"  # macOS OpenMP fix
 
-from typing import List, Dict, Optional, Union
+from typing import AsyncIterator, List, Dict, Optional, Tuple, Union
 from dotenv import load_dotenv
 
-from microtutor.core.llm.llm_client import LLMClient
+from microtutor.core.llm.llm_client import AsyncLLMClient, LLMClient
 from microtutor.core.config.config_helper import config
 
 # Load environment
@@ -19,6 +20,53 @@ load_dotenv()
 # Initialize global client
 BACKEND = config.LLM_BACKEND
 llm_client = LLMClient(model=config.API_MODEL_NAME, use_azure=(BACKEND == "azure"))
+async_llm_client = AsyncLLMClient(model=config.API_MODEL_NAME, use_azure=(BACKEND == "azure"))
+# Share one cost tracker so cost summaries cover sync and async calls alike
+async_llm_client.cost_tracker = llm_client.cost_tracker
+
+# Per-provider clients for calls that pass use_azure explicitly, keyed by (use_azure, is_async).
+# The underlying SDK clients come from client_pool, so these reuse pooled connections too.
+_provider_clients: Dict[Tuple[bool, bool], LLMClient] = {}
+
+
+def _client_for(use_azure: Optional[bool], is_async: bool = False) -> LLMClient:
+    """Global client, or a cached client for an explicitly requested provider."""
+    if use_azure is None:
+        return async_llm_client if is_async else llm_client
+    key = (use_azure, is_async)
+    client = _provider_clients.get(key)
+    if client is None:
+        client_cls = AsyncLLMClient if is_async else LLMClient
+        client = client_cls(model=config.API_MODEL_NAME, use_azure=use_azure)
+        client.cost_tracker = llm_client.cost_tracker
+        _provider_clients[key] = client
+    return client
+
+
+def _build_messages(
+    system_prompt: str,
+    user_prompt: str,
+    conversation_history: Optional[List[Dict[str, str]]]
+) -> List[Dict[str, str]]:
+    """Use the full conversation history if given, else system + user."""
+    if conversation_history:
+        return conversation_history
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": user_prompt}
+    ]
+
+
+def _check_response(response: Union[str, Dict, None], max_retries: int) -> Union[str, Dict, None]:
+    """Return a usable response or None."""
+    if response:
+        if isinstance(response, dict):
+            return response  # Tool call response
+        if isinstance(response, str) and response.strip():
+            return response  # Text response
+    
+    print(f"Error: LLM returned empty response after {max_retries} attempts")
+    return None
 
 
 def chat_complete(
@@ -49,23 +97,10 @@ def chat_complete(
         Dict: {'content': str, 'tool_calls': list} (if tool called)
         None: If all retries failed on both models
         """
-    if conversation_history:
-        # Use full conversation history if provided
-        messages = conversation_history
-    else:
-        # Fallback to simple system + user format
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ]
+    messages = _build_messages(system_prompt, user_prompt, conversation_history)
     
-    # Determine which client to use
-    if use_azure is not None:
-        # Use specific provider as requested
-        client = LLMClient(model=model or config.API_MODEL_NAME, use_azure=use_azure)
-    else:
-        # Use global client (backward compatibility)
-        client = llm_client
+    # Global client, or the shared client for the requested provider
+    client = _client_for(use_azure)
     
     # The LLM client now handles retries internally, so we just need to call it once
     response = client.generate(
@@ -75,16 +110,64 @@ def chat_complete(
         retries=max_retries,
         fallback_model=fallback_model
     )
+    return _check_response(response, max_retries)
+
+
+async def achat_complete(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    tools: Optional[List[Dict]] = None,
+    max_retries: int = 4,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    fallback_model: Optional[str] = None,
+    use_azure: Optional[bool] = None
+) -> Union[str, Dict]:
+    """
+    Async version of chat_complete() - same arguments and return values.
     
-    # Success
-    if response:
-        if isinstance(response, dict):
-            return response  # Tool call response
-        if isinstance(response, str) and response.strip():
-            return response  # Text response
+    Uses AsyncLLMClient so the event loop stays free while waiting on the API.
+    """
+    messages = _build_messages(system_prompt, user_prompt, conversation_history)
     
-    print(f"Error: LLM returned empty response after {max_retries} attempts")
-    return None
+    client = _client_for(use_azure, is_async=True)
+    
+    response = await client.generate(
+        messages=messages,
+        model=model,
+        tools=tools,
+        retries=max_retries,
+        fallback_model=fallback_model
+    )
+    return _check_response(response, max_retries)
+
+
+async def achat_complete_stream(
+    system_prompt: str,
+    user_prompt: str,
+    model: Optional[str] = None,
+    max_retries: int = 4,
+    conversation_history: Optional[List[Dict[str, str]]] = None,
+    fallback_model: Optional[str] = None,
+    use_azure: Optional[bool] = None
+) -> AsyncIterator[str]:
+    """
+    Streaming version of achat_complete() for plain text responses (no tools).
+    
+    Yields:
+        str: Content deltas as they arrive from the model
+    """
+    messages = _build_messages(system_prompt, user_prompt, conversation_history)
+    
+    client = _client_for(use_azure, is_async=True)
+    
+    async for delta in client.generate_stream(
+        messages=messages,
+        model=model,
+        retries=max_retries,
+        fallback_model=fallback_model
+    ):
+        yield delta
 
 
 # Global access to client for cost tracking
@@ -93,6 +176,11 @@ def get_llm_client() -> LLMClient:
     return llm_client
 
 
+def get_async_llm_client() -> AsyncLLMClient:
+    """Get the global async LLM client (shares cost tracking with get_llm_client())."""
+    return async_llm_client
+
+
 # Backward compatibility alias
 llm_manager = llm_client
 
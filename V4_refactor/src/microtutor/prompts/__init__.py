@@ -10,6 +10,7 @@ Agents:
 - tests_management: Test selection and management guidance
 - feedback: Final feedback on performance
 - post_case_assessment: Targeted MCQ generation after case
+- checklist: Findings checklist extraction (offline pre-generation)
 """
 
 # Tutor prompts
@@ -19,6 +20,7 @@ from microtutor.prompts.tutor_prompt import (
     get_tool_schemas_for_function_calling,
     get_first_pt_sentence_generation_system_prompt,
     get_first_pt_sentence_generation_user_prompt,
+    get_conversation_summary_prompt,
 )
 
 # Agent prompts
@@ -47,6 +49,10 @@ from microtutor.prompts.post_case_assessment_prompts import (
     get_weakness_analysis_prompt,
 )
 
+from microtutor.prompts.checklist_prompts import (
+    get_checklist_generation_prompt,
+)
+
 __all__ = [
     # Tutor prompts
     "get_system_message_template",
@@ -54,6 +60,7 @@ __all__ = [
     "get_tool_schemas_for_function_calling",
     "get_first_pt_sentence_generation_system_prompt",
     "get_first_pt_sentence_generation_user_prompt",
+    "get_conversation_summary_prompt",
     # Patient prompts
     "get_patient_system_prompt",
     # Socratic prompts
@@ -67,4 +74,6 @@ __all__ = [
     # Post-case assessment prompts
     "get_post_case_assessment_system_prompt",
     "get_weakness_analysis_prompt",
+    # Checklist prompts
+    "get_checklist_generation_prompt",
 ]
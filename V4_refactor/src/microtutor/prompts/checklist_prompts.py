@@ -0,0 +1,54 @@
+"""
+Findings checklist prompts - structured list of every fact a student can uncover in a case.
+
+Same prompt and JSON shape as src_simplified (agents/orchestrator.py), which
+reads checklists from data/cases/cached/checklists/<sha256(case)[:16]>.json.
+The pre-generation job (services/case/pregenerate.py) writes them offline.
+"""
+
+
+def get_checklist_generation_prompt(case: str) -> str:
+    """User prompt for extracting the findings checklist from a case (JSON output).
+    
+    Args:
+        case: Full case description
+        
+    Returns:
+        Prompt asking for {"history_exam": [...], "investigations": [...]} items
+        with id, category, label and detail
+    """
+    return f"""You are a clinical educator preparing a structured information checklist for a medical case.
+
+=== CASE TEXT ===
+{case}
+
+=== YOUR TASK ===
+Extract every discrete piece of clinical information a student could gather during a
+history-taking interview (including history, physical exam, and investigations).
+Group them into two categories:
+
+1. **history_exam** — subjective history AND physical examination findings:
+   Categories: HPI, PMH, Medications, Allergies, Social History, Family History,
+   Epidemiological History, Vitals, Physical Exam
+
+2. **investigations** — laboratory results, imaging, cultures, procedures:
+   Categories: Labs, Imaging, Microbiology, CSF, Procedures, Other Ix
+
+Each item should be a SINGLE discrete fact (e.g. separate "Temperature" from "Blood pressure").
+For items with multiple sub-findings (e.g. a CBC with WBC, Hct, Plt), keep them as ONE item
+representing the whole test.
+
+=== OUTPUT FORMAT (strict JSON) ===
+{{
+  "history_exam": [
+    {{"id": "he_1", "category": "HPI", "label": "Chief complaint & onset", "detail": "R temporal headache x11 days, periorbital swelling"}},
+    {{"id": "he_2", "category": "Vitals", "label": "Temperature", "detail": "101.9 F (38.8 C)"}}
+  ],
+  "investigations": [
+    {{"id": "ix_1", "category": "Labs", "label": "CBC", "detail": "WBC 18,600 (93% neutrophils), Hct 33.6%, Plt 216k"}}
+  ]
+}}
+
+Use sequential IDs: he_1, he_2, ... for history_exam; ix_1, ix_2, ... for investigations.
+Be comprehensive — include ALL information available in the case.
+"""
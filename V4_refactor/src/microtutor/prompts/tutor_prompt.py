@@ -323,3 +323,30 @@ def get_first_pt_sentence_generation_user_prompt(case_description: str) -> str:
 {case_description}
 
 Generate a sentence in the format shown above."""
+
+
+def get_conversation_summary_prompt(organism: str, previous_summary: str = "") -> str:
+    """System prompt for folding older turns into the running conversation summary.
+    
+    Args:
+        organism: Case organism (kept out of the summary unless the student named it)
+        previous_summary: Summary of the turns folded so far ("" for the first fold)
+        
+    Returns:
+        System prompt; the turns to fold are sent as the conversation
+    """
+    previous = previous_summary.strip() or "(none yet)"
+    return f"""You maintain a running summary of a microbiology tutoring session (case organism: {organism}).
+The conversation below continues from the existing summary. Produce an updated summary that merges the two.
+
+Existing summary:
+{previous}
+
+Keep:
+- History, exam findings and test results the student has obtained (with specific values)
+- The student's differential diagnosis, reasoning and tests/management proposed so far
+- Misconceptions or errors the tutor corrected, and hints already given
+- The current phase of the case
+
+Do NOT reveal the organism or final diagnosis unless the student has already named it.
+Write concise bullet points (at most ~250 words). Output ONLY the updated summary."""
@@ -97,7 +97,8 @@ class ChatRequest(BaseModel):
     
     Attributes:
         message: User's message to the tutor
-        history: Full conversation history
+        history: Full conversation history (optional once the server holds the session)
+        version: Session version from the last response (server-side session)
         organism_key: Current organism being studied
         case_id: Active case ID
         model_name: Optional LLM model to use
@@ -110,7 +111,15 @@ class ChatRequest(BaseModel):
     )
     history: List[Message] = Field(
         default_factory=list,
-        description="Full conversation history including system messages"
+        description="Full conversation history including system messages. "
+                    "May be omitted when sending `version`: the server keeps the session."
+    )
+    version: Optional[int] = Field(
+        None,
+        ge=1,
+        description="Session version returned by the last start_case/chat response. "
+                    "With an empty history the server continues its stored session; "
+                    "a stale version is answered with 409 (resend the full history)."
     )
     organism_key: Optional[str] = Field(
         None,
@@ -18,6 +18,7 @@ class StartCaseResponse(BaseModel):
         history: Initial conversation history
         case_id: Case ID for this session
         organism: Organism for this case
+        version: Server-side session version (send it with the next chat message)
     """
     
     initial_message: str = Field(
@@ -36,6 +37,10 @@ class StartCaseResponse(BaseModel):
         ...,
         description="Organism for this case"
     )
+    version: Optional[int] = Field(
+        None,
+        description="Server-side session version (None if the session store is disabled)"
+    )
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -62,6 +67,7 @@ class ChatResponse(BaseModel):
         history: Updated conversation history
         tools_used: Tools used in generating this response
         metadata: Additional metadata (tokens, timing, etc.)
+        version: Server-side session version after this turn
     """
     
     response: str = Field(
@@ -84,6 +90,10 @@ class ChatResponse(BaseModel):
         default_factory=list,
         description="AI feedback examples used to guide the response"
     )
+    version: Optional[int] = Field(
+        None,
+        description="Server-side session version after this turn (None if the session store is disabled)"
+    )
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -45,6 +45,15 @@ class TutorContext(BaseModel):
     guidelines: Optional[Dict[str, Any]] = Field(default=None, description="Pre-fetched clinical guidelines")
     guidelines_fetched_at: Optional[datetime] = Field(default=None, description="When guidelines were fetched")
     
+    # Bounded context window: older turns folded into a running summary
+    history_summary: Optional[str] = Field(default=None, description="Summary of conversation_history[:summarized_count]")
+    summarized_count: int = Field(default=0, description="Number of leading history messages covered by history_summary")
+    fold_history: bool = Field(
+        default=True,
+        exclude=True,  # Per-turn flag, never stored
+        description="Whether this turn may fold expired messages into history_summary (off when nothing would keep it)"
+    )
+    
     model_config = ConfigDict(use_enum_values=True)
     
     def get_model_name(self) -> str:
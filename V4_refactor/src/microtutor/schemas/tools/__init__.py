@@ -1,7 +1,7 @@
 """Tool-related schemas and error models."""
 
 from .tool_models import BaseTool, AgenticTool
-from .tool_errors import ToolError, ToolConfigError, ToolExecutionError, ToolLLMError
+from .tool_errors import ToolError, ToolConfigError, ToolExecutionError, ToolLLMError, ToolTimeoutError
 
 __all__ = [
     "BaseTool",
@@ -10,5 +10,6 @@ __all__ = [
     "ToolConfigError",
     "ToolExecutionError",
     "ToolLLMError",
+    "ToolTimeoutError",
 ]
 
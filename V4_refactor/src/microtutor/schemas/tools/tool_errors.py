@@ -30,6 +30,11 @@ class ToolExecutionError(ToolError):
     pass
 
 
+class ToolTimeoutError(ToolExecutionError):
+    """Tool did not finish within its time budget."""
+    pass
+
+
 class ToolConfigError(ToolError):
     """Invalid tool configuration."""
     pass
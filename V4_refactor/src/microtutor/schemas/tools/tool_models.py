@@ -6,7 +6,8 @@ Concrete implementations in tools/ define HOW they work.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
 import json
 import hashlib
 import logging
@@ -29,6 +30,10 @@ class BaseTool(ABC):
     Base tool class - standardized interface for all tools.
     
     Provides: validation, caching, error handling, execution metrics.
+    
+    run() is the blocking entry point; arun() is its awaitable twin. Tools
+    that implement _aexecute run natively on the event loop, everything
+    else falls back to running _execute in a worker thread.
     """
     
     def __init__(self, tool_config: Dict[str, Any]):
@@ -83,6 +88,64 @@ class BaseTool(ABC):
         """Execute tool logic - must be implemented by subclasses."""
         pass
     
+    async def _aexecute(self, arguments: Dict[str, Any]) -> Any:
+        """Async execute - defaults to running the sync _execute in a thread."""
+        return await asyncio.to_thread(self._execute, arguments)
+    
+    def _check_cache(self, arguments: Dict[str, Any], validate: bool, use_cache: bool) -> Optional[Dict[str, Any]]:
+        """Validate arguments and return a cached result dict if available."""
+        if validate:
+            self.validate_parameters(arguments)
+        
+        if use_cache and self.cacheable:
+            cached = self.get_cached_result(arguments)
+            if cached is not None:
+                return {
+                    "result": cached,
+                    "tool_name": self.name,
+                    "success": True,
+                    "cached": True,
+                    "execution_time_ms": 0
+                }
+        return None
+    
+    def _success_result(self, arguments: Dict[str, Any], result: Any, use_cache: bool, start_time: datetime) -> Dict[str, Any]:
+        """Cache (if enabled) and wrap a successful result."""
+        if use_cache and self.cacheable:
+            self.cache_result(arguments, result)
+        
+        exec_time = (datetime.now() - start_time).total_seconds() * 1000
+        
+        return {
+            "result": result,
+            "tool_name": self.name,
+            "success": True,
+            "cached": False,
+            "execution_time_ms": exec_time
+        }
+    
+    def _error_result(self, e: Exception, start_time: datetime) -> Dict[str, Any]:
+        """Wrap a failure in the standard result dict."""
+        exec_time = (datetime.now() - start_time).total_seconds() * 1000
+        if isinstance(e, ToolError):
+            logger.error(f"Tool error in {self.name}: {e}")
+            error = e.to_dict()
+        else:
+            logger.error(f"Unexpected error in {self.name}: {e}", exc_info=True)
+            error = {
+                "error_type": "UnexpectedError",
+                "message": str(e),
+                "tool_name": self.name
+            }
+        return {
+            "result": None,
+            "tool_name": self.name,
+            "success": False,
+            "cached": False,
+            "execution_time_ms": exec_time,
+            "error": error
+        }
+    
     def run(
         self, 
         arguments: Optional[Dict[str, Any]] = None,
@@ -99,66 +162,58 @@ class BaseTool(ABC):
         arguments = arguments or {}
         
         try:
-            # Validate
-            if validate:
-                self.validate_parameters(arguments)
+            cached = self._check_cache(arguments, validate, use_cache)
+            if cached is not None:
+                return cached
             
-            # Check cache
-            if use_cache and self.cacheable:
-                cached = self.get_cached_result(arguments)
-                if cached is not None:
-                    return {
-                        "result": cached,
-                        "tool_name": self.name,
-                        "success": True,
-                        "cached": True,
-                        "execution_time_ms": 0
-                    }
-            
-            # Execute
             result = self._execute(arguments)
+            return self._success_result(arguments, result, use_cache, start_time)
             
-            # Cache
-            if use_cache and self.cacheable:
-                self.cache_result(arguments, result)
-            
-            exec_time = (datetime.now() - start_time).total_seconds() * 1000
-            
-            return {
-                "result": result,
-                "tool_name": self.name,
-                "success": True,
-                "cached": False,
-                "execution_time_ms": exec_time
-            }
+        except Exception as e:
+            return self._error_result(e, start_time)
+    
+    async def arun(
+        self, 
+        arguments: Optional[Dict[str, Any]] = None,
+        validate: bool = True,
+        use_cache: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async version of run() - same validation, caching and result dict.
+        
+        Returns:
+            Dict with: result, tool_name, success, cached, execution_time_ms, error (if failed)
+        """
+        start_time = datetime.now()
+        arguments = arguments or {}
+        
+        try:
+            cached = self._check_cache(arguments, validate, use_cache)
+            if cached is not None:
+                return cached
             
-        except ToolError as e:
-            exec_time = (datetime.now() - start_time).total_seconds() * 1000
-            logger.error(f"Tool error in {self.name}: {e}")
-            return {
-                "result": None,
-                "tool_name": self.name,
-                "success": False,
-                "cached": False,
-                "execution_time_ms": exec_time,
-                "error": e.to_dict()
-            }
+            result = await self._aexecute(arguments)
+            return self._success_result(arguments, result, use_cache, start_time)
             
         except Exception as e:
-            exec_time = (datetime.now() - start_time).total_seconds() * 1000
-            logger.error(f"Unexpected error in {self.name}: {e}", exc_info=True)
-            return {
-                "result": None,
-                "tool_name": self.name,
-                "success": False,
-                "cached": False,
-                "execution_time_ms": exec_time,
-                "error": {
-                    "error_type": "UnexpectedError",
-                    "message": str(e),
-                    "tool_name": self.name
-                }
-            }
+            return self._error_result(e, start_time)
+    
+    async def astream(
+        self,
+        arguments: Optional[Dict[str, Any]] = None,
+        validate: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream tool output.
+        
+        Yields {"type": "delta", "content": str} events followed by exactly one
+        {"type": "result", "result": <arun()-style dict>} event. Tools without
+        a streaming path emit their whole output as a single delta.
+        """
+        result = await self.arun(arguments, validate=validate)
+        if result.get("success") and result.get("result") is not None:
+            yield {"type": "delta", "content": str(result["result"])}
+        yield {"type": "result", "result": result}
     
     def get_schema(self) -> Dict[str, Any]:
         """Get OpenAI-compatible function schema."""
@@ -180,6 +235,8 @@ class AgenticTool(BaseTool):
     Agentic Tool - powered by LLM calls.
     
     Base class for educational agents (patient, socratic, hint).
+    Subclasses implement _call_llm and may add a native _acall_llm;
+    otherwise the async path runs _call_llm in a worker thread.
     """
     
     def __init__(self, tool_config: Dict[str, Any]):
@@ -204,6 +261,10 @@ class AgenticTool(BaseTool):
         """Call LLM - must be implemented by subclasses."""
         pass
     
+    async def _acall_llm(self, prompt: str, **kwargs) -> str:
+        """Async LLM call - defaults to running _call_llm in a thread."""
+        return await asyncio.to_thread(self._call_llm, prompt, **kwargs)
+    
     def _execute(self, arguments: Dict[str, Any]) -> str:
         """Execute by calling LLM."""
         prompt = self._build_prompt(arguments)
@@ -214,3 +275,77 @@ class AgenticTool(BaseTool):
             return self._call_llm(prompt, **call_kwargs)
         except Exception as e:
             raise ToolLLMError(f"LLM call failed: {e}", tool_name=self.name)
+    
+    async def _aexecute(self, arguments: Dict[str, Any]) -> str:
+        """Async execute by awaiting the LLM call."""
+        # A subclass with a custom sync _execute but no async twin keeps its own logic
+        if type(self)._execute is not AgenticTool._execute:
+            return await super()._aexecute(arguments)
+        
+        prompt = self._build_prompt(arguments)
+        try:
+            call_kwargs = {**self.llm_config, **arguments}
+            return await self._acall_llm(prompt, **call_kwargs)
+        except Exception as e:
+            raise ToolLLMError(f"LLM call failed: {e}", tool_name=self.name)
+    
+    def _prepare_llm_messages(self, **kwargs) -> Optional[Tuple[str, List[Dict[str, str]]]]:
+        """Return (model, messages) for a single chat completion, if the tool has one.
+        
+        Tools that implement this get token streaming in astream(); the default
+        None means "no single LLM call to stream".
+        """
+        return None
+    
+    def _finalize_stream(self, text: str, arguments: Dict[str, Any]) -> Any:
+        """Post-process the full streamed text into the tool result."""
+        return text
+    
+    async def astream(
+        self,
+        arguments: Optional[Dict[str, Any]] = None,
+        validate: bool = True
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream LLM tokens as they arrive (see BaseTool.astream for the event format)."""
+        start_time = datetime.now()
+        arguments = arguments or {}
+        
+        try:
+            if validate:
+                self.validate_parameters(arguments)
+            prepared = self._prepare_llm_messages(**{**self.llm_config, **arguments})
+        except Exception as e:
+            yield {"type": "result", "result": self._error_result(e, start_time)}
+            return
+        
+        if prepared is None:
+            async for event in super().astream(arguments, validate=False):
+                yield event
+            return
+        
+        # Lazy import - schemas shouldn't pull in the LLM stack at import time
+        from microtutor.core.llm.llm_router import achat_complete_stream
+        
+        model, llm_messages = prepared
+        parts: List[str] = []
+        try:
+            async for delta in achat_complete_stream(
+                system_prompt="",
+                user_prompt="",
+                model=model,
+                conversation_history=llm_messages
+            ):
+                parts.append(delta)
+                yield {"type": "delta", "content": delta}
+            
+            text = "".join(parts)
+            if not text.strip():
+                raise ToolLLMError("LLM returned empty response", tool_name=self.name)
+            result = self._finalize_stream(text, arguments)
+        except Exception as e:
+            if not isinstance(e, ToolError):
+                e = ToolLLMError(f"LLM call failed: {e}", tool_name=self.name)
+            yield {"type": "result", "result": self._error_result(e, start_time)}
+            return
+        
+        yield {"type": "result", "result": self._success_result(arguments, result, False, start_time)}
@@ -2,23 +2,98 @@
 
 This adapter wraps the AutoFeedbackRetriever to match the FeedbackClient protocol
 expected by TutorService.
+
+A chat turn needs feedback twice: formatted examples for the tutor prompt and
+structured examples for the frontend. retrieval_context() embeds the message
+once; both methods then run their own filtered search (rating, organism) with
+that embedding when it is passed in as `retrieval`, so each view gets its full
+k examples without a second embedding call.
 """
 
 import logging
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Tuple
 
 from microtutor.utils.protocols import FeedbackClient
 
 logger = logging.getLogger(__name__)
 
+# Prompt examples: the 5 most similar with rating >= 3; frontend examples: top k
+PROMPT_EXAMPLES_K = 5
+PROMPT_MIN_RATING = 3
+
+
+@dataclass
+class FeedbackRetrievalContext:
+    """One turn's query embedding plus the filtered searches already run with it."""
+    current_message: str
+    index_type: str = "all"
+    organism: Optional[str] = None  # Restrict examples to this organism's cases
+    query_vector: Any = None  # None = lexical-only (embedding timed out or failed)
+    results: Dict[Tuple[int, int], List[Any]] = field(default_factory=dict)  # (k, min_rating) -> hits
+
+    def covers(self, current_message: str, index_type: str) -> bool:
+        """Whether this context's embedding applies to a request."""
+        return current_message == self.current_message and index_type == self.index_type
+
 
 class FeedbackClientAdapter(FeedbackClient):
     """Adapter that wraps AutoFeedbackRetriever to match the FeedbackClient protocol."""
-    
+
     def __init__(self, feedback_retriever):
         """Initialize with an AutoFeedbackRetriever instance."""
         self.feedback_retriever = feedback_retriever
-    
+
+    def retrieval_context(
+        self,
+        current_message: str,
+        conversation_history: List[Dict[str, str]],
+        index_type: str = "all",
+        organism: Optional[str] = None,
+    ) -> Optional[FeedbackRetrievalContext]:
+        """Embed the message once for this turn's feedback searches."""
+        if self.feedback_retriever is None:
+            return None
+
+        try:
+            return FeedbackRetrievalContext(
+                current_message=current_message,
+                index_type=index_type,
+                organism=organism,
+                query_vector=self.feedback_retriever.embed_query(current_message),
+            )
+        except Exception as e:
+            logger.warning("Failed to embed feedback query: %s", e)
+            return None
+
+    def _resolve_context(
+        self,
+        retrieval: Optional[FeedbackRetrievalContext],
+        current_message: str,
+        conversation_history: List[Dict[str, str]],
+        index_type: str,
+    ) -> Optional[FeedbackRetrievalContext]:
+        """Reuse the turn's retrieval context if it matches, otherwise embed now."""
+        if retrieval is not None and retrieval.covers(current_message, index_type):
+            return retrieval
+        organism = retrieval.organism if retrieval is not None else None
+        return self.retrieval_context(current_message, conversation_history, index_type, organism)
+
+    def _search(self, ctx: FeedbackRetrievalContext, k: int, min_rating: int) -> List[Any]:
+        """Top-k examples with rating >= min_rating (one filtered search per view and turn)."""
+        key = (k, min_rating)
+        if key not in ctx.results:
+            ctx.results[key] = self.feedback_retriever.search_similar(
+                input_text=ctx.current_message,
+                k=k,
+                index_type=ctx.index_type,
+                min_rating=min_rating,
+                organism=ctx.organism,
+                query_vector=ctx.query_vector,
+                lexical_only=ctx.query_vector is None,
+            )
+        return ctx.results[key]
+
     def get_examples_for_tool(
         self,
         user_input: str,
@@ -26,26 +101,23 @@ class FeedbackClientAdapter(FeedbackClient):
         tool_name: str,
         include_feedback: bool,
         similarity_threshold: Optional[float] = None,
+        retrieval: Optional[FeedbackRetrievalContext] = None,
     ) -> str:
         """Get feedback examples formatted as a string for the LLM prompt."""
         if not include_feedback or self.feedback_retriever is None:
             return ""
-            
+
         try:
-            from microtutor.core.feedback import get_feedback_examples_for_tool
-            
-            return get_feedback_examples_for_tool(
-                user_input=user_input,
-                conversation_history=conversation_history,
-                tool_name=tool_name,
-                feedback_retriever=self.feedback_retriever,
-                include_feedback=include_feedback,
-                similarity_threshold=similarity_threshold
-            ) or ""
+            from microtutor.core.feedback import format_feedback_examples
+
+            ctx = self._resolve_context(retrieval, user_input, conversation_history, "all")
+            if ctx is None:
+                return ""
+            return format_feedback_examples(self._search(ctx, PROMPT_EXAMPLES_K, PROMPT_MIN_RATING), "all") or ""
         except Exception as e:
             logger.warning("Failed to get feedback examples: %s", e)
             return ""
-    
+
     def retrieve_feedback_examples(
         self,
         current_message: str,
@@ -53,22 +125,21 @@ class FeedbackClientAdapter(FeedbackClient):
         message_type: str,
         k: int,
         similarity_threshold: Optional[float] = None,
+        retrieval: Optional[FeedbackRetrievalContext] = None,
     ) -> List[Dict[str, Any]]:
         """Retrieve structured feedback examples for the frontend."""
         if self.feedback_retriever is None:
             return []
-            
+
         try:
-            # AutoFeedbackRetriever uses retrieve_similar_examples
             min_rating = 3 if similarity_threshold else 1
-            retrieved = self.feedback_retriever.retrieve_similar_examples(
-                input_text=current_message,
-                history=conversation_history,
-                k=k,
-                index_type=message_type if message_type in ["all", "patient", "tutor"] else "all",
-                min_rating=min_rating
-            )
-            
+            index_type = message_type if message_type in ["all", "patient", "tutor"] else "all"
+
+            ctx = self._resolve_context(retrieval, current_message, conversation_history, index_type)
+            if ctx is None:
+                return []
+            retrieved = self._search(ctx, k, min_rating)
+
             # Convert FeedbackExample objects to structured format for frontend
             return [
                 {
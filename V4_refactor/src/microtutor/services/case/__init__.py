@@ -3,5 +3,6 @@
 from .service import CaseService
 from .case_loader import get_case
 from .case_generator_rag import CaseGeneratorRAGAgent
+from .case_store import CaseStore, get_case_store
 
-__all__ = ["CaseService", "get_case", "CaseGeneratorRAGAgent"]
+__all__ = ["CaseService", "get_case", "CaseGeneratorRAGAgent", "CaseStore", "get_case_store"]
@@ -6,12 +6,14 @@ Adapted from V3 to work standalone in V4 structure.
 """
 
 import os
-import json
 import time
-from typing import Dict, List, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from dotenv import load_dotenv
 from microtutor.core.base_agent import BaseAgent
-from openai import AzureOpenAI, OpenAI
+from microtutor.utils.embedding_utils import get_embeddings_batch, get_embedding_client
+from microtutor.services.case.case_store import get_case_store
+from microtutor.utils.atomic_io import atomic_write_text
 import logging
 
 # Try to import Qdrant and embedding libraries (optional)
@@ -27,6 +29,33 @@ except ImportError:
 # Load environment
 load_dotenv()
 
+# Case sections and what each one's prompt is given. A section starts as soon
+# as its dependencies are written: patient_info first, then history_and_exam
+# and diagnostics in parallel, then diagnosis_and_treatment, which must see the
+# culture/susceptibility results so the regimen can't contradict them.
+SECTION_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    "patient_info": (),
+    "history_and_exam": ("patient_info",),
+    "diagnostics": ("patient_info",),
+    "diagnosis_and_treatment": ("patient_info", "history_and_exam", "diagnostics"),
+}
+
+SECTION_TITLES: Dict[str, str] = {
+    "patient_info": "PATIENT INFORMATION",
+    "history_and_exam": "HISTORY AND EXAMINATION",
+    "diagnostics": "DIAGNOSTIC STUDIES",
+    "diagnosis_and_treatment": "DIAGNOSIS AND TREATMENT",
+}
+
+# Qdrant queries per section (all embedded in one request)
+SECTION_RAG_QUERIES: Dict[str, str] = {
+    "patient_info": "Patient demographics, risk factors, and common presentations of {organism} infections",
+    "history_and_exam": "Clinical presentation, symptoms, and physical examination findings of {organism} infections",
+    "diagnostics": "Laboratory findings, diagnostic tests, and imaging for {organism} infections",
+    "diagnosis_and_treatment": "Diagnosis, treatment, and management of {organism} infections",
+}
+VALIDATION_RAG_QUERY = "Information about {organism}"
+
 class CaseGeneratorRAGAgent(BaseAgent):
     def __init__(self, model_name: str = None):
         super().__init__(model_name)
@@ -61,8 +90,8 @@ class CaseGeneratorRAGAgent(BaseAgent):
         print(f"[DEBUG] CaseGeneratorRAG cached_cases_dir: {self.cached_cases_dir}")
         print(f"[DEBUG] CaseGeneratorRAG case_cache_file exists: {os.path.exists(self.case_cache_file)}")
         
-        # Load existing case cache
-        self.case_cache = self._load_case_cache()
+        # Cached cases are shared process-wide (loaded once, reloaded when the file changes)
+        self.case_store = get_case_store(self.cached_cases_dir)
         
         # Initialize Qdrant client
         self.qdrant_client = None
@@ -79,24 +108,8 @@ class CaseGeneratorRAGAgent(BaseAgent):
                 print("Will use fallback generation when needed")
                 self.qdrant_client = None
         
-        # Initialize embedding client
-        use_azure_env = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
-        azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-        azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-        openai_api_key = os.getenv("OPENAI_API_KEY")
-        
-        if use_azure_env and azure_endpoint and azure_api_key:
-            # Use Azure OpenAI
-            self.embedding_client = AzureOpenAI(
-                azure_endpoint=azure_endpoint,
-                api_key=azure_api_key,
-                api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2025-04-16")
-            )
-        elif openai_api_key:
-            # Use personal OpenAI
-            self.embedding_client = OpenAI(api_key=openai_api_key)
-        else:
-            raise ValueError("Missing required OpenAI environment variables. Check USE_AZURE_OPENAI setting and credentials.")
+        # Initialize embedding client (shared, pooled - same provider selection as BaseAgent)
+        self.embedding_client = get_embedding_client()
         
         # Case sections
         self.case_sections = {
@@ -112,56 +125,22 @@ class CaseGeneratorRAGAgent(BaseAgent):
         # Counter for Qdrant API calls
         self.qdrant_call_count = 0
 
-    def _load_case_cache(self) -> Dict[str, str]:
-        """Load the case cache from file."""
-        try:
-            if os.path.exists(self.case_cache_file):
-                with open(self.case_cache_file, 'r', encoding='utf-8') as f:
-                    cache = json.load(f)
-                    print(f"Loaded case cache with {len(cache)} organisms")
-                    return cache
-            else:
-                print("No existing case cache found, starting with empty cache")
-                return {}
-        except Exception as e:
-            print(f"Error loading case cache: {str(e)}")
-            return {}
-
-    def _save_case_cache(self):
-        """Save the case cache to file."""
-        try:
-            with open(self.case_cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.case_cache, f, indent=2, ensure_ascii=False)
-            print(f"Saved case cache with {len(self.case_cache)} organisms")
-        except Exception as e:
-            print(f"Error saving case cache: {str(e)}")
+    @property
+    def case_cache(self) -> Dict[str, str]:
+        """Snapshot of the cached cases (normalized organism -> case text)."""
+        return self.case_store.snapshot()
 
     def _normalize_organism_name(self, organism: str) -> str:
         """Normalize organism name for consistent cache keys."""
         return organism.lower().strip().replace(" ", "_")
 
-    def _load_cached_case_cache(self) -> Dict[str, str]:
-        """Load case_cache.json from cached cases directory.
-        
-        Returns:
-            Dictionary mapping organism keys to full case text, or empty dict if not found
-        """
-        try:
-            if os.path.exists(self.case_cache_cached_file):
-                with open(self.case_cache_cached_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                    logging.info(f"Loaded cached case_cache.json with {len(cache_data)} organisms")
-                    return cache_data
-        except Exception as e:
-            logging.warning(f"Error loading cached case_cache.json: {e}")
-        return {}
-
     def generate_case(self, organism: str = None) -> str:
         """Generate a clinical case for the specified organism.
         
         Priority order:
-        1. Check in-memory case cache (loaded from data/cases/cached/case_cache.json at init)
-        2. Generate new case using QDRANT RAG (if available) or fallback
+        1. Check the case store (data/cases/cached/, kept in memory)
+        2. Generate new case using QDRANT RAG (if available) or fallback,
+           single-flighted per organism across workers
         
         Args:
             organism: The organism name
@@ -178,13 +157,53 @@ class CaseGeneratorRAGAgent(BaseAgent):
         cache_key = self._normalize_organism_name(self.organism)
         logging.info(f"[BACKEND_START_CASE]   - Normalized cache key is: '{cache_key}'.")
         
-        # 1. Check in-memory case cache (loaded at init from data/cases/cached/case_cache.json)
-        if cache_key in self.case_cache:
+        # 1. Check the shared case store
+        cached_case = self.case_store.get(cache_key)
+        if cached_case is not None:
             logging.info(f"[BACKEND_START_CASE]   - Found cached case for '{cache_key}'. Returning it.")
-            return self.case_cache[cache_key]
+            return cached_case
+        
+        # 2. No cached case found, generate new case using QDRANT RAG. Only one
+        #    worker (thread or process) generates a given organism; the others
+        #    wait here and pick up its result.
+        with self.case_store.generation_lock(cache_key):
+            cached_case = self.case_store.get(cache_key, fresh=True)
+            if cached_case is not None:
+                logging.info(f"[BACKEND_START_CASE]   - Case for '{cache_key}' was generated by another worker. Returning it.")
+                return cached_case
+            
+            logging.info(f"[BACKEND_START_CASE]   - No cached case found for '{cache_key}', generating new case using QDRANT RAG...")
+            case_text = self.build_case()
+            
+            # Save the generated case to cache
+            self.case_store.put(cache_key, case_text)
         
-        # 2. No cached case found, generate new case using QDRANT RAG
-        logging.info(f"[BACKEND_START_CASE]   - No cached case found for '{cache_key}', generating new case using QDRANT RAG...")
+        # Also save to the old case.txt file for backward compatibility
+        case_file = os.path.join(self.output_dir, "case.txt")
+        try:
+            atomic_write_text(case_file, case_text)
+        except Exception as e:
+            print(f"Error saving case to case.txt: {str(e)}")
+        
+        print(f"Generated and cached new case for {self.organism}")
+        return case_text
+
+    def build_case(self, organism: str = None) -> str:
+        """Generate a new case text for the organism without reading or writing any cache.
+        
+        Uses QDRANT RAG when available, otherwise fallback generation. Not
+        safe to call concurrently on one agent (sections are instance state);
+        use one agent per worker thread.
+        
+        Args:
+            organism: The organism name (defaults to the current self.organism)
+            
+        Returns:
+            Case description text
+        """
+        if organism:
+            self.organism = organism.lower()
+            self.collection = "union_collection"
         
         # Reset case sections
         self._reset_case_sections()
@@ -198,20 +217,29 @@ class CaseGeneratorRAGAgent(BaseAgent):
             print("No Qdrant client available, using fallback case generation")
             case_text = self._fallback_case_generation()
         else:
-            # Try to get context to validate connection
+            # Retrieve the validation context and every section's context in one batch
             try:
-                test_context = self._get_rag_context(f"Information about {self.organism}")
+                sections = list(SECTION_RAG_QUERIES)
+                contexts = self._get_rag_contexts(
+                    [VALIDATION_RAG_QUERY.format(organism=self.organism)]
+                    + [SECTION_RAG_QUERIES[s].format(organism=self.organism) for s in sections]
+                )
+                test_context, section_contexts = contexts[0], dict(zip(sections, contexts[1:]))
                 if not test_context or len(test_context.strip()) < 20:
                     print("Could not retrieve sufficient context, using fallback case generation")
                     case_text = self._fallback_case_generation()
                 else:
                     print("Successfully retrieved context, proceeding with RAG case generation")
                     
-                    # Generate each section of the case
-                    self._generate_patient_info()
-                    self._generate_history_and_exam()
-                    self._generate_diagnostics()
-                    self._generate_diagnosis_and_treatment()
+                    # Generate the sections (independent ones concurrently)
+                    self._generate_sections({
+                        "patient_info": lambda: self._generate_patient_info(section_contexts["patient_info"]),
+                        "history_and_exam": lambda: self._generate_history_and_exam(section_contexts["history_and_exam"]),
+                        "diagnostics": lambda: self._generate_diagnostics(section_contexts["diagnostics"]),
+                        "diagnosis_and_treatment": lambda: self._generate_diagnosis_and_treatment(
+                            section_contexts["diagnosis_and_treatment"]
+                        ),
+                    })
                     
                     # Combine all sections into a complete case
                     case_text = self._combine_case_sections()
@@ -220,19 +248,6 @@ class CaseGeneratorRAGAgent(BaseAgent):
                 print(f"Error in RAG case generation: {str(e)}")
                 case_text = self._fallback_case_generation()
         
-        # Save the generated case to cache
-        self.case_cache[cache_key] = case_text
-        self._save_case_cache()
-        
-        # Also save to the old case.txt file for backward compatibility
-        case_file = os.path.join(self.output_dir, "case.txt")
-        try:
-            with open(case_file, 'w', encoding='utf-8') as f:
-                f.write(case_text)
-        except Exception as e:
-            print(f"Error saving case to case.txt: {str(e)}")
-        
-        print(f"Generated and cached new case for {self.organism}")
         return case_text
 
     def get_cached_organisms(self) -> List[str]:
@@ -241,38 +256,29 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Returns:
             List of organism names that have pre-generated cases available.
         """
-        return list(self.case_cache.keys())
+        return self.case_store.organisms()
     
     def get_cached_organisms_list(self) -> List[str]:
         """Get a list of all organisms that have cached cases.
         
         Returns:
-            List of organism names with cached cases (from both cache sources).
+            List of organism names with cached cases.
         """
-        organisms = set()
-        
-        # Add from cached case_cache.json
-        cached_case_cache = self._load_cached_case_cache()
-        organisms.update(cached_case_cache.keys())
-        
-        # Add from in-memory cache
-        organisms.update(self.case_cache.keys())
-        
-        return list(organisms)
+        return self.case_store.organisms()
+
+    def get_hpi_organisms(self) -> List[str]:
+        """Get a list of organisms with an entry in HPI_per_organism.json."""
+        return self.case_store.hpi_organisms()
 
     def clear_cache(self, organism: str = None):
         """Clear the cache for a specific organism or all organisms."""
         if organism:
-            cache_key = self._normalize_organism_name(organism)
-            if cache_key in self.case_cache:
-                del self.case_cache[cache_key]
-                self._save_case_cache()
+            if self.case_store.remove(organism):
                 print(f"Cleared cache for {organism}")
             else:
                 print(f"No cached case found for {organism}")
         else:
-            self.case_cache = {}
-            self._save_case_cache()
+            self.case_store.remove()
             print("Cleared all cached cases")
 
     def regenerate_case(self, organism: str = None) -> str:
@@ -283,8 +289,7 @@ class CaseGeneratorRAGAgent(BaseAgent):
         cache_key = self._normalize_organism_name(self.organism)
         
         # Remove from cache if it exists
-        if cache_key in self.case_cache:
-            del self.case_cache[cache_key]
+        if self.case_store.remove(cache_key):
             print(f"Removed cached case for {self.organism}")
         
         # Generate new case
@@ -327,9 +332,40 @@ class CaseGeneratorRAGAgent(BaseAgent):
         # Join all sections with line breaks
         return "\n".join(sections)
 
-    def _generate_patient_info(self) -> str:
+    def _previous_sections(self, section: str) -> str:
+        """Format the sections `section` depends on (see SECTION_DEPENDENCIES)."""
+        return "\n".join(
+            f"{SECTION_TITLES[dep]}:\n{self.case_sections[dep]}\n" for dep in SECTION_DEPENDENCIES[section]
+        )
+
+    def _generate_sections(self, generators: Dict[str, Callable[[], str]]) -> None:
+        """Run section generators concurrently, each once its dependencies are done.
+        
+        Generators write their own case_sections entry. An exception from any
+        section is re-raised after the sections already running have finished.
+        """
+        pending = dict(generators)
+        done: Set[str] = set()
+        running: Dict[Future, str] = {}
+        
+        with ThreadPoolExecutor(max_workers=len(generators), thread_name_prefix="case-section") as pool:
+            while pending or running:
+                ready = [s for s in pending if all(d in done or d not in generators for d in SECTION_DEPENDENCIES[s])]
+                for section in ready:
+                    running[pool.submit(pending.pop(section))] = section
+                if not running:
+                    raise RuntimeError(f"Unsatisfiable section dependencies: {sorted(pending)}")
+        
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    section = running.pop(future)
+                    future.result()  # Re-raise section errors
+                    done.add(section)
+
+    def _generate_patient_info(self, context: Optional[str] = None) -> str:
         """Generate the patient information section using RAG."""
-        context = self._get_rag_context(f"Patient demographics, risk factors, and common presentations of {self.organism} infections")
+        if context is None:
+            context = self._get_rag_context(SECTION_RAG_QUERIES["patient_info"].format(organism=self.organism))
         
         prompt = f"""
         Create a realistic patient profile for a case of {self.organism} infection.
@@ -346,22 +382,23 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Keep this section concise (200-300 words) but detailed.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["patient_info"] = result
         return result
 
-    def _generate_history_and_exam(self) -> str:
+    def _generate_history_and_exam(self, context: Optional[str] = None) -> str:
         """Generate the history and physical examination section using RAG."""
-        context = self._get_rag_context(f"Clinical presentation, symptoms, and physical examination findings of {self.organism} infections")
+        if context is None:
+            context = self._get_rag_context(SECTION_RAG_QUERIES["history_and_exam"].format(organism=self.organism))
         
-        # Include patient info as context for consistency
-        patient_info = self.case_sections["patient_info"]
+        # Include earlier sections as context for consistency
+        previous_sections = self._previous_sections("history_and_exam")
         
         prompt = f"""
         Create the history of present illness and physical examination findings for this patient with {self.organism} infection.
         
-        Patient information:
-        {patient_info}
+        Previous case information:
+        {previous_sections}
         
         Include:
         - Presenting complaint and duration
@@ -377,22 +414,17 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Be specific with values for vital signs and examination findings.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["history_and_exam"] = result
         return result
 
-    def _generate_diagnostics(self) -> str:
+    def _generate_diagnostics(self, context: Optional[str] = None) -> str:
         """Generate the diagnostic studies section using RAG."""
-        context = self._get_rag_context(f"Laboratory findings, diagnostic tests, and imaging for {self.organism} infections")
+        if context is None:
+            context = self._get_rag_context(SECTION_RAG_QUERIES["diagnostics"].format(organism=self.organism))
         
-        # Include previous sections for context
-        previous_sections = f"""
-        PATIENT INFORMATION:
-        {self.case_sections["patient_info"]}
-        
-        HISTORY AND EXAMINATION:
-        {self.case_sections["history_and_exam"]}
-        """
+        # Include earlier sections for context
+        previous_sections = self._previous_sections("diagnostics")
         
         prompt = f"""
         Create the diagnostic studies section for this patient with suspected {self.organism} infection.
@@ -409,28 +441,20 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Medical context on diagnostic findings in {self.organism} infections:
         {context}
         
-        Make the laboratory values and diagnostic findings consistent with the patient's presentation and typical for {self.organism} infection.
+        Make the laboratory values and diagnostic findings consistent with the patient's profile and typical for {self.organism} infection.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["diagnostics"] = result
         return result
 
-    def _generate_diagnosis_and_treatment(self) -> str:
+    def _generate_diagnosis_and_treatment(self, context: Optional[str] = None) -> str:
         """Generate the diagnosis and treatment section using RAG."""
-        context = self._get_rag_context(f"Diagnosis, treatment, and management of {self.organism} infections")
-        
-        # Include all previous sections for context
-        previous_sections = f"""
-        PATIENT INFORMATION:
-        {self.case_sections["patient_info"]}
+        if context is None:
+            context = self._get_rag_context(SECTION_RAG_QUERIES["diagnosis_and_treatment"].format(organism=self.organism))
         
-        HISTORY AND EXAMINATION:
-        {self.case_sections["history_and_exam"]}
-        
-        DIAGNOSTIC STUDIES:
-        {self.case_sections["diagnostics"]}
-        """
+        # Include earlier sections for context
+        previous_sections = self._previous_sections("diagnosis_and_treatment")
         
         prompt = f"""
         Create the diagnosis and treatment section for this patient with {self.organism} infection.
@@ -451,62 +475,78 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Make the treatment plan evidence-based and appropriate for this specific patient and infection. Include specific antibiotic names, doses, and durations.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["diagnosis_and_treatment"] = result
         return result
 
     def _get_rag_context(self, query: str) -> str:
         """Get RAG context for a query using Qdrant."""
-        # Check if we have cached results for this query
-        cache_key = f"{query}_{self.organism}"
-        if cache_key in self.context_cache:
-            return self.context_cache[cache_key]
+        return self._get_rag_contexts([query])[0]
+
+    def _get_rag_contexts(self, queries: List[str]) -> List[str]:
+        """Get RAG context for several queries: one embedding request, one Qdrant batch search."""
+        # Check if we have cached results for these queries
+        results: Dict[str, str] = {}
+        misses = []
+        for query in dict.fromkeys(queries):
+            cache_key = f"{query}_{self.organism}"
+            if cache_key in self.context_cache:
+                results[query] = self.context_cache[cache_key]
+            else:
+                misses.append(query)
         
-        try:
-            # Increment the call counter
-            self.qdrant_call_count += 1
-            
-            # Generate embedding for the query
-            embedding_response = self.embedding_client.embeddings.create(
-                model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-large"),
-                input=query
-            )
-            query_vector = embedding_response.data[0].embedding
-            
-            # Search for relevant context in Qdrant
-            search_results = self.qdrant_client.search(
-                collection_name=self.collection,
-                query_vector=query_vector,
-                limit=5
-            )
-            
-            # Extract and combine text from the search results
-            contexts = []
-            for result in search_results:
-                if "text" in result.payload:
-                    contexts.append(result.payload["text"])
-            
-            # Join contexts with separators
-            context_text = "\n---\n".join(contexts)
-            
-            # Cache the result
-            self.context_cache[cache_key] = context_text
-            
-            return context_text
-        except Exception as e:
-            print(f"Error retrieving RAG context: {str(e)}")
-            return ""
+        if misses:
+            try:
+                # Increment the call counter
+                self.qdrant_call_count += 1
+        
+                # Embed all queries in one request (cached across cases and processes)
+                query_vectors = get_embeddings_batch(
+                    misses,
+                    model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-large"),
+                    client=self.embedding_client,
+                )
+        
+                # Search for relevant context in Qdrant (one round trip)
+                if hasattr(self.qdrant_client, "search_batch"):
+                    batch_results = self.qdrant_client.search_batch(
+                        collection_name=self.collection,
+                        requests=[
+                            models.SearchRequest(vector=vector, limit=5, with_payload=True)
+                            for vector in query_vectors
+                        ],
+                    )
+                else:
+                    batch_results = [
+                        self.qdrant_client.search(collection_name=self.collection, query_vector=vector, limit=5)
+                        for vector in query_vectors
+                    ]
+        
+                for query, search_results in zip(misses, batch_results):
+                    # Extract and combine text from the search results
+                    contexts = [r.payload["text"] for r in search_results if r.payload and "text" in r.payload]
+                    context_text = "\n---\n".join(contexts)
+        
+                    # Cache the result
+                    self.context_cache[f"{query}_{self.organism}"] = context_text
+                    results[query] = context_text
+            except Exception as e:
+                print(f"Error retrieving RAG context: {str(e)}")
+        
+        return [results.get(query, "") for query in queries]
 
     def _fallback_case_generation(self) -> str:
         """Generate a case without RAG if RAG is not available."""
         print("Using fallback case generation without RAG...")
         self._reset_case_sections()
         
-        # Generate each section without RAG
-        self._fallback_generate_patient_info()
-        self._fallback_generate_history_and_exam()
-        self._fallback_generate_diagnostics()
-        self._fallback_generate_diagnosis_and_treatment()
+        # Generate sections without RAG (independent sections in parallel)
+        self._generate_sections({
+            "patient_info": self._fallback_generate_patient_info,
+            "history_and_exam": self._fallback_generate_history_and_exam,
+            "diagnostics": self._fallback_generate_diagnostics,
+            "diagnosis_and_treatment": self._fallback_generate_diagnosis_and_treatment,
+        })
         
         # Combine all sections into a complete case
         case_text = self._combine_case_sections()
@@ -521,36 +561,30 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Keep this section concise but detailed.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["patient_info"] = result
         return result
 
     def _fallback_generate_history_and_exam(self) -> str:
         """Generate history and exam without RAG."""
-        patient_info = self.case_sections["patient_info"]
+        previous_sections = self._previous_sections("history_and_exam")
         
         prompt = f"""
         Create the history of present illness and physical examination findings for this patient with {self.organism} infection.
         
-        Patient information:
-        {patient_info}
+        Previous case information:
+        {previous_sections}
         
         Include presenting complaint, duration, evolution of symptoms, vital signs, and detailed physical examination.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["history_and_exam"] = result
         return result
 
     def _fallback_generate_diagnostics(self) -> str:
         """Generate diagnostics without RAG."""
-        previous_sections = f"""
-        PATIENT INFORMATION:
-        {self.case_sections["patient_info"]}
-        
-        HISTORY AND EXAMINATION:
-        {self.case_sections["history_and_exam"]}
-        """
+        previous_sections = self._previous_sections("diagnostics")
         
         prompt = f"""
         Create the diagnostic studies section for this patient with suspected {self.organism} infection.
@@ -561,22 +595,13 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Include laboratory results, microbiology results, imaging findings, and other relevant diagnostic tests.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["diagnostics"] = result
         return result
 
     def _fallback_generate_diagnosis_and_treatment(self) -> str:
         """Generate diagnosis and treatment without RAG."""
-        previous_sections = f"""
-        PATIENT INFORMATION:
-        {self.case_sections["patient_info"]}
-        
-        HISTORY AND EXAMINATION:
-        {self.case_sections["history_and_exam"]}
-        
-        DIAGNOSTIC STUDIES:
-        {self.case_sections["diagnostics"]}
-        """
+        previous_sections = self._previous_sections("diagnosis_and_treatment")
         
         prompt = f"""
         Create the diagnosis and treatment section for this patient with {self.organism} infection.
@@ -587,6 +612,6 @@ class CaseGeneratorRAGAgent(BaseAgent):
         Include final diagnosis, antimicrobial therapy, additional interventions, prognosis, and follow-up recommendations.
         """
         
-        result = self.generate_response(self.system_prompt, prompt)
+        result = self.complete(self.system_prompt, prompt)
         self.case_sections["diagnosis_and_treatment"] = result
-        return result 
\ No newline at end of file
+        return result
@@ -7,26 +7,45 @@ Adapted from V3 to work standalone in V4 structure.
 
 import os
 import logging
+import threading
+from typing import Optional
 
+from microtutor.core.config.config_helper import config
 from microtutor.services.case.case_generator_rag import CaseGeneratorRAGAgent
+from microtutor.services.case.case_store import get_case_store
 
-# Initialize the case generator
-case_generator = CaseGeneratorRAGAgent()
+# The generator (Qdrant + embedding clients) is only needed for organisms
+# without a cached case, so it is created on first miss
+_case_generator: Optional[CaseGeneratorRAGAgent] = None
+_case_generator_lock = threading.Lock()
 
-def get_case(organism: str) -> str:
+
+def get_case_generator() -> CaseGeneratorRAGAgent:
+    """Get the shared case generator (created on first use)."""
+    global _case_generator
+    if _case_generator is None:
+        with _case_generator_lock:
+            if _case_generator is None:
+                _case_generator = CaseGeneratorRAGAgent()
+    return _case_generator
+
+
+def get_case(organism: str) -> Optional[str]:
     """
     Get a case for the specified organism.
     
     Priority order:
-    1. Check HPI_per_organism.json (cached full case descriptions from data/cases/cached/)
-    2. Check case_cache.json (cached generated cases)
-    3. Generate new case using QDRANT RAG (if available) or fallback
+    1. Check the case store (data/cases/cached/, kept in memory - see case_store.py)
+    2. Generate new case using QDRANT RAG (if available) or fallback, unless
+       CASE_GENERATION_ON_DEMAND is off (cases then come only from the
+       offline job in pregenerate.py)
     
     Args:
         organism: The organism to get a case for
     
     Returns:
-        str: The case text (full case description)
+        str: The case text (full case description), or None if the organism
+        has no pre-generated case and on-demand generation is disabled
     """
     logging.info(f"[BACKEND_START_CASE] 3c. get_case function called for organism: '{organism}'.")
     
@@ -38,8 +57,19 @@ def get_case(organism: str) -> str:
         except Exception as e:
             print(f"Error reading case from file: {str(e)}")
     
-    # Generate or retrieve case for the specified organism
-    # Priority: HPI_per_organism.json -> case_cache.json -> QDRANT RAG generation
+    # Cached case: a dict lookup, no generator needed
+    cached_case = get_case_store().get(organism)
+    if cached_case is not None:
+        logging.info(f"[BACKEND_START_CASE]   - Found cached case for '{organism}' in case store.")
+        return cached_case
+    
+    if not getattr(config, "CASE_GENERATION_ON_DEMAND", True):
+        logging.warning(
+            f"[BACKEND_START_CASE]   - No pre-generated case for '{organism}' and on-demand generation is disabled."
+        )
+        return None
+    
+    # Generate a new case (QDRANT RAG or fallback); the generator saves it to the store
     logging.info(f"[BACKEND_START_CASE]   - Calling case_generator.generate_case for '{organism}'.")
-    return case_generator.generate_case(organism)
+    return get_case_generator().generate_case(organism)
     
\ No newline at end of file
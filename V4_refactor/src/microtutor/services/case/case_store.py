@@ -0,0 +1,298 @@
+"""
+Case Store - process-wide view of the cached cases on disk.
+
+Layout of data/cases/cached/:
+
+    cases/<organism>.txt      one file per generated case (written by put())
+    case_cache.json           original bundled cases (read-only seed; a
+                              cases/ file for the same organism wins)
+    HPI_per_organism.json     organisms offered in the UI
+    .locks/                   flock files for writes and generation
+
+Everything is loaded once, indexed by normalized organism name, and reloaded
+when a file or the cases/ directory changes on disk (checked by mtime at most
+every `check_interval_s`). start_case, get_case, CaseService and
+has_cached_case all read from here, so a cached organism costs a dict lookup.
+
+Writes are crash- and multi-process-safe: a new case is written to a temp
+file and renamed into cases/, so no worker ever reads a half-written case and
+adding one case never rewrites the others. generation_lock() single-flights
+cold generation of one organism across threads and processes (gunicorn
+workers, the pre-generation job).
+
+Usage:
+    from microtutor.services.case.case_store import get_case_store
+
+    store = get_case_store()
+    case_text = store.get("Staphylococcus aureus")   # None if not cached
+
+    with store.generation_lock("Staphylococcus aureus"):
+        case_text = store.get("Staphylococcus aureus", fresh=True) or generate_and_put()
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+from microtutor.utils.atomic_io import atomic_write_json, atomic_write_text
+from microtutor.utils.conversation_utils import normalize_organism_name
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:  # Windows: locks are per process only
+    fcntl = None
+    FCNTL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CASE_CACHE_FILENAME = "case_cache.json"
+HPI_FILENAME = "HPI_per_organism.json"
+CASES_DIRNAME = "cases"
+LOCKS_DIRNAME = ".locks"
+CASE_FILE_SUFFIX = ".txt"
+
+_FileStamp = Optional[Tuple[float, int]]  # (mtime, size), None if missing
+
+
+def _stamp(path: Path) -> _FileStamp:
+    try:
+        st = path.stat()
+        return (st.st_mtime, st.st_size)
+    except OSError:
+        return None
+
+
+def _read_json_dict(path: Path) -> Dict[str, str]:
+    """Read a {organism: text} JSON file with normalized keys ({} if missing/invalid)."""
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"Error loading {path}: {e}")
+        return {}
+    if not isinstance(data, dict):
+        logger.warning(f"Ignoring {path}: expected a JSON object")
+        return {}
+    return {normalize_organism_name(k): v for k, v in data.items() if isinstance(v, str)}
+
+
+def _case_filename(key: str) -> str:
+    """cases/ file name for a normalized organism key (reversible, filesystem-safe)."""
+    return quote(key, safe="") + CASE_FILE_SUFFIX
+
+
+def _read_case_files(cases_dir: Path) -> Dict[str, str]:
+    """All cases/<organism>.txt files ({} if the directory is missing)."""
+    cases: Dict[str, str] = {}
+    if not cases_dir.is_dir():
+        return cases
+    for path in cases_dir.glob("*" + CASE_FILE_SUFFIX):
+        try:
+            cases[unquote(path.name[: -len(CASE_FILE_SUFFIX)])] = path.read_text(encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Error loading {path}: {e}")
+    return cases
+
+
+@contextmanager
+def _flock(lock_path: Path) -> Iterator[None]:
+    """Exclusive inter-process lock on lock_path (no-op without fcntl)."""
+    if not FCNTL_AVAILABLE:
+        yield
+        return
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(lock_path, "a") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+class CaseStore:
+    """Cached cases for one directory, kept in sync with the JSON files."""
+
+    def __init__(self, cached_cases_dir: str, check_interval_s: float = 1.0):
+        self.cached_cases_dir = Path(cached_cases_dir)
+        self.case_cache_file = self.cached_cases_dir / CASE_CACHE_FILENAME
+        self.hpi_file = self.cached_cases_dir / HPI_FILENAME
+        self.cases_dir = self.cached_cases_dir / CASES_DIRNAME
+        self.locks_dir = self.cached_cases_dir / LOCKS_DIRNAME
+        self.check_interval_s = check_interval_s
+
+        self._lock = threading.RLock()
+        self._cases: Dict[str, str] = {}
+        self._hpi: Dict[str, str] = {}
+        self._stamps: Tuple[_FileStamp, ...] = ()
+        self._last_check = 0.0
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.reload()
+
+    # ---------- Loading ----------
+
+    def _current_stamps(self) -> Tuple[_FileStamp, ...]:
+        # Renaming a file into cases/ updates the directory's mtime
+        return (_stamp(self.case_cache_file), _stamp(self.hpi_file), _stamp(self.cases_dir))
+
+    def reload(self) -> None:
+        """Re-read the seed JSON, HPI JSON and cases/ from disk."""
+        with self._lock:
+            self._stamps = self._current_stamps()
+            cases = _read_json_dict(self.case_cache_file)
+            cases.update(_read_case_files(self.cases_dir))
+            self._cases = cases
+            self._hpi = _read_json_dict(self.hpi_file)
+            self._last_check = time.monotonic()
+        logger.info(f"Case store loaded {len(self._cases)} cached cases, {len(self._hpi)} HPIs from {self.cached_cases_dir}")
+
+    def _refresh_if_changed(self) -> None:
+        """Reload if a file changed on disk (stat at most every check_interval_s)."""
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval_s:
+            return
+        with self._lock:
+            self._last_check = now
+            if self._current_stamps() != self._stamps:
+                logger.info("Cached case files changed on disk - reloading case store")
+                self.reload()
+
+    # ---------- Reads ----------
+
+    def get(self, organism: str, fresh: bool = False) -> Optional[str]:
+        """Cached case text for an organism (any casing / spaces), or None.
+
+        fresh=True reads the organism's case file from disk instead of
+        trusting the periodic refresh (use inside generation_lock()).
+        """
+        key = normalize_organism_name(organism)
+        if fresh:
+            try:
+                case_text = (self.cases_dir / _case_filename(key)).read_text(encoding="utf-8")
+                with self._lock:
+                    self._cases[key] = case_text
+                return case_text
+            except FileNotFoundError:
+                pass
+        else:
+            self._refresh_if_changed()
+        return self._cases.get(key)
+
+    def has(self, organism: str) -> bool:
+        """Whether the organism has a cached case."""
+        return self.get(organism) is not None
+
+    def organisms(self) -> List[str]:
+        """Normalized names of organisms with cached cases."""
+        self._refresh_if_changed()
+        return list(self._cases.keys())
+
+    def hpi_organisms(self) -> List[str]:
+        """Normalized names of organisms with an entry in HPI_per_organism.json."""
+        self._refresh_if_changed()
+        return list(self._hpi.keys())
+
+    def snapshot(self) -> Dict[str, str]:
+        """Copy of all cached cases (normalized organism -> case text)."""
+        self._refresh_if_changed()
+        with self._lock:
+            return dict(self._cases)
+
+    # ---------- Writes ----------
+
+    @contextmanager
+    def generation_lock(self, organism: str) -> Iterator[None]:
+        """Hold while generating a case so each organism is generated once.
+
+        Exclusive per organism across threads (in-process lock) and processes
+        (flock on .locks/<organism>.lock). After acquiring it, re-check with
+        get(organism, fresh=True): another worker may have just written it.
+        """
+        key = normalize_organism_name(organism)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock, _flock(self.locks_dir / (_case_filename(key) + ".lock")):
+            yield
+
+    def put(self, organism: str, case_text: str) -> None:
+        """Add or replace a cached case (atomic write of cases/<organism>.txt)."""
+        key = normalize_organism_name(organism)
+        try:
+            atomic_write_text(self.cases_dir / _case_filename(key), case_text)
+        except Exception as e:
+            logger.error(f"Error saving cached case for {key}: {e}")
+        with self._lock:
+            self._cases[key] = case_text
+
+    def remove(self, organism: Optional[str] = None) -> bool:
+        """Remove one organism's cached case (or all if organism is None).
+
+        Deletes the cases/ file and, for bundled cases, rewrites
+        case_cache.json without it (under a file lock, atomically).
+
+        Returns:
+            True if anything was removed
+        """
+        self._refresh_if_changed()
+        with self._lock:
+            keys = list(self._cases) if organism is None else [normalize_organism_name(organism)]
+            removed = False
+            for key in keys:
+                removed = self._cases.pop(key, None) is not None or removed
+                try:
+                    (self.cases_dir / _case_filename(key)).unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.error(f"Error removing cached case for {key}: {e}")
+            self._remove_from_seed(keys)
+            return removed
+
+    def _remove_from_seed(self, keys: List[str]) -> None:
+        """Drop keys from case_cache.json (read-modify-write under the file lock)."""
+        if not self.case_cache_file.exists():
+            return
+        try:
+            with _flock(self.locks_dir / (CASE_CACHE_FILENAME + ".lock")):
+                with open(self.case_cache_file, "r", encoding="utf-8") as f:
+                    seed = json.load(f)
+                drop = set(keys)
+                kept = {k: v for k, v in seed.items() if normalize_organism_name(k) not in drop}
+                if len(kept) != len(seed):
+                    atomic_write_json(self.case_cache_file, kept, indent=2, ensure_ascii=False)
+                    logger.info(f"Saved case cache with {len(kept)} organisms")
+        except Exception as e:
+            logger.error(f"Error saving case cache: {e}")
+
+
+# -------- Singleton (one store per directory) --------
+
+_case_stores: Dict[str, CaseStore] = {}
+_case_stores_lock = threading.Lock()
+
+
+def default_cached_cases_dir() -> str:
+    """V4_refactor/data/cases/cached."""
+    # __file__ is at: V4_refactor/src/microtutor/services/case/case_store.py
+    return str(Path(__file__).resolve().parents[4] / "data" / "cases" / "cached")
+
+
+def get_case_store(cached_cases_dir: Optional[str] = None) -> CaseStore:
+    """Get the process-wide case store for a directory (default data/cases/cached)."""
+    key = os.path.realpath(cached_cases_dir or default_cached_cases_dir())
+    store = _case_stores.get(key)
+    if store is None:
+        with _case_stores_lock:
+            store = _case_stores.get(key)
+            if store is None:
+                store = CaseStore(key)
+                _case_stores[key] = store
+    return store
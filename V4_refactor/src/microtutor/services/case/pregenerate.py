@@ -0,0 +1,264 @@
+"""
+Offline case pre-generation for the whole organism catalogue.
+
+For every pathogen in data/pathogen_history_domains_complete.csv (rows with
+cat_pathogen set) plus any organism already in the case store, produce:
+
+1. the case text                -> data/cases/cached/cases/<organism>.txt (CaseStore)
+2. the first patient sentence   -> data/cases/cached/ambiguous_with_ages.json
+3. the findings checklist       -> data/cases/cached/checklists/<sha256(case)[:16]>.json
+
+so that start_case only ever reads from disk. Run it before deploying, with
+CASE_GENERATION_ON_DEMAND=false on the server to guarantee no student
+request triggers generation.
+
+Organisms run on a bounded thread pool (one CaseGeneratorRAGAgent per
+worker). Every output is written atomically as soon as it is produced and
+existing outputs are skipped, so an interrupted run can simply be restarted.
+
+Usage:
+    python -m microtutor.services.case.pregenerate
+    python -m microtutor.services.case.pregenerate --workers 8 --organisms staphylococcus_aureus HSV_1
+    python -m microtutor.services.case.pregenerate --force --skip-checklists
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from microtutor.prompts.checklist_prompts import get_checklist_generation_prompt
+from microtutor.prompts.tutor_prompt import (
+    get_first_pt_sentence_generation_system_prompt,
+    get_first_pt_sentence_generation_user_prompt,
+)
+from microtutor.services.case.case_store import CaseStore, get_case_store
+from microtutor.utils.atomic_io import atomic_write_json
+from microtutor.utils.conversation_utils import normalize_organism_name
+
+logger = logging.getLogger(__name__)
+
+CATALOGUE_FILENAME = "pathogen_history_domains_complete.csv"
+FIRST_PT_SENTENCE_FILENAME = "ambiguous_with_ages.json"
+CHECKLIST_DIRNAME = "checklists"
+
+
+def checklist_path(checklists_dir: Path, case_text: str) -> Path:
+    """Checklist file for a case (same content-hash naming as src_simplified)."""
+    digest = hashlib.sha256(case_text.encode()).hexdigest()[:16]
+    return checklists_dir / f"{digest}.json"
+
+
+def load_organism_catalogue(csv_path: Path) -> List[str]:
+    """Pathogen concepts from the catalogue CSV (rows with cat_pathogen set), normalized."""
+    organisms: List[str] = []
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            concept = (row.get("concept") or "").strip()
+            if concept and (row.get("cat_pathogen") or "").strip():
+                organisms.append(normalize_organism_name(concept))
+    return list(dict.fromkeys(organisms))
+
+
+def _read_json_object(path: Path) -> Dict[str, Any]:
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    return data
+
+
+def _clean_sentence(text: str) -> str:
+    # Same cleanup as TutorService._generate_first_pt_sentence_via_llm
+    return (text or "").strip().strip('"').strip("'")
+
+
+class CasePregenerator:
+    """Fills the case, first-sentence and checklist caches for a list of organisms."""
+
+    def __init__(
+        self,
+        cached_cases_dir: Path,
+        workers: int = 4,
+        force: bool = False,
+        sentences: bool = True,
+        checklists: bool = True,
+        model_name: Optional[str] = None,
+    ):
+        self.cached_cases_dir = Path(cached_cases_dir)
+        self.sentences_file = self.cached_cases_dir / FIRST_PT_SENTENCE_FILENAME
+        self.checklists_dir = self.cached_cases_dir / CHECKLIST_DIRNAME
+        self.workers = max(1, workers)
+        self.force = force
+        self.sentences = sentences
+        self.checklists = checklists
+        self.model_name = model_name
+
+        self.store: CaseStore = get_case_store(str(self.cached_cases_dir))
+        self._sentences_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _agent(self):
+        """One generator per worker thread (case sections are agent state)."""
+        agent = getattr(self._local, "agent", None)
+        if agent is None:
+            from microtutor.services.case.case_generator_rag import CaseGeneratorRAGAgent
+            agent = CaseGeneratorRAGAgent(model_name=self.model_name)
+            self._local.agent = agent
+        return agent
+
+    # ---------- Steps ----------
+
+    def _ensure_case(self, organism: str) -> Tuple[str, str]:
+        """(case_text, status) - status is "cached" or "generated"."""
+        case_text = None if self.force else self.store.get(organism)
+        if case_text:
+            return case_text, "cached"
+        # Same lock as on-demand generation, so a running server and this job
+        # never generate the same organism twice
+        with self.store.generation_lock(organism):
+            case_text = None if self.force else self.store.get(organism, fresh=True)
+            if case_text:
+                return case_text, "cached"
+            case_text = self._agent().build_case(organism.replace("_", " "))
+            if not case_text:
+                raise ValueError("empty case")
+            self.store.put(organism, case_text)
+        return case_text, "generated"
+
+    def _ensure_sentence(self, organism: str, case_text: str) -> str:
+        key = normalize_organism_name(organism)
+        if not self.force and _read_json_object(self.sentences_file).get(key):
+            return "cached"
+        sentence = _clean_sentence(self._agent().complete(
+            get_first_pt_sentence_generation_system_prompt(),
+            get_first_pt_sentence_generation_user_prompt(case_text),
+        ))
+        if not sentence:
+            raise ValueError("empty first patient sentence")
+        # Read-modify-write so sentences from other workers are kept
+        with self._sentences_lock:
+            sentences = _read_json_object(self.sentences_file)
+            sentences[key] = sentence
+            atomic_write_json(self.sentences_file, sentences, indent=2, ensure_ascii=False)
+        return "generated"
+
+    def _ensure_checklist(self, case_text: str) -> str:
+        path = checklist_path(self.checklists_dir, case_text)
+        if not self.force and path.exists():
+            return "cached"
+        raw = self._agent().complete(
+            None,
+            get_checklist_generation_prompt(case_text),
+            response_format={"type": "json_object"},
+        )
+        data = json.loads(raw)
+        if not isinstance(data, dict):
+            raise ValueError("Expected JSON object from checklist generation")
+        atomic_write_json(path, data, indent=2)
+        return "generated"
+
+    def process(self, organism: str) -> Dict[str, Any]:
+        """Run all steps for one organism; a failed step is recorded, not raised."""
+        t0 = time.perf_counter()
+        result: Dict[str, Any] = {"organism": organism}
+        try:
+            case_text, result["case"] = self._ensure_case(organism)
+        except Exception as e:
+            logger.error(f"[{organism}] case generation failed: {e}")
+            result["case"] = f"failed: {e}"
+            result["seconds"] = round(time.perf_counter() - t0, 2)
+            return result
+
+        steps = []
+        if self.sentences:
+            steps.append(("first_pt_sentence", lambda: self._ensure_sentence(organism, case_text)))
+        if self.checklists:
+            steps.append(("checklist", lambda: self._ensure_checklist(case_text)))
+        for name, step in steps:
+            try:
+                result[name] = step()
+            except Exception as e:
+                logger.error(f"[{organism}] {name} generation failed: {e}")
+                result[name] = f"failed: {e}"
+
+        result["seconds"] = round(time.perf_counter() - t0, 2)
+        return result
+
+    def run(self, organisms: List[str]) -> Dict[str, Any]:
+        """Process organisms on the worker pool and summarize."""
+        t0 = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="pregen") as pool:
+            futures = {pool.submit(self.process, organism): organism for organism in organisms}
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results.append(result)
+                logger.info(
+                    f"[{done}/{len(organisms)}] {result['organism']}: "
+                    + ", ".join(f"{k}={v}" for k, v in result.items() if k not in ("organism", "seconds"))
+                    + f" ({result['seconds']}s)"
+                )
+
+        summary: Dict[str, Any] = {"organisms": len(organisms), "workers": self.workers}
+        for step in ("case", "first_pt_sentence", "checklist"):
+            statuses = [r[step] for r in results if step in r]
+            if statuses:
+                summary[step] = {
+                    "generated": statuses.count("generated"),
+                    "cached": statuses.count("cached"),
+                    "failed": sum(1 for s in statuses if s.startswith("failed")),
+                }
+        summary["failed_organisms"] = sorted(
+            r["organism"] for r in results
+            if any(str(v).startswith("failed") for v in r.values())
+        )
+        summary["seconds"] = round(time.perf_counter() - t0, 2)
+        return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    project_root = Path(__file__).resolve().parents[4]
+    parser = argparse.ArgumentParser(description="Pre-generate cases, first sentences and checklists for every organism")
+    parser.add_argument("--csv", default=str(project_root / "data" / CATALOGUE_FILENAME))
+    parser.add_argument("--cached-cases-dir", default=str(project_root / "data" / "cases" / "cached"))
+    parser.add_argument("--organisms", nargs="+", default=None, help="Only these organisms (default: whole catalogue)")
+    parser.add_argument("--workers", type=int, default=4, help="Organisms generated concurrently")
+    parser.add_argument("--model", default=None, help="LLM model (default: configured model)")
+    parser.add_argument("--force", action="store_true", help="Regenerate outputs that already exist")
+    parser.add_argument("--skip-sentences", action="store_true")
+    parser.add_argument("--skip-checklists", action="store_true")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    pregenerator = CasePregenerator(
+        cached_cases_dir=Path(args.cached_cases_dir),
+        workers=args.workers,
+        force=args.force,
+        sentences=not args.skip_sentences,
+        checklists=not args.skip_checklists,
+        model_name=args.model,
+    )
+    if args.organisms:
+        organisms = [normalize_organism_name(o) for o in args.organisms]
+    else:
+        # Catalogue plus the organisms the UI offers (HPI list) or already has cases for
+        organisms = list(dict.fromkeys(
+            load_organism_catalogue(Path(args.csv))
+            + pregenerator.store.hpi_organisms()
+            + pregenerator.store.organisms()
+        ))
+    summary = pregenerator.run(organisms)
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
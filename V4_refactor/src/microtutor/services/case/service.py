@@ -13,7 +13,7 @@ import logging
 
 # Import directly from submodules to avoid circular imports
 from .case_loader import get_case
-from .case_generator_rag import CaseGeneratorRAGAgent
+from .case_store import get_case_store
 
 logger = logging.getLogger(__name__)
 
@@ -58,8 +58,7 @@ class CaseService:
             List of organism names
         """
         try:
-            case_generator = CaseGeneratorRAGAgent()
-            organisms = case_generator.get_cached_organisms()
+            organisms = get_case_store().organisms()
             logger.info(f"Found {len(organisms)} available organisms")
             return organisms
         except Exception as e:
@@ -2,6 +2,15 @@
 
 from .service import GuidelineService
 from .cache import GuidelinesCache, get_guidelines_cache
+from .ingest import ingest_guidelines, load_index
+from .result_cache import GuidelineResultCache
 
-__all__ = ["GuidelineService", "GuidelinesCache", "get_guidelines_cache"]
+__all__ = [
+    "GuidelineService",
+    "GuidelinesCache",
+    "get_guidelines_cache",
+    "GuidelineResultCache",
+    "ingest_guidelines",
+    "load_index",
+]
 
@@ -2,18 +2,31 @@
 Guidelines Cache Service - RAG-based guideline retrieval.
 
 This service implements a RAG pipeline to retrieve relevant clinical guidelines
-based on organism and case context.
+based on organism and case context. The index is built offline from the PDFs
+in data/guidelines/ by `python -m microtutor.services.guideline.ingest`;
+a legacy embeddings.jsonl is still read if no index exists.
+
+Results are cached per (organism, case description, index) for
+GUIDELINE_CACHE_TTL_SECONDS in an LRU backed by SQLite (shared by workers),
+and pre-warmed at startup for every organism with a cached case.
 """
 
+import asyncio
+import hashlib
 import logging
 import json
 import os
 import numpy as np
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime
 from pathlib import Path
 
-from openai import AsyncAzureOpenAI, AsyncOpenAI
+from microtutor.core.llm.client_pool import get_openai_client
+from microtutor.utils.embedding_utils import aget_embedding
+from microtutor.services.guideline.ingest import BM25_FILE, GUIDELINE_EMBEDDING_MODEL, index_dir_for, load_index
+from microtutor.services.guideline.result_cache import build_result_cache, result_key
+from microtutor.utils.conversation_utils import normalize_organism_name
+from microtutor.utils.lexical_search import BM25Index, reciprocal_rank_fusion
 from microtutor.core.config.config_helper import config
 
 logger = logging.getLogger(__name__)
@@ -23,8 +36,11 @@ class GuidelinesCache:
     """
     Service for clinical guidelines caching and RAG retrieval.
     
-    Loads pre-computed embeddings and performs vector search to find
-    relevant guideline chunks for a given case.
+    Loads pre-computed embeddings once into a contiguous, L2-normalized
+    float32 matrix (chunk metadata kept in a parallel list), so a search is a
+    single matrix-vector product plus argpartition. A BM25 index over the same
+    chunks is fused with the vector ranking (RRF) and answers alone when the
+    query embedding fails or exceeds its time budget.
     """
     
     def __init__(self, guidelines_dir: Optional[str] = None, project_root: Optional[str] = None):
@@ -54,16 +70,26 @@ class GuidelinesCache:
         # Load embeddings
         # self._guidelines_dir is already set to data/guidelines
         self.embeddings_path = self._guidelines_dir / "embeddings.jsonl"
-        self.local_embeddings = []
-        self._load_embeddings()
+        self.index_dir = index_dir_for(self._guidelines_dir)
+        self.embedding_model = GUIDELINE_EMBEDDING_MODEL
+        self._matrix: Optional[np.ndarray] = None  # (n_chunks, dim) float32, rows L2-normalized
+        self._chunks: List[Dict[str, Any]] = []    # Chunk metadata (topic, title, text, ...) by row
+        self._bm25: Optional[BM25Index] = None
+        self._index_fingerprint = "none"  # Part of result cache keys; changes when the index does
+        self.embed_timeout_s = getattr(config, "RETRIEVAL_EMBED_TIMEOUT_SECONDS", 2.0)
+        if not self._load_index():
+            self._load_embeddings()
+        
+        # Per-organism result cache (None if disabled)
+        self.result_cache = build_result_cache(config, self._project_root)
         
         # Setup OpenAI client
         self.client = None
         self._setup_client()
         
         logger.info(f"Guidelines cache initialized - directory: {self._guidelines_dir}")
-        if self.local_embeddings:
-            logger.info(f"RAG enabled with {len(self.local_embeddings)} chunks")
+        if self.chunk_count:
+            logger.info(f"RAG enabled with {self.chunk_count} chunks")
         else:
             logger.warning("RAG disabled - no embeddings loaded")
 
@@ -71,46 +97,114 @@ class GuidelinesCache:
         """Initialize OpenAI client based on config."""
         try:
             if config.USE_AZURE_OPENAI:
-                self.client = AsyncAzureOpenAI(
+                self.client = get_openai_client(
+                    use_azure=True,
+                    is_async=True,
                     azure_endpoint=config.AZURE_OPENAI_ENDPOINT,
                     api_key=config.AZURE_OPENAI_API_KEY,
                     api_version=config.AZURE_OPENAI_API_VERSION
                 )
             elif config.OPENAI_API_KEY:
-                self.client = AsyncOpenAI(api_key=config.OPENAI_API_KEY)
+                self.client = get_openai_client(use_azure=False, is_async=True, api_key=config.OPENAI_API_KEY)
             else:
                 logger.warning("No OpenAI credentials found for GuidelinesCache")
         except Exception as e:
             logger.error(f"Failed to setup OpenAI client for GuidelinesCache: {e}")
 
+    @property
+    def chunk_count(self) -> int:
+        """Number of searchable guideline chunks."""
+        return 0 if self._matrix is None else int(self._matrix.shape[0])
+
+    def _load_index(self) -> bool:
+        """Memory-map the index built by `python -m microtutor.services.guideline.ingest`."""
+        try:
+            loaded = load_index(self.index_dir, mmap=True)
+        except Exception as e:
+            logger.error(f"Failed to load guideline index from {self.index_dir}: {e}")
+            return False
+        if loaded is None:
+            return False
+        matrix, chunks, manifest = loaded
+        self.embedding_model = manifest.get("model", GUIDELINE_EMBEDDING_MODEL)
+        self._set_index(matrix, chunks, normalized=manifest.get("normalized", False),
+                        bm25_path=self.index_dir / BM25_FILE)
+        self._index_fingerprint = self._fingerprint(
+            self.embedding_model, len(chunks), manifest.get("built_at"), manifest.get("files")
+        )
+        logger.info(f"Memory-mapped {len(chunks)} guideline chunks from {self.index_dir}")
+        return True
+
     def _load_embeddings(self):
-        """Load embeddings from JSONL file."""
+        """Load embeddings from legacy JSONL file into a normalized float32 matrix."""
         if self.embeddings_path.exists():
             try:
-                count = 0
+                vectors: List[np.ndarray] = []
+                chunks: List[Dict[str, Any]] = []
                 with open(self.embeddings_path, "r", encoding="utf-8") as f:
                     for line in f:
                         if line.strip():
-                            self.local_embeddings.append(json.loads(line))
-                            count += 1
-                logger.info(f"Loaded {count} guideline embeddings from {self.embeddings_path}")
+                            item = json.loads(line)
+                            embedding = item.pop("embedding", None)
+                            if not embedding:
+                                continue
+                            vectors.append(np.asarray(embedding, dtype=np.float32))
+                            chunks.append(item)
+                self._set_index(np.vstack(vectors) if vectors else None, chunks)
+                stat = self.embeddings_path.stat()
+                self._index_fingerprint = self._fingerprint(
+                    self.embedding_model, len(chunks), stat.st_mtime, stat.st_size
+                )
+                logger.info(f"Loaded {len(chunks)} guideline embeddings from {self.embeddings_path}")
             except Exception as e:
                 logger.error(f"Failed to load embeddings: {e}")
         else:
             logger.warning(f"Embeddings file not found at {self.embeddings_path}")
 
-    def get_cached(self, organism: str) -> Optional[Dict[str, Any]]:
+    def _set_index(
+        self,
+        matrix: Optional[np.ndarray],
+        chunks: List[Dict[str, Any]],
+        normalized: bool = False,
+        bm25_path: Optional[Path] = None,
+    ) -> None:
+        """Install a (n_chunks, dim) matrix, normalizing rows so dot product = cosine."""
+        if matrix is None or len(chunks) == 0:
+            self._matrix, self._chunks, self._bm25 = None, [], None
+            return
+        # Lexical index: saved by ingest next to the vectors, else built here (fast)
+        self._bm25 = BM25Index.load_or_build(
+            str(bm25_path) if bm25_path else None, [c.get("text", "") for c in chunks]
+        )
+        if normalized:
+            # Already normalized on disk - keep the memory map instead of copying
+            self._matrix, self._chunks = matrix, chunks
+            return
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0  # Zero rows stay zero (score 0)
+        self._matrix = matrix / norms
+        self._chunks = chunks
+
+    @staticmethod
+    def _fingerprint(*parts: Any) -> str:
+        """Short stable hash identifying the loaded index."""
+        return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+    def get_cached(self, organism: str, case_description: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
-        Get cached guidelines for an organism (stub - always returns None).
+        Get cached guidelines for an organism and case.
         
         Args:
-            organism: The organism name
+            organism: The organism name (any casing / spaces or underscores)
+            case_description: The case text the guidelines were retrieved for
             
         Returns:
-            None (stub implementation)
+            The cached retrieval result, or None on a miss / expiry
         """
-        # TODO: Implement actual caching mechanism if needed
-        return None
+        if self.result_cache is None or not self.chunk_count:
+            return None
+        return self.result_cache.get(result_key(organism, case_description, self._index_fingerprint))
     
     async def prefetch_guidelines_for_organism(
         self,
@@ -118,7 +212,7 @@ class GuidelinesCache:
         case_description: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Retrieve guidelines using RAG.
+        Retrieve guidelines using RAG (served from the result cache when possible).
         
         Args:
             organism: The pathogen/condition
@@ -127,63 +221,136 @@ class GuidelinesCache:
         Returns:
             Dict containing retrieved guidelines
         """
-        if not self.local_embeddings or not self.client:
+        if not self.chunk_count:
             return self._get_stub_guidelines(organism)
+        
+        cached = self.get_cached(organism, case_description)
+        if cached is not None:
+            logger.info(f"Guidelines for {organism} served from cache")
+            return cached
             
         logger.info(f"Searching guidelines for: {organism}")
         
-        try:
-            # Construct query: organism + case text
-            query = f"{organism} {case_description or ''}".strip()
-            
-            # Embed query using same model as generation
-            resp = await self.client.embeddings.create(
-                input=query,
-                model="text-embedding-3-small"
-            )
-            query_vec = np.array(resp.data[0].embedding)
-            
-            # Vector search
-            found_items = self._vector_search(query_vec, top_k=2)
-            
-            return {
-                "organism": organism,
-                "found_guidelines": found_items,
-                "fetched_at": datetime.now(),
-                "stub_mode": False
-            }
+        # Construct query: organism + case text ("staphylococcus_aureus" and
+        # "Staphylococcus aureus" share a cache entry, so they share a query too)
+        organism_text = normalize_organism_name(organism).replace("_", " ")
+        query = f"{organism_text} {case_description or ''}".strip()
+        top_k, n_candidates = 2, 20
+        
+        # Lexical ranking is local and instant
+        lexical = self._bm25.search(query, top_k=n_candidates) if self._bm25 else []
+        
+        # Vector ranking needs the query embedding - bounded by a time budget
+        vector: List[Tuple[int, float]] = []
+        if self.client:
+            try:
+                # Embed query using same model as generation (cached by query text)
+                embedding = await asyncio.wait_for(
+                    aget_embedding(query, model=self.embedding_model, client=self.client),
+                    timeout=self.embed_timeout_s,
+                )
+                vector = self._vector_rank(np.asarray(embedding, dtype=np.float32), n_candidates)
+            except asyncio.TimeoutError:
+                logger.warning(f"Guideline query embedding exceeded {self.embed_timeout_s}s - using lexical search only")
+            except Exception as e:
+                logger.error(f"Error embedding guideline query: {e} - using lexical search only")
+        
+        if not vector and not lexical:
+            return self._get_stub_guidelines(organism)
+        
+        fused = reciprocal_rank_fusion([[i for i, _ in vector], [i for i, _ in lexical]])[:top_k]
+        vector_scores = dict(vector)
+        found_items = [
+            {**self._chunks[i], "score": vector_scores.get(i), "rrf_score": rrf}
+            for i, rrf in fused
+        ]
+        
+        result = {
+            "organism": organism,
+            "found_guidelines": found_items,
+            "fetched_at": datetime.now(),
+            "stub_mode": False,
+            "retrieval_mode": "hybrid" if vector and lexical else ("vector" if vector else "lexical"),
+        }
+        
+        # Don't pin a lexical-only fallback (embedding timeout/error) for the whole TTL
+        if self.result_cache is not None and (vector or not self.client):
+            self.result_cache.put(result_key(organism, case_description, self._index_fingerprint), organism, result)
+        return result
+
+    async def prewarm(self, case_cache_path: Optional[str] = None, max_concurrency: int = 4) -> Dict[str, int]:
+        """
+        Fill the result cache for every organism with a cached case.
+        
+        Cached cases are what sessions are started with, so the first
+        management/MCQ tool call of a session becomes a cache hit.
+        
+        Args:
+            case_cache_path: Path to a case_cache.json-style file (defaults to the
+                case store for data/cases/cached/)
+            max_concurrency: Lookups in flight at once
             
+        Returns:
+            Counts of organisms already cached, fetched and failed
+        """
+        summary = {"cached": 0, "fetched": 0, "failed": 0}
+        if self.result_cache is None or not self.chunk_count:
+            return summary
+        
+        path = Path(case_cache_path) if case_cache_path else self._project_root / "data" / "cases" / "cached"
+        try:
+            if case_cache_path:
+                with open(path, "r", encoding="utf-8") as f:
+                    cases: Dict[str, str] = json.load(f)
+            else:
+                from microtutor.services.case.case_store import get_case_store
+                cases = get_case_store(str(path)).snapshot()
         except Exception as e:
-            logger.error(f"Error searching guidelines: {e}")
-            return self._get_stub_guidelines(organism)
+            logger.warning(f"Guideline prewarm skipped - could not read {path}: {e}")
+            return summary
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def warm(organism_key: str, case_text: str) -> None:
+            organism = organism_key.replace("_", " ")
+            if self.get_cached(organism, case_text) is not None:
+                summary["cached"] += 1
+                return
+            async with semaphore:
+                try:
+                    await self.prefetch_guidelines_for_organism(organism, case_text)
+                    summary["fetched"] += 1
+                except Exception as e:
+                    logger.warning(f"Guideline prewarm failed for {organism}: {e}")
+                    summary["failed"] += 1
+        
+        await asyncio.gather(*(warm(k, v) for k, v in cases.items() if isinstance(v, str)))
+        logger.info(f"Guideline cache prewarm: {summary}")
+        return summary
 
-    def _vector_search(self, query_vec: np.ndarray, top_k: int = 2) -> List[Dict[str, Any]]:
-        """Perform cosine similarity search."""
-        if not self.local_embeddings:
+    def _vector_rank(self, query_vec: np.ndarray, top_k: int) -> List[Tuple[int, float]]:
+        """Top-k (row, cosine) pairs, best first (one matvec + argpartition)."""
+        if self._matrix is None:
             return []
             
-        scores = []
         q_norm = np.linalg.norm(query_vec)
-        
         if q_norm == 0:
             return []
-            
-        for item in self.local_embeddings:
-            vec = np.array(item['embedding'])
-            v_norm = np.linalg.norm(vec)
-            
-            if v_norm == 0:
-                score = 0
-            else:
-                score = np.dot(query_vec, vec) / (q_norm * v_norm)
-                
-            scores.append((score, item))
-            
-        # Sort by score descending
-        scores.sort(key=lambda x: x[0], reverse=True)
         
-        # Return top k items
-        return [item for _, item in scores[:top_k]]
+        scores = self._matrix @ (np.asarray(query_vec, dtype=np.float32) / q_norm)
+        
+        top_k = min(top_k, scores.shape[0])
+        if top_k < scores.shape[0]:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(scores.shape[0])
+        top = top[np.argsort(-scores[top])]
+        return [(int(i), float(scores[i])) for i in top]
+
+    def _vector_search(self, query_vec: np.ndarray, top_k: int = 2) -> List[Dict[str, Any]]:
+        """Perform cosine similarity search (vector only)."""
+        # Return top k items (metadata only, with the similarity score)
+        return [{**self._chunks[i], "score": score} for i, score in self._vector_rank(query_vec, top_k)]
 
     def _get_stub_guidelines(self, organism: str) -> Dict[str, Any]:
         """Return empty/stub guidelines."""
@@ -0,0 +1,423 @@
+"""
+Guideline ingestion - turn the PDFs in data/guidelines/ into a searchable index.
+
+Pipeline:
+1. Extract text from each PDF (one process per PDF, pypdf)
+2. Split into section-aware chunks (headings start new chunks; long sections
+   are split on paragraph boundaries with a small overlap)
+3. Embed chunks in batches through the embedding cache (embedding_utils.embed_texts)
+4. Write a compact index that GuidelinesCache memory-maps at startup:
+
+    data/guidelines/index/
+        embeddings.npy   float32 (n_chunks, dim), rows L2-normalized
+        chunks.json      chunk metadata by row (topic, title, section, text, source, page)
+        manifest.json    per-PDF sha256 + row range, model, chunking params
+        bm25.json        lexical index over chunk texts (utils.lexical_search)
+
+PDFs whose sha256 and chunking params match the previous manifest are not
+re-extracted or re-embedded; their rows are copied from the old index.
+
+Usage:
+    python -m microtutor.services.guideline.ingest
+    python -m microtutor.services.guideline.ingest --workers 8 --force
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from microtutor.utils.lexical_search import BM25Index
+
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except ImportError:
+    PdfReader = None
+    PYPDF_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Queries are embedded with the same model in GuidelinesCache
+GUIDELINE_EMBEDDING_MODEL = "text-embedding-3-small"
+
+INDEX_DIRNAME = "index"
+EMBEDDINGS_FILE = "embeddings.npy"
+CHUNKS_FILE = "chunks.json"
+MANIFEST_FILE = "manifest.json"
+BM25_FILE = "bm25.json"
+
+# Bump when extraction/chunking logic changes so every PDF is re-chunked
+CHUNKER_VERSION = 2
+
+_HEADING_RE = re.compile(
+    r"^(?:"
+    r"(?:[IVX]+|\d+(?:\.\d+)*)\.?\s+[A-Z][^.]{2,80}"   # "2.1 Diagnosis", "IV. Treatment"
+    r"|[A-Z][A-Z0-9 ,/&()\-]{3,80}"                    # "RECOMMENDATIONS", "BACKGROUND"
+    r"|(?:Recommendation|Summary|Background|Introduction|Methods|Diagnosis|Treatment|"
+    r"Management|Prevention|Evidence Summary|Rationale)s?\b[^.]{0,80}"
+    r")$"
+)
+# Words a heading never ends on but a wrapped sentence often does
+_CONTINUATION_RE = re.compile(
+    r"\b(?:a|an|and|are|as|at|be|by|for|from|in|is|of|on|or|should|than|that|the|to|we|with)$",
+    re.IGNORECASE,
+)
+_MAX_HEADING_WORDS = 10
+
+
+def file_sha256(path: Path) -> str:
+    """Content hash of a PDF (used to skip unchanged files)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_title(pdf_path: Path) -> str:
+    """Readable citation from the repo's "Author_Journal_Year[_n].pdf" naming."""
+    parts = pdf_path.stem.split("_")
+    if len(parts) >= 3 and parts[2][:4].isdigit():
+        return f"{parts[0]} et al., {parts[1]} ({parts[2][:4]})"
+    return pdf_path.stem.replace("_", " ")
+
+
+# -------- Extraction + chunking (runs in worker processes) --------
+
+# Back matter that adds noise to retrieval
+_SKIP_SECTION_RE = re.compile(
+    r"^(references|acknowledg|notes|financial support|potential conflicts|supplementary data)",
+    re.IGNORECASE,
+)
+_MIN_CHUNK_CHARS = 50
+
+
+def _is_heading(line: str) -> bool:
+    line = line.strip()
+    if not (4 <= len(line) <= 90) or line.endswith((".", ",", ";")):
+        return False
+    if line.count(",") > 1:  # Author lists / citations, not headings
+        return False
+    # The first line of a wrapped numbered recommendation ("1. Patients with
+    # suspected ... should") also fits the pattern - reject lines that read
+    # like the start of a sentence rather than a title
+    if not line.isupper() and len(line.split()) > _MAX_HEADING_WORDS:
+        return False
+    if _CONTINUATION_RE.search(line) or re.search(r":\s+\S+(?:\s+\S+){3,}", line):
+        return False
+    return bool(_HEADING_RE.match(line))
+
+
+def _document_title(reader: Any, first_page_text: str) -> str:
+    """PDF metadata title, else the first substantial line of page 1."""
+    try:
+        title = (reader.metadata.title or "").strip() if reader.metadata else ""
+    except Exception:
+        title = ""
+    if len(title) > 10:
+        return title
+    for line in first_page_text.splitlines():
+        line = line.strip()
+        if len(line) > 20:
+            return line[:150]
+    return ""
+
+
+def _split_section(
+    paragraphs: List[Tuple[str, int]], chunk_chars: int, overlap_chars: int
+) -> List[Tuple[str, int]]:
+    """Pack (paragraph, page) pairs into chunks of ~chunk_chars with a paragraph overlap."""
+    chunks: List[Tuple[str, int]] = []
+    current: List[Tuple[str, int]] = []
+    size = 0
+    for para, page in paragraphs:
+        # Hard-split paragraphs that alone exceed the budget
+        while len(para) > chunk_chars:
+            cut = para.rfind(" ", 0, chunk_chars)
+            cut = cut if cut > chunk_chars // 2 else chunk_chars
+            if current:
+                chunks.append(("\n\n".join(p for p, _ in current), current[0][1]))
+                current, size = [], 0
+            chunks.append((para[:cut].strip(), page))
+            para = para[cut:].strip()
+        if current and size + len(para) > chunk_chars:
+            chunks.append(("\n\n".join(p for p, _ in current), current[0][1]))
+            # Carry the tail of the previous chunk as overlap
+            tail = current[-1]
+            current, size = ([tail], len(tail[0])) if len(tail[0]) <= overlap_chars else ([], 0)
+        if para:
+            current.append((para, page))
+            size += len(para)
+    if current:
+        chunks.append(("\n\n".join(p for p, _ in current), current[0][1]))
+    return chunks
+
+
+def extract_and_chunk(pdf_path: str, chunk_chars: int, overlap_chars: int) -> Dict[str, Any]:
+    """Extract one PDF and return its chunks (top-level so it can run in a worker process)."""
+    path = Path(pdf_path)
+    reader = PdfReader(str(path))
+    pages = []
+    for page in reader.pages:
+        try:
+            pages.append(page.extract_text() or "")
+        except Exception:
+            pages.append("")
+
+    doc_title = _document_title(reader, pages[0] if pages else "")
+    citation = source_title(path)
+
+    # Walk lines; headings start a new section, blank lines end paragraphs
+    sections: List[Tuple[str, List[Tuple[str, int]]]] = [("", [])]
+    para_lines: List[str] = []
+    para_page = 1
+
+    def flush_paragraph():
+        if para_lines:
+            text = re.sub(r"-\n(?=[a-z])", "", "\n".join(para_lines))  # De-hyphenate line breaks
+            text = re.sub(r"\s*\n\s*", " ", text).strip()
+            if len(text) > 20:
+                sections[-1][1].append((text, para_page))
+            para_lines.clear()
+
+    for page_no, page_text in enumerate(pages, 1):
+        for raw in page_text.splitlines():
+            line = raw.strip()
+            if not line:
+                flush_paragraph()
+                continue
+            if _is_heading(line):
+                flush_paragraph()
+                sections.append((line.title() if line.isupper() else line, []))
+                continue
+            if not para_lines:
+                para_page = page_no
+            para_lines.append(line)
+        flush_paragraph()
+
+    chunks = []
+    for section, paragraphs in sections:
+        if _SKIP_SECTION_RE.match(section):
+            continue
+        for text, page in _split_section(paragraphs, chunk_chars, overlap_chars):
+            if len(text) < _MIN_CHUNK_CHARS:
+                continue
+            if section:
+                # Heading lines are consumed by the section split; keep them in
+                # the searchable text (and intact if one was a misread sentence)
+                text = f"{section}\n{text}"
+            chunks.append({
+                "topic": f"{doc_title} - {section}" if section and doc_title else (doc_title or section or citation),
+                "title": citation,
+                "section": section,
+                "text": text,
+                "source": path.name,
+                "page": page,
+            })
+
+    return {"source": path.name, "page_count": len(pages), "chunks": chunks}
+
+
+# -------- Index I/O --------
+
+def index_dir_for(guidelines_dir: Path) -> Path:
+    return Path(guidelines_dir) / INDEX_DIRNAME
+
+
+def load_index(index_dir: Path, mmap: bool = True) -> Optional[Tuple[np.ndarray, List[Dict[str, Any]], Dict[str, Any]]]:
+    """Load (matrix, chunks, manifest) or None if no complete index exists."""
+    index_dir = Path(index_dir)
+    paths = [index_dir / EMBEDDINGS_FILE, index_dir / CHUNKS_FILE, index_dir / MANIFEST_FILE]
+    if not all(p.exists() for p in paths):
+        return None
+    matrix = np.load(paths[0], mmap_mode="r" if mmap else None)
+    with open(paths[1], "r", encoding="utf-8") as f:
+        chunks = json.load(f)
+    with open(paths[2], "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if matrix.shape[0] != len(chunks):
+        logger.error(f"Guideline index at {index_dir} is inconsistent ({matrix.shape[0]} rows, {len(chunks)} chunks)")
+        return None
+    return matrix, chunks, manifest
+
+
+def _write_index(index_dir: Path, matrix: np.ndarray, chunks: List[Dict[str, Any]], manifest: Dict[str, Any]) -> None:
+    """Write into a temp dir, then swap it in so readers never see a partial index."""
+    index_dir = Path(index_dir)
+    tmp_dir = index_dir.with_name(f".{index_dir.name}.tmp-{os.getpid()}")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    np.save(tmp_dir / EMBEDDINGS_FILE, np.ascontiguousarray(matrix, dtype=np.float32))
+    with open(tmp_dir / CHUNKS_FILE, "w", encoding="utf-8") as f:
+        json.dump(chunks, f, ensure_ascii=False)
+    BM25Index.build(c["text"] for c in chunks).save(str(tmp_dir / BM25_FILE))
+    with open(tmp_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    old_dir = index_dir.with_name(f".{index_dir.name}.old-{os.getpid()}")
+    if index_dir.exists():
+        os.replace(index_dir, old_dir)
+    os.replace(tmp_dir, index_dir)
+    if old_dir.exists():
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+
+# -------- Pipeline --------
+
+def ingest_guidelines(
+    guidelines_dir: Path,
+    output_dir: Optional[Path] = None,
+    workers: Optional[int] = None,
+    chunk_chars: int = 2000,
+    overlap_chars: int = 300,
+    force: bool = False,
+) -> Dict[str, Any]:
+    """Build or refresh the guideline index. Returns a summary dict."""
+    if not PYPDF_AVAILABLE:
+        raise RuntimeError("pypdf is required for guideline ingestion (pip install pypdf)")
+    from microtutor.utils.embedding_utils import embed_texts
+
+    t0 = time.time()
+    guidelines_dir = Path(guidelines_dir)
+    output_dir = Path(output_dir) if output_dir else index_dir_for(guidelines_dir)
+    pdfs = sorted(guidelines_dir.glob("*.pdf"))
+    if not pdfs:
+        raise ValueError(f"No PDFs found in {guidelines_dir}")
+
+    params = {"chunker_version": CHUNKER_VERSION, "chunk_chars": chunk_chars, "overlap_chars": overlap_chars}
+
+    previous = None if force else load_index(output_dir, mmap=True)
+    prev_files: Dict[str, Any] = {}
+    if previous is not None:
+        _, _, prev_manifest = previous
+        if prev_manifest.get("params") == params and prev_manifest.get("model") == GUIDELINE_EMBEDDING_MODEL:
+            prev_files = prev_manifest.get("files", {})
+
+    hashes = {pdf.name: file_sha256(pdf) for pdf in pdfs}
+    unchanged = [pdf for pdf in pdfs if prev_files.get(pdf.name, {}).get("sha256") == hashes[pdf.name]]
+    changed = [pdf for pdf in pdfs if pdf not in unchanged]
+    logger.info(f"Guideline ingestion: {len(pdfs)} PDFs ({len(unchanged)} unchanged, {len(changed)} to process)")
+    if not changed and set(prev_files) == set(hashes):
+        logger.info("Guideline index is up to date")
+        return {"output_dir": str(output_dir), "pdfs": len(pdfs), "reused_pdfs": len(pdfs),
+                "processed_pdfs": 0, "chunks": len(previous[1]), "new_chunks": 0,
+                "failed_chunks": 0, "seconds": round(time.time() - t0, 1)}
+
+    # 1-2) Extract + chunk changed PDFs in parallel processes
+    extracted: Dict[str, Dict[str, Any]] = {}
+    if changed:
+        max_workers = workers or min(len(changed), os.cpu_count() or 1)
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = {
+                pdf.name: pool.submit(extract_and_chunk, str(pdf), chunk_chars, overlap_chars)
+                for pdf in changed
+            }
+            for name, future in futures.items():
+                try:
+                    extracted[name] = future.result()
+                    logger.info(f"  {name}: {len(extracted[name]['chunks'])} chunks")
+                except Exception as e:
+                    logger.error(f"  {name}: extraction failed ({e}) - skipped")
+
+    # 3) Embed new chunks (cached by content, batched)
+    new_texts = [c["text"] for result in extracted.values() for c in result["chunks"]]
+    new_vectors = embed_texts(new_texts, model=GUIDELINE_EMBEDDING_MODEL) if new_texts else []
+    vector_iter = iter(new_vectors)
+
+    # 4) Assemble rows in PDF order, reusing rows for unchanged PDFs
+    rows: List[np.ndarray] = []
+    chunks: List[Dict[str, Any]] = []
+    files: Dict[str, Any] = {}
+    skipped_chunks = 0
+    for pdf in pdfs:
+        start = len(chunks)
+        if pdf in unchanged:
+            prev_matrix, prev_chunks, _ = previous
+            info = prev_files[pdf.name]
+            lo, hi = info["rows"]
+            rows.extend(np.asarray(prev_matrix[lo:hi], dtype=np.float32))
+            chunks.extend(prev_chunks[lo:hi])
+            page_count = info.get("page_count")
+        elif pdf.name in extracted:
+            page_count = extracted[pdf.name]["page_count"]
+            for chunk in extracted[pdf.name]["chunks"]:
+                vector = next(vector_iter)
+                if vector is None:
+                    skipped_chunks += 1
+                    continue
+                rows.append(np.asarray(vector, dtype=np.float32))
+                chunks.append(chunk)
+        else:
+            continue
+        files[pdf.name] = {"sha256": hashes[pdf.name], "rows": [start, len(chunks)], "page_count": page_count}
+
+    if not rows:
+        raise ValueError("No guideline chunks could be indexed")
+
+    matrix = np.vstack(rows).astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    matrix /= norms
+
+    manifest = {
+        "model": GUIDELINE_EMBEDDING_MODEL,
+        "dim": int(matrix.shape[1]),
+        "count": int(matrix.shape[0]),
+        "normalized": True,
+        "params": params,
+        "files": files,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+    _write_index(output_dir, matrix, chunks, manifest)
+
+    summary = {
+        "output_dir": str(output_dir),
+        "pdfs": len(pdfs),
+        "reused_pdfs": len(unchanged),
+        "processed_pdfs": len(extracted),
+        "chunks": len(chunks),
+        "new_chunks": len(new_texts) - skipped_chunks,
+        "failed_chunks": skipped_chunks,
+        "seconds": round(time.time() - t0, 1),
+    }
+    logger.info(f"Guideline index written: {summary}")
+    return summary
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    project_root = Path(__file__).resolve().parents[4]
+    parser = argparse.ArgumentParser(description="Build the guideline RAG index from PDFs")
+    parser.add_argument("--guidelines-dir", default=str(project_root / "data" / "guidelines"))
+    parser.add_argument("--output-dir", default=None, help="Defaults to <guidelines-dir>/index")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--chunk-chars", type=int, default=2000)
+    parser.add_argument("--overlap-chars", type=int, default=300)
+    parser.add_argument("--force", action="store_true", help="Re-process every PDF")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    summary = ingest_guidelines(
+        guidelines_dir=Path(args.guidelines_dir),
+        output_dir=Path(args.output_dir) if args.output_dir else None,
+        workers=args.workers,
+        chunk_chars=args.chunk_chars,
+        overlap_chars=args.overlap_chars,
+        force=args.force,
+    )
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Guideline result cache.
+
+A guideline lookup (query embedding + hybrid search) depends only on the
+organism, the case description and the index it ran against, so results are
+cached under (organism, sha256(case_description), index fingerprint) in two
+tiers:
+
+- an in-process LRU with a TTL (GUIDELINE_CACHE_LRU_SIZE / _TTL_SECONDS)
+- a SQLite file shared by every worker on the host (JSON rows, same TTL)
+
+Rebuilding the guideline index changes the fingerprint, so stale results are
+never served after a re-ingest; they simply expire.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from microtutor.utils.conversation_utils import normalize_organism_name
+from microtutor.utils.sqlite_tier import SQLiteLRUTier, expand_db_path
+
+logger = logging.getLogger(__name__)
+
+
+def result_key(organism: str, case_description: Optional[str], fingerprint: str) -> str:
+    """Cache key for one lookup: normalized organism + case hash + index fingerprint."""
+    case_hash = hashlib.sha256((case_description or "").strip().encode("utf-8")).hexdigest()[:16]
+    return f"{normalize_organism_name(organism)}:{case_hash}:{fingerprint}"
+
+
+def _encode(result: Dict[str, Any]) -> str:
+    return json.dumps(result, default=lambda o: o.isoformat() if isinstance(o, datetime) else str(o))
+
+
+def _decode(payload: str) -> Dict[str, Any]:
+    result = json.loads(payload)
+    fetched_at = result.get("fetched_at")
+    if isinstance(fetched_at, str):
+        try:
+            result["fetched_at"] = datetime.fromisoformat(fetched_at)
+        except ValueError:
+            pass
+    return result
+
+
+class GuidelineResultCache(SQLiteLRUTier):
+    """Two-tier (LRU + SQLite) TTL cache of guideline retrieval results."""
+
+    _label = "Guideline result cache"
+    _table = "guideline_results"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS guideline_results (
+            key TEXT PRIMARY KEY,
+            organism TEXT NOT NULL,
+            result TEXT NOT NULL,
+            created_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, db_path: Optional[str] = None, ttl_s: float = 86400.0, lru_size: int = 256):
+        # LRU values are (created_at, result)
+        self.ttl_s = ttl_s
+        self._stats: Dict[str, int] = {"lru_hits": 0, "disk_hits": 0, "misses": 0, "expired": 0, "writes": 0}
+        super().__init__(db_path=db_path, lru_size=lru_size)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_s > 0 and time.time() - created_at > self.ttl_s
+
+    # ---------- Public API ----------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None (miss or expired)."""
+        with self._lock:
+            item = self._lru.get(key)
+            if item is not None:
+                if not self._expired(item[0]):
+                    self._lru.move_to_end(key)
+                    self._stats["lru_hits"] += 1
+                    return dict(item[1])
+                del self._lru[key]
+                self._stats["expired"] += 1
+
+            if self._conn is not None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT result, created_at FROM guideline_results WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        payload, created_at = row
+                        if not self._expired(created_at):
+                            result = _decode(payload)
+                            self._lru_put(key, (created_at, result))
+                            self._stats["disk_hits"] += 1
+                            return dict(result)
+                        self._conn.execute("DELETE FROM guideline_results WHERE key = ?", (key,))
+                        self._conn.commit()
+                        self._stats["expired"] += 1
+                except (sqlite3.Error, ValueError) as e:
+                    logger.warning(f"Guideline result cache read failed: {e}")
+
+            self._stats["misses"] += 1
+        return None
+
+    def put(self, key: str, organism: str, result: Dict[str, Any]) -> None:
+        """Store a result (callers should not store stub/degraded results)."""
+        now = time.time()
+        with self._lock:
+            self._lru_put(key, (now, dict(result)))
+            self._disk_execute(
+                "INSERT OR REPLACE INTO guideline_results (key, organism, result, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, normalize_organism_name(organism), _encode(result), now),
+            )
+            self._stats["writes"] += 1
+
+    def clear(self) -> None:
+        """Drop every cached result (both tiers)."""
+        with self._lock:
+            self._lru.clear()
+            self._disk_execute("DELETE FROM guideline_results", what="clear")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            lookups = stats["lru_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["lookups"] = lookups
+            stats["hit_rate"] = ((stats["lru_hits"] + stats["disk_hits"]) / lookups) if lookups else 0.0
+            stats["ttl_seconds"] = self.ttl_s
+            stats.update(self._tier_stats())
+        return stats
+
+
+def build_result_cache(config: Any, project_root: Path) -> Optional[GuidelineResultCache]:
+    """Result cache from config (GUIDELINE_CACHE_*), or None if disabled."""
+    if not getattr(config, "GUIDELINE_CACHE_ENABLED", True):
+        return None
+    db_path = getattr(config, "GUIDELINE_CACHE_PATH", None)
+    if db_path is None:
+        db_path = str(project_root / "data" / "cache" / "guideline_results.sqlite3")
+    return GuidelineResultCache(
+        db_path=expand_db_path(db_path),
+        ttl_s=getattr(config, "GUIDELINE_CACHE_TTL_SECONDS", 86400.0),
+        lru_size=getattr(config, "GUIDELINE_CACHE_LRU_SIZE", 256),
+    )
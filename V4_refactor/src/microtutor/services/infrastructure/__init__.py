@@ -3,11 +3,15 @@
 from .cost import CostService
 from .background import BackgroundTaskService, get_background_service
 from .factory import create_tutor_service
+from .session_store import SessionStore, SessionVersionConflict, get_session_store
 
 __all__ = [
     "CostService",
     "BackgroundTaskService",
     "get_background_service",
     "create_tutor_service",
+    "SessionStore",
+    "SessionVersionConflict",
+    "get_session_store",
 ]
 
@@ -35,6 +35,8 @@ def create_tutor_service(
     cfg = ServiceConfig(
         model_name=model_name or config.API_MODEL_NAME,
         enable_feedback=enable_feedback,
+        max_concurrent_tools=getattr(config, 'TOOL_MAX_CONCURRENCY', 4),
+        tool_timeout_s=getattr(config, 'TOOL_TIMEOUT_SECONDS', 120.0),
     )
     
     # Create tool engine
@@ -0,0 +1,239 @@
+"""
+Session store - server-side TutorContext per case_id.
+
+/chat used to receive (and re-validate, re-serialize and re-filter) the whole
+conversation on every turn. With the store, the server keeps each case's
+TutorContext (history, phase, case description, guidelines) and the client
+sends only the new message plus the version it last saw:
+
+- an in-process LRU of live TutorContext objects (SESSION_STORE_LRU_SIZE)
+- a SQLite file (SESSION_STORE_PATH) so sessions survive restarts and are
+  shared by every worker on the host; idle rows expire after
+  SESSION_STORE_TTL_SECONDS
+
+Every save bumps the session's version. A worker whose LRU copy is behind the
+SQLite row reloads it, and a client that sends an older version gets a
+SessionVersionConflict (the route answers 409 and the client resends history).
+A turn's save is conditional on the version it was loaded at, so of two
+concurrent turns on one case the second to finish gets the conflict instead
+of overwriting the first.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from microtutor.core.config.config_helper import config
+from microtutor.schemas.domain.domain import TutorContext
+from microtutor.utils.sqlite_tier import SQLiteLRUTier, expand_db_path
+
+logger = logging.getLogger(__name__)
+
+
+class SessionVersionConflict(Exception):
+    """The client's session version does not match the stored one."""
+
+    def __init__(self, case_id: str, expected: int, actual: int):
+        super().__init__(f"Session {case_id} is at version {actual}, client sent {expected}")
+        self.case_id = case_id
+        self.expected = expected
+        self.actual = actual
+
+
+class SessionStore(SQLiteLRUTier):
+    """Two-tier (LRU + SQLite) store of TutorContext objects keyed by case_id."""
+
+    _label = "Session store"
+    _table = "sessions"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            case_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL,
+            context TEXT NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    """
+
+    def __init__(self, db_path: Optional[str] = None, lru_size: int = 1000, ttl_s: float = 86400.0):
+        # LRU values are (version, context)
+        self.ttl_s = ttl_s
+        self._stats: Dict[str, int] = {"lru_hits": 0, "disk_loads": 0, "misses": 0, "conflicts": 0, "saves": 0}
+        super().__init__(db_path=db_path, lru_size=lru_size)
+
+    # ---------- Storage ----------
+
+    def _disk_version(self, case_id: str) -> Optional[int]:
+        row = self._conn.execute("SELECT version FROM sessions WHERE case_id = ?", (case_id,)).fetchone()
+        return row[0] if row else None
+
+    def _disk_load(self, case_id: str) -> Optional[Tuple[int, TutorContext]]:
+        row = self._conn.execute(
+            "SELECT version, context, updated_at FROM sessions WHERE case_id = ?", (case_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        version, payload, updated_at = row
+        if self.ttl_s > 0 and time.time() - updated_at > self.ttl_s:
+            self._conn.execute("DELETE FROM sessions WHERE case_id = ?", (case_id,))
+            self._conn.commit()
+            return None
+        return version, TutorContext.model_validate(json.loads(payload))
+
+    # ---------- Public API ----------
+
+    def get(self, case_id: str, expected_version: Optional[int] = None) -> Optional[Tuple[TutorContext, int]]:
+        """(context, version) for a case, or None if unknown/expired.
+
+        The context is a copy: mutate it freely for the turn, then save() it.
+
+        Raises:
+            SessionVersionConflict: expected_version is set and differs from the stored version
+        """
+        with self._lock:
+            item = self._lru.get(case_id)
+            try:
+                if self._conn is not None:
+                    # Another worker may have saved a newer version
+                    disk_version = self._disk_version(case_id)
+                    if disk_version is None:
+                        item = None
+                        self._lru.pop(case_id, None)
+                    elif item is None or item[0] != disk_version:
+                        item = self._disk_load(case_id)
+                        if item is not None:
+                            self._lru_put(case_id, item)
+                            self._stats["disk_loads"] += 1
+                    else:
+                        self._stats["lru_hits"] += 1
+                elif item is not None:
+                    self._stats["lru_hits"] += 1
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"Session store read failed for {case_id}: {e}")
+
+            if item is None:
+                self._stats["misses"] += 1
+                return None
+            version, context = item
+            self._lru.move_to_end(case_id)
+            if expected_version is not None and expected_version != version:
+                self._stats["conflicts"] += 1
+                raise SessionVersionConflict(case_id, expected_version, version)
+            return context.model_copy(deep=True), version
+
+    def save(self, context: TutorContext, base_version: int) -> int:
+        """Store a turn's context if the session is still at base_version; returns the new version.
+
+        base_version is the version get() returned when the turn started. If
+        another turn saved in the meantime the write is refused, so
+        concurrent turns on one case can't silently overwrite each other.
+
+        Raises:
+            SessionVersionConflict: the stored version is no longer base_version
+        """
+        case_id = context.case_id
+        snapshot = context.model_copy(deep=True)
+        version = base_version + 1
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    # Compare-and-set on disk: other workers share the row
+                    cur = self._conn.execute(
+                        "UPDATE sessions SET version = ?, context = ?, updated_at = ? WHERE case_id = ? AND version = ?",
+                        (version, snapshot.model_dump_json(), time.time(), case_id, base_version),
+                    )
+                    self._conn.commit()
+                    if cur.rowcount == 0:
+                        self._raise_conflict(case_id, base_version, self._disk_version(case_id) or 0)
+                except sqlite3.Error as e:
+                    logger.warning(f"Session store write failed for {case_id}: {e}")
+                    self._check_lru_version(case_id, base_version)
+            else:
+                self._check_lru_version(case_id, base_version)
+            self._lru_put(case_id, (version, snapshot))
+            self._stats["saves"] += 1
+            return version
+
+    def replace(self, context: TutorContext) -> int:
+        """Store a context regardless of what is stored for its case_id; returns the new version.
+
+        Used by start_case and by turns that bring their own full history:
+        the context replaces the stored session, still with a higher version
+        so clients holding the old one get a conflict.
+        """
+        case_id = context.case_id
+        snapshot = context.model_copy(deep=True)
+        with self._lock:
+            current = self._lru.get(case_id, (0, None))[0]
+            if self._conn is not None:
+                try:
+                    current = max(current, self._disk_version(case_id) or 0)
+                except sqlite3.Error as e:
+                    logger.warning(f"Session store read failed for {case_id}: {e}")
+            version = current + 1
+            self._lru_put(case_id, (version, snapshot))
+            self._disk_execute(
+                "INSERT OR REPLACE INTO sessions (case_id, version, context, updated_at) VALUES (?, ?, ?, ?)",
+                (case_id, version, snapshot.model_dump_json(), time.time()),
+                what=f"write for {case_id}",
+            )
+            self._stats["saves"] += 1
+            return version
+
+    def _check_lru_version(self, case_id: str, base_version: int) -> None:
+        """Memory-only compare-and-set check (caller holds the lock)."""
+        current = self._lru.get(case_id, (0, None))[0]
+        if current != base_version:
+            self._raise_conflict(case_id, base_version, current)
+
+    def _raise_conflict(self, case_id: str, expected: int, actual: int) -> None:
+        self._stats["conflicts"] += 1
+        raise SessionVersionConflict(case_id, expected, actual)
+
+    def delete(self, case_id: str) -> None:
+        """Forget a case's session (both tiers)."""
+        with self._lock:
+            self._lru.pop(case_id, None)
+            self._disk_execute("DELETE FROM sessions WHERE case_id = ?", (case_id,), what=f"delete for {case_id}")
+
+    def purge_expired(self) -> int:
+        """Delete sessions idle for longer than the TTL from disk; returns rows removed."""
+        if self._conn is None or self.ttl_s <= 0:
+            return 0
+        with self._lock:
+            cur = self._disk_execute("DELETE FROM sessions WHERE updated_at < ?", (time.time() - self.ttl_s,), what="purge")
+            return cur.rowcount if cur is not None else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            stats: Dict[str, Any] = dict(self._stats)
+            stats["ttl_seconds"] = self.ttl_s
+            stats.update(self._tier_stats())
+        return stats
+
+
+# -------- Singleton --------
+
+_session_store: Optional[SessionStore] = None
+_session_store_lock = threading.Lock()
+
+
+def get_session_store() -> Optional[SessionStore]:
+    """Get the process-wide session store from config (SESSION_STORE_*), or None if disabled."""
+    global _session_store
+    if not getattr(config, "SESSION_STORE_ENABLED", True):
+        return None
+    if _session_store is None:
+        with _session_store_lock:
+            if _session_store is None:
+                db_path = getattr(config, "SESSION_STORE_PATH", None)
+                _session_store = SessionStore(
+                    db_path=expand_db_path(db_path),
+                    lru_size=getattr(config, "SESSION_STORE_LRU_SIZE", 1000),
+                    ttl_s=getattr(config, "SESSION_STORE_TTL_SECONDS", 86400.0),
+                )
+                _session_store.purge_expired()
+    return _session_store
@@ -1,6 +1,6 @@
 """Tutor service - main tutoring logic."""
 
 from .service import TutorService, ServiceConfig
+from .intent_router import LocalIntentRouter, RouteDecision, get_intent_router
 
-__all__ = ["TutorService", "ServiceConfig"]
-
+__all__ = ["TutorService", "ServiceConfig", "LocalIntentRouter", "RouteDecision", "get_intent_router"]
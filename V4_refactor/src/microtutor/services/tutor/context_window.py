@@ -0,0 +1,188 @@
+"""
+Bounded context window for the router and agentic tools.
+
+Every tutor turn used to send the full conversation to the routing LLM and
+again to the agent it picked, so a long case cost more tokens (and latency)
+on every turn. ContextWindow bounds what each call sees:
+
+- the last CONTEXT_KEEP_LAST_MESSAGES messages are sent verbatim
+- older messages are folded, CONTEXT_SUMMARY_BATCH at a time, into a running
+  summary (TutorContext.history_summary) that prepare_llm_messages() appends
+  to the agent's system prompt
+- what remains is trimmed oldest-first to a per-agent token budget
+  (CONTEXT_TOKEN_BUDGET, overridden per agent by CONTEXT_TOKEN_BUDGETS)
+
+The summary is updated incrementally: each fold sends only the previous
+summary and the newly expired messages, never the whole history. TutorService
+runs the fold in the background while the turn is being answered, so it adds
+no latency unless it is slower than the turn itself.
+
+A client-sent history picks up the stored session's summary when it starts
+with the messages the summary covers (api/routes/chat.py). One that doesn't
+is caught up at most 2 * CONTEXT_SUMMARY_BATCH messages per turn, so no
+single fold summarizes a whole long prefix. When nothing would keep the
+summary (session store off) TutorContext.fold_history is off and no fold
+runs. Until a summary exists, select() sends the history untrimmed.
+
+TutorContext.conversation_history itself is never shortened - the client
+and the session store keep the full transcript.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from microtutor.core.config.config_helper import config
+from microtutor.prompts.tutor_prompt import get_conversation_summary_prompt
+from microtutor.schemas.domain.domain import TutorContext
+from microtutor.utils.conversation_utils import prepare_llm_messages
+from microtutor.utils.embedding_utils import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+# End-of-case reviews need more of the transcript; hints need very little
+DEFAULT_AGENT_BUDGETS: Dict[str, int] = {
+    "feedback": 12000,
+    "post_case_assessment": 12000,
+    "mcq_tool": 8000,
+    "hint": 3000,
+}
+
+
+def parse_budgets(spec: str) -> Dict[str, int]:
+    """Parse "agent=tokens,agent=tokens" (invalid entries are skipped with a warning)."""
+    budgets: Dict[str, int] = {}
+    for item in (spec or "").split(","):
+        if not item.strip():
+            continue
+        agent, _, tokens = item.partition("=")
+        try:
+            budgets[agent.strip()] = int(tokens)
+        except ValueError:
+            logger.warning(f"Ignoring invalid context budget entry: {item!r}")
+    return budgets
+
+
+class ContextWindow:
+    """Selects the messages (and summary) each agent sees for a turn."""
+
+    def __init__(
+        self,
+        keep_last: int = 12,
+        fold_batch: int = 8,
+        default_budget: int = 6000,
+        budgets: Optional[Dict[str, int]] = None,
+        summary_model: Optional[str] = None,
+    ):
+        self.keep_last = max(1, keep_last)
+        self.fold_batch = max(1, fold_batch)
+        self.default_budget = default_budget
+        self.budgets = {**DEFAULT_AGENT_BUDGETS, **(budgets or {})}
+        self.summary_model = summary_model or None
+
+    def budget_for(self, agent: str) -> int:
+        """Token budget for an agent's history (summary included)."""
+        return self.budgets.get(agent, self.default_budget)
+
+    def _summarized_count(self, context: TutorContext) -> int:
+        """Messages covered by the summary (0 if the history no longer matches it)."""
+        count = context.summarized_count
+        if count > len(context.conversation_history or []):
+            # The client sent a shorter history than the one summarized
+            context.history_summary = None
+            context.summarized_count = 0
+            return 0
+        return count
+
+    def pending_fold(self, context: TutorContext) -> List[Dict[str, str]]:
+        """Messages that have left the verbatim window but are not summarized yet.
+
+        Empty until at least fold_batch messages are waiting, so the summary
+        is updated every few turns rather than on every turn, and capped at
+        2 * fold_batch (oldest first) so a long unsummarized history is
+        caught up over several turns instead of in one large call.
+        """
+        if not context.fold_history:
+            return []
+        history = context.conversation_history or []
+        start = self._summarized_count(context)
+        end = len(history) - self.keep_last
+        if end - start < self.fold_batch:
+            return []
+        return history[start:min(end, start + 2 * self.fold_batch)]
+
+    async def fold(self, context: TutorContext, llm_client: Any) -> bool:
+        """Fold pending messages into context.history_summary.
+
+        Returns:
+            True if the summary was updated. On failure the summary is left
+            as it was and the messages are retried on a later turn.
+        """
+        pending = self.pending_fold(context)
+        if not pending:
+            return False
+        end = context.summarized_count + len(pending)
+        system_prompt = get_conversation_summary_prompt(context.organism, context.history_summary or "")
+        try:
+            response = await llm_client.generate(
+                messages=prepare_llm_messages(pending, system_prompt),
+                model=self.summary_model or context.model_name,
+                tools=None,
+                retries=2,
+            )
+        except Exception as e:
+            logger.warning(f"Conversation summary failed for case {context.case_id}: {e}")
+            return False
+        summary = response if isinstance(response, str) else (response or {}).get("content", "")
+        if not summary or not summary.strip():
+            return False
+        context.history_summary = summary.strip()
+        context.summarized_count = end
+        logger.info(f"Folded {len(pending)} messages into the summary for case {context.case_id} (now covers {end})")
+        return True
+
+    def select(self, context: TutorContext, agent: str) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """(messages, summary) for one agent call.
+
+        messages are the unsummarized tail of the history, trimmed oldest-first
+        to the agent's budget; the latest message is always kept. Without a
+        summary nothing is dropped - trimming would lose those messages
+        entirely rather than leave them summarized.
+        """
+        history = context.conversation_history or []
+        start = self._summarized_count(context)
+        if not start:
+            return history, None
+        summary = context.history_summary
+        recent = history[start:]
+
+        budget = self.budget_for(agent) - (estimate_tokens(summary) if summary else 0)
+        tokens = [estimate_tokens(str(msg.get("content", ""))) for msg in recent]
+        total = sum(tokens)
+        drop = 0
+        while total > budget and drop < len(recent) - 1:
+            total -= tokens[drop]
+            drop += 1
+        if drop:
+            logger.info(f"Context budget for {agent}: dropped {drop} oldest unsummarized messages")
+        return recent[drop:], summary
+
+
+# -------- Singleton --------
+
+_context_window: Optional[ContextWindow] = None
+
+
+def get_context_window() -> Optional[ContextWindow]:
+    """Get the context window from config (CONTEXT_*), or None if disabled."""
+    global _context_window
+    if not getattr(config, "CONTEXT_WINDOW_ENABLED", True):
+        return None
+    if _context_window is None:
+        _context_window = ContextWindow(
+            keep_last=getattr(config, "CONTEXT_KEEP_LAST_MESSAGES", 12),
+            fold_batch=getattr(config, "CONTEXT_SUMMARY_BATCH", 8),
+            default_budget=getattr(config, "CONTEXT_TOKEN_BUDGET", 6000),
+            budgets=parse_budgets(getattr(config, "CONTEXT_TOKEN_BUDGETS", "")),
+            summary_model=getattr(config, "CONTEXT_SUMMARY_MODEL", "") or None,
+        )
+    return _context_window
@@ -0,0 +1,415 @@
+"""
+Local intent router - picks the agent tool without an LLM call when it can.
+
+Every chat turn normally costs two LLM round trips: the tutor LLM decides
+which tool to call, then the tool itself calls the LLM. For most turns the
+choice is obvious from the phase and the wording ("any fever?" during
+information gathering goes to the patient), so this router decides locally
+and only defers to LLM routing when it isn't confident.
+
+Decision order:
+1. Rules (keyword patterns + phase from PHASE_AGENT_MAPPING)
+2. Optional classifier trained on logged routing decisions (scikit-learn)
+3. None -> caller falls back to LLM routing
+
+Train the classifier from logs/agents/*.jsonl:
+    python -m microtutor.services.tutor.intent_router --train
+"""
+
+import json
+import logging
+import os
+import pickle
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from microtutor.schemas.domain.domain import TutorState
+from microtutor.utils.phase_utils import PHASE_AGENT_MAPPING, TOOL_TO_PHASE
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Tools the router may pick (single-input agentic tools)
+ROUTABLE_TOOLS = ("patient", "socratic", "hint", "tests_management", "feedback")
+
+# Agent logs that record a tool's own LLM call (used to label tutor turns)
+_TOOL_LOG_AGENTS = ("patient", "socratic", "hint", "tests_management", "feedback")
+
+# A tool log entry belongs to the preceding tutor turn if it follows within this window
+_LABEL_WINDOW_SECONDS = 60
+
+_HINT_RE = re.compile(
+    r"\b(hint|i'?m stuck|stuck|give me a clue|what should i (ask|do|consider)( next)?|"
+    r"i don'?t know what to|not sure what to|where do i (go|start))\b",
+    re.IGNORECASE,
+)
+_FEEDBACK_RE = re.compile(
+    r"\b(how did i do|feedback|my performance|what could i (have )?improve|review my)\b",
+    re.IGNORECASE,
+)
+_REASONING_RE = re.compile(
+    r"\b(differential|diagnos[ie]s|ddx|i think (it'?s|this is)|could (it|this) be|"
+    r"most likely|likely (cause|organism|pathogen)|rule out|pathogen|organism)\b",
+    re.IGNORECASE,
+)
+_MANAGEMENT_RE = re.compile(
+    r"\b(treat(ment)?|manage(ment)?|antibiotic|antimicrobial|empiric|dose|dosing|"
+    r"regimen|therapy|prescribe|i would (order|start|give)|order (a|an|the)?)\b",
+    re.IGNORECASE,
+)
+_RESULT_RE = re.compile(
+    r"\b(result|results|show(ed|s)?|came back|findings?|values?|levels?|"
+    r"cbc|culture|gram stain|x-?ray|ct|mri|blood work|labs?|ua|urinalysis|pcr|serology)\b",
+    re.IGNORECASE,
+)
+_PATIENT_RE = re.compile(
+    r"(^\s*(any|do you|did you|have you|has|how long|how many|how much|when|where|what|"
+    r"does|is there|are you|can you|tell me)\b)|"
+    r"\b(fever|pain|cough|rash|symptom|history|travel|medication|allerg|vital|exam|"
+    r"temperature|blood pressure|heart rate|smok|alcohol|sexual|contacts?|occupation|"
+    r"pets?|animals?|vaccin|listen|auscultat|palpat|inspect)\w*",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class RouteDecision:
+    """Outcome of local routing. tool is None when the LLM should decide."""
+    tool: Optional[str]
+    confidence: float
+    source: str  # "rule", "classifier" or "none"
+    reason: str = ""
+
+
+def _normalize_state(state: Any) -> TutorState:
+    """Accept TutorState or its string value; INITIALIZING behaves like information gathering."""
+    try:
+        state = TutorState(state)
+    except ValueError:
+        return TutorState.INFORMATION_GATHERING
+    if state == TutorState.INITIALIZING:
+        return TutorState.INFORMATION_GATHERING
+    return state
+
+
+def _is_consistent_with_phase(tool: str, state: TutorState) -> bool:
+    """Only route locally to tools that won't change the phase behind the student's back."""
+    if tool == "hint":
+        return True
+    if tool == "patient" and state == TutorState.TESTS_MANAGEMENT:
+        return True  # Test results come from the patient agent
+    return TOOL_TO_PHASE.get(tool) == state
+
+
+class LocalIntentRouter:
+    """Rule + classifier router in front of the tutor's LLM routing call.
+
+    Thread-safe counters track how often routing is resolved locally
+    (see get_stats()).
+    """
+
+    def __init__(
+        self,
+        model_path: Optional[str] = None,
+        confidence_threshold: float = 0.8,
+        enabled: bool = True,
+    ):
+        self.enabled = enabled
+        self.confidence_threshold = confidence_threshold
+        self.model_path = model_path
+        self.classifier = None
+
+        self._lock = threading.Lock()
+        self._stats: Counter = Counter()
+        self._by_tool: Counter = Counter()
+
+        if model_path:
+            self.load_classifier(model_path)
+
+    # ---------- Classifier ----------
+
+    def load_classifier(self, model_path: str) -> bool:
+        """Load a trained classifier if present (optional)."""
+        if not SKLEARN_AVAILABLE:
+            logger.info("scikit-learn not installed - intent router uses rules only")
+            return False
+        if not os.path.exists(model_path):
+            logger.info(f"No intent classifier at {model_path} - intent router uses rules only")
+            return False
+        try:
+            with open(model_path, "rb") as f:
+                self.classifier = pickle.load(f)
+            logger.info(f"Loaded intent classifier from {model_path}")
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to load intent classifier: {e}")
+            self.classifier = None
+            return False
+
+    def _classify(self, message: str, state: TutorState) -> Optional[Tuple[str, float]]:
+        """Return (tool, probability) from the classifier, if one is loaded."""
+        if self.classifier is None:
+            return None
+        try:
+            probs = self.classifier.predict_proba([_classifier_text(message, state)])[0]
+            best = int(probs.argmax())
+            return str(self.classifier.classes_[best]), float(probs[best])
+        except Exception as e:
+            logger.warning(f"Intent classifier failed: {e}")
+            return None
+
+    # ---------- Rules ----------
+
+    def _apply_rules(self, message: str, state: TutorState) -> RouteDecision:
+        """Keyword + phase rules. Low confidence means "let something else decide"."""
+        text = message.strip()
+
+        if _HINT_RE.search(text):
+            return RouteDecision("hint", 0.9, "rule", "hint request")
+
+        if state == TutorState.FEEDBACK:
+            return RouteDecision("feedback", 0.9, "rule", "feedback phase")
+
+        if state == TutorState.INFORMATION_GATHERING:
+            if _REASONING_RE.search(text) or _FEEDBACK_RE.search(text) or _MANAGEMENT_RE.search(text):
+                return RouteDecision(None, 0.0, "rule", "off-phase wording")
+            if _PATIENT_RE.search(text) or text.endswith("?"):
+                return RouteDecision("patient", 0.9, "rule", "history/exam question")
+
+        elif state == TutorState.DIFFERENTIAL_DIAGNOSIS:
+            if _MANAGEMENT_RE.search(text) or _FEEDBACK_RE.search(text):
+                return RouteDecision(None, 0.0, "rule", "off-phase wording")
+            if _REASONING_RE.search(text):
+                return RouteDecision("socratic", 0.9, "rule", "clinical reasoning")
+
+        elif state == TutorState.TESTS_MANAGEMENT:
+            if _FEEDBACK_RE.search(text):
+                return RouteDecision(None, 0.0, "rule", "off-phase wording")
+            if _RESULT_RE.search(text) and not _MANAGEMENT_RE.search(text) and text.endswith("?"):
+                return RouteDecision("patient", 0.85, "rule", "test result request")
+            if _MANAGEMENT_RE.search(text):
+                return RouteDecision("tests_management", 0.9, "rule", "tests/management planning")
+
+        # Weak prior: the phase's own agent
+        agent = PHASE_AGENT_MAPPING.get(state)
+        return RouteDecision(agent, 0.5 if agent else 0.0, "rule", "phase default")
+
+    # ---------- Public API ----------
+
+    def route(self, message: str, current_state: Any) -> RouteDecision:
+        """Pick a tool for the message, or RouteDecision(tool=None) to defer to the LLM."""
+        if not self.enabled or not message or not message.strip():
+            return RouteDecision(None, 0.0, "none", "disabled or empty")
+
+        state = _normalize_state(current_state)
+        decision = self._apply_rules(message, state)
+
+        if decision.tool is None or decision.confidence < self.confidence_threshold:
+            predicted = self._classify(message, state)
+            if predicted and predicted[1] >= self.confidence_threshold:
+                decision = RouteDecision(predicted[0], predicted[1], "classifier", "classifier")
+
+        if (
+            decision.tool not in ROUTABLE_TOOLS
+            or decision.confidence < self.confidence_threshold
+            or not _is_consistent_with_phase(decision.tool, state)
+        ):
+            decision = RouteDecision(None, decision.confidence, "none", decision.reason)
+
+        self._record(decision)
+        return decision
+
+    def _record(self, decision: RouteDecision) -> None:
+        with self._lock:
+            self._stats["requests"] += 1
+            if decision.tool:
+                self._stats["local_hits"] += 1
+                self._stats[f"source_{decision.source}"] += 1
+                self._by_tool[decision.tool] += 1
+            else:
+                self._stats["llm_fallbacks"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit-rate metrics: share of turns routed without the tutor LLM call."""
+        with self._lock:
+            requests = self._stats["requests"]
+            hits = self._stats["local_hits"]
+            return {
+                "enabled": self.enabled,
+                "classifier_loaded": self.classifier is not None,
+                "confidence_threshold": self.confidence_threshold,
+                "requests": requests,
+                "local_hits": hits,
+                "llm_fallbacks": self._stats["llm_fallbacks"],
+                "hit_rate": (hits / requests) if requests else 0.0,
+                "by_source": {
+                    "rule": self._stats["source_rule"],
+                    "classifier": self._stats["source_classifier"],
+                },
+                "by_tool": dict(self._by_tool),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._by_tool.clear()
+
+
+# -------- Training --------
+
+def _classifier_text(message: str, state: Any) -> str:
+    """Classifier input: phase marker + message, so phase context is a feature."""
+    return f"__phase_{_normalize_state(state).value}__ {message}"
+
+
+def _read_jsonl(path: Path) -> List[Dict[str, Any]]:
+    if not path.exists():
+        return []
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return entries
+
+
+def load_training_examples(logs_dir: str) -> List[Tuple[str, str]]:
+    """Build (classifier_text, tool) pairs from log_agent_context output.
+
+    Two sources in logs/agents/:
+    - router_context.jsonl: explicit routing decisions made by the tutor LLM
+    - tutor_context.jsonl + <tool>_context.jsonl: older turns, labelled with the
+      first tool log written within a short window after each tutor entry
+    """
+    agents_dir = Path(logs_dir) / "agents"
+    examples: List[Tuple[str, str]] = []
+
+    # Explicit LLM routing decisions (only "llm" ones - local decisions would be self-training)
+    for entry in _read_jsonl(agents_dir / "router_context.jsonl"):
+        meta = entry.get("metadata") or {}
+        tool = meta.get("tool")
+        message = (entry.get("conversation_context") or {}).get("user_prompt", "")
+        if meta.get("source") == "llm" and tool in ROUTABLE_TOOLS and message:
+            examples.append((_classifier_text(message, meta.get("phase")), tool))
+
+    # Join older tutor turns with the tool that answered them
+    tool_events: List[Tuple[datetime, str]] = []
+    for agent in _TOOL_LOG_AGENTS:
+        for entry in _read_jsonl(agents_dir / f"{agent}_context.jsonl"):
+            try:
+                tool_events.append((datetime.fromisoformat(entry["timestamp"]), agent))
+            except (KeyError, ValueError):
+                continue
+    tool_events.sort()
+
+    tutor_entries = []
+    for entry in _read_jsonl(agents_dir / "tutor_context.jsonl"):
+        try:
+            tutor_entries.append((datetime.fromisoformat(entry["timestamp"]), entry))
+        except (KeyError, ValueError):
+            continue
+    tutor_entries.sort(key=lambda x: x[0])
+
+    j = 0
+    for i, (ts, entry) in enumerate(tutor_entries):
+        next_ts = tutor_entries[i + 1][0] if i + 1 < len(tutor_entries) else None
+        while j < len(tool_events) and tool_events[j][0] < ts:
+            j += 1
+        if j >= len(tool_events):
+            break
+        tool_ts, tool = tool_events[j]
+        if next_ts is not None and tool_ts >= next_ts:
+            continue
+        if (tool_ts - ts).total_seconds() > _LABEL_WINDOW_SECONDS:
+            continue
+        message = (entry.get("conversation_context") or {}).get("user_prompt", "")
+        if not message or "Let's move onto phase:" in message:
+            continue
+        # Older tutor logs carry no phase - approximate it from the answering tool
+        phase = TOOL_TO_PHASE.get(tool, TutorState.INFORMATION_GATHERING)
+        examples.append((_classifier_text(message, phase), tool))
+
+    return examples
+
+
+def train_intent_classifier(logs_dir: str, output_path: str, min_examples: int = 20) -> Dict[str, Any]:
+    """Train the optional classifier from logged routing decisions and pickle it."""
+    if not SKLEARN_AVAILABLE:
+        raise RuntimeError("scikit-learn is required to train the intent classifier")
+
+    examples = load_training_examples(logs_dir)
+    labels = Counter(tool for _, tool in examples)
+    if len(examples) < min_examples or len(labels) < 2:
+        raise ValueError(
+            f"Not enough labelled routing examples ({len(examples)}, classes={dict(labels)}); "
+            f"need at least {min_examples} across 2+ tools"
+        )
+
+    texts = [t for t, _ in examples]
+    targets = [tool for _, tool in examples]
+
+    pipeline = Pipeline([
+        ("tfidf", TfidfVectorizer(ngram_range=(1, 2), min_df=1, sublinear_tf=True)),
+        ("clf", LogisticRegression(max_iter=1000, class_weight="balanced")),
+    ])
+    pipeline.fit(texts, targets)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(pipeline, f)
+    os.replace(tmp_path, output_path)
+
+    logger.info(f"Trained intent classifier on {len(examples)} examples -> {output_path}")
+    return {"examples": len(examples), "labels": dict(labels), "output_path": output_path}
+
+
+# -------- Singleton --------
+
+_intent_router: Optional[LocalIntentRouter] = None
+
+
+def get_intent_router() -> LocalIntentRouter:
+    """Get the process-wide intent router (configured from config)."""
+    global _intent_router
+    if _intent_router is None:
+        from microtutor.core.config.config_helper import config
+        _intent_router = LocalIntentRouter(
+            model_path=getattr(config, "INTENT_ROUTER_MODEL_PATH", None),
+            confidence_threshold=getattr(config, "INTENT_ROUTER_CONFIDENCE", 0.8),
+            enabled=getattr(config, "INTENT_ROUTER_ENABLED", True),
+        )
+    return _intent_router
+
+
+if __name__ == "__main__":
+    import argparse
+
+    project_root = Path(__file__).resolve().parents[4]
+    parser = argparse.ArgumentParser(description="Train the local intent router classifier")
+    parser.add_argument("--train", action="store_true", help="Train from logs/agents/*.jsonl")
+    parser.add_argument("--logs-dir", default=str(project_root / "logs"))
+    parser.add_argument("--output", default=str(project_root / "data" / "models" / "intent_router.pkl"))
+    args = parser.parse_args()
+
+    if args.train:
+        print(json.dumps(train_intent_classifier(args.logs_dir, args.output), indent=2))
+    else:
+        print(f"{len(load_training_examples(args.logs_dir))} labelled examples in {args.logs_dir}")
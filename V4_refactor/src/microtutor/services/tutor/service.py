@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from datetime import datetime
+import asyncio
 import logging
 import os
 import json
@@ -15,13 +17,17 @@ from microtutor.prompts.tutor_prompt import (
     get_first_pt_sentence_generation_user_prompt
 )
 from microtutor.services.case import get_case
-from microtutor.core.llm.llm_client import LLMClient
+from microtutor.core.llm.llm_client import AsyncLLMClient
 from microtutor.services.guideline.cache import get_guidelines_cache
+from microtutor.services.tutor.intent_router import LocalIntentRouter, get_intent_router
+from microtutor.services.tutor.context_window import ContextWindow, get_context_window
 from microtutor.utils.conversation_utils import (
     filter_system_messages,
+    strip_feedback_blocks,
     prepare_llm_messages,
     get_cached_first_pt_sentence,
-    has_cached_case
+    has_cached_case,
+    normalize_organism_name,
 )
 from microtutor.utils.phase_utils import (
     PHASE_AGENT_MAPPING,
@@ -44,7 +50,26 @@ class ServiceConfig:
     model_name: str
     enable_feedback: bool = True
     fallback_model: str = "gpt-5"
+    max_concurrent_tools: int = 4  # Tool calls from one tutor turn run in parallel up to this
+    tool_timeout_s: float = 120.0  # Per-tool time budget before a ToolTimeoutError result
     first_pt_sentence_json_relpath: str = os.path.join("data", "cases", "cached", "ambiguous_with_ages.json")
+    max_tracked_prefetches: int = 512  # Guideline prefetch tasks remembered for status queries
+
+
+@dataclass
+class GuidelinePrefetch:
+    """Background guideline lookup started by start_case for one case."""
+    organism: str
+    task: asyncio.Task
+    started_at: datetime = field(default_factory=datetime.now)
+
+    @property
+    def status(self) -> str:
+        if not self.task.done():
+            return "running"
+        if self.task.cancelled():
+            return "cancelled"
+        return "failed" if self.task.exception() is not None else "ready"
 
 # -------- TutorService --------
 
@@ -54,18 +79,23 @@ class TutorService:
         *,
         cfg: Optional[ServiceConfig] = None,
         tool_engine: Optional[ToolEngine] = None,
-        llm_client: Optional[LLMClient] = None,  # Now using concrete LLMClient, not protocol
+        llm_client: Optional[AsyncLLMClient] = None,  # Async client so LLM calls don't block the event loop
         feedback_client: Optional[FeedbackClient] = None,
         project_root: Optional[str] = None,
         enable_guidelines_prefetch: bool = True,  # Enable async guideline pre-fetching
+        intent_router: Optional[LocalIntentRouter] = None,  # Local routing before the tutor LLM call
+        context_window: Optional[ContextWindow] = None,  # Bounded history per LLM call (None = from config)
     ):
         self.cfg = cfg or ServiceConfig(model_name=global_config.API_MODEL_NAME, enable_feedback=True)
         self.tool_engine: ToolEngine = tool_engine or get_tool_engine()
-        self.llm_client = llm_client or LLMClient(model=self.cfg.model_name)
+        self.llm_client = llm_client or AsyncLLMClient(model=self.cfg.model_name)
         self.feedback_client = feedback_client if self.cfg.enable_feedback else None
         self.enable_guidelines_prefetch = enable_guidelines_prefetch
+        self.intent_router = intent_router or get_intent_router()
+        self.context_window = context_window or get_context_window()
 
         self.interaction_counter = 0
+        self._guideline_prefetches: "OrderedDict[str, GuidelinePrefetch]" = OrderedDict()  # case_id -> prefetch
 
         # Resolve project root: go up 3 levels from services/ to V4_refactor/
         # __file__ is at: V4_refactor/src/microtutor/services/tutor/service.py
@@ -94,7 +124,7 @@ class TutorService:
     # ---------- Public API ----------
 
 
-    def _generate_first_pt_sentence_via_llm(self, case_description: str, model: str) -> str:
+    async def _generate_first_pt_sentence_via_llm(self, case_description: str, model: str) -> str:
         """Generate first patient sentence via LLM in the format of ambiguous_with_ages.json.
         
         The generated sentence should be a brief, ambiguous initial presentation
@@ -115,7 +145,7 @@ class TutorService:
             {"role": "user", "content": user_prompt}
         ]
         
-        response = self.llm_client.generate(
+        response = await self.llm_client.generate(
             messages=messages,
             model=model,
             tools=None,
@@ -159,14 +189,8 @@ class TutorService:
         t0 = datetime.now()
         model = model_name or self.cfg.model_name
 
-        # Check if organism has cached case (get in-memory cache if available)
-        from microtutor.services.case import CaseGeneratorRAGAgent
-        case_generator = CaseGeneratorRAGAgent()
-        organism_has_cached_case = has_cached_case(
-            organism,
-            self._cached_cases_dir,
-            case_generator_cache=case_generator.case_cache
-        )
+        # Check if organism has cached case (shared in-memory case store)
+        organism_has_cached_case = has_cached_case(organism, self._cached_cases_dir)
         
         # Get or generate case description
         case_desc = get_case(organism)
@@ -180,7 +204,7 @@ class TutorService:
         if not first_pt_sentence:
             # b) or c) Generate first_pt_sentence via LLM (using the case description)
             logger.info("Generating first patient sentence via LLM")
-            first_pt_sentence = self._generate_first_pt_sentence_via_llm(case_desc, model)
+            first_pt_sentence = await self._generate_first_pt_sentence_via_llm(case_desc, model)
 
         # Format welcome message
         response_text = (
@@ -191,11 +215,10 @@ class TutorService:
             "management and feedback."
         )
 
-        # Reset guidelines cache for this session if enabled
+        # Fetch guidelines in the background so the management phase finds them ready
         if self.enable_guidelines_prefetch and self.guidelines_cache:
-            # We don't need to clear the whole cache, just ensure we're starting fresh
-            # The client should clear its local state, but we can log it here
-            logger.info(f"Starting new case {case_id} - guidelines prefetch enabled: {enable_guidelines}")
+            self._schedule_guideline_prefetch(case_id, organism, case_desc)
+            logger.info(f"Starting new case {case_id} - guidelines prefetch scheduled (enabled: {enable_guidelines})")
 
         # Return immediately (guidelines load in background)
         dt_ms = (datetime.now() - t0).total_seconds() * 1000
@@ -221,17 +244,218 @@ class TutorService:
         feedback_threshold: Optional[float] = None,
     ) -> TutorResponse:
         t0 = datetime.now()
+        early, feedback_struct, tutor_system_prompt, fold = await self._begin_turn(
+            message, context, feedback_enabled, feedback_threshold, t0
+        )
+        if early is not None:
+            await self._finish_fold(fold)
+            return early
+
+        # 4) Route: local intent router if confident, else LLM call with tools
+        response = await self._route_turn(message, context, tutor_system_prompt)
+
+        # 5) Handle tool calls or direct text response
+        tools_used: List[str] = []
+        if isinstance(response, dict) and "tool_calls" in response:
+            # Tool calling flow: execute ALL tools and return results directly
+            # In our educational system, tools are agentic responses (patient, socratic, etc.)
+            # that provide the final response - no synthesis needed
+            result_text, tools_used = await self._execute_all_tool_calls(response["tool_calls"], context)
+        else:
+            # Direct text response (no tools called)
+            result_text = response if isinstance(response, str) else (response.get("content", "") if response else "")
+
+        if not result_text:
+            raise ValueError("LLM returned empty response.")
+
+        await self._finish_fold(fold)
+        return self._complete_turn(result_text, tools_used, context, feedback_struct, t0)
+
+    async def process_message_stream(
+        self,
+        message: str,
+        context: TutorContext,
+        feedback_enabled: Optional[bool] = None,
+        feedback_threshold: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming version of process_message.
+        
+        Yields {"type": "delta", "content": str} events as the final agent's tokens
+        arrive, then one {"type": "done", "response": TutorResponse} event. Direct
+        tutor replies stream from the routing call itself and a single tool call
+        streams token by token; multiple tool calls and phase-transition answers
+        arrive as one delta. The done event's content is authoritative (any text
+        the tutor emitted before deciding to call a tool is not part of it).
+        """
+        t0 = datetime.now()
+        early, feedback_struct, tutor_system_prompt, fold = await self._begin_turn(
+            message, context, feedback_enabled, feedback_threshold, t0
+        )
+        if early is not None:
+            await self._finish_fold(fold)
+            yield {"type": "delta", "content": early.content}
+            yield {"type": "done", "response": early}
+            return
+
+        # Route while streaming: a direct tutor reply reaches the client as it is generated
+        streamed: List[str] = []
+        tool_calls: Optional[List[Any]] = None
+        async for event in self._stream_route_turn(message, context, tutor_system_prompt):
+            if event["type"] == "delta":
+                streamed.append(event["content"])
+                yield event
+            else:
+                tool_calls = event["tool_calls"]
+
+        tools_used: List[str] = []
+        if tool_calls and len(tool_calls) == 1:
+            (tool_name, tool_args, guidelines_debug), = await self._prepare_tool_calls(tool_calls, context)
+            result: Dict[str, Any] = {}
+            async for event in self.tool_engine.astream_tool(tool_name, tool_args, timeout=self.cfg.tool_timeout_s):
+                if event["type"] == "delta":
+                    yield event
+                else:
+                    result = event["result"]
+            result_text = self._format_tool_result(tool_name, result, guidelines_debug)
+            if result.get("success"):
+                if guidelines_debug:
+                    yield {"type": "delta", "content": f"\n\n{guidelines_debug}"}
+            else:
+                yield {"type": "delta", "content": result_text}
+            tools_used = [tool_name]
+        elif tool_calls:
+            result_text, tools_used = await self._execute_all_tool_calls(tool_calls, context)
+            yield {"type": "delta", "content": result_text}
+        else:
+            result_text = "".join(streamed)
+
+        if not result_text:
+            raise ValueError("LLM returned empty response.")
+
+        await self._finish_fold(fold)
+        yield {"type": "done", "response": self._complete_turn(result_text, tools_used, context, feedback_struct, t0)}
+
+    async def _route_turn(self, message: str, context: TutorContext, tutor_system_prompt: str) -> Union[str, Dict[str, Any], None]:
+        """Pick the tool for this turn.
+        
+        The local intent router answers obvious turns without an LLM call and
+        returns a tool call in the same shape the LLM would. Otherwise the tutor
+        LLM decides which tool to call (or replies directly).
+        """
+        local = self._route_locally(message, context)
+        if local is not None:
+            return local
+
+        history, summary = self._history_for(context, "tutor")
+        llm_messages = prepare_llm_messages(history, tutor_system_prompt, summary=summary)
+        response = await self.llm_client.generate(
+            messages=llm_messages,
+            model=context.model_name,
+            tools=self.tool_engine.get_tool_schemas(),
+            retries=4,
+            fallback_model=self.cfg.fallback_model
+        )
+        # Record the LLM's choice - these are the intent classifier's training labels
+        if isinstance(response, dict) and response.get("tool_calls"):
+            tool_name, _ = self._parse_tool_call(response["tool_calls"][0])
+            self._log_route(message, context, tool_name, "llm", None)
+        return response
+
+    async def _stream_route_turn(
+        self, message: str, context: TutorContext, tutor_system_prompt: str
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Streaming _route_turn.
+        
+        Yields {"type": "delta", "content": str} events while the tutor LLM
+        answers directly, or one {"type": "tool_calls", "tool_calls": [...]}
+        event when a tool should answer (from the local router, without an
+        LLM call, or from the streamed routing call).
+        """
+        local = self._route_locally(message, context)
+        if local is not None:
+            yield {"type": "tool_calls", "tool_calls": local["tool_calls"]}
+            return
+
+        history, summary = self._history_for(context, "tutor")
+        llm_messages = prepare_llm_messages(history, tutor_system_prompt, summary=summary)
+        async for event in self.llm_client.generate_stream_with_tools(
+            messages=llm_messages,
+            tools=self.tool_engine.get_tool_schemas(),
+            model=context.model_name,
+            retries=4,
+            fallback_model=self.cfg.fallback_model
+        ):
+            if event["type"] == "tool_calls":
+                tool_name, _ = self._parse_tool_call(event["tool_calls"][0])
+                self._log_route(message, context, tool_name, "llm", None)
+            yield event
+
+    def _route_locally(self, message: str, context: TutorContext) -> Optional[Dict[str, Any]]:
+        """Tool call from the local intent router, or None if the LLM should decide."""
+        decision = self.intent_router.route(message, context.current_state)
+        if not decision.tool:
+            return None
+        logger.info("Intent router: %s (%s, %.2f)", decision.tool, decision.source, decision.confidence)
+        self._log_route(message, context, decision.tool, decision.source, decision.confidence)
+        return {
+            "content": "",
+            "tool_calls": [{
+                "function": {
+                    "name": decision.tool,
+                    "arguments": json.dumps({"input_text": message}),
+                }
+            }],
+        }
+
+    def _log_route(
+        self, message: str, context: TutorContext, tool: str, source: str, confidence: Optional[float]
+    ) -> None:
+        """Log a routing decision to logs/agents/router_context.jsonl."""
+        phase = getattr(context.current_state, "value", context.current_state)
+        log_agent_context(
+            case_id=context.case_id,
+            agent_name="router",
+            interaction_id=self.interaction_counter,
+            system_prompt="",
+            user_prompt=message,
+            metadata={"tool": tool, "source": source, "confidence": confidence, "phase": phase},
+        )
+
+    async def _begin_turn(
+        self,
+        message: str,
+        context: TutorContext,
+        feedback_enabled: Optional[bool],
+        feedback_threshold: Optional[float],
+        t0: datetime,
+    ) -> Tuple[Optional[TutorResponse], List[Dict[str, Any]], str, Optional[asyncio.Task]]:
+        """Shared first half of a chat turn (everything before tutor routing).
+        
+        Returns:
+            (early_response, feedback_examples, tutor_system_prompt, fold_task).
+            early_response is set when the turn is already answered (phase
+            transition commands). fold_task updates the conversation summary in
+            the background; pass it to _finish_fold() before _complete_turn().
+        """
         logger.info("process_message: case_id=%s", context.case_id)
 
         # 0) Filter out any system messages from incoming history (chat history should be clean)
-        context.conversation_history = filter_system_messages(context.conversation_history)
+        # and drop feedback examples injected into earlier turns (only this turn's are relevant)
+        context.conversation_history = strip_feedback_blocks(filter_system_messages(context.conversation_history))
         
         # 0.5) Load case description if not already set (needed for agentic tools)
         if not context.case_description and context.organism:
             from microtutor.services.case import get_case
-            context.case_description = get_case(context.organism)
+            case_desc = get_case(context.organism)
+            if not case_desc:
+                # No pre-generated case and CASE_GENERATION_ON_DEMAND is off
+                raise ValueError(f"Could not load or generate case for organism: {context.organism}")
+            context.case_description = case_desc
             logger.info(f"Loaded case description for organism: {context.organism}")
         
+        # Fold expired turns into the summary while this turn is answered
+        fold = self._start_fold(context)
+        
         # 1) Phase transition command (if present) - acts as tool call to activate specific agent
         if "Let's move onto phase:" in message:
             phase_name = message.split("Let's move onto phase:")[1].strip()
@@ -240,7 +464,7 @@ class TutorService:
                 return self._finalize_response(
                     TutorResponse(content=f"Phase transition error: {err}", tools_used=[], metadata={"error": "invalid_phase_transition"}),
                     t0
-                )
+                ), [], "", fold
             
             # Enforce forward-only transition
             if not is_forward_transition(context.current_state, new_state):
@@ -251,7 +475,7 @@ class TutorService:
                         metadata={"error": "backward_phase_transition"}
                     ),
                     t0
-                )
+                ), [], "", fold
             
             # Generate summary if moving forward
             summary = ""
@@ -290,7 +514,7 @@ class TutorService:
                         context.conversation_history.append({"role": "assistant", "content": routed.content})
                     if summary:
                         routed.content = f"**Summary of Skipped Sections:**\n{summary}\n\n---\n\n{routed.content}"
-                    return self._finalize_response(routed, t0)
+                    return self._finalize_response(routed, t0), [], "", fold
             # If no agent found for phase, continue to LLM routing
 
         # 2) Optional feedback (no global mutations)
@@ -301,21 +525,33 @@ class TutorService:
         logger.info(f"[FEEDBACK_DEBUG] feedback_enabled={feedback_enabled}, feedback_client={self.feedback_client is not None}, use_feedback={use_feedback}")
         
         if use_feedback:
-            feedback_str = self.feedback_client.get_examples_for_tool(
-                user_input=message,
-                conversation_history=context.conversation_history,
-                tool_name="tutor",
-                include_feedback=True,
-                similarity_threshold=feedback_threshold,
-            ) or ""
-            retrieved = self.feedback_client.retrieve_feedback_examples(
-                current_message=message,
-                conversation_history=context.conversation_history,
-                message_type="all",  # Use "all" to get all feedback types
-                k=3,  # Increase to get more examples
-                similarity_threshold=feedback_threshold,
-            ) or []
-            feedback_struct = retrieved
+            organism_scope = context.organism if getattr(global_config, "FEEDBACK_ORGANISM_SCOPED", False) else None
+
+            def retrieve_feedback() -> Tuple[str, List[Dict[str, Any]]]:
+                # Embed once per turn; both views below run their filtered search with it
+                retrieval = self.feedback_client.retrieval_context(
+                    message, context.conversation_history, "all", organism_scope
+                )
+                prompt_examples = self.feedback_client.get_examples_for_tool(
+                    user_input=message,
+                    conversation_history=context.conversation_history,
+                    tool_name="tutor",
+                    include_feedback=True,
+                    similarity_threshold=feedback_threshold,
+                    retrieval=retrieval,
+                ) or ""
+                frontend_examples = self.feedback_client.retrieve_feedback_examples(
+                    current_message=message,
+                    conversation_history=context.conversation_history,
+                    message_type="all",  # Use "all" to get all feedback types
+                    k=3,  # Increase to get more examples
+                    similarity_threshold=feedback_threshold,
+                    retrieval=retrieval,
+                ) or []
+                return prompt_examples, frontend_examples
+
+            # Off the event loop (embedding call + local index searches)
+            feedback_str, feedback_struct = await asyncio.to_thread(retrieve_feedback)
             
             # Debug logging for feedback retrieval
             logger.info(f"[FEEDBACK_DEBUG] Retrieved {len(feedback_struct)} feedback examples")
@@ -368,30 +604,37 @@ class TutorService:
             metadata={"model": context.model_name, "feedback_enabled": bool(use_feedback), "organism": context.organism},
         )
 
-        # 4) LLM call with tools - tutor decides which tool to call
-        llm_messages = prepare_llm_messages(context.conversation_history, tutor_system_prompt)
-        response = self.llm_client.generate(
-            messages=llm_messages,
-            model=context.model_name,
-            tools=self.tool_engine.get_tool_schemas(),
-            retries=4,
-            fallback_model=self.cfg.fallback_model
+        return None, feedback_struct, tutor_system_prompt, fold
+
+    def _start_fold(self, context: TutorContext) -> Optional[asyncio.Task]:
+        """Start folding expired messages into the conversation summary, if any are due."""
+        if self.context_window is None or not self.context_window.pending_fold(context):
+            return None
+        return asyncio.create_task(
+            self.context_window.fold(context, self.llm_client),
+            name=f"context-fold-{context.case_id}",
         )
 
-        # 5) Handle tool calls or direct text response
-        tools_used: List[str] = []
-        if isinstance(response, dict) and "tool_calls" in response:
-            # Tool calling flow: execute ALL tools and return results directly
-            # In our educational system, tools are agentic responses (patient, socratic, etc.)
-            # that provide the final response - no synthesis needed
-            result_text, tools_used = await self._execute_all_tool_calls(response["tool_calls"], context)
-        else:
-            # Direct text response (no tools called)
-            result_text = response if isinstance(response, str) else (response.get("content", "") if response else "")
+    async def _finish_fold(self, fold: Optional[asyncio.Task]) -> None:
+        """Wait for this turn's summary fold so the saved context includes it."""
+        if fold is not None:
+            await fold  # fold() logs and swallows its own errors
 
-        if not result_text:
-            raise ValueError("LLM returned empty response.")
+    def _history_for(self, context: TutorContext, agent: str) -> Tuple[List[Dict[str, str]], Optional[str]]:
+        """(history, summary) an agent sees this turn (full history if the window is disabled)."""
+        if self.context_window is None:
+            return context.conversation_history or [], None
+        return self.context_window.select(context, agent)
 
+    def _complete_turn(
+        self,
+        result_text: str,
+        tools_used: List[str],
+        context: TutorContext,
+        feedback_struct: List[Dict[str, Any]],
+        t0: datetime,
+    ) -> TutorResponse:
+        """Shared last step of a chat turn: record the reply, advance the phase, build the response."""
         # 6) Update convo + phase; return
         # Ensure we're not duplicating the assistant's message if it was already added by a tool
         # In this architecture, the tool output IS the assistant's message, so we append it here.
@@ -460,7 +703,7 @@ class TutorService:
             
             messages = prepare_llm_messages(relevant_history, prompt)
             
-            response = self.llm_client.generate(
+            response = await self.llm_client.generate(
                 messages=messages,
                 model=context.model_name,
                 tools=None, # No tools for summarization
@@ -474,8 +717,92 @@ class TutorService:
             logger.error(f"Error generating phase summary: {e}")
             return ""
 
+    def get_guideline_prefetch_status(self, case_id: str) -> Dict[str, Any]:
+        """Status of the background guideline prefetch for a case.
+        
+        Returns:
+            Dict with status: not_started | running | ready | failed | cancelled
+        """
+        prefetch = self._guideline_prefetches.get(case_id)
+        if prefetch is None:
+            return {"case_id": case_id, "status": "not_started"}
+        info: Dict[str, Any] = {
+            "case_id": case_id,
+            "organism": prefetch.organism,
+            "status": prefetch.status,
+            "started_at": prefetch.started_at.isoformat(),
+        }
+        if info["status"] == "ready":
+            info["guidelines_found"] = len(prefetch.task.result().get("found_guidelines", []))
+        elif info["status"] == "failed":
+            info["error"] = str(prefetch.task.exception())
+        return info
+
+    def cancel_guideline_prefetch(self, case_id: str) -> bool:
+        """Cancel a running guideline prefetch (e.g. the session was abandoned).
+        
+        Returns:
+            True if a running task was cancelled
+        """
+        prefetch = self._guideline_prefetches.get(case_id)
+        if prefetch is None or prefetch.task.done():
+            return False
+        prefetch.task.cancel()
+        logger.info(f"Cancelled guideline prefetch for case {case_id}")
+        return True
+
     # ---------- Internals ----------
 
+    def _schedule_guideline_prefetch(self, case_id: str, organism: str, case_description: str) -> None:
+        """Start the guideline lookup for a new case as a background task."""
+        # Restarting a case supersedes its previous prefetch
+        self.cancel_guideline_prefetch(case_id)
+        self._guideline_prefetches.pop(case_id, None)
+        
+        # Bound the registry: forget the oldest finished prefetches first
+        while len(self._guideline_prefetches) >= self.cfg.max_tracked_prefetches:
+            oldest_done = next((cid for cid, p in self._guideline_prefetches.items() if p.task.done()), None)
+            if oldest_done is None:
+                _, oldest = self._guideline_prefetches.popitem(last=False)
+                oldest.task.cancel()
+            else:
+                del self._guideline_prefetches[oldest_done]
+        
+        task = asyncio.create_task(
+            self.guidelines_cache.prefetch_guidelines_for_organism(organism, case_description),
+            name=f"guideline-prefetch-{case_id}",
+        )
+        
+        def _log_result(t: asyncio.Task) -> None:
+            if t.cancelled():
+                return
+            if t.exception() is not None:
+                logger.warning(f"Guideline prefetch failed for case {case_id}: {t.exception()}")
+            else:
+                logger.info(f"Guideline prefetch ready for case {case_id}")
+        
+        task.add_done_callback(_log_result)
+        self._guideline_prefetches[case_id] = GuidelinePrefetch(organism=organism, task=task)
+
+    async def _await_guideline_prefetch(self, context: TutorContext) -> Optional[Dict[str, Any]]:
+        """Result of this case's background prefetch, waiting if it is still running.
+        
+        Returns None if there is no usable prefetch (none started, different
+        organism, cancelled or failed) so the caller fetches directly.
+        """
+        prefetch = self._guideline_prefetches.get(context.case_id or "")
+        if prefetch is None or normalize_organism_name(prefetch.organism) != normalize_organism_name(context.organism or ""):
+            return None
+        try:
+            # Shield: if this request is cancelled, the prefetch still completes for the next turn
+            return await asyncio.shield(prefetch.task)
+        except asyncio.CancelledError:
+            if prefetch.task.cancelled():
+                return None
+            raise
+        except Exception:
+            return None  # Already logged by the task's done callback
+
     async def _load_and_format_guidelines(
         self,
         context: TutorContext,
@@ -489,6 +816,9 @@ class TutorService:
         try:
             # Always load for management/MCQ tools
             if not context.guidelines:
+                context.guidelines = await self._await_guideline_prefetch(context)
+            if not context.guidelines:
+                # No background result - fetch now (served from the result cache when warm)
                 context.guidelines = await self.guidelines_cache.prefetch_guidelines_for_organism(
                     context.organism, context.case_description
                 )
@@ -537,12 +867,13 @@ class TutorService:
         try:
             # Pass filtered history (no system prompts) to tools
             # Tools will add their own system prompt when calling LLM
-            filtered_history = filter_system_messages(context.conversation_history or [])
+            filtered_history, summary = self._history_for(context, agent)
             
             tool_args = {
                 "input_text": message,
                 "case": context.case_description,
-                "conversation_history": filtered_history,
+                "conversation_history": filter_system_messages(filtered_history),
+                "conversation_summary": summary,
                 "model": context.get_model_name(),
                 "organism": context.organism or "",
             }
@@ -552,7 +883,7 @@ class TutorService:
             if agent == "tests_management":
                 guidelines_debug = await self._load_and_format_guidelines(context, agent, tool_args)
             
-            result = self.tool_engine.execute_tool(agent, tool_args)
+            result = await self.tool_engine.aexecute_tool(agent, tool_args, timeout=self.cfg.tool_timeout_s)
             if not result.get("success"):
                 logger.error("Phase agent %s failed: %s", agent, result.get("error"))
                 return None
@@ -598,6 +929,9 @@ class TutorService:
         This follows ToolUniverse's pattern of handling multiple tool calls but adapted
         for our human-in-the-loop educational interaction model.
         
+        Calls run concurrently (bounded by cfg.max_concurrent_tools, each limited to
+        cfg.tool_timeout_s); results are combined in the order the LLM returned them.
+        
         Args:
             tool_calls: List of tool calls from LLM
             context: Current conversation context
@@ -608,84 +942,121 @@ class TutorService:
         if not tool_calls:
             return "", []
         
+        # Prepare ALL tool calls (not just first) before running any of them
+        prepared = await self._prepare_tool_calls(tool_calls, context)
+        
+        semaphore = asyncio.Semaphore(max(1, self.cfg.max_concurrent_tools))
+        
+        async def run_one(tool_name: str, tool_args: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                hist_len = len(context.conversation_history or [])
+                logger.info(
+                    f"Executing tool: {tool_name} with args keys={list(tool_args.keys())} history_len={hist_len}"
+                )
+                if hist_len:
+                    try:
+                        last = context.conversation_history[-1]
+                        logger.info(
+                            f"[TOOL_CTX] last_msg role={last.get('role')} content={str(last.get('content',''))[:120]}..."
+                        )
+                    except Exception:
+                        pass
+                return await self.tool_engine.aexecute_tool(
+                    tool_name, tool_args, timeout=self.cfg.tool_timeout_s
+                )
+        
+        # gather() keeps results in call order regardless of completion order
+        tool_results = await asyncio.gather(
+            *(run_one(tool_name, tool_args) for tool_name, tool_args, _ in prepared)
+        )
+        
         tools_used = []
         results = []
+        for (tool_name, _, guidelines_debug), result in zip(prepared, tool_results):
+            results.append(self._format_tool_result(tool_name, result, guidelines_debug))
+            tools_used.append(tool_name)
+        
+        # Combine results if multiple tools were called
+        # In practice, we typically only call one agentic tool at a time,
+        # but this handles the general case
+        combined_result = "\n\n---\n\n".join(results) if len(results) > 1 else (results[0] if results else "")
+        
+        return combined_result, tools_used
+
+    async def _prepare_tool_calls(
+        self,
+        tool_calls: List[Any],
+        context: TutorContext
+    ) -> List[Tuple[str, Dict[str, Any], Optional[str]]]:
+        """Parse and augment tool calls. Returns (tool_name, tool_args, guidelines_debug) per call.
         
-        # Execute ALL tool calls (not just first)
+        Guidelines are fetched at most once per turn: the first tool that needs
+        them populates context.guidelines and the others reuse it.
+        """
+        prepared: List[Tuple[str, Dict[str, Any], Optional[str]]] = []
         for tool_call in tool_calls:
-            # Extract tool info
-            if hasattr(tool_call, 'function'):
-                tool_name = tool_call.function.name
-                tool_args = tool_call.function.arguments
-            else:
-                tool_name = tool_call["function"]["name"]
-                tool_args = tool_call["function"]["arguments"]
-            
-            # Parse JSON arguments
-            if isinstance(tool_args, str):
-                try:
-                    tool_args = json.loads(tool_args)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Failed to parse tool arguments for {tool_name}: {e}")
-                    tool_args = {}
+            tool_name, tool_args = self._parse_tool_call(tool_call)
             
             # Load and add guidelines if tool needs them (Management or MCQ)
             guidelines_debug = None
             if tool_name in ["tests_management", "mcq_tool"]:
                 guidelines_debug = await self._load_and_format_guidelines(context, tool_name, tool_args)
             
-            # Augment tool args with context for agentic tools
-            # These tools need case, conversation_history, model to function properly
-            if tool_name in ["patient", "socratic", "tests_management", "feedback", "mcq_tool", "post_case_assessment"]:
-                tool_args["case"] = context.case_description or ""
-                tool_args["conversation_history"] = context.conversation_history or []
-                tool_args["model"] = context.model_name or global_config.API_MODEL_NAME or "gpt-5"
-                tool_args["case_id"] = context.case_id or ""
-                tool_args["organism"] = context.organism or ""
-            elif tool_name == "hint":
-                # Hint tool does NOT get the full case - only conversation history
-                # This prevents leaking undiscovered case information
-                tool_args["case"] = ""  # No case access
-                tool_args["conversation_history"] = context.conversation_history or []
-                tool_args["model"] = context.model_name or global_config.API_MODEL_NAME or "gpt-5"
-                tool_args["case_id"] = context.case_id or ""
-            
-            # Execute tool
-            hist_len = len(context.conversation_history or [])
-            logger.info(
-                f"Executing tool: {tool_name} with args keys={list(tool_args.keys())} history_len={hist_len}"
-            )
-            if hist_len:
-                try:
-                    last = context.conversation_history[-1]
-                    logger.info(
-                        f"[TOOL_CTX] last_msg role={last.get('role')} content={str(last.get('content',''))[:120]}..."
-                    )
-                except Exception:
-                    pass
-            result = self.tool_engine.execute_tool(tool_name, tool_args)
-            
-            # Collect results
-            if result.get("success"):
-                res_content = str(result.get("result", ""))
-                # If guidelines were loaded and debug info is available, append it to the response
-                if guidelines_debug:
-                    res_content += f"\n\n{guidelines_debug}"
-                results.append(res_content)
-            else:
-                error = result.get("error", {})
-                error_msg = f"Tool {tool_name} failed: {error.get('message', 'Unknown error')}"
-                logger.error(error_msg)
-                results.append(error_msg)
-            
-            tools_used.append(tool_name)
+            self._augment_tool_args(tool_name, tool_args, context)
+            prepared.append((tool_name, tool_args, guidelines_debug))
+        return prepared
+
+    def _format_tool_result(self, tool_name: str, result: Dict[str, Any], guidelines_debug: Optional[str]) -> str:
+        """Turn a tool result dict into response text (error text on failure)."""
+        if result.get("success"):
+            res_content = str(result.get("result", ""))
+            # If guidelines were loaded and debug info is available, append it to the response
+            if guidelines_debug:
+                res_content += f"\n\n{guidelines_debug}"
+            return res_content
         
-        # Combine results if multiple tools were called
-        # In practice, we typically only call one agentic tool at a time,
-        # but this handles the general case
-        combined_result = "\n\n---\n\n".join(results) if len(results) > 1 else (results[0] if results else "")
+        error = result.get("error", {})
+        error_msg = f"Tool {tool_name} failed: {error.get('message', 'Unknown error')}"
+        logger.error(error_msg)
+        return error_msg
+
+    def _parse_tool_call(self, tool_call: Any) -> Tuple[str, Dict[str, Any]]:
+        """Extract tool name and parsed JSON arguments from an LLM tool call."""
+        if hasattr(tool_call, 'function'):
+            tool_name = tool_call.function.name
+            tool_args = tool_call.function.arguments
+        else:
+            tool_name = tool_call["function"]["name"]
+            tool_args = tool_call["function"]["arguments"]
         
-        return combined_result, tools_used
+        # Parse JSON arguments
+        if isinstance(tool_args, str):
+            try:
+                tool_args = json.loads(tool_args)
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse tool arguments for {tool_name}: {e}")
+                tool_args = {}
+        return tool_name, tool_args or {}
+
+    def _augment_tool_args(self, tool_name: str, tool_args: Dict[str, Any], context: TutorContext) -> None:
+        """Add case context to tool args for agentic tools (in place)."""
+        history, summary = self._history_for(context, tool_name)
+        # These tools need case, conversation_history, model to function properly
+        if tool_name in ["patient", "socratic", "tests_management", "feedback", "mcq_tool", "post_case_assessment"]:
+            tool_args["case"] = context.case_description or ""
+            tool_args["conversation_history"] = history
+            tool_args["conversation_summary"] = summary
+            tool_args["model"] = context.model_name or global_config.API_MODEL_NAME or "gpt-5"
+            tool_args["case_id"] = context.case_id or ""
+            tool_args["organism"] = context.organism or ""
+        elif tool_name == "hint":
+            # Hint tool does NOT get the full case - only conversation history
+            # This prevents leaking undiscovered case information
+            tool_args["case"] = ""  # No case access
+            tool_args["conversation_history"] = history
+            tool_args["conversation_summary"] = summary
+            tool_args["model"] = context.model_name or global_config.API_MODEL_NAME or "gpt-5"
+            tool_args["case_id"] = context.case_id or ""
 
     def _finalize_response(self, resp: TutorResponse, t0: datetime) -> TutorResponse:
         resp.processing_time_ms = (datetime.now() - t0).total_seconds() * 1000
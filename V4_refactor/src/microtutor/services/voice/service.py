@@ -9,7 +9,7 @@ import logging
 from pathlib import Path
 from typing import Literal, Optional
 
-from openai import AsyncOpenAI
+from microtutor.core.llm.client_pool import get_openai_client
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +63,7 @@ class VoiceService:
             tts_model: TTS model quality (tts-1 for speed, tts-1-hd for quality).
             default_format: Default audio format (mp3 recommended for web).
         """
-        self.client = AsyncOpenAI(api_key=api_key)
+        self.client = get_openai_client(use_azure=False, is_async=True, api_key=api_key)
         self.tutor_voice = tutor_voice
         self.patient_voice = patient_voice
         self.tts_model = tts_model
@@ -50,6 +50,7 @@ from microtutor.tools.engine import (
     MicroTutorToolEngine,
     get_tool_engine,
     execute_tool,
+    aexecute_tool,
     list_tools,
     get_tool_schemas
 )
@@ -80,6 +81,7 @@ __all__ = [
     'MicroTutorToolEngine',
     'get_tool_engine',
     'execute_tool',
+    'aexecute_tool',
     'list_tools',
     'get_tool_schemas',
     
@@ -2,12 +2,15 @@
 Tool Execution Engine - ToolUniverse-style tool orchestration.
 """
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
 from pathlib import Path
 
 from microtutor.tools.registry import get_registry, register_tool_class
 from microtutor.schemas.tools.tool_models import BaseTool
+from microtutor.schemas.tools.tool_errors import ToolTimeoutError
 
 logger = logging.getLogger(__name__)
 
@@ -79,21 +82,120 @@ class MicroTutorToolEngine:
         tool = self.registry.get_tool_instance(tool_name)
         
         if not tool:
-            return {
-                "result": None,
-                "tool_name": tool_name,
-                "success": False,
-                "cached": False,
-                "execution_time_ms": 0,
-                "error": {
-                    "error_type": "ToolNotFoundError",
-                    "message": f"Tool '{tool_name}' not found",
-                    "tool_name": tool_name
-                }
-            }
+            return self._tool_not_found(tool_name)
         
         return tool.run(arguments, validate=validate, use_cache=use_cache)
     
+    async def aexecute_tool(
+        self,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        validate: bool = True,
+        use_cache: bool = False,
+        timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Execute a tool by name without blocking the event loop.
+        
+        Tools with a native async path are awaited directly; sync-only tools
+        are run in a worker thread (see BaseTool.arun). If timeout (seconds)
+        is given and exceeded, a ToolTimeoutError result is returned.
+        
+        Returns:
+            Dict with: result, tool_name, success, cached, execution_time_ms, error (if failed)
+        """
+        tool = self.registry.get_tool_instance(tool_name)
+        
+        if not tool:
+            return self._tool_not_found(tool_name)
+        
+        if timeout is None:
+            return await tool.arun(arguments, validate=validate, use_cache=use_cache)
+        
+        start_time = datetime.now()
+        try:
+            return await asyncio.wait_for(
+                tool.arun(arguments, validate=validate, use_cache=use_cache),
+                timeout=timeout
+            )
+        except asyncio.TimeoutError:
+            return self._tool_timed_out(tool_name, timeout, start_time)
+    
+    async def astream_tool(
+        self,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        validate: bool = True,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Execute a tool by name, streaming its output.
+        
+        Yields {"type": "delta", "content": str} events, then one
+        {"type": "result", "result": <execute_tool()-style dict>} event.
+        If timeout (seconds) runs out mid-stream, the stream stops and the
+        result event carries a ToolTimeoutError.
+        """
+        tool = self.registry.get_tool_instance(tool_name)
+        
+        if not tool:
+            yield {"type": "result", "result": self._tool_not_found(tool_name)}
+            return
+        
+        if timeout is None:
+            async for event in tool.astream(arguments, validate=validate):
+                yield event
+            return
+        
+        start_time = datetime.now()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        events = tool.astream(arguments, validate=validate).__aiter__()
+        try:
+            while True:
+                try:
+                    event = await asyncio.wait_for(events.__anext__(), timeout=max(0.0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    return
+                except asyncio.TimeoutError:
+                    yield {"type": "result", "result": self._tool_timed_out(tool_name, timeout, start_time)}
+                    return
+                yield event
+        finally:
+            await events.aclose()
+    
+    def _tool_timed_out(self, tool_name: str, timeout: float, start_time: datetime) -> Dict[str, Any]:
+        """Standard result dict for a tool that ran past its timeout."""
+        logger.error(f"Tool '{tool_name}' timed out after {timeout}s")
+        error = ToolTimeoutError(
+            f"Tool '{tool_name}' timed out after {timeout}s",
+            tool_name=tool_name,
+            details={"timeout_s": timeout}
+        )
+        return {
+            "result": None,
+            "tool_name": tool_name,
+            "success": False,
+            "cached": False,
+            "execution_time_ms": (datetime.now() - start_time).total_seconds() * 1000,
+            "error": error.to_dict()
+        }
+    
+    def _tool_not_found(self, tool_name: str) -> Dict[str, Any]:
+        """Standard result dict for an unknown tool."""
+        return {
+            "result": None,
+            "tool_name": tool_name,
+            "success": False,
+            "cached": False,
+            "execution_time_ms": 0,
+            "error": {
+                "error_type": "ToolNotFoundError",
+                "message": f"Tool '{tool_name}' not found",
+                "tool_name": tool_name
+            }
+        }
+    
     def list_tools(self) -> List[str]:
         """List all available tool names."""
         return self.registry.list_tools()
@@ -133,6 +235,11 @@ def execute_tool(tool_name: str, arguments: Optional[Dict[str, Any]] = None, **k
     return get_tool_engine().execute_tool(tool_name, arguments, **kwargs)
 
 
+async def aexecute_tool(tool_name: str, arguments: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+    """Execute tool globally (async)."""
+    return await get_tool_engine().aexecute_tool(tool_name, arguments, **kwargs)
+
+
 def list_tools() -> List[str]:
     """List all tools globally."""
     return get_tool_engine().list_tools()
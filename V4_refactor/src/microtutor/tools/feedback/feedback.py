@@ -3,11 +3,11 @@ FeedbackTool - Feedback agent following ToolUniverse AgenticTool pattern.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from microtutor.schemas.tools.tool_models import AgenticTool
 from microtutor.schemas.tools.tool_errors import ToolLLMError
-from microtutor.core.llm.llm_router import chat_complete
+from microtutor.core.llm.llm_router import achat_complete, chat_complete
 from microtutor.prompts.final_feedback_agent_prompts import get_feedback_system_prompt
 from microtutor.core.logging.logging_config import log_agent_context
 
@@ -26,46 +26,51 @@ class FeedbackTool(AgenticTool):
         super().__init__(config)
         self.interaction_counter = 0
     
+    def _prepare_llm_messages(self, **kwargs) -> Tuple[str, List[Dict[str, str]]]:
+        """Build the model name and message list for case feedback."""
+        model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+        case = kwargs.get('case', '')
+        input_text = kwargs.get('input_text', '')
+        conversation_history = kwargs.get('conversation_history', [])
+        
+        # Get system prompt template and format with case
+        system_prompt_template = get_feedback_system_prompt()
+        system_prompt = system_prompt_template.format(case=case)
+        
+        # Use conversation_history which already includes feedback at the end
+        # Feedback was added to the last user message in tutor_service_v2.py
+        # Prepare messages with system prompt (includes case) + conversation history (which includes feedback)
+        from microtutor.utils.conversation_utils import prepare_llm_messages
+        # Ensure history is passed as list of dicts
+        clean_history = conversation_history if isinstance(conversation_history, list) else []
+        llm_messages = prepare_llm_messages(clean_history, system_prompt, summary=kwargs.get('conversation_summary'))
+        
+        # Check if feedback is in the conversation history (last user message)
+        feedback_in_history = False
+        if conversation_history:
+            last_user_msg = next((msg for msg in reversed(conversation_history) if msg.get("role") == "user"), None)
+            if last_user_msg and "\n\n" in last_user_msg.get("content", ""):
+                # Feedback is typically appended with "\n\n" separator
+                feedback_in_history = True
+        
+        # Log agent context
+        log_agent_context(
+            case_id="feedback_session",
+            agent_name="feedback",
+            interaction_id=self.interaction_counter,
+            system_prompt=system_prompt[:200] + "..." if len(system_prompt) > 200 else system_prompt,
+            user_prompt=input_text,
+            metadata={
+                "case_context": case[:100] + "..." if len(case) > 100 else case,
+                "feedback_included": feedback_in_history
+            }
+        )
+        return model, llm_messages
+    
     def _call_llm(self, prompt: str, **kwargs) -> str:
         """Call LLM to generate comprehensive feedback."""
         try:
-            model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
-            case = kwargs.get('case', '')
-            input_text = kwargs.get('input_text', '')
-            conversation_history = kwargs.get('conversation_history', [])
-            
-            # Get system prompt template and format with case
-            system_prompt_template = get_feedback_system_prompt()
-            system_prompt = system_prompt_template.format(case=case)
-            
-            # Use conversation_history which already includes feedback at the end
-            # Feedback was added to the last user message in tutor_service_v2.py
-            # Prepare messages with system prompt (includes case) + conversation history (which includes feedback)
-            from microtutor.utils.conversation_utils import prepare_llm_messages
-            # Ensure history is passed as list of dicts
-            clean_history = conversation_history if isinstance(conversation_history, list) else []
-            llm_messages = prepare_llm_messages(clean_history, system_prompt)
-            
-            # Check if feedback is in the conversation history (last user message)
-            feedback_in_history = False
-            if conversation_history:
-                last_user_msg = next((msg for msg in reversed(conversation_history) if msg.get("role") == "user"), None)
-                if last_user_msg and "\n\n" in last_user_msg.get("content", ""):
-                    # Feedback is typically appended with "\n\n" separator
-                    feedback_in_history = True
-            
-            # Log agent context
-            log_agent_context(
-                case_id="feedback_session",
-                agent_name="feedback",
-                interaction_id=self.interaction_counter,
-                system_prompt=system_prompt[:200] + "..." if len(system_prompt) > 200 else system_prompt,
-                user_prompt=input_text,
-                metadata={
-                    "case_context": case[:100] + "..." if len(case) > 100 else case,
-                    "feedback_included": feedback_in_history
-                }
-            )
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
             
             # Call LLM with prepared messages (includes system prompt + feedback from conversation_history)
             # Note: system_prompt is already in llm_messages, so we don't pass it separately
@@ -86,6 +91,33 @@ class FeedbackTool(AgenticTool):
             logger.error(f"Feedback tool LLM call failed: {e}")
             raise ToolLLMError(f"LLM call failed: {e}")
     
+    async def _acall_llm(self, prompt: str, **kwargs) -> str:
+        """Async LLM call to generate comprehensive feedback."""
+        try:
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
+            
+            response = await achat_complete(
+                system_prompt="",
+                user_prompt="",
+                model=model,
+                conversation_history=llm_messages
+            )
+            
+            if not response:
+                raise ToolLLMError("Empty response from LLM")
+            
+            self.interaction_counter += 1
+            return response
+            
+        except Exception as e:
+            logger.error(f"Feedback tool LLM call failed: {e}")
+            raise ToolLLMError(f"LLM call failed: {e}")
+    
+    def _finalize_stream(self, text: str, arguments: Dict[str, Any]) -> str:
+        """Count the streamed interaction like a regular LLM call."""
+        self.interaction_counter += 1
+        return text
+    
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute feedback tool."""
         try:
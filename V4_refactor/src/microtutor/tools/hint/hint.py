@@ -3,11 +3,11 @@ HintTool - Hint generation agent following ToolUniverse AgenticTool pattern.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from microtutor.schemas.tools.tool_models import AgenticTool
 from microtutor.schemas.tools.tool_errors import ToolLLMError
-from microtutor.core.llm.llm_router import chat_complete
+from microtutor.core.llm.llm_router import achat_complete, chat_complete
 from microtutor.prompts.hint_prompts import get_hint_system_prompt
 
 logger = logging.getLogger(__name__)
@@ -16,20 +16,24 @@ logger = logging.getLogger(__name__)
 class HintTool(AgenticTool):
     """Provides strategic hints to guide investigation."""
     
+    def _prepare_llm_messages(self, **kwargs) -> Tuple[str, List[Dict[str, str]]]:
+        """Build the model name and message list for a hint."""
+        model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+        conversation_history = kwargs.get('conversation_history', [])
+        
+        # Get system prompt - no case info, only uses conversation history
+        system_prompt = get_hint_system_prompt()
+        
+        # Prepare messages with system prompt + conversation history
+        from microtutor.utils.conversation_utils import prepare_llm_messages
+        # Ensure history is passed as list of dicts
+        clean_history = conversation_history if isinstance(conversation_history, list) else []
+        return model, prepare_llm_messages(clean_history, system_prompt, summary=kwargs.get('conversation_summary'))
+    
     def _call_llm(self, prompt: str, **kwargs) -> str:
         """Call LLM to generate hint."""
         try:
-            model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
-            conversation_history = kwargs.get('conversation_history', [])
-            
-            # Get system prompt - no case info, only uses conversation history
-            system_prompt = get_hint_system_prompt()
-            
-            # Prepare messages with system prompt + conversation history
-            from microtutor.utils.conversation_utils import prepare_llm_messages
-            # Ensure history is passed as list of dicts
-            clean_history = conversation_history if isinstance(conversation_history, list) else []
-            llm_messages = prepare_llm_messages(clean_history, system_prompt)
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
             
             # Call LLM with prepared messages
             response = chat_complete(
@@ -48,14 +52,44 @@ class HintTool(AgenticTool):
             logger.error(f"LLM call failed in {self.name}: {e}")
             raise ToolLLMError(f"Failed to generate hint: {e}", tool_name=self.name)
     
-    def _execute(self, arguments: Dict[str, Any]) -> str:
-        """Execute hint tool."""
-        return self._call_llm(
-            "",
+    async def _acall_llm(self, prompt: str, **kwargs) -> str:
+        """Async LLM call to generate hint."""
+        try:
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
+            
+            response = await achat_complete(
+                system_prompt="",
+                user_prompt="",
+                model=model,
+                conversation_history=llm_messages
+            )
+            
+            if not response or not response.strip():
+                raise ToolLLMError("LLM returned empty response", tool_name=self.name)
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"LLM call failed in {self.name}: {e}")
+            raise ToolLLMError(f"Failed to generate hint: {e}", tool_name=self.name)
+    
+    def _llm_kwargs(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Select the arguments forwarded to the LLM call."""
+        return dict(
             conversation_history=arguments.get('conversation_history', []),
             input_text=arguments.get('input_text', ''),
-            model=arguments.get('model', 'gpt-5')
+            model=arguments.get('model', 'gpt-5'),
+            case_id=arguments.get('case_id'),
+            conversation_summary=arguments.get('conversation_summary')
         )
+    
+    def _execute(self, arguments: Dict[str, Any]) -> str:
+        """Execute hint tool."""
+        return self._call_llm("", **self._llm_kwargs(arguments))
+    
+    async def _aexecute(self, arguments: Dict[str, Any]) -> str:
+        """Execute hint tool without blocking the event loop."""
+        return await self._acall_llm("", **self._llm_kwargs(arguments))
 
 
 # Legacy wrapper for backward compatibility
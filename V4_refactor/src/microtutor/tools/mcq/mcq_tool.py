@@ -138,50 +138,7 @@ This will help reinforce your learning through evidence-based questions derived
                     }
                 }
             
-            # Format MCQ for display
-            formatted_mcq = self._format_mcq_for_display(mcq)
-            
-            # Log interaction
-            log_agent_context(
-                case_id=session_id or "mcq_test",
-                agent_name="mcq_tool",
-                interaction_id=self.interaction_counter,
-                system_prompt="MCQ Generation",
-                user_prompt=f"Generate MCQ for topic: {topic}",
-                feedback_examples="",
-                full_context=case_context[:100] + "..." if len(case_context) > 100 else case_context,
-                metadata={"guidelines_included": True}
-            )
-            
-            self.interaction_counter += 1
-            
-            return {
-                "success": True,
-                "result": formatted_mcq,
-                "mcq_data": {
-                    "question_id": mcq.question_id,
-                    "question_text": mcq.question_text,
-                    "options": [
-                        {
-                            "letter": opt.letter,
-                            "text": opt.text,
-                            "is_correct": opt.is_correct
-                        } for opt in mcq.options
-                    ],
-                    "correct_answer": mcq.correct_answer,
-                    "explanation": mcq.explanation,
-                    "topic": mcq.topic,
-                    "difficulty": mcq.difficulty,
-                    "source_guidelines": mcq.source_guidelines
-                },
-                "metadata": {
-                    "agent": "mcq_tool",
-                    "interaction_count": self.interaction_counter,
-                    "topic": topic,
-                    "difficulty": difficulty,
-                    "guidelines_based": True
-                }
-            }
+            return self._build_result(mcq, topic, difficulty, session_id, case_context)
             
         except Exception as e:
             logger.error(f"MCQ tool execution failed: {e}")
@@ -193,6 +150,72 @@ This will help reinforce your learning through evidence-based questions derived
                 }
             }
     
+    def _build_result(
+        self,
+        mcq,
+        topic: str,
+        difficulty: str,
+        session_id: Optional[str],
+        case_context: str
+    ) -> Dict[str, Any]:
+        """Format a generated MCQ, log the interaction and build the result dict."""
+        # Format MCQ for display
+        formatted_mcq = self._format_mcq_for_display(mcq)
+        
+        # Log interaction
+        log_agent_context(
+            case_id=session_id or "mcq_test",
+            agent_name="mcq_tool",
+            interaction_id=self.interaction_counter,
+            system_prompt="MCQ Generation",
+            user_prompt=f"Generate MCQ for topic: {topic}",
+            feedback_examples="",
+            full_context=case_context[:100] + "..." if len(case_context) > 100 else case_context,
+            metadata={"guidelines_included": True}
+        )
+        
+        self.interaction_counter += 1
+        
+        return {
+            "success": True,
+            "result": formatted_mcq,
+            "mcq_data": {
+                "question_id": mcq.question_id,
+                "question_text": mcq.question_text,
+                "options": [
+                    {
+                        "letter": opt.letter,
+                        "text": opt.text,
+                        "is_correct": opt.is_correct
+                    } for opt in mcq.options
+                ],
+                "correct_answer": mcq.correct_answer,
+                "explanation": mcq.explanation,
+                "topic": mcq.topic,
+                "difficulty": mcq.difficulty,
+                "source_guidelines": mcq.source_guidelines
+            },
+            "metadata": {
+                "agent": "mcq_tool",
+                "interaction_count": self.interaction_counter,
+                "topic": topic,
+                "difficulty": difficulty,
+                "guidelines_based": True
+            }
+        }
+    
+    def _execute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Engine entry point (run) - delegates to execute()."""
+        return self.execute(**arguments)
+    
+    async def _aexecute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Engine entry point (arun) - execute() in a worker thread.
+        
+        MCQService does its guideline search and LLM calls synchronously, so
+        awaiting generate_mcq directly would block the event loop.
+        """
+        return await asyncio.to_thread(self.execute, **arguments)
+    
     def process_response(self, mcq_data: Dict[str, Any], selected_answer: str, session_id: str = None) -> Dict[str, Any]:
         """
         Process a student's response to an MCQ.
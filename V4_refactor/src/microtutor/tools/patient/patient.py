@@ -4,11 +4,11 @@ PatientTool - Patient agent following ToolUniverse AgenticTool pattern.
 
 import logging
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from microtutor.schemas.tools.tool_models import AgenticTool
 from microtutor.schemas.tools.tool_errors import ToolLLMError
-from microtutor.core.llm.llm_router import chat_complete
+from microtutor.core.llm.llm_router import achat_complete, chat_complete
 from microtutor.prompts.patient_prompts import get_patient_system_prompt
 from microtutor.core.logging.logging_config import log_agent_context
 
@@ -114,52 +114,57 @@ class PatientTool(AgenticTool):
             logger.error(f"Error getting audio data: {e}")
             return None
     
+    def _prepare_llm_messages(self, **kwargs) -> Tuple[str, List[Dict[str, str]]]:
+        """Build the model name and message list for a patient response."""
+        model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+        case = kwargs.get('case', '')
+        input_text = kwargs.get('input_text', '')
+        conversation_history = kwargs.get('conversation_history', [])
+        
+        # Get system prompt template and format with case
+        system_prompt_template = get_patient_system_prompt()
+        system_prompt = system_prompt_template.format(case=case)
+        
+        # Use conversation_history which already includes feedback at the end
+        # Feedback was added to the last user message in tutor_service_v2.py
+        # Prepare messages with system prompt (includes case) + conversation history (which includes feedback)
+        from microtutor.utils.conversation_utils import prepare_llm_messages
+        # Ensure history is passed as list of dicts
+        clean_history = conversation_history if isinstance(conversation_history, list) else []
+        llm_messages = prepare_llm_messages(clean_history, system_prompt, summary=kwargs.get('conversation_summary'))
+        
+        # Increment interaction counter and log agent context
+        self.interaction_counter += 1
+        case_id = kwargs.get('case_id', 'unknown')
+        
+        # Check if feedback is in the conversation history (last user message)
+        feedback_in_history = False
+        if conversation_history:
+            last_user_msg = next((msg for msg in reversed(conversation_history) if msg.get("role") == "user"), None)
+            if last_user_msg and "\n\n" in last_user_msg.get("content", ""):
+                # Feedback is typically appended with "\n\n" separator
+                feedback_in_history = True
+        
+        log_agent_context(
+            case_id=case_id,
+            agent_name="patient",
+            interaction_id=self.interaction_counter,
+            system_prompt=system_prompt,
+            user_prompt=input_text,
+            feedback_examples="[Using feedback from conversation_history]" if feedback_in_history else "",
+            full_context=llm_messages[-1].get("content", "") if llm_messages else input_text,
+            metadata={
+                "model": model,
+                "feedback_from_history": feedback_in_history,
+                "case_length": len(case)
+            }
+        )
+        return model, llm_messages
+    
     def _call_llm(self, prompt: str, **kwargs) -> str:
         """Call LLM to generate patient response."""
         try:
-            model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
-            case = kwargs.get('case', '')
-            input_text = kwargs.get('input_text', '')
-            conversation_history = kwargs.get('conversation_history', [])
-            
-            # Get system prompt template and format with case
-            system_prompt_template = get_patient_system_prompt()
-            system_prompt = system_prompt_template.format(case=case)
-            
-            # Use conversation_history which already includes feedback at the end
-            # Feedback was added to the last user message in tutor_service_v2.py
-            # Prepare messages with system prompt (includes case) + conversation history (which includes feedback)
-            from microtutor.utils.conversation_utils import prepare_llm_messages
-            # Ensure history is passed as list of dicts
-            clean_history = conversation_history if isinstance(conversation_history, list) else []
-            llm_messages = prepare_llm_messages(clean_history, system_prompt)
-            
-            # Increment interaction counter and log agent context
-            self.interaction_counter += 1
-            case_id = kwargs.get('case_id', 'unknown')
-            
-            # Check if feedback is in the conversation history (last user message)
-            feedback_in_history = False
-            if conversation_history:
-                last_user_msg = next((msg for msg in reversed(conversation_history) if msg.get("role") == "user"), None)
-                if last_user_msg and "\n\n" in last_user_msg.get("content", ""):
-                    # Feedback is typically appended with "\n\n" separator
-                    feedback_in_history = True
-            
-            log_agent_context(
-                case_id=case_id,
-                agent_name="patient",
-                interaction_id=self.interaction_counter,
-                system_prompt=system_prompt,
-                user_prompt=input_text,
-                feedback_examples="[Using feedback from conversation_history]" if feedback_in_history else "",
-                full_context=llm_messages[-1].get("content", "") if llm_messages else input_text,
-                metadata={
-                    "model": model,
-                    "feedback_from_history": feedback_in_history,
-                    "case_length": len(case)
-                }
-            )
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
             
             # Call LLM with prepared messages (includes system prompt + feedback from conversation_history)
             # Note: system_prompt is already in llm_messages, so we don't pass it separately
@@ -179,20 +184,29 @@ class PatientTool(AgenticTool):
             logger.error(f"LLM call failed in {self.name}: {e}")
             raise ToolLLMError(f"Failed to generate patient response: {e}", tool_name=self.name)
     
-    def _execute(self, arguments: Dict[str, Any]) -> str:
-        """Execute patient tool."""
-        input_text = arguments.get('input_text', '')
-        case = arguments.get('case', '')
-        
-        # Get text response
-        text_response = self._call_llm(
-            "",
-            case=case,
-            input_text=input_text,
-            conversation_history=arguments.get('conversation_history', []),
-            model=arguments.get('model', 'gpt-5')
-        )
-        
+    async def _acall_llm(self, prompt: str, **kwargs) -> str:
+        """Async LLM call to generate patient response."""
+        try:
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
+            
+            response = await achat_complete(
+                system_prompt="",
+                user_prompt="",
+                model=model,
+                conversation_history=llm_messages
+            )
+            
+            if not response or not response.strip():
+                raise ToolLLMError("LLM returned empty response", tool_name=self.name)
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"LLM call failed in {self.name}: {e}")
+            raise ToolLLMError(f"Failed to generate patient response: {e}", tool_name=self.name)
+    
+    def _with_audio(self, text_response: str, input_text: str, case: str) -> str:
+        """Attach respiratory audio data to the response when applicable."""
         # Check for audio data
         audio_data = self._get_audio_data(input_text, case)
         
@@ -207,6 +221,31 @@ class PatientTool(AgenticTool):
         else:
             # Return simple text response
             return text_response
+    
+    def _finalize_stream(self, text: str, arguments: Dict[str, Any]) -> str:
+        """Attach audio data once the streamed text is complete."""
+        return self._with_audio(text, arguments.get('input_text', ''), arguments.get('case', ''))
+    
+    def _llm_kwargs(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Select the arguments forwarded to the LLM call."""
+        return dict(
+            case=arguments.get('case', ''),
+            input_text=arguments.get('input_text', ''),
+            conversation_history=arguments.get('conversation_history', []),
+            model=arguments.get('model', 'gpt-5'),
+            case_id=arguments.get('case_id', 'unknown'),
+            conversation_summary=arguments.get('conversation_summary')
+        )
+    
+    def _execute(self, arguments: Dict[str, Any]) -> str:
+        """Execute patient tool."""
+        text_response = self._call_llm("", **self._llm_kwargs(arguments))
+        return self._with_audio(text_response, arguments.get('input_text', ''), arguments.get('case', ''))
+    
+    async def _aexecute(self, arguments: Dict[str, Any]) -> str:
+        """Execute patient tool without blocking the event loop."""
+        text_response = await self._acall_llm("", **self._llm_kwargs(arguments))
+        return self._with_audio(text_response, arguments.get('input_text', ''), arguments.get('case', ''))
 
 
 # Legacy wrapper for backward compatibility
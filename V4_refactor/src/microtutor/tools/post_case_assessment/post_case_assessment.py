@@ -12,12 +12,12 @@ Called AFTER the case is complete (not during conversation).
 import json
 import logging
 import uuid
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 
 from microtutor.schemas.tools.tool_models import AgenticTool
 from microtutor.schemas.tools.tool_errors import ToolLLMError
-from microtutor.core.llm.llm_router import chat_complete
+from microtutor.core.llm.llm_router import achat_complete, chat_complete
 from microtutor.prompts.post_case_assessment_prompts import (
     get_post_case_assessment_system_prompt,
     get_weakness_analysis_prompt
@@ -26,6 +26,8 @@ from microtutor.core.logging.logging_config import log_agent_context
 
 logger = logging.getLogger(__name__)
 
+WEAKNESS_ANALYSIS_SYSTEM_PROMPT = "You are an expert medical educator analyzing student performance."
+
 
 @dataclass
 class MCQOption:
@@ -92,50 +94,24 @@ class PostCaseAssessmentTool(AgenticTool):
         for msg in conversation_history:
             role = msg.get('role', 'unknown').upper()
             content = msg.get('content', '')
-            # Truncate very long messages
-            if len(content) > 500:
+            # Truncate very long messages (the earlier-conversation summary is kept whole)
+            if role != 'SUMMARY' and len(content) > 500:
                 content = content[:500] + "..."
             formatted.append(f"{role}: {content}")
         
         return "\n\n".join(formatted)
     
-    def _analyze_weaknesses(
-        self, 
-        conversation_history: List[Dict], 
-        model: str
-    ) -> List[WeakArea]:
-        """Analyze conversation to identify student weak areas."""
+    def _weakness_analysis_prompt(self, conversation_history: List[Dict]) -> str:
+        """Build the weakness analysis prompt."""
+        conversation_text = self._format_conversation_for_analysis(conversation_history)
+        return get_weakness_analysis_prompt().format(
+            conversation=conversation_text
+        )
+    
+    def _parse_weaknesses(self, response: str) -> Tuple[List[WeakArea], List[str]]:
+        """Parse the weakness analysis JSON (falls back to a default weak area)."""
         try:
-            conversation_text = self._format_conversation_for_analysis(conversation_history)
-            
-            prompt = get_weakness_analysis_prompt().format(
-                conversation=conversation_text
-            )
-            
-            response = chat_complete(
-                system_prompt="You are an expert medical educator analyzing student performance.",
-                user_prompt=prompt,
-                model=model
-            )
-            
-            # Parse JSON response
             result = json.loads(response)
-            
-            weak_areas = []
-            for wa in result.get('weak_areas', []):
-                weak_areas.append(WeakArea(
-                    topic=wa.get('topic', 'Unknown'),
-                    description=wa.get('description', ''),
-                    severity=wa.get('severity', 'moderate'),
-                    evidence=wa.get('evidence', '')
-                ))
-            
-            # Also get recommended focus areas
-            recommended = result.get('recommended_focus', [])
-            logger.info(f"Identified {len(weak_areas)} weak areas, recommended focus: {recommended}")
-            
-            return weak_areas, recommended
-            
         except json.JSONDecodeError as e:
             logger.warning(f"Failed to parse weakness analysis JSON: {e}")
             # Return default weak areas
@@ -145,10 +121,115 @@ class PostCaseAssessmentTool(AgenticTool):
                 severity="moderate",
                 evidence="Unable to parse specific weaknesses"
             )], ["Clinical reasoning"]
+        
+        weak_areas = []
+        for wa in result.get('weak_areas', []):
+            weak_areas.append(WeakArea(
+                topic=wa.get('topic', 'Unknown'),
+                description=wa.get('description', ''),
+                severity=wa.get('severity', 'moderate'),
+                evidence=wa.get('evidence', '')
+            ))
+        
+        # Also get recommended focus areas
+        recommended = result.get('recommended_focus', [])
+        logger.info(f"Identified {len(weak_areas)} weak areas, recommended focus: {recommended}")
+        
+        return weak_areas, recommended
+    
+    def _analyze_weaknesses(
+        self, 
+        conversation_history: List[Dict], 
+        model: str
+    ) -> Tuple[List[WeakArea], List[str]]:
+        """Analyze conversation to identify student weak areas."""
+        try:
+            response = chat_complete(
+                system_prompt=WEAKNESS_ANALYSIS_SYSTEM_PROMPT,
+                user_prompt=self._weakness_analysis_prompt(conversation_history),
+                model=model
+            )
+            return self._parse_weaknesses(response)
         except Exception as e:
             logger.error(f"Weakness analysis failed: {e}")
             raise ToolLLMError(f"Failed to analyze weaknesses: {e}")
     
+    async def _aanalyze_weaknesses(
+        self, 
+        conversation_history: List[Dict], 
+        model: str
+    ) -> Tuple[List[WeakArea], List[str]]:
+        """Async version of _analyze_weaknesses."""
+        try:
+            response = await achat_complete(
+                system_prompt=WEAKNESS_ANALYSIS_SYSTEM_PROMPT,
+                user_prompt=self._weakness_analysis_prompt(conversation_history),
+                model=model
+            )
+            return self._parse_weaknesses(response)
+        except Exception as e:
+            logger.error(f"Weakness analysis failed: {e}")
+            raise ToolLLMError(f"Failed to analyze weaknesses: {e}")
+    
+    def _mcq_generation_prompt(
+        self,
+        case: str,
+        weak_areas: List[WeakArea],
+        recommended_focus: List[str],
+        num_questions: int
+    ) -> str:
+        """Build the MCQ generation prompt for the identified weak areas."""
+        # Format weak areas for prompt
+        weak_areas_text = "\n".join([
+            f"- {wa.topic}: {wa.description} (severity: {wa.severity})"
+            for wa in weak_areas
+        ])
+        
+        if recommended_focus:
+            weak_areas_text += f"\n\nRecommended focus areas: {', '.join(recommended_focus)}"
+        
+        return get_post_case_assessment_system_prompt().format(
+            case=case,
+            weak_areas=weak_areas_text,
+            num_questions=num_questions
+        )
+    
+    def _parse_mcqs(self, response: str, weak_areas: List[WeakArea]) -> AssessmentResult:
+        """Parse the MCQ generation JSON into an AssessmentResult."""
+        result = json.loads(response)
+        
+        mcqs = []
+        for mcq_data in result.get('mcqs', []):
+            options = [
+                MCQOption(
+                    letter=opt['letter'],
+                    text=opt['text'],
+                    is_correct=opt['is_correct'],
+                    explanation=opt['explanation']
+                )
+                for opt in mcq_data.get('options', [])
+            ]
+            
+            mcqs.append(MCQ(
+                question_id=mcq_data.get('question_id', str(uuid.uuid4())),
+                question_text=mcq_data['question_text'],
+                topic=mcq_data.get('topic', 'General'),
+                weakness_addressed=mcq_data.get('weakness_addressed', ''),
+                difficulty=mcq_data.get('difficulty', 'intermediate'),
+                options=options,
+                correct_answer=mcq_data['correct_answer'],
+                learning_point=mcq_data.get('learning_point', '')
+            ))
+        
+        summary = result.get('summary', {})
+        
+        return AssessmentResult(
+            mcqs=mcqs,
+            weak_areas_covered=summary.get('weak_areas_covered', [wa.topic for wa in weak_areas]),
+            total_questions=len(mcqs),
+            difficulty_distribution=summary.get('difficulty_distribution', {})
+        )
+    
     def _generate_mcqs(
         self,
         case: str,
@@ -159,62 +240,35 @@ class PostCaseAssessmentTool(AgenticTool):
     ) -> AssessmentResult:
         """Generate MCQs targeting identified weak areas."""
         try:
-            # Format weak areas for prompt
-            weak_areas_text = "\n".join([
-                f"- {wa.topic}: {wa.description} (severity: {wa.severity})"
-                for wa in weak_areas
-            ])
-            
-            if recommended_focus:
-                weak_areas_text += f"\n\nRecommended focus areas: {', '.join(recommended_focus)}"
-            
-            prompt = get_post_case_assessment_system_prompt().format(
-                case=case,
-                weak_areas=weak_areas_text,
-                num_questions=num_questions
-            )
-            
             response = chat_complete(
                 system_prompt="",
-                user_prompt=prompt,
+                user_prompt=self._mcq_generation_prompt(case, weak_areas, recommended_focus, num_questions),
                 model=model
             )
-            
-            # Parse JSON response
-            result = json.loads(response)
-            
-            mcqs = []
-            for mcq_data in result.get('mcqs', []):
-                options = [
-                    MCQOption(
-                        letter=opt['letter'],
-                        text=opt['text'],
-                        is_correct=opt['is_correct'],
-                        explanation=opt['explanation']
-                    )
-                    for opt in mcq_data.get('options', [])
-                ]
-                
-                mcqs.append(MCQ(
-                    question_id=mcq_data.get('question_id', str(uuid.uuid4())),
-                    question_text=mcq_data['question_text'],
-                    topic=mcq_data.get('topic', 'General'),
-                    weakness_addressed=mcq_data.get('weakness_addressed', ''),
-                    difficulty=mcq_data.get('difficulty', 'intermediate'),
-                    options=options,
-                    correct_answer=mcq_data['correct_answer'],
-                    learning_point=mcq_data.get('learning_point', '')
-                ))
-            
-            summary = result.get('summary', {})
-            
-            return AssessmentResult(
-                mcqs=mcqs,
-                weak_areas_covered=summary.get('weak_areas_covered', [wa.topic for wa in weak_areas]),
-                total_questions=len(mcqs),
-                difficulty_distribution=summary.get('difficulty_distribution', {})
+            return self._parse_mcqs(response, weak_areas)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse MCQ JSON: {e}")
+            raise ToolLLMError(f"Failed to parse MCQ response: {e}")
+        except Exception as e:
+            logger.error(f"MCQ generation failed: {e}")
+            raise ToolLLMError(f"Failed to generate MCQs: {e}")
+    
+    async def _agenerate_mcqs(
+        self,
+        case: str,
+        weak_areas: List[WeakArea],
+        recommended_focus: List[str],
+        num_questions: int,
+        model: str
+    ) -> AssessmentResult:
+        """Async version of _generate_mcqs."""
+        try:
+            response = await achat_complete(
+                system_prompt="",
+                user_prompt=self._mcq_generation_prompt(case, weak_areas, recommended_focus, num_questions),
+                model=model
             )
-            
+            return self._parse_mcqs(response, weak_areas)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse MCQ JSON: {e}")
             raise ToolLLMError(f"Failed to parse MCQ response: {e}")
@@ -226,6 +280,87 @@ class PostCaseAssessmentTool(AgenticTool):
         """Required by AgenticTool but not directly used."""
         return ""
     
+    def _parse_execute_kwargs(self, kwargs: Dict[str, Any]) -> Tuple[str, List[Dict], int, str]:
+        """Validate execute() kwargs and return (case, history, num_questions, model)."""
+        # Validate required parameters
+        if 'case' not in kwargs:
+            raise ValueError("Missing required parameter: case")
+        if 'conversation_history' not in kwargs:
+            raise ValueError("Missing required parameter: conversation_history")
+        
+        case = kwargs['case']
+        conversation_history = kwargs['conversation_history']
+        if kwargs.get('conversation_summary'):
+            # Turns folded out of the context window by TutorService
+            conversation_history = [{'role': 'summary', 'content': kwargs['conversation_summary']}] + list(conversation_history)
+        num_questions = kwargs.get('num_questions', self.default_num_questions)
+        model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+        return case, conversation_history, num_questions, model
+    
+    def _build_execute_result(
+        self,
+        assessment: AssessmentResult,
+        weak_areas: List[WeakArea],
+        num_questions: int
+    ) -> Dict[str, Any]:
+        """Log the interaction and convert the assessment to the execute() result dict."""
+        # Log interaction
+        log_agent_context(
+            case_id="post_case_assessment",
+            agent_name="post_case_assessment",
+            interaction_id=self.interaction_counter,
+            system_prompt="Post-case MCQ generation",
+            user_prompt=f"Generate {num_questions} MCQs for weak areas",
+            feedback_examples="",
+            full_context=f"Weak areas: {[wa.topic for wa in weak_areas]}",
+            metadata={
+                "num_questions": num_questions,
+                "weak_areas_count": len(weak_areas)
+            }
+        )
+        
+        self.interaction_counter += 1
+        
+        # Convert to serializable format
+        mcqs_data = []
+        for mcq in assessment.mcqs:
+            mcqs_data.append({
+                "question_id": mcq.question_id,
+                "question_text": mcq.question_text,
+                "topic": mcq.topic,
+                "weakness_addressed": mcq.weakness_addressed,
+                "difficulty": mcq.difficulty,
+                "options": [
+                    {
+                        "letter": opt.letter,
+                        "text": opt.text,
+                        "is_correct": opt.is_correct,
+                        "explanation": opt.explanation
+                    }
+                    for opt in mcq.options
+                ],
+                "correct_answer": mcq.correct_answer,
+                "learning_point": mcq.learning_point
+            })
+        
+        return {
+            "success": True,
+            "result": {
+                "mcqs": mcqs_data,
+                "summary": {
+                    "weak_areas_covered": assessment.weak_areas_covered,
+                    "total_questions": assessment.total_questions,
+                    "difficulty_distribution": assessment.difficulty_distribution
+                }
+            },
+            "metadata": {
+                "agent": "post_case_assessment",
+                "interaction_count": self.interaction_counter,
+                "weak_areas_analyzed": [wa.topic for wa in weak_areas],
+                "questions_generated": len(assessment.mcqs)
+            }
+        }
+    
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute post-case assessment to generate targeted MCQs.
         
@@ -239,16 +374,7 @@ class PostCaseAssessmentTool(AgenticTool):
             Dict with MCQs structured for interactive display
         """
         try:
-            # Validate required parameters
-            if 'case' not in kwargs:
-                raise ValueError("Missing required parameter: case")
-            if 'conversation_history' not in kwargs:
-                raise ValueError("Missing required parameter: conversation_history")
-            
-            case = kwargs['case']
-            conversation_history = kwargs['conversation_history']
-            num_questions = kwargs.get('num_questions', self.default_num_questions)
-            model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+            case, conversation_history, num_questions, model = self._parse_execute_kwargs(kwargs)
             
             # Step 1: Analyze conversation for weak areas
             logger.info("Analyzing conversation for student weak areas...")
@@ -266,62 +392,42 @@ class PostCaseAssessmentTool(AgenticTool):
                 model=model
             )
             
-            # Log interaction
-            log_agent_context(
-                case_id="post_case_assessment",
-                agent_name="post_case_assessment",
-                interaction_id=self.interaction_counter,
-                system_prompt="Post-case MCQ generation",
-                user_prompt=f"Generate {num_questions} MCQs for weak areas",
-                feedback_examples="",
-                full_context=f"Weak areas: {[wa.topic for wa in weak_areas]}",
-                metadata={
-                    "num_questions": num_questions,
-                    "weak_areas_count": len(weak_areas)
-                }
-            )
-            
-            self.interaction_counter += 1
-            
-            # Convert to serializable format
-            mcqs_data = []
-            for mcq in assessment.mcqs:
-                mcqs_data.append({
-                    "question_id": mcq.question_id,
-                    "question_text": mcq.question_text,
-                    "topic": mcq.topic,
-                    "weakness_addressed": mcq.weakness_addressed,
-                    "difficulty": mcq.difficulty,
-                    "options": [
-                        {
-                            "letter": opt.letter,
-                            "text": opt.text,
-                            "is_correct": opt.is_correct,
-                            "explanation": opt.explanation
-                        }
-                        for opt in mcq.options
-                    ],
-                    "correct_answer": mcq.correct_answer,
-                    "learning_point": mcq.learning_point
-                })
+            return self._build_execute_result(assessment, weak_areas, num_questions)
             
+        except Exception as e:
+            logger.error(f"Post-case assessment failed: {e}")
             return {
-                "success": True,
-                "result": {
-                    "mcqs": mcqs_data,
-                    "summary": {
-                        "weak_areas_covered": assessment.weak_areas_covered,
-                        "total_questions": assessment.total_questions,
-                        "difficulty_distribution": assessment.difficulty_distribution
-                    }
-                },
-                "metadata": {
-                    "agent": "post_case_assessment",
-                    "interaction_count": self.interaction_counter,
-                    "weak_areas_analyzed": [wa.topic for wa in weak_areas],
-                    "questions_generated": len(assessment.mcqs)
+                "success": False,
+                "error": {
+                    "type": type(e).__name__,
+                    "message": str(e)
                 }
             }
+    
+    def _execute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Engine entry point (run) - delegates to execute()."""
+        return self.execute(**arguments)
+    
+    async def _aexecute(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Engine entry point (arun) - execute() with awaited LLM calls."""
+        try:
+            case, conversation_history, num_questions, model = self._parse_execute_kwargs(arguments)
+            
+            logger.info("Analyzing conversation for student weak areas...")
+            weak_areas, recommended_focus = await self._aanalyze_weaknesses(
+                conversation_history, model
+            )
+            
+            logger.info(f"Generating {num_questions} targeted MCQs...")
+            assessment = await self._agenerate_mcqs(
+                case=case,
+                weak_areas=weak_areas,
+                recommended_focus=recommended_focus,
+                num_questions=num_questions,
+                model=model
+            )
+            
+            return self._build_execute_result(assessment, weak_areas, num_questions)
             
         except Exception as e:
             logger.error(f"Post-case assessment failed: {e}")
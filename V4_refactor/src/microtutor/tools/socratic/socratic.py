@@ -3,11 +3,11 @@ SocraticTool - Socratic dialogue agent following ToolUniverse AgenticTool patter
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from microtutor.schemas.tools.tool_models import AgenticTool
 from microtutor.schemas.tools.tool_errors import ToolLLMError
-from microtutor.core.llm.llm_router import chat_complete
+from microtutor.core.llm.llm_router import achat_complete, chat_complete
 from microtutor.prompts.socratic_prompts import get_socratic_system_prompt
 from microtutor.utils.csv_guidance import csv_guidance
 
@@ -21,46 +21,50 @@ class SocraticTool(AgenticTool):
         super().__init__(tool_config)
         self.completion_signal = self.metadata.get('completion_signal', '[SOCRATIC_COMPLETE]')
     
+    def _prepare_llm_messages(self, **kwargs) -> Tuple[str, List[Dict[str, str]]]:
+        """Build the model name and message list for a Socratic response."""
+        model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+        case = kwargs.get('case', '')
+        conversation_history = kwargs.get('conversation_history', [])
+        # Get organism from kwargs (passed from TutorService)
+        # If not passed explicitly, we might try to infer it, but TutorService should pass it.
+        # In V4, TutorService passes 'case' and 'conversation_history'. 
+        # We need to ensure 'organism' is also passed in tool_args.
+        organism = kwargs.get('organism', '') 
+        
+        # Get CSV guidance
+        csv_guidance_text = ""
+        if organism:
+            crucial_factors = csv_guidance.get_crucial_factors(organism)
+            if crucial_factors:
+                factors_list = "\n- ".join(crucial_factors)
+                csv_guidance_text = (
+                    f"=== CRITICAL GUIDANCE FROM KNOWLEDGE BASE ===\n"
+                    f"For the correct diagnosis ({organism}), the following factors are CRITICAL. "
+                    f"Ensure the student considers these associations in their differential:\n"
+                    f"- {factors_list}\n\n"
+                    f"Guide the student to identify these specific connections."
+                )
+        
+        # Get system prompt template and format with case and csv_guidance
+        system_prompt_template = get_socratic_system_prompt()
+        system_prompt = system_prompt_template.format(
+            case=case,
+            csv_guidance=csv_guidance_text
+        )
+        
+        # Use conversation_history which already includes feedback at the end
+        # Feedback was added to the last user message in tutor_service_v2.py
+        # Prepare messages with system prompt (includes case) + conversation history (which includes feedback)
+        from microtutor.utils.conversation_utils import prepare_llm_messages
+        # Ensure history is passed as list of dicts
+        clean_history = conversation_history if isinstance(conversation_history, list) else []
+        return model, prepare_llm_messages(clean_history, system_prompt, summary=kwargs.get('conversation_summary'))
+    
     def _call_llm(self, prompt: str, **kwargs) -> str:
         """Call LLM to generate Socratic response."""
         try:
-            model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
-            case = kwargs.get('case', '')
-            conversation_history = kwargs.get('conversation_history', [])
-            # Get organism from kwargs (passed from TutorService)
-            # If not passed explicitly, we might try to infer it, but TutorService should pass it.
-            # In V4, TutorService passes 'case' and 'conversation_history'. 
-            # We need to ensure 'organism' is also passed in tool_args.
-            organism = kwargs.get('organism', '') 
-            
-            # Get CSV guidance
-            csv_guidance_text = ""
-            if organism:
-                crucial_factors = csv_guidance.get_crucial_factors(organism)
-                if crucial_factors:
-                    factors_list = "\n- ".join(crucial_factors)
-                    csv_guidance_text = (
-                        f"=== CRITICAL GUIDANCE FROM KNOWLEDGE BASE ===\n"
-                        f"For the correct diagnosis ({organism}), the following factors are CRITICAL. "
-                        f"Ensure the student considers these associations in their differential:\n"
-                        f"- {factors_list}\n\n"
-                        f"Guide the student to identify these specific connections."
-                    )
-            
-            # Get system prompt template and format with case and csv_guidance
-            system_prompt_template = get_socratic_system_prompt()
-            system_prompt = system_prompt_template.format(
-                case=case,
-                csv_guidance=csv_guidance_text
-            )
-            
-            # Use conversation_history which already includes feedback at the end
-            # Feedback was added to the last user message in tutor_service_v2.py
-            # Prepare messages with system prompt (includes case) + conversation history (which includes feedback)
-            from microtutor.utils.conversation_utils import prepare_llm_messages
-            # Ensure history is passed as list of dicts
-            clean_history = conversation_history if isinstance(conversation_history, list) else []
-            llm_messages = prepare_llm_messages(clean_history, system_prompt)
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
             
             # Call LLM with prepared messages (includes system prompt + feedback from conversation_history)
             # Note: system_prompt is already in llm_messages, so we don't pass it separately
@@ -80,16 +84,46 @@ class SocraticTool(AgenticTool):
             logger.error(f"LLM call failed in {self.name}: {e}")
             raise ToolLLMError(f"Failed to generate Socratic response: {e}", tool_name=self.name)
     
-    def _execute(self, arguments: Dict[str, Any]) -> str:
-        """Execute Socratic tool."""
-        return self._call_llm(
-            "",
+    async def _acall_llm(self, prompt: str, **kwargs) -> str:
+        """Async LLM call to generate Socratic response."""
+        try:
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
+            
+            response = await achat_complete(
+                system_prompt="",
+                user_prompt="",
+                model=model,
+                conversation_history=llm_messages
+            )
+            
+            if not response or not response.strip():
+                raise ToolLLMError("LLM returned empty response", tool_name=self.name)
+            
+            return response
+            
+        except Exception as e:
+            logger.error(f"LLM call failed in {self.name}: {e}")
+            raise ToolLLMError(f"Failed to generate Socratic response: {e}", tool_name=self.name)
+    
+    def _llm_kwargs(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Select the arguments forwarded to the LLM call."""
+        return dict(
             case=arguments.get('case', ''),
             input_text=arguments.get('input_text', ''),
             conversation_history=arguments.get('conversation_history', []),
             model=arguments.get('model', 'gpt-5'),
-            organism=arguments.get('organism', '') # Pass organism
+            organism=arguments.get('organism', ''), # Pass organism
+            case_id=arguments.get('case_id'),
+            conversation_summary=arguments.get('conversation_summary')
         )
+    
+    def _execute(self, arguments: Dict[str, Any]) -> str:
+        """Execute Socratic tool."""
+        return self._call_llm("", **self._llm_kwargs(arguments))
+    
+    async def _aexecute(self, arguments: Dict[str, Any]) -> str:
+        """Execute Socratic tool without blocking the event loop."""
+        return await self._acall_llm("", **self._llm_kwargs(arguments))
 
 
 # Legacy wrapper for backward compatibility
@@ -11,11 +11,11 @@ Note: MCQ generation is handled by the separate PostCaseAssessmentTool.
 """
 
 import logging
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 
 from microtutor.schemas.tools.tool_models import AgenticTool
 from microtutor.schemas.tools.tool_errors import ToolLLMError
-from microtutor.core.llm.llm_router import chat_complete
+from microtutor.core.llm.llm_router import achat_complete, chat_complete
 from microtutor.prompts.tests_management_prompts import get_tests_management_system_prompt
 from microtutor.core.logging.logging_config import log_agent_context
 from microtutor.utils.conversation_utils import prepare_llm_messages
@@ -40,66 +40,71 @@ class TestsManagementTool(AgenticTool):
         super().__init__(config)
         self.interaction_counter = 0
     
+    def _prepare_llm_messages(self, **kwargs) -> Tuple[str, List[Dict[str, str]]]:
+        """Build the model name and message list for tests/management guidance."""
+        model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
+        case = kwargs.get('case', '')
+        input_text = kwargs.get('input_text', '')
+        conversation_history = kwargs.get('conversation_history', [])
+        
+        # Debug: Log conversation history length
+        logger.info(f"[TESTS_MGMT] Received {len(conversation_history)} messages in conversation history")
+        if conversation_history:
+            # Log full conversation history to inspect structure
+            logger.info(f"[TESTS_MGMT] FULL HISTORY DUMP: {conversation_history}")
+            # Log last few messages to verify context
+            for msg in conversation_history[-3:]:
+                role = msg.get('role', 'unknown')
+                content = msg.get('content', '')[:100]
+                logger.info(f"[TESTS_MGMT] Recent msg - {role}: {content}...")
+        
+        # Get guidelines context if provided (from database/service)
+        guidelines_context = kwargs.get("guidelines_context", "")
+        
+        # Get system prompt template and format with case
+        system_prompt_template = get_tests_management_system_prompt()
+        system_prompt = system_prompt_template.format(case=case)
+        
+        # Add guidelines if available
+        if guidelines_context:
+            system_prompt += f"\n\n=== CLINICAL GUIDELINES ===\n{guidelines_context}"
+            logger.info("Using guidelines context from service")
+        
+        # Prepare messages with system prompt + conversation history (which includes feedback)
+        # Ensure history is passed as list of dicts
+        clean_history = conversation_history if isinstance(conversation_history, list) else []
+        llm_messages = prepare_llm_messages(clean_history, system_prompt, summary=kwargs.get('conversation_summary'))
+        
+        # Check if feedback is in the conversation history
+        feedback_in_history = False
+        if conversation_history:
+            last_user_msg = next(
+                (msg for msg in reversed(conversation_history) if msg.get("role") == "user"), 
+                None
+            )
+            if last_user_msg and "\n\n" in last_user_msg.get("content", ""):
+                feedback_in_history = True
+        
+        # Log agent context
+        log_agent_context(
+            case_id="tests_management",
+            agent_name="tests_management",
+            interaction_id=self.interaction_counter,
+            system_prompt=system_prompt[:200] + "..." if len(system_prompt) > 200 else system_prompt,
+            user_prompt=input_text,
+            feedback_examples="[From conversation_history]" if feedback_in_history else "",
+            full_context=llm_messages[-1].get("content", "") if llm_messages else input_text,
+            metadata={
+                "feedback_from_history": feedback_in_history,
+                "guidelines_included": bool(guidelines_context)
+            }
+        )
+        return model, llm_messages
+    
     def _call_llm(self, prompt: str, **kwargs) -> str:
         """Call LLM to generate tests and management guidance."""
         try:
-            model = kwargs.get('model', self.llm_config.get('model', 'gpt-5'))
-            case = kwargs.get('case', '')
-            input_text = kwargs.get('input_text', '')
-            conversation_history = kwargs.get('conversation_history', [])
-            
-            # Debug: Log conversation history length
-            logger.info(f"[TESTS_MGMT] Received {len(conversation_history)} messages in conversation history")
-            if conversation_history:
-                # Log full conversation history to inspect structure
-                logger.info(f"[TESTS_MGMT] FULL HISTORY DUMP: {conversation_history}")
-                # Log last few messages to verify context
-                for msg in conversation_history[-3:]:
-                    role = msg.get('role', 'unknown')
-                    content = msg.get('content', '')[:100]
-                    logger.info(f"[TESTS_MGMT] Recent msg - {role}: {content}...")
-            
-            # Get guidelines context if provided (from database/service)
-            guidelines_context = kwargs.get("guidelines_context", "")
-            
-            # Get system prompt template and format with case
-            system_prompt_template = get_tests_management_system_prompt()
-            system_prompt = system_prompt_template.format(case=case)
-            
-            # Add guidelines if available
-            if guidelines_context:
-                system_prompt += f"\n\n=== CLINICAL GUIDELINES ===\n{guidelines_context}"
-                logger.info("Using guidelines context from service")
-            
-            # Prepare messages with system prompt + conversation history (which includes feedback)
-            # Ensure history is passed as list of dicts
-            clean_history = conversation_history if isinstance(conversation_history, list) else []
-            llm_messages = prepare_llm_messages(clean_history, system_prompt)
-            
-            # Check if feedback is in the conversation history
-            feedback_in_history = False
-            if conversation_history:
-                last_user_msg = next(
-                    (msg for msg in reversed(conversation_history) if msg.get("role") == "user"), 
-                    None
-                )
-                if last_user_msg and "\n\n" in last_user_msg.get("content", ""):
-                    feedback_in_history = True
-            
-            # Log agent context
-            log_agent_context(
-                case_id="tests_management",
-                agent_name="tests_management",
-                interaction_id=self.interaction_counter,
-                system_prompt=system_prompt[:200] + "..." if len(system_prompt) > 200 else system_prompt,
-                user_prompt=input_text,
-                feedback_examples="[From conversation_history]" if feedback_in_history else "",
-                full_context=llm_messages[-1].get("content", "") if llm_messages else input_text,
-                metadata={
-                    "feedback_from_history": feedback_in_history,
-                    "guidelines_included": bool(guidelines_context)
-                }
-            )
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
             
             # Call LLM
             response = chat_complete(
@@ -119,6 +124,33 @@ class TestsManagementTool(AgenticTool):
             logger.error(f"Tests and management tool LLM call failed: {e}")
             raise ToolLLMError(f"LLM call failed: {e}")
     
+    async def _acall_llm(self, prompt: str, **kwargs) -> str:
+        """Async LLM call to generate tests and management guidance."""
+        try:
+            model, llm_messages = self._prepare_llm_messages(**kwargs)
+            
+            response = await achat_complete(
+                system_prompt="",
+                user_prompt="",
+                model=model,
+                conversation_history=llm_messages
+            )
+            
+            if not response:
+                raise ToolLLMError("Empty response from LLM")
+            
+            self.interaction_counter += 1
+            return response
+            
+        except Exception as e:
+            logger.error(f"Tests and management tool LLM call failed: {e}")
+            raise ToolLLMError(f"LLM call failed: {e}")
+    
+    def _finalize_stream(self, text: str, arguments: Dict[str, Any]) -> str:
+        """Count the streamed interaction like a regular LLM call."""
+        self.interaction_counter += 1
+        return text
+    
     def execute(self, **kwargs) -> Dict[str, Any]:
         """Execute tests and management tool.
         
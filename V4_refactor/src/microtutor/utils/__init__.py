@@ -4,8 +4,10 @@ Utility modules for the Microbiology Tutor application.
 
 # Import embedding utilities directly to avoid circular imports
 try:
-    from .embedding_utils import get_embedding, get_embeddings_batch, get_embedding_model_name, get_embedding_dimension
-    __all__ = ["get_embedding", "get_embeddings_batch", "get_embedding_model_name", "get_embedding_dimension"]
+    from .embedding_utils import get_embedding, aget_embedding, get_embeddings_batch, embed_texts, get_embedding_model_name, get_embedding_dimension
+    from .embedding_cache import EmbeddingCache, get_embedding_cache
+    __all__ = ["get_embedding", "aget_embedding", "get_embeddings_batch", "embed_texts", "get_embedding_model_name", "get_embedding_dimension",
+               "EmbeddingCache", "get_embedding_cache"]
 except ImportError as e:
     # If there are import issues, we'll handle them gracefully
     print(f"Warning: Could not import embedding utilities: {e}")
@@ -20,6 +22,9 @@ from .conversation_utils import (
     has_cached_case
 )
 
+# Import lexical search (BM25 + rank fusion)
+from .lexical_search import BM25Index, reciprocal_rank_fusion, tokenize
+
 # Import phase utilities
 from .phase_utils import (
     PHASE_DISPLAY_MAPPING,
@@ -43,6 +48,10 @@ __all__.extend([
     "normalize_organism_name",
     "get_cached_first_pt_sentence",
     "has_cached_case",
+    # Lexical search
+    "BM25Index",
+    "reciprocal_rank_fusion",
+    "tokenize",
     # Phase utilities
     "PHASE_DISPLAY_MAPPING",
     "PHASE_AGENT_MAPPING",
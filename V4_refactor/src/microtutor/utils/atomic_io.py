@@ -0,0 +1,40 @@
+"""
+Atomic file writes.
+
+Data files that the app reads while other processes (the pre-generation job,
+other workers) may be rewriting them are written to a temp file in the same
+directory and swapped in with os.replace, so readers see either the old or
+the new content, never a partial file.
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def atomic_write_text(path: PathLike, text: str, encoding: str = "utf-8") -> None:
+    """Write text to path atomically (temp file + fsync + os.replace)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=str(path.parent))
+    try:
+        with os.fdopen(fd, "w", encoding=encoding) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def atomic_write_json(path: PathLike, data: Any, **json_kwargs: Any) -> None:
+    """Serialize data as JSON and write it atomically (json_kwargs go to json.dumps)."""
+    atomic_write_text(path, json.dumps(data, **json_kwargs))
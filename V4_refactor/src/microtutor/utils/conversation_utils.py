@@ -14,6 +14,10 @@ from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
+# Header of the feedback examples block TutorService appends to the user's
+# message (core/feedback/formatter.py)
+FEEDBACK_BLOCK_HEADER = "=== EXPERT FEEDBACK EXAMPLES ==="
+
 
 def filter_system_messages(history: List[Dict[str, str]]) -> List[Dict[str, str]]:
     """Filter out system messages from conversation history.
@@ -39,10 +43,35 @@ def filter_system_messages(history: List[Dict[str, str]]) -> List[Dict[str, str]
     return [msg for msg in history if msg.get("role") != "system"]
 
 
+def strip_feedback_blocks(history: List[Dict[str, str]]) -> List[Dict[str, str]]:
+    """Remove injected feedback example blocks from user messages.
+    
+    Feedback examples are appended to the user's message for the turn they
+    were retrieved for; kept in history they would be re-sent on every later
+    turn. Call this before adding the new turn's message.
+    
+    Args:
+        history: Conversation history
+        
+    Returns:
+        History with the feedback blocks cut from user message contents
+        (messages without a block are returned as-is)
+    """
+    marker = "\n\n" + FEEDBACK_BLOCK_HEADER
+    cleaned = []
+    for msg in history:
+        content = msg.get("content")
+        if msg.get("role") == "user" and isinstance(content, str) and marker in content:
+            msg = {**msg, "content": content.split(marker, 1)[0]}
+        cleaned.append(msg)
+    return cleaned
+
+
 def prepare_llm_messages(
     chat_history: List[Dict[str, str]], 
     system_prompt: str,
-    case_description: Optional[str] = None
+    case_description: Optional[str] = None,
+    summary: Optional[str] = None
 ) -> List[Dict[str, str]]:
     """Prepare messages for LLM call by prepending system prompt to filtered chat history.
     
@@ -51,11 +80,14 @@ def prepare_llm_messages(
     2. System prompt is added only when calling LLM (not stored in history)
     3. Each agent can use its own system prompt
     4. Case description is optionally included in system prompt
+    5. A summary of earlier turns (bounded context window) is optionally
+       included in system prompt
     
     Args:
         chat_history: Chat history (user/assistant messages only, no system prompts)
         system_prompt: System prompt to prepend for this LLM call
         case_description: Optional case description to append to system prompt
+        summary: Optional summary of the turns not included in chat_history
         
     Returns:
         Messages array ready for LLM API call: [system, ...chat_history]
@@ -80,6 +112,8 @@ def prepare_llm_messages(
     full_system_prompt = system_prompt
     if case_description:
         full_system_prompt += f"\n\n=== CASE INFORMATION ===\n{case_description}"
+    if summary:
+        full_system_prompt += f"\n\n=== EARLIER CONVERSATION (SUMMARY) ===\n{summary}"
     
     # Prepend system prompt for LLM call
     messages = [{"role": "system", "content": full_system_prompt}]
@@ -108,10 +142,12 @@ def normalize_organism_name(organism: str) -> str:
     return organism.lower().strip().replace(" ", "_")
 
 
-@lru_cache(maxsize=1)
 def load_first_pt_sentence_json(json_path: str) -> Dict[str, str]:
     """Load the cached first patient sentence JSON file.
     
+    Cached in memory until the file changes on disk (e.g. the pre-generation
+    job adds sentences while the server is running).
+    
     Args:
         json_path: Path to the ambiguous_with_ages.json file
         
@@ -119,9 +155,17 @@ def load_first_pt_sentence_json(json_path: str) -> Dict[str, str]:
         Dictionary mapping organism keys to first patient sentence strings, or empty dict if load fails
     """
     try:
-        if not os.path.exists(json_path):
-            logger.warning(f"First patient sentence JSON file not found at: {json_path}")
-            return {}
+        mtime = os.path.getmtime(json_path)
+    except OSError:
+        logger.warning(f"First patient sentence JSON file not found at: {json_path}")
+        return {}
+    return _load_first_pt_sentence_json(json_path, mtime)
+
+
+@lru_cache(maxsize=1)
+def _load_first_pt_sentence_json(json_path: str, mtime: float) -> Dict[str, str]:
+    """Read ambiguous_with_ages.json (cached per path and mtime)."""
+    try:
         with open(json_path, "r") as f:
             data = json.load(f)
             logger.info(f"Successfully loaded first patient sentence JSON from {json_path} with {len(data)} organisms")
@@ -157,7 +201,10 @@ def get_cached_first_pt_sentence(organism: str, first_pt_sentence_path: str) ->
 
 
 def load_cached_case_cache(cached_cases_dir: str) -> Dict[str, str]:
-    """Load case_cache.json from cached cases directory.
+    """Get the cached cases (case_cache.json and cases/) for a directory.
+    
+    Served from the process-wide case store, which reloads the file only
+    when it changes on disk.
     
     Args:
         cached_cases_dir: Path to the data/cases/cached directory
@@ -165,20 +212,13 @@ def load_cached_case_cache(cached_cases_dir: str) -> Dict[str, str]:
     Returns:
         Dictionary mapping organism keys to full case text, or empty dict if not found
     """
-    case_cache_file = os.path.join(cached_cases_dir, "case_cache.json")
-    try:
-        if os.path.exists(case_cache_file):
-            with open(case_cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-                logger.info(f"Loaded cached case_cache.json with {len(cache_data)} organisms")
-                return cache_data
-    except Exception as e:
-        logger.warning(f"Error loading cached case_cache.json: {e}")
-    return {}
+    # Lazy import: services import this module
+    from microtutor.services.case.case_store import get_case_store
+    return get_case_store(cached_cases_dir).snapshot()
 
 
 def has_cached_case(organism: str, cached_cases_dir: str, case_generator_cache: Optional[Dict[str, str]] = None) -> bool:
-    """Check if organism has a cached case in case_cache.json.
+    """Check if organism has a cached case (case_cache.json or cases/).
     
     Args:
         organism: The organism name
@@ -191,9 +231,9 @@ def has_cached_case(organism: str, cached_cases_dir: str, case_generator_cache:
     try:
         cache_key = normalize_organism_name(organism)
         
-        # Check cached case_cache.json (from data/cases/cached/)
-        cached_case_cache = load_cached_case_cache(cached_cases_dir)
-        if cache_key in cached_case_cache:
+        # Check the case store for data/cases/cached/ (no file read per call)
+        from microtutor.services.case.case_store import get_case_store
+        if get_case_store(cached_cases_dir).has(cache_key):
             return True
         
         # Check in-memory cache if provided
@@ -0,0 +1,167 @@
+"""
+Content-addressed embedding cache.
+
+Embeddings are deterministic for a given (model, text), so they are cached
+under (model, sha256(text)) in two tiers:
+
+- an in-process LRU (fast, bounded by EMBEDDING_CACHE_LRU_SIZE)
+- a SQLite file shared by every process on the host (float32 BLOBs)
+
+Lookups go LRU -> SQLite; SQLite hits are promoted into the LRU. Callers that
+embed lists use get_many() to find the misses and only send those to the API
+(see embedding_utils.get_embeddings_batch).
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from microtutor.utils.sqlite_tier import SQLiteLRUTier, expand_db_path
+
+logger = logging.getLogger(__name__)
+
+_Key = Tuple[str, str]  # (model, sha256 hex digest)
+
+
+def text_digest(text: str) -> str:
+    """sha256 of the exact text that would be sent to the embedding API."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(SQLiteLRUTier):
+    """Two-tier (LRU + SQLite) cache of embedding vectors keyed by (model, sha256(text))."""
+
+    _label = "Embedding cache"
+    _table = "embeddings"
+    _schema = """
+        CREATE TABLE IF NOT EXISTS embeddings (
+            model TEXT NOT NULL,
+            digest TEXT NOT NULL,
+            dim INTEGER NOT NULL,
+            vector BLOB NOT NULL,
+            created_at REAL NOT NULL,
+            PRIMARY KEY (model, digest)
+        )
+    """
+
+    def __init__(self, db_path: Optional[str] = None, lru_size: int = 10000):
+        self._stats: Dict[str, int] = {"lru_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0}
+        super().__init__(db_path=db_path, lru_size=lru_size)
+
+    # ---------- Public API ----------
+
+    def get_many(self, model: str, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Look up several texts at once; None marks a miss."""
+        keys = [(model, text_digest(t)) for t in texts]
+        found: Dict[_Key, array] = {}
+
+        with self._lock:
+            pending = []
+            for key in keys:
+                vec = self._lru_get(key)
+                if vec is not None:
+                    found[key] = vec
+                    self._stats["lru_hits"] += 1
+                elif key not in pending:
+                    pending.append(key)
+
+            if pending and self._conn is not None:
+                digests = [d for _, d in pending]
+                try:
+                    # SQLite caps bound parameters; query in chunks
+                    for i in range(0, len(digests), 500):
+                        chunk = digests[i:i + 500]
+                        rows = self._conn.execute(
+                            f"SELECT digest, vector FROM embeddings WHERE model = ? "
+                            f"AND digest IN ({','.join('?' * len(chunk))})",
+                            [model, *chunk],
+                        ).fetchall()
+                        for digest, blob in rows:
+                            vec = array("f")
+                            vec.frombytes(blob)
+                            key = (model, digest)
+                            found[key] = vec
+                            self._lru_put(key, vec)
+                            self._stats["disk_hits"] += 1
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding cache read failed: {e}")
+
+            self._stats["misses"] += sum(1 for key in pending if key not in found)
+
+        return [found[key].tolist() if key in found else None for key in keys]
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        """Look up one text; None on a miss."""
+        return self.get_many(model, [text])[0]
+
+    def put_many(self, model: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        """Store embeddings for texts (same order)."""
+        rows = []
+        now = time.time()
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                if not vector:
+                    continue  # Never cache empty/failed embeddings
+                key = (model, text_digest(text))
+                vec = array("f", vector)
+                self._lru_put(key, vec)
+                rows.append((model, key[1], len(vec), vec.tobytes(), now))
+
+            if rows:
+                self._disk_execute(
+                    "INSERT OR REPLACE INTO embeddings (model, digest, dim, vector, created_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                    many=True,
+                )
+            self._stats["writes"] += len(rows)
+
+    def put(self, model: str, text: str, vector: Sequence[float]) -> None:
+        """Store one embedding."""
+        self.put_many(model, [text], [vector])
+
+    def get_stats(self) -> Dict[str, object]:
+        """Hit/miss counters for monitoring."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["lru_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["lookups"] = lookups
+            stats["hit_rate"] = ((stats["lru_hits"] + stats["disk_hits"]) / lookups) if lookups else 0.0
+            stats.update(self._tier_stats())
+        return stats
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for k in self._stats:
+                self._stats[k] = 0
+
+
+# -------- Singleton --------
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """Get the process-wide embedding cache, or None if disabled by config."""
+    global _embedding_cache
+    if _embedding_cache is None:
+        with _embedding_cache_lock:
+            if _embedding_cache is None:
+                from microtutor.core.config.config_helper import config
+                if not getattr(config, "EMBEDDING_CACHE_ENABLED", True):
+                    return None
+                db_path = getattr(config, "EMBEDDING_CACHE_PATH", None)
+                if db_path is None:
+                    project_root = Path(__file__).resolve().parents[3]
+                    db_path = str(project_root / "data" / "cache" / "embeddings.sqlite3")
+                _embedding_cache = EmbeddingCache(
+                    db_path=expand_db_path(db_path),
+                    lru_size=getattr(config, "EMBEDDING_CACHE_LRU_SIZE", 10000),
+                )
+    return _embedding_cache
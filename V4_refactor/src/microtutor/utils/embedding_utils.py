@@ -3,24 +3,84 @@ Embedding utilities for text vectorization using OpenAI/Azure OpenAI.
 
 This module provides centralized functions for generating embeddings from text
 using either OpenAI or Azure OpenAI services, with automatic client selection
-based on environment configuration.
+based on environment configuration. Clients come from the shared pool in
+microtutor.core.llm.client_pool, so repeated calls reuse warm connections,
+and vectors are cached by (model, sha256(text)) in utils.embedding_cache.
 """
 
+import asyncio
+import logging
 import os
-from typing import List, Union
-from openai import AzureOpenAI, OpenAI
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Union
+import openai
 from dotenv import load_dotenv
 
+from microtutor.core.llm.client_pool import get_openai_client
+from microtutor.utils.embedding_cache import get_embedding_cache
+
+try:
+    import tiktoken
+    _TOKEN_ENCODER = tiktoken.get_encoding("cl100k_base")
+except Exception:  # Optional - fall back to a character estimate
+    _TOKEN_ENCODER = None
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
-def get_embedding(text: str) -> List[float]:
+def get_embedding_client(is_async: bool = False):
+    """
+    Get the shared OpenAI or Azure OpenAI client for embeddings.
+    
+    Azure is used when USE_AZURE_OPENAI is set and its credentials are present,
+    otherwise personal OpenAI.
+    
+    Raises:
+        ValueError: If required API credentials are missing
+    """
+    use_azure_env = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
+    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
+    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
+    openai_api_key = os.getenv("OPENAI_API_KEY")
+    
+    if use_azure_env and azure_endpoint and azure_api_key:
+        return get_openai_client(use_azure=True, is_async=is_async)
+    if openai_api_key:
+        return get_openai_client(use_azure=False, is_async=is_async)
+    raise ValueError(
+        "Missing required OpenAI environment variables. "
+        "Check USE_AZURE_OPENAI setting and credentials."
+    )
+
+
+def _lookup_cached(model: str, texts: List[str]) -> List[Optional[List[float]]]:
+    """Cache lookup that degrades to "all misses" when the cache is disabled."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return [None] * len(texts)
+    return cache.get_many(model, texts)
+
+
+def _store_cached(model: str, texts: List[str], vectors: List[List[float]]) -> None:
+    cache = get_embedding_cache()
+    if cache is not None:
+        cache.put_many(model, texts, vectors)
+
+
+def get_embedding(text: str, model: Optional[str] = None, client=None) -> List[float]:
     """
     Get embedding for a single text using OpenAI or Azure OpenAI.
     
+    Results are cached by (model, sha256(text)); see embedding_cache.
+    
     Args:
         text: The text to embed
+        model: Embedding model (defaults to EMBEDDING_MODEL)
+        client: Optional OpenAI client to use instead of the shared one
         
     Returns:
         List of float values representing the embedding vector
@@ -29,41 +89,51 @@ def get_embedding(text: str) -> List[float]:
         ValueError: If required API credentials are missing
         Exception: If the embedding request fails
     """
-    # Determine which client to use based on the toggle
-    use_azure_env = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
-    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-    openai_api_key = os.getenv("OPENAI_API_KEY")
+    model = model or get_embedding_model_name()
+    cached = _lookup_cached(model, [text])[0]
+    if cached is not None:
+        return cached
     
-    if use_azure_env and azure_endpoint and azure_api_key:
-        # Use Azure OpenAI
-        client = AzureOpenAI(
-            azure_endpoint=azure_endpoint,
-            api_key=azure_api_key,
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2025-04-16")
-        )
-    elif openai_api_key:
-        # Use personal OpenAI
-        client = OpenAI(api_key=openai_api_key)
-    else:
-        raise ValueError(
-            "Missing required OpenAI environment variables. "
-            "Check USE_AZURE_OPENAI setting and credentials."
-        )
-    
-    response = client.embeddings.create(
-        model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
-        input=text
-    )
-    return response.data[0].embedding
+    client = client or get_embedding_client()
+    response = client.embeddings.create(model=model, input=text)
+    embedding = response.data[0].embedding
+    _store_cached(model, [text], [embedding])
+    return embedding
 
 
-def get_embeddings_batch(texts: List[str]) -> List[List[float]]:
+async def aget_embedding(text: str, model: Optional[str] = None, client=None) -> List[float]:
+    """
+    Async version of get_embedding() (same cache, AsyncOpenAI client).
+    
+    Args:
+        text: The text to embed
+        model: Embedding model (defaults to EMBEDDING_MODEL)
+        client: Optional async OpenAI client to use instead of the shared one
+    """
+    model = model or get_embedding_model_name()
+    # The cache's disk tier is blocking SQLite - keep it off the event loop
+    cached = (await asyncio.to_thread(_lookup_cached, model, [text]))[0]
+    if cached is not None:
+        return cached
+    
+    client = client or get_embedding_client(is_async=True)
+    response = await client.embeddings.create(model=model, input=text)
+    embedding = response.data[0].embedding
+    await asyncio.to_thread(_store_cached, model, [text], [embedding])
+    return embedding
+
+
+def get_embeddings_batch(texts: List[str], model: Optional[str] = None, client=None) -> List[List[float]]:
     """
     Get embeddings for a batch of texts using OpenAI or Azure OpenAI.
     
+    Cached texts are served from the embedding cache; only the misses
+    (deduplicated) are sent to the API, in one request.
+    
     Args:
         texts: List of texts to embed
+        model: Embedding model (defaults to EMBEDDING_MODEL)
+        client: Optional OpenAI client to use instead of the shared one
         
     Returns:
         List of embedding vectors, one for each input text
@@ -72,33 +142,132 @@ def get_embeddings_batch(texts: List[str]) -> List[List[float]]:
         ValueError: If required API credentials are missing
         Exception: If the embedding request fails
     """
-    # Determine which client to use based on the toggle
-    use_azure_env = os.getenv("USE_AZURE_OPENAI", "false").lower() == "true"
-    azure_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    azure_api_key = os.getenv("AZURE_OPENAI_API_KEY")
-    openai_api_key = os.getenv("OPENAI_API_KEY")
+    model = model or get_embedding_model_name()
+    results = _lookup_cached(model, texts)
     
-    if use_azure_env and azure_endpoint and azure_api_key:
-        # Use Azure OpenAI
-        client = AzureOpenAI(
-            azure_endpoint=azure_endpoint,
-            api_key=azure_api_key,
-            api_version=os.getenv("AZURE_OPENAI_API_VERSION", "2025-04-16")
-        )
-    elif openai_api_key:
-        # Use personal OpenAI
-        client = OpenAI(api_key=openai_api_key)
-    else:
-        raise ValueError(
-            "Missing required OpenAI environment variables. "
-            "Check USE_AZURE_OPENAI setting and credentials."
-        )
-    
-    response = client.embeddings.create(
-        model=os.getenv("EMBEDDING_MODEL", "text-embedding-3-small"),
-        input=texts
-    )
-    return [data.embedding for data in response.data]
+    misses = list(dict.fromkeys(t for t, vec in zip(texts, results) if vec is None))
+    if misses:
+        client = client or get_embedding_client()
+        response = client.embeddings.create(model=model, input=misses)
+        fresh = {text: data.embedding for text, data in zip(misses, response.data)}
+        _store_cached(model, misses, [fresh[t] for t in misses])
+        results = [vec if vec is not None else fresh[t] for t, vec in zip(texts, results)]
+    
+    return results
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count estimate (tiktoken if installed, else ~4 chars/token)."""
+    if _TOKEN_ENCODER is not None:
+        return len(_TOKEN_ENCODER.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def _token_aware_batches(texts: List[str], max_tokens: int, max_inputs: int) -> List[List[str]]:
+    """Split texts into request-sized batches by estimated tokens and input count."""
+    batches: List[List[str]] = []
+    current: List[str] = []
+    current_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_inputs):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(text)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _embed_with_retry(client, model: str, batch: List[str], retries: int) -> Dict[str, List[float]]:
+    """Embed one batch, retrying transient errors and bisecting rejected input.
+    
+    Returns a {text: embedding} dict; texts missing from it failed. Only an
+    input-specific rejection (BadRequestError, e.g. too many tokens) splits
+    the batch, so only the offending inputs are lost. Rate limits, timeouts,
+    connection and 5xx errors are retried with backoff and then fail the
+    whole batch. Auth/permission errors are raised - no batch can succeed.
+    """
+    for attempt in range(retries):
+        try:
+            response = client.embeddings.create(model=model, input=batch)
+            return {text: data.embedding for text, data in zip(batch, response.data)}
+        except openai.BadRequestError as e:
+            if len(batch) == 1:
+                logger.error(f"Embedding input rejected ({len(batch[0])} chars): {e}")
+                return {}
+            logger.warning(f"Embedding batch of {len(batch)} rejected ({e}), splitting it")
+            mid = len(batch) // 2
+            result = _embed_with_retry(client, model, batch[:mid], retries)
+            result.update(_embed_with_retry(client, model, batch[mid:], retries))
+            return result
+        except (openai.AuthenticationError, openai.PermissionDeniedError, openai.NotFoundError):
+            raise
+        except Exception as e:
+            if attempt < retries - 1:
+                wait = min(2 ** attempt, 30)
+                logger.warning(f"Embedding batch of {len(batch)} failed ({e}), retrying in {wait}s")
+                time.sleep(wait)
+            else:
+                logger.error(f"Embedding batch of {len(batch)} failed after {retries} attempts: {e}")
+    return {}
+
+
+def embed_texts(
+    texts: List[str],
+    model: Optional[str] = None,
+    max_tokens_per_batch: int = 100_000,
+    max_inputs_per_batch: int = 512,
+    max_concurrency: int = 4,
+    retries: int = 3,
+    client=None,
+) -> List[Optional[List[float]]]:
+    """
+    Embed many texts for index builds: cached, batched and concurrent.
+    
+    Cached texts are served from the embedding cache. The misses (deduplicated)
+    go out as multi-input requests sized by estimated tokens, with up to
+    max_concurrency requests in flight. Transient failures are retried; a
+    batch the API rejects is bisected, so only the inputs that actually fail
+    are lost.
+    
+    Args:
+        texts: Texts to embed
+        model: Embedding model (defaults to EMBEDDING_MODEL)
+        max_tokens_per_batch: Estimated token budget per request
+        max_inputs_per_batch: Maximum inputs per request
+        max_concurrency: Concurrent embedding requests
+        retries: Attempts per batch on transient errors
+        client: Optional OpenAI client to use instead of the shared one
+        
+    Returns:
+        One embedding per input text, or None where embedding failed
+        
+    Raises:
+        openai.AuthenticationError, openai.PermissionDeniedError,
+        openai.NotFoundError: credentials or model are unusable
+    """
+    model = model or get_embedding_model_name()
+    results = _lookup_cached(model, texts)
+    misses = list(dict.fromkeys(t for t, vec in zip(texts, results) if vec is None))
+    if not misses:
+        return results
+    
+    client = client or get_embedding_client()
+    batches = _token_aware_batches(misses, max_tokens_per_batch, max_inputs_per_batch)
+    logger.info(f"Embedding {len(misses)} texts in {len(batches)} batches ({len(texts) - len(misses)} cached)")
+    
+    fresh: Dict[str, List[float]] = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(batches)))) as pool:
+        for batch_result in pool.map(lambda b: _embed_with_retry(client, model, b, retries), batches):
+            fresh.update(batch_result)
+            _store_cached(model, list(batch_result), list(batch_result.values()))
+    
+    failed = len(misses) - len(fresh)
+    if failed:
+        logger.warning(f"{failed} of {len(misses)} texts could not be embedded")
+    return [vec if vec is not None else fresh.get(t) for t, vec in zip(texts, results)]
 
 
 def get_embedding_model_name() -> str:
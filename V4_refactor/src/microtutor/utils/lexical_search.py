@@ -0,0 +1,130 @@
+"""
+Local lexical retrieval (BM25) and rank fusion.
+
+Vector search needs a remote embedding call before it can run. A BM25 index
+over the same texts answers instantly and offline, so retrievers use it two
+ways:
+
+- fused with vector results via reciprocal rank fusion (RRF), and
+- on its own when the embedding call is unavailable or over its time budget.
+
+Indices are plain JSON so they can sit next to the FAISS / .npy files.
+"""
+
+import json
+import math
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:[-'][a-z0-9]+)*")
+
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have he her his how i if in
+into is it its me my no not of on or our she so than that the their them then there these they this
+to was we were what when where which who why will with would you your
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords or single characters."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+class BM25Index:
+    """Okapi BM25 over a list of documents (doc ids are list positions)."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_lens: List[int] = []
+        self.postings: Dict[str, List[Tuple[int, int]]] = {}  # term -> [(doc_id, tf), ...]
+
+    @classmethod
+    def build(cls, texts: Iterable[str], k1: float = 1.5, b: float = 0.75) -> "BM25Index":
+        index = cls(k1=k1, b=b)
+        index.add_documents(texts)
+        return index
+
+    def __len__(self) -> int:
+        return len(self.doc_lens)
+
+    def add_documents(self, texts: Iterable[str]) -> None:
+        """Append documents (ids continue from the current size)."""
+        for text in texts:
+            doc_id = len(self.doc_lens)
+            tokens = tokenize(text or "")
+            self.doc_lens.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                self.postings.setdefault(term, []).append((doc_id, tf))
+
+    def search(self, query: str, top_k: int = 10, allowed: Optional[Sequence[bool]] = None) -> List[Tuple[int, float]]:
+        """Return [(doc_id, score), ...] best first.
+
+        Args:
+            query: Free-text query
+            top_k: Number of results
+            allowed: Optional per-doc mask; docs with False are skipped
+        """
+        n_docs = len(self.doc_lens)
+        if n_docs == 0:
+            return []
+        avgdl = (sum(self.doc_lens) / n_docs) or 1.0
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings:
+                if allowed is not None and not allowed[doc_id]:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * self.doc_lens[doc_id] / avgdl)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        return sorted(scores.items(), key=lambda x: x[1], reverse=True)[:top_k]
+
+    # ---------- Persistence ----------
+
+    def save(self, path: str) -> None:
+        """Write atomically as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp-{os.getpid()}")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"k1": self.k1, "b": self.b, "doc_lens": self.doc_lens, "postings": self.postings}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "BM25Index":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(k1=data.get("k1", 1.5), b=data.get("b", 0.75))
+        index.doc_lens = data["doc_lens"]
+        index.postings = {term: [tuple(p) for p in plist] for term, plist in data["postings"].items()}
+        return index
+
+    @classmethod
+    def load_or_build(cls, path: str, texts: Sequence[str]) -> "BM25Index":
+        """Load the saved index if it matches texts, else build one in memory."""
+        if path and os.path.exists(path):
+            try:
+                index = cls.load(path)
+                if len(index) == len(texts):
+                    return index
+            except Exception:
+                pass
+        return cls.build(texts)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[int]], k: int = 60) -> List[Tuple[int, float]]:
+    """Fuse ranked id lists: score(d) = sum over lists of 1 / (k + rank). Best first."""
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(fused.items(), key=lambda x: x[1], reverse=True)
@@ -6,7 +6,7 @@ collaborator dependencies, allowing for flexible dependency injection
 and testing.
 """
 
-from typing import List, Dict, Any, Optional, Protocol
+from typing import Any, AsyncIterator, Dict, List, Optional, Protocol
 
 
 class ToolEngine(Protocol):
@@ -27,11 +27,46 @@ class ToolEngine(Protocol):
             Dict with: result, tool_name, success, cached, execution_time_ms, error (if failed)
         """
         ...
+    
+    async def aexecute_tool(
+        self,
+        name: str,
+        args: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Async version of execute_tool (same result dict), with optional timeout in seconds."""
+        ...
+    
+    def astream_tool(
+        self,
+        name: str,
+        args: Dict[str, Any],
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream a tool's output: "delta" events, then one "result" event (timeout in seconds)."""
+        ...
 
 
 class FeedbackClient(Protocol):
     """Protocol for feedback retrieval client."""
     
+    def retrieval_context(
+        self,
+        current_message: str,
+        conversation_history: List[Dict[str, str]],
+        index_type: str = "all",
+        organism: Optional[str] = None,
+    ) -> Any:
+        """Embed once for a turn; pass the result as `retrieval` below.
+        
+        organism restricts every search made with the context to that
+        organism's feedback.
+        
+        Returns:
+            Opaque retrieval context, or None if unavailable
+        """
+        ...
+    
     def get_examples_for_tool(
         self,
         user_input: str,
@@ -39,6 +74,7 @@ class FeedbackClient(Protocol):
         tool_name: str,
         include_feedback: bool,
         similarity_threshold: Optional[float],
+        retrieval: Any = None,
     ) -> str:
         """Get formatted feedback examples string for a tool.
         
@@ -54,6 +90,7 @@ class FeedbackClient(Protocol):
         message_type: str,
         k: int,
         similarity_threshold: Optional[float],
+        retrieval: Any = None,
     ) -> List[Dict[str, Any]]:
         """Retrieve structured feedback examples.
         
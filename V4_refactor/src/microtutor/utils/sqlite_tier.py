@@ -0,0 +1,103 @@
+"""
+LRU + SQLite storage tier shared by the two-tier caches and stores.
+
+EmbeddingCache, GuidelineResultCache and SessionStore all keep a bounded
+in-process LRU in front of a SQLite file (WAL, shared by every worker on the
+host) and fall back to memory only if the file can't be opened. This base
+class owns that plumbing; subclasses declare their table and implement their
+own get/put semantics on top of _lru_get/_lru_put and self._conn, holding
+self._lock.
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def expand_db_path(db_path: Optional[str]) -> Optional[str]:
+    """Config value -> SQLite path; "" (or None) means memory only."""
+    return os.path.expanduser(db_path) if db_path else None
+
+
+class SQLiteLRUTier:
+    """In-process LRU in front of an optional SQLite table.
+
+    Subclasses set:
+        _label: Name used in log messages ("Embedding cache")
+        _table: Table name (used for stats)
+        _schema: CREATE TABLE IF NOT EXISTS statement for _table
+    """
+
+    _label = "Cache"
+    _table = ""
+    _schema = ""
+
+    def __init__(self, db_path: Optional[str] = None, lru_size: int = 1000):
+        self.db_path = db_path
+        self.lru_size = lru_size
+        self._lru: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str) -> None:
+        """Open (or create) the SQLite tier; stay memory-only if that fails."""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(self._schema)
+            conn.commit()
+            self._conn = conn
+            logger.info(f"{self._label} on disk at {db_path}")
+        except Exception as e:
+            logger.warning(f"{self._label} disk tier unavailable ({e}) - using memory only")
+            self._conn = None
+
+    def _lru_get(self, key: Hashable) -> Optional[Any]:
+        value = self._lru.get(key)
+        if value is not None:
+            self._lru.move_to_end(key)
+        return value
+
+    def _lru_put(self, key: Hashable, value: Any) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.lru_size:
+            self._lru.popitem(last=False)
+
+    def _disk_execute(self, sql: str, params: Any = (), what: str = "write", many: bool = False) -> Optional[sqlite3.Cursor]:
+        """Run and commit one statement on the disk tier; None if disabled or it failed (logged)."""
+        if self._conn is None:
+            return None
+        try:
+            cur = self._conn.executemany(sql, params) if many else self._conn.execute(sql, params)
+            self._conn.commit()
+            return cur
+        except sqlite3.Error as e:
+            logger.warning(f"{self._label} {what} failed: {e}")
+            return None
+
+    def _tier_stats(self) -> Dict[str, Any]:
+        """Size/config fields for get_stats() (caller holds the lock)."""
+        stats: Dict[str, Any] = {
+            "lru_entries": len(self._lru),
+            "lru_size": self.lru_size,
+            "disk_enabled": self._conn is not None,
+            "db_path": self.db_path,
+        }
+        if self._conn is not None:
+            try:
+                stats["disk_entries"] = self._conn.execute(f"SELECT COUNT(*) FROM {self._table}").fetchone()[0]
+            except sqlite3.Error:
+                stats["disk_entries"] = None
+        return stats